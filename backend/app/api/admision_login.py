@@ -0,0 +1,167 @@
+"""
+Control de admisión de los intentos de login.
+
+Cada login cuesta una verificación bcrypt completa, así que una terminal mal
+configurada que reintenta una contraseña incorrecta en bucle puede ocupar
+todos los núcleos y demorar el triage. Antes de cualquier hash, cada intento
+consume un token de dos baldes (token buckets): el del email y el del
+cliente que se conecta. Si alguno está vacío el intento se rechaza al
+instante indicando cuánto esperar. Además se acota cuántas verificaciones
+corren a la vez en el proceso.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+class LimiteExcedido(Exception):
+    """El intento de login se rechaza; `espera` son los segundos sugeridos antes de reintentar"""
+
+    def __init__(self, mensaje: str, espera: float):
+        super().__init__(mensaje)
+        self.espera = espera
+
+    @property
+    def retry_after(self) -> str:
+        """Valor del header Retry-After (segundos enteros, al menos 1)"""
+        return str(max(1, math.ceil(self.espera)))
+
+
+class BaldesTokens:
+    """
+    Un token bucket por clave: `capacidad` intentos seguidos y luego uno cada
+    `60 / por_minuto` segundos. Las claves menos usadas se descartan al
+    superar `max_claves` (un balde descartado vuelve lleno). No es
+    thread-safe: lo protege el lock del limitador.
+    """
+
+    def __init__(self, capacidad: float, por_minuto: float, max_claves: int = 10_000):
+        self.capacidad = capacidad
+        self.por_segundo = por_minuto / 60
+        self.max_claves = max_claves
+        # clave -> [tokens, instante de la última recarga]
+        self._baldes: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    def espera(self, clave: str, ahora: float) -> float:
+        """
+        Segundos hasta que la clave tenga un token (0 si ya lo tiene).
+
+        Args:
+            clave: Email o cliente
+            ahora: Instante actual (reloj monotónico)
+        """
+        tokens = self._recargar(clave, ahora)
+        if tokens >= 1:
+            return 0.0
+        if self.por_segundo <= 0:
+            return math.inf
+        return (1 - tokens) / self.por_segundo
+
+    def consumir(self, clave: str, ahora: float) -> None:
+        """Consume un token de la clave (llamar después de `espera` == 0)"""
+        self._recargar(clave, ahora)
+        self._baldes[clave][0] -= 1
+
+    def __len__(self) -> int:
+        return len(self._baldes)
+
+    def _recargar(self, clave: str, ahora: float) -> float:
+        """Actualiza los tokens de la clave según el tiempo transcurrido"""
+        balde = self._baldes.get(clave)
+        if balde is None:
+            balde = self._baldes[clave] = [self.capacidad, ahora]
+            while len(self._baldes) > self.max_claves:
+                self._baldes.popitem(last=False)
+        else:
+            balde[0] = min(self.capacidad, balde[0] + (ahora - balde[1]) * self.por_segundo)
+            balde[1] = ahora
+            self._baldes.move_to_end(clave)
+        return balde[0]
+
+
+class LimitadorLogin:
+    """Baldes por email y por cliente más un tope de verificaciones simultáneas. Es thread-safe."""
+
+    def __init__(
+        self,
+        por_email: BaldesTokens,
+        por_cliente: BaldesTokens,
+        max_verificaciones: int,
+        reloj: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            por_email: Baldes por email
+            por_cliente: Baldes por cliente (dirección IP)
+            max_verificaciones: Verificaciones de contraseña simultáneas en el proceso
+            reloj: Reloj monotónico en segundos
+        """
+        self.por_email = por_email
+        self.por_cliente = por_cliente
+        self.max_verificaciones = max_verificaciones
+        self._reloj = reloj
+        self._lock = threading.Lock()
+        self._verificaciones = 0
+
+        # Métricas
+        self._admitidos = 0
+        self._rechazados_email = 0
+        self._rechazados_cliente = 0
+        self._rechazados_concurrencia = 0
+
+    @contextmanager
+    def admitir(self, email: str, cliente: Optional[str]) -> Iterator[None]:
+        """
+        Admite un intento de login o lo rechaza sin hacer ningún trabajo.
+
+        El intento consume un token del email y otro del cliente, y ocupa un
+        lugar de verificación hasta salir del bloque.
+
+        Args:
+            email: Email con que se intenta el login
+            cliente: Dirección del cliente (None si no se conoce)
+
+        Raises:
+            LimiteExcedido: Si el email o el cliente no tienen tokens, o ya hay
+                `max_verificaciones` verificaciones en curso
+        """
+        cliente = cliente or "desconocido"
+        with self._lock:
+            ahora = self._reloj()
+            espera_email = self.por_email.espera(email, ahora)
+            espera_cliente = self.por_cliente.espera(cliente, ahora)
+            if espera_email > 0 or espera_cliente > 0:
+                if espera_email > 0:
+                    self._rechazados_email += 1
+                else:
+                    self._rechazados_cliente += 1
+                raise LimiteExcedido("Demasiados intentos de inicio de sesión", max(espera_email, espera_cliente))
+            if self._verificaciones >= self.max_verificaciones:
+                self._rechazados_concurrencia += 1
+                raise LimiteExcedido("Hay demasiados inicios de sesión en curso", 1)
+            self.por_email.consumir(email, ahora)
+            self.por_cliente.consumir(cliente, ahora)
+            self._verificaciones += 1
+            self._admitidos += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._verificaciones -= 1
+
+    def estadisticas(self) -> Dict[str, Any]:
+        """Intentos admitidos y rechazados por motivo, y verificaciones en curso"""
+        with self._lock:
+            return {
+                "admitidos": self._admitidos,
+                "rechazados_por_email": self._rechazados_email,
+                "rechazados_por_cliente": self._rechazados_cliente,
+                "rechazados_por_concurrencia": self._rechazados_concurrencia,
+                "verificaciones_en_curso": self._verificaciones,
+                "max_verificaciones": self.max_verificaciones,
+                "emails": len(self.por_email),
+                "clientes": len(self.por_cliente),
+            }
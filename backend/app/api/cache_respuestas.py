@@ -0,0 +1,139 @@
+"""
+Cache de respuestas ya serializadas para las lecturas más frecuentes.
+
+Cada entrada guarda los bytes JSON de una respuesta junto con la versión del
+dato del que salió (por ejemplo, la versión de la lista de espera). Una
+entrada solo se usa si su versión coincide con la actual, así que cualquier
+admisión, reclamo o atención la invalida en el momento exacto, incluso si el
+cambio lo hizo otro worker (con SQLite las versiones son compartidas).
+"""
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, List, Optional
+
+from fastapi import Response
+
+from backend.app.api.codificacion import FORMATO_JSON, codificar, comprimir
+from backend.app.core.config import settings
+
+
+@dataclass(frozen=True)
+class RespuestaSerializada:
+    """Cuerpo ya serializado (y comprimido, si corresponde) y headers propios de esa respuesta"""
+    contenido: bytes
+    # Por ejemplo, el cursor de la página siguiente o el Content-Encoding
+    headers: Dict[str, str] = field(default_factory=dict)
+    media_type: str = FORMATO_JSON
+
+
+def serializar_respuesta(
+    items: List[Any],
+    formato: str = FORMATO_JSON,
+    compresion: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None
+) -> RespuestaSerializada:
+    """
+    Serializa una lista de schemas y la comprime si supera COMPRESION_MIN_BYTES.
+
+    Args:
+        items: Schemas a serializar
+        formato: Formato negociado (ver codificacion.negociar_formato)
+        compresion: Compresión negociada (ver codificacion.negociar_compresion)
+        headers: Headers propios de la respuesta
+
+    Returns:
+        Respuesta serializada
+    """
+    headers = dict(headers or {})
+    # La representación depende de estos headers del request
+    headers["Vary"] = "Accept, Accept-Encoding"
+    contenido = codificar(items, formato)
+    if compresion is not None and len(contenido) >= settings.COMPRESION_MIN_BYTES:
+        contenido = comprimir(contenido, compresion)
+        headers["Content-Encoding"] = compresion
+    return RespuestaSerializada(contenido, headers, formato)
+
+
+def armar_respuesta(serializada: RespuestaSerializada, response: Response) -> Response:
+    """
+    Arma la respuesta con el contenido ya serializado.
+
+    Args:
+        serializada: Respuesta serializada
+        response: Response de la ruta (se copian sus headers, por ejemplo el ETag)
+
+    Returns:
+        Respuesta lista para enviar
+    """
+    respuesta = Response(content=serializada.contenido, media_type=serializada.media_type)
+    for nombre, valor in response.headers.items():
+        if nombre != "content-length":
+            respuesta.headers[nombre] = valor
+    respuesta.headers.update(serializada.headers)
+    return respuesta
+
+
+class CacheRespuestas:
+    """Respuestas serializadas por clave, válidas mientras no cambie su versión"""
+
+    def __init__(self, max_entradas: int = 64):
+        """
+        Args:
+            max_entradas: Cantidad máxima de claves (se descartan las menos usadas)
+        """
+        self.max_entradas = max_entradas
+        self._entradas: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Métricas
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, clave: Hashable, version: Hashable) -> Optional[RespuestaSerializada]:
+        """
+        Obtiene la respuesta guardada para la clave si corresponde a la versión dada.
+
+        Args:
+            clave: Recurso (por ejemplo, lista y parámetros de paginación)
+            version: Versión actual del dato
+
+        Returns:
+            La respuesta serializada, o None si no hay una para esta versión
+        """
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None or entrada[0] != version:
+                self.fallos += 1
+                return None
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return entrada[1]
+
+    def guardar(self, clave: Hashable, version: Hashable, respuesta: RespuestaSerializada) -> None:
+        """
+        Guarda la respuesta de una clave para una versión, reemplazando la anterior.
+
+        Args:
+            clave: Recurso
+            version: Versión del dato con el que se armó la respuesta (debe leerse
+                antes de armarla, para que lo guardado nunca sea más viejo que su versión)
+            respuesta: Respuesta serializada
+        """
+        with self._lock:
+            self._entradas[clave] = (version, respuesta)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+
+    def estadisticas(self) -> Dict[str, Any]:
+        """Entradas, bytes guardados y aciertos/fallos"""
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                "entradas": len(self._entradas),
+                "bytes": sum(len(respuesta.contenido) for _, respuesta in self._entradas.values()),
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+            }
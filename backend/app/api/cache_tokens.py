@@ -0,0 +1,162 @@
+"""
+Cache de tokens JWT ya verificados.
+
+Cada request autenticado verifica la firma del JWT (HMAC más el parseo del
+JSON) y busca al usuario en el repositorio, aunque la misma pantalla
+presente el mismo token de 24 horas miles de veces por turno. El cache
+guarda, por token, el usuario que ya se validó, hasta que vence el token (su
+claim `exp`) o pasa `ttl` segundos, lo que ocurra primero. El ttl acota lo
+que puede tardar en verse un cambio del usuario hecho por otro worker; los
+cambios de este proceso invalidan las entradas del usuario en el momento.
+Las revocaciones de otros workers se ven en el siguiente request, con la
+versión de la lista de revocación compartida (ver `sincronizar`).
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from backend.app.models.models import Usuario
+
+
+class CacheTokens:
+    """Usuarios de los tokens ya verificados, con desalojo LRU y vencimiento por entrada"""
+
+    def __init__(self, max_entradas: int = 4096, ttl: float = 300):
+        """
+        Args:
+            max_entradas: Cantidad máxima de tokens (se descartan los menos usados)
+            ttl: Segundos máximos que se usa una entrada, aunque el token siga vigente
+        """
+        self.max_entradas = max_entradas
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # token -> (vence, usuario), en orden de uso
+        self._entradas: "OrderedDict[str, Tuple[float, Usuario]]" = OrderedDict()
+        self._tokens_por_email: Dict[str, Set[str]] = {}
+        # Cuenta las invalidaciones: lo verificado antes de una no se guarda
+        self._generacion = 0
+        # Última versión vista de la lista de revocación compartida
+        self._version_revocaciones: Optional[int] = None
+
+        # Métricas
+        self.aciertos = 0
+        self.fallos = 0
+        self._segundos_aciertos = 0.0
+        self._segundos_fallos = 0.0
+
+    def validar(self, token: str, verificar: Callable[[str], Tuple[Usuario, Optional[float]]]) -> Usuario:
+        """
+        Retorna el usuario del token, verificándolo solo si no está en el cache.
+
+        Args:
+            token: JWT presentado
+            verificar: Verifica el token y retorna (usuario, exp); exp es el
+                timestamp de vencimiento del token, o None si no vence (no se guarda)
+
+        Returns:
+            Usuario del token
+
+        Raises:
+            Las excepciones de `verificar` (los tokens inválidos no se guardan)
+        """
+        inicio = time.perf_counter()
+        with self._lock:
+            entrada = self._entradas.get(token)
+            if entrada is not None:
+                if entrada[0] > time.time():
+                    self._entradas.move_to_end(token)
+                    self.aciertos += 1
+                    self._segundos_aciertos += time.perf_counter() - inicio
+                    return entrada[1]
+                self._quitar(token)
+            generacion = self._generacion
+
+        usuario, exp = verificar(token)
+
+        with self._lock:
+            self.fallos += 1
+            if exp is not None and generacion == self._generacion:
+                self._guardar(token, min(exp, time.time() + self.ttl), usuario)
+            self._segundos_fallos += time.perf_counter() - inicio
+        return usuario
+
+    def invalidar(self, email: Optional[str] = None) -> None:
+        """
+        Descarta los tokens de un usuario (o todos).
+
+        Args:
+            email: Email del usuario; None para vaciar el cache
+        """
+        with self._lock:
+            self._generacion += 1
+            if email is None:
+                self._entradas.clear()
+                self._tokens_por_email.clear()
+                return
+            for token in self._tokens_por_email.pop(email, ()):
+                self._entradas.pop(token, None)
+
+    def sincronizar(self, version_revocaciones: int) -> None:
+        """
+        Vacía el cache si hubo revocaciones desde la última versión vista,
+        ya que pueden haberlas hecho otros procesos.
+
+        Args:
+            version_revocaciones: Versión actual de la lista de revocación compartida
+        """
+        with self._lock:
+            if version_revocaciones == self._version_revocaciones:
+                return
+            self._version_revocaciones = version_revocaciones
+            self._generacion += 1
+            self._entradas.clear()
+            self._tokens_por_email.clear()
+
+    def quitar(self, token: str) -> None:
+        """
+        Descarta un token (por ejemplo, al revocarlo).
+
+        Args:
+            token: JWT
+        """
+        with self._lock:
+            self._generacion += 1
+            self._quitar(token)
+
+    def estadisticas(self) -> Dict[str, Any]:
+        """Entradas, tasa de aciertos y milisegundos ahorrados por request"""
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            ms_acierto = self._segundos_aciertos / self.aciertos * 1000 if self.aciertos else 0.0
+            ms_fallo = self._segundos_fallos / self.fallos * 1000 if self.fallos else 0.0
+            ahorro_por_acierto = max(ms_fallo - ms_acierto, 0.0) if self.aciertos and self.fallos else 0.0
+            return {
+                "entradas": len(self._entradas),
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+                "ms_promedio_acierto": ms_acierto,
+                "ms_promedio_verificacion": ms_fallo,
+                "ms_ahorrados_por_acierto": ahorro_por_acierto,
+                "ms_ahorrados_por_request": ahorro_por_acierto * self.aciertos / consultas if consultas else 0.0,
+            }
+
+    def _guardar(self, token: str, vence: float, usuario: Usuario) -> None:
+        """Guarda una entrada y desaloja las menos usadas (con el lock tomado)"""
+        self._quitar(token)
+        self._entradas[token] = (vence, usuario)
+        self._tokens_por_email.setdefault(usuario.email, set()).add(token)
+        while len(self._entradas) > self.max_entradas:
+            self._quitar(next(iter(self._entradas)))
+
+    def _quitar(self, token: str) -> None:
+        """Quita una entrada y su referencia en el índice por email (con el lock tomado)"""
+        entrada = self._entradas.pop(token, None)
+        if entrada is None:
+            return
+        tokens = self._tokens_por_email.get(entrada[1].email)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_por_email[entrada[1].email]
@@ -0,0 +1,98 @@
+"""
+Coalescencia de lecturas idénticas concurrentes (single-flight).
+
+Cuando varios requests piden lo mismo a la vez (por ejemplo, todas las
+pantallas refrescando la lista de espera en un cambio de turno), solo el
+primero calcula la respuesta; los demás esperan ese mismo cálculo y reciben
+su resultado. Las rutas sync de FastAPI corren en un threadpool, así que la
+espera es con primitivas de threading.
+"""
+import threading
+from collections import Counter
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+
+class _Vuelo:
+    """Cálculo en curso de una clave"""
+
+    def __init__(self):
+        self.listo = threading.Event()
+        self.resultado: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class CoalescedorLecturas:
+    """Comparte un único cálculo entre las lecturas concurrentes de una misma clave"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._en_curso: Dict[Hashable, _Vuelo] = {}
+
+        # Métricas (por el primer elemento de la clave, por ejemplo la ruta)
+        self._ejecuciones: Counter = Counter()
+        self._coalescidas: Counter = Counter()
+
+    def ejecutar(self, clave: Hashable, calcular: Callable[[], T]) -> T:
+        """
+        Calcula el resultado de la clave, o espera el cálculo que ya está en curso.
+
+        La clave tiene que identificar completamente el resultado (incluida la
+        versión del dato, si la hay): dos requests con la misma clave reciben
+        el mismo objeto. Si el cálculo falla, todos los que lo esperaban
+        reciben la misma excepción.
+
+        Args:
+            clave: Identifica la lectura; conviene que sea una tupla que empiece por la ruta
+            calcular: Función que calcula el resultado
+
+        Returns:
+            El resultado del cálculo
+        """
+        grupo = clave[0] if isinstance(clave, tuple) and clave else clave
+        with self._lock:
+            vuelo = self._en_curso.get(clave)
+            lider = vuelo is None
+            if lider:
+                vuelo = self._en_curso[clave] = _Vuelo()
+                self._ejecuciones[grupo] += 1
+            else:
+                self._coalescidas[grupo] += 1
+
+        if not lider:
+            vuelo.listo.wait()
+            if vuelo.error is not None:
+                raise vuelo.error
+            return vuelo.resultado
+
+        try:
+            vuelo.resultado = calcular()
+        except BaseException as e:
+            vuelo.error = e
+            raise
+        finally:
+            # Los requests que lleguen desde ahora calculan de nuevo
+            with self._lock:
+                del self._en_curso[clave]
+            vuelo.listo.set()
+        return vuelo.resultado
+
+    def estadisticas(self) -> Dict[str, Any]:
+        """Cálculos hechos y requests coalescidos, en total y por ruta"""
+        with self._lock:
+            ejecuciones = sum(self._ejecuciones.values())
+            coalescidas = sum(self._coalescidas.values())
+            return {
+                "ejecuciones": ejecuciones,
+                "coalescidas": coalescidas,
+                "en_curso": len(self._en_curso),
+                "por_ruta": {
+                    str(grupo): {
+                        "ejecuciones": self._ejecuciones[grupo],
+                        "coalescidas": self._coalescidas[grupo],
+                    }
+                    for grupo in self._ejecuciones
+                },
+            }
@@ -0,0 +1,165 @@
+"""
+Codificación de las respuestas de lista: JSON rápido, MessagePack y compresión.
+
+Los schemas de `api.schemas` son dataclasses planas (solo str, float y None),
+así que no hace falta el camino genérico de FastAPI (jsonable_encoder recorre
+cada valor para convertirlo): con orjson se serializan directamente y, sin
+orjson, con un codificador que ya conoce los campos de cada schema.
+
+orjson, msgpack y brotli están en requirements.txt. Si alguno falta (por
+ejemplo, en una instalación mínima) se usa json de la biblioteca estándar,
+se responde siempre JSON o se comprime con gzip.
+"""
+import dataclasses
+import gzip
+import json
+import operator
+from functools import lru_cache
+from typing import Any, Callable, List, Optional, Tuple
+
+from fastapi import Request
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+FORMATO_JSON = "application/json"
+FORMATO_MSGPACK = "application/x-msgpack"
+
+# Nombres con los que los clientes suelen pedir MessagePack
+_TIPOS_MSGPACK = ("application/x-msgpack", "application/msgpack", "application/vnd.msgpack")
+
+# Nivel 5 de gzip y 4 de brotli: casi la misma compresión que el máximo con
+# una fracción del CPU (la respuesta comprimida queda en el cache de respuestas)
+_NIVEL_GZIP = 5
+_NIVEL_BROTLI = 4
+
+_codificador_json = json.JSONEncoder(
+    ensure_ascii=False,
+    check_circular=False,
+    allow_nan=False,
+    separators=(",", ":")
+)
+
+
+@lru_cache(maxsize=None)
+def _campos(tipo: type) -> Tuple[Tuple[str, ...], Callable[[Any], tuple]]:
+    """Nombres de los campos de un schema y una función que lee todos juntos"""
+    nombres = tuple(campo.name for campo in dataclasses.fields(tipo))
+    if len(nombres) == 1:
+        leer_uno = operator.attrgetter(nombres[0])
+        return nombres, lambda item: (leer_uno(item),)
+    return nombres, operator.attrgetter(*nombres)
+
+
+def _a_dicts(items: List[Any]) -> List[dict]:
+    """Convierte schemas planos a dicts sin recorrerlos recursivamente (a diferencia de asdict)"""
+    if not items:
+        return []
+    nombres, leer = _campos(type(items[0]))
+    return [dict(zip(nombres, leer(item))) for item in items]
+
+
+def codificar(items: List[Any], formato: str = FORMATO_JSON) -> bytes:
+    """
+    Serializa una lista de schemas planos (todos del mismo tipo).
+
+    Args:
+        items: Schemas a serializar
+        formato: FORMATO_JSON o FORMATO_MSGPACK
+
+    Returns:
+        Contenido serializado
+    """
+    if formato == FORMATO_MSGPACK:
+        return msgpack.packb(_a_dicts(items), use_bin_type=True)
+    if orjson is not None:
+        return orjson.dumps(items)
+    return _codificador_json.encode(_a_dicts(items)).encode("utf-8")
+
+
+def _calidades(valor: Optional[str]) -> dict:
+    """Parsea un header Accept/Accept-Encoding a {valor: calidad}"""
+    calidades = {}
+    for parte in (valor or "").split(","):
+        nombre, *parametros = parte.split(";")
+        nombre = nombre.strip().lower()
+        if not nombre:
+            continue
+        calidad = 1.0
+        for parametro in parametros:
+            clave, _, numero = parametro.strip().partition("=")
+            if clave == "q":
+                try:
+                    calidad = float(numero)
+                except ValueError:
+                    calidad = 0.0
+        calidades[nombre] = calidad
+    return calidades
+
+
+def negociar_formato(request: Request) -> str:
+    """
+    Elige el formato de la respuesta según el header Accept.
+
+    MessagePack solo se usa si el cliente lo prefiere explícitamente a JSON y
+    msgpack está instalado; en cualquier otro caso se responde JSON.
+
+    Args:
+        request: Request HTTP
+
+    Returns:
+        FORMATO_JSON o FORMATO_MSGPACK
+    """
+    if msgpack is None:
+        return FORMATO_JSON
+    calidades = _calidades(request.headers.get("accept"))
+    calidad_msgpack = max((calidades.get(tipo, 0.0) for tipo in _TIPOS_MSGPACK), default=0.0)
+    calidad_json = max(calidades.get(FORMATO_JSON, 0.0), calidades.get("*/*", 0.0))
+    return FORMATO_MSGPACK if calidad_msgpack > calidad_json else FORMATO_JSON
+
+
+def negociar_compresion(request: Request) -> Optional[str]:
+    """
+    Elige la compresión de la respuesta según el header Accept-Encoding.
+
+    Args:
+        request: Request HTTP
+
+    Returns:
+        "br", "gzip" o None si el cliente no acepta ninguna disponible
+    """
+    calidades = _calidades(request.headers.get("accept-encoding"))
+    if brotli is not None and calidades.get("br", 0.0) > 0:
+        return "br"
+    if calidades.get("gzip", 0.0) > 0:
+        return "gzip"
+    return None
+
+
+def comprimir(contenido: bytes, compresion: str) -> bytes:
+    """
+    Comprime el contenido de una respuesta.
+
+    Args:
+        contenido: Contenido sin comprimir
+        compresion: "br" o "gzip"
+
+    Returns:
+        Contenido comprimido
+    """
+    if compresion == "br":
+        return brotli.compress(contenido, quality=_NIVEL_BROTLI)
+    return gzip.compress(contenido, compresslevel=_NIVEL_GZIP, mtime=0)
@@ -1,27 +1,85 @@
 """Dependencias para inyección en FastAPI"""
-from typing import Optional
-from fastapi import Depends, HTTPException, status
+import threading
+from datetime import timedelta
+from typing import Optional, Tuple, Union
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
 
-from backend.app.core.security import decode_access_token
+from backend.app.core.config import settings
+from backend.app.core.credenciales import MotorCredenciales, motor_credenciales
+from backend.app.core.revocacion import ListaRevocacion
+from backend.app.core.security import ALCANCE_SSE, decode_access_token
 from backend.app.models.models import Usuario, Enfermera, Doctor, Rol
 from backend.app.services.auth_service import InMemoryUserRepo
 from backend.app.repositories.paciente_repo_impl import InMemoryPacientesRepo
 from backend.app.services.servicio_emergencias import ServicioEmergencias
+from backend.app.services.servicio_emergencias_sqlite import ServicioEmergenciasSQLite
+from backend.app.services.directorio_personal import DirectorioPersonal
+from backend.app.models.registro_canonico import RegistroCanonico, registro_canonico
+from backend.app.repositories.sqlite_db import BaseSQLite
+from backend.app.repositories.paciente_repo_sqlite import SQLitePacientesRepo
+from backend.app.repositories.user_repo_sqlite import SQLiteUserRepo
+from backend.app.repositories.revocacion_sqlite import ListaRevocacionSQLite
+from backend.app.persistence.wal import WriteAheadLog, leer_registros, reproducir
+from backend.app.persistence.snapshot import GestorSnapshots, cargar_ultima_imagen, restaurar_imagen
+from backend.app.persistence.archivo_ingresos import ArchivoIngresos
+from backend.app.api.cache_respuestas import CacheRespuestas
+from backend.app.api.cache_tokens import CacheTokens
+from backend.app.api.admision_login import BaldesTokens, LimitadorLogin
+from backend.app.api.coalescencia import CoalescedorLecturas
+from backend.app.api.eventos import DifusorSSE
 
 
 # OAuth2 scheme para autenticación con Bearer token
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+# Variante que no falla sin header, para streams abiertos con EventSource (con ticket)
+oauth2_scheme_opcional = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
 
 
 # Singletons para desarrollo (en producción usar scope de FastAPI)
-_user_repo: Optional[InMemoryUserRepo] = None
-_pacientes_repo: Optional[InMemoryPacientesRepo] = None
+_db: Optional[BaseSQLite] = None
+_user_repo: Optional[Union[InMemoryUserRepo, SQLiteUserRepo]] = None
+_pacientes_repo: Optional[Union[InMemoryPacientesRepo, SQLitePacientesRepo]] = None
 _servicio_emergencias: Optional[ServicioEmergencias] = None
+_directorio_personal: Optional[DirectorioPersonal] = None
+_cache_tokens: Optional[CacheTokens] = None
+_lista_revocacion: Optional[Union[ListaRevocacion, ListaRevocacionSQLite]] = None
+_wal: Optional[WriteAheadLog] = None
+_gestor_snapshots: Optional[GestorSnapshots] = None
+_archivo_ingresos: Optional[ArchivoIngresos] = None
+_detener_archivado = threading.Event()
+_difusor_eventos: Optional[DifusorSSE] = None
+_cache_respuestas = CacheRespuestas()
+_limitador_login = LimitadorLogin(
+    BaldesTokens(settings.LOGIN_EMAIL_CAPACIDAD, settings.LOGIN_EMAIL_POR_MINUTO),
+    BaldesTokens(settings.LOGIN_CLIENTE_CAPACIDAD, settings.LOGIN_CLIENTE_POR_MINUTO),
+    settings.LOGIN_MAX_VERIFICACIONES
+)
+_coalescedor_lecturas = CoalescedorLecturas()
 
 
-def get_user_repo() -> InMemoryUserRepo:
+def _usa_sqlite() -> bool:
+    """Indica si el estado se comparte entre procesos vía SQLite (STORAGE_BACKEND)"""
+    if settings.STORAGE_BACKEND not in ("memoria", "sqlite"):
+        raise ValueError(f"STORAGE_BACKEND desconocido: {settings.STORAGE_BACKEND}")
+    return settings.STORAGE_BACKEND == "sqlite"
+
+
+def get_db() -> BaseSQLite:
+    """
+    Obtiene la base SQLite compartida (singleton por proceso).
+    
+    Returns:
+        Base SQLite
+    """
+    global _db
+    if _db is None:
+        _db = BaseSQLite(settings.SQLITE_PATH)
+    return _db
+
+
+def get_user_repo() -> Union[InMemoryUserRepo, SQLiteUserRepo]:
     """
     Obtiene el repositorio de usuarios (singleton).
     
@@ -30,11 +88,59 @@ def get_user_repo() -> InMemoryUserRepo:
     """
     global _user_repo
     if _user_repo is None:
-        _user_repo = InMemoryUserRepo()
+        _user_repo = SQLiteUserRepo(get_db()) if _usa_sqlite() else InMemoryUserRepo()
     return _user_repo
 
 
-def get_pacientes_repo() -> InMemoryPacientesRepo:
+def get_directorio_personal() -> DirectorioPersonal:
+    """
+    Obtiene el directorio de enfermeras y médicos autenticados (singleton por proceso).
+    
+    Returns:
+        Directorio del personal
+    """
+    global _directorio_personal
+    if _directorio_personal is None:
+        _directorio_personal = DirectorioPersonal(get_user_repo())
+    return _directorio_personal
+
+
+def get_cache_tokens() -> CacheTokens:
+    """
+    Obtiene el cache de tokens JWT verificados (singleton por proceso).
+    
+    Returns:
+        Cache de tokens
+    """
+    global _cache_tokens
+    if _cache_tokens is None:
+        _cache_tokens = CacheTokens(settings.TOKENS_CACHE_MAX, settings.TOKENS_CACHE_TTL_SEGUNDOS)
+        get_user_repo().suscribir_cambios(_cache_tokens.invalidar)
+    return _cache_tokens
+
+
+def get_lista_revocacion() -> Union[ListaRevocacion, ListaRevocacionSQLite]:
+    """
+    Obtiene la lista de tokens revocados (singleton). Con STORAGE_BACKEND=sqlite
+    vive en la base compartida, así que todos los workers ven las revocaciones.
+    Guardar un usuario revoca los tokens que se le emitieron antes, ya que sus
+    claims (rol, matrícula) pueden haber cambiado.
+    
+    Returns:
+        Lista de revocación
+    """
+    global _lista_revocacion
+    if _lista_revocacion is None:
+        duracion_tokens = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        if _usa_sqlite():
+            _lista_revocacion = ListaRevocacionSQLite(get_db(), duracion_tokens)
+        else:
+            _lista_revocacion = ListaRevocacion(duracion_tokens)
+        get_user_repo().suscribir_cambios(_lista_revocacion.revocar_usuario)
+    return _lista_revocacion
+
+
+def get_pacientes_repo() -> Union[InMemoryPacientesRepo, SQLitePacientesRepo]:
     """
     Obtiene el repositorio de pacientes (singleton).
     
@@ -43,7 +149,7 @@ def get_pacientes_repo() -> InMemoryPacientesRepo:
     """
     global _pacientes_repo
     if _pacientes_repo is None:
-        _pacientes_repo = InMemoryPacientesRepo()
+        _pacientes_repo = SQLitePacientesRepo(get_db()) if _usa_sqlite() else InMemoryPacientesRepo()
     return _pacientes_repo
 
 
@@ -61,20 +167,210 @@ def get_servicio_emergencias(
     """
     global _servicio_emergencias
     if _servicio_emergencias is None:
-        _servicio_emergencias = ServicioEmergencias(pacientes_repo)
+        _servicio_emergencias = _crear_servicio_emergencias(pacientes_repo)
     return _servicio_emergencias
 
 
+def _crear_servicio_emergencias(pacientes_repo: InMemoryPacientesRepo) -> ServicioEmergencias:
+    """
+    Crea el servicio de emergencias restaurando el estado persistido.
+    
+    Con STORAGE_BACKEND=sqlite el estado vive en la base compartida. En memoria,
+    primero carga el snapshot más reciente (si SNAPSHOT_DIR está configurado)
+    y luego reproduce el WAL desde el LSN que incluye ese snapshot.
+    
+    Args:
+        pacientes_repo: Repositorio de pacientes
+        
+    Returns:
+        Servicio de emergencias con el estado restaurado
+    """
+    global _wal, _gestor_snapshots, _archivo_ingresos
+    if _usa_sqlite():
+        # El estado ya es durable y compartido: no hay nada que reconstruir
+        return ServicioEmergenciasSQLite(get_db(), pacientes_repo)
+    
+    ingresos = []
+    desde_lsn = 0
+    
+    if settings.SNAPSHOT_DIR:
+        imagen = cargar_ultima_imagen(settings.SNAPSHOT_DIR)
+        if imagen is not None:
+            ingresos, desde_lsn = restaurar_imagen(imagen, get_user_repo(), pacientes_repo)
+    
+    if settings.WAL_PATH:
+        # Reconstruir el estado desde el WAL antes de aceptar nuevas operaciones
+        ingresos = reproducir(leer_registros(settings.WAL_PATH, desde_lsn), pacientes_repo, ingresos)
+        _wal = WriteAheadLog(
+            settings.WAL_PATH,
+            esperar_fsync=settings.WAL_ESPERAR_FSYNC,
+            demora_commit_ms=settings.WAL_DEMORA_COMMIT_MS,
+            lsn_inicial=desde_lsn
+        )
+    
+    if settings.ARCHIVO_DIR:
+        _archivo_ingresos = ArchivoIngresos(
+            settings.ARCHIVO_DIR,
+            tamanio_max_segmento=settings.ARCHIVO_TAMANIO_SEGMENTO_MB * 1024 * 1024
+        )
+    
+    servicio = ServicioEmergencias(
+        pacientes_repo,
+        wal=_wal,
+        archivo=_archivo_ingresos,
+        max_cambios=settings.CAMBIOS_PENDIENTES_MAX
+    )
+    servicio.cargar_ingresos(ingresos)
+    
+    if _archivo_ingresos is not None and settings.ARCHIVO_INTERVALO_SEGUNDOS > 0:
+        _iniciar_archivado_periodico(servicio)
+    
+    if settings.SNAPSHOT_DIR:
+        _gestor_snapshots = GestorSnapshots(
+            settings.SNAPSHOT_DIR, get_user_repo(), pacientes_repo, servicio, wal=_wal
+        )
+        if settings.SNAPSHOT_INTERVALO_SEGUNDOS > 0:
+            _gestor_snapshots.iniciar_periodico(settings.SNAPSHOT_INTERVALO_SEGUNDOS)
+    
+    return servicio
+
+
+def _iniciar_archivado_periodico(servicio: ServicioEmergencias) -> None:
+    """
+    Lanza un hilo que archiva los ingresos finalizados antiguos cada
+    ARCHIVO_INTERVALO_SEGUNDOS.
+    
+    Args:
+        servicio: Servicio de emergencias
+    """
+    antiguedad = timedelta(hours=settings.ARCHIVO_ANTIGUEDAD_HORAS)
+    
+    def ciclo():
+        while not _detener_archivado.wait(settings.ARCHIVO_INTERVALO_SEGUNDOS):
+            servicio.archivar_finalizados(antiguedad)
+    
+    threading.Thread(target=ciclo, name="archivo-ingresos", daemon=True).start()
+
+
+def get_archivo_ingresos() -> Optional[ArchivoIngresos]:
+    """
+    Obtiene el archivo de ingresos finalizados (None si ARCHIVO_DIR no está configurado).
+    
+    Returns:
+        Archivo de ingresos
+    """
+    return _archivo_ingresos
+
+
+def get_difusor_eventos(
+    servicio: ServicioEmergencias = Depends(get_servicio_emergencias)
+) -> DifusorSSE:
+    """
+    Obtiene el difusor de eventos SSE del servicio de emergencias (singleton).
+    
+    Args:
+        servicio: Servicio de emergencias
+        
+    Returns:
+        Difusor de eventos
+    """
+    global _difusor_eventos
+    if _difusor_eventos is None:
+        _difusor_eventos = DifusorSSE(servicio)
+    return _difusor_eventos
+
+
+def get_cache_respuestas() -> CacheRespuestas:
+    """
+    Obtiene el cache de respuestas serializadas (singleton por proceso).
+    
+    Returns:
+        Cache de respuestas
+    """
+    return _cache_respuestas
+
+
+def get_coalescedor_lecturas() -> CoalescedorLecturas:
+    """
+    Obtiene el coalescedor de lecturas concurrentes (singleton por proceso).
+    
+    Returns:
+        Coalescedor de lecturas
+    """
+    return _coalescedor_lecturas
+
+
+def get_registro_canonico() -> RegistroCanonico:
+    """
+    Obtiene el registro canónico de obras sociales y textos del domicilio (singleton por proceso).
+    
+    Returns:
+        Registro canónico
+    """
+    return registro_canonico
+
+
+def get_motor_credenciales() -> MotorCredenciales:
+    """
+    Obtiene el motor de credenciales (bcrypt en un pool de procesos, singleton por proceso).
+    
+    Returns:
+        Motor de credenciales
+    """
+    return motor_credenciales
+
+
+def get_limitador_login() -> LimitadorLogin:
+    """
+    Obtiene el control de admisión de los intentos de login (singleton por proceso).
+    
+    Returns:
+        Limitador de login
+    """
+    return _limitador_login
+
+
+def get_gestor_snapshots() -> Optional[GestorSnapshots]:
+    """
+    Obtiene el gestor de snapshots (None si SNAPSHOT_DIR no está configurado).
+    
+    Returns:
+        Gestor de snapshots
+    """
+    return _gestor_snapshots
+
+
+def cerrar_persistencia() -> None:
+    """
+    Detiene los snapshots y el archivado periódicos y vuelca y cierra el WAL
+    (si están configurados).
+    """
+    global _wal
+    if _gestor_snapshots is not None:
+        _gestor_snapshots.detener()
+    _detener_archivado.set()
+    if _wal is not None:
+        _wal.cerrar()
+        _wal = None
+
+
 def get_current_user(
     token: str = Depends(oauth2_scheme),
-    user_repo: InMemoryUserRepo = Depends(get_user_repo)
+    user_repo: InMemoryUserRepo = Depends(get_user_repo),
+    cache: CacheTokens = Depends(get_cache_tokens),
+    revocacion: ListaRevocacion = Depends(get_lista_revocacion)
 ) -> Usuario:
     """
     Extrae y valida el JWT del header Authorization.
     
+    Con AUTH_SIN_ESTADO el usuario se arma con los claims del token, sin
+    consultar el repositorio de usuarios.
+    
     Args:
         token: Token JWT del header Authorization
         user_repo: Repositorio de usuarios
+        cache: Cache de tokens verificados
+        revocacion: Tokens revocados
         
     Returns:
         Usuario autenticado
@@ -82,38 +378,118 @@ def get_current_user(
     Raises:
         HTTPException 401: Si el token es inválido o el usuario no existe
     """
+    return _usuario_desde_token(token, user_repo, cache, revocacion)
+
+
+def get_current_user_stream(
+    token_header: Optional[str] = Depends(oauth2_scheme_opcional),
+    ticket: Optional[str] = Query(None, description="Ticket de POST /eventos/ticket (EventSource no permite enviar headers)"),
+    user_repo: InMemoryUserRepo = Depends(get_user_repo),
+    cache: CacheTokens = Depends(get_cache_tokens),
+    revocacion: ListaRevocacion = Depends(get_lista_revocacion)
+) -> Usuario:
+    """
+    Igual que get_current_user, pero sin header acepta como query param
+    `ticket` un ticket del stream (ya que EventSource no permite agregar el
+    header Authorization). El token de acceso no se acepta en la URL: quedaría
+    en logs y en el historial durante sus 24 horas de validez.
+    
+    Args:
+        token_header: Token JWT del header Authorization (si se envió)
+        ticket: Ticket de POST /eventos/ticket, de corta duración y con scope `sse`
+        user_repo: Repositorio de usuarios
+        cache: Cache de tokens verificados
+        revocacion: Tokens revocados
+        
+    Returns:
+        Usuario autenticado
+        
+    Raises:
+        HTTPException 401: Si no hay token ni ticket, o son inválidos, o el usuario no existe
+    """
+    if token_header:
+        return _usuario_desde_token(token_header, user_repo, cache, revocacion)
+    return _usuario_desde_token(ticket, user_repo, cache, revocacion, alcance=ALCANCE_SSE)
+
+
+def _usuario_desde_token(
+    token: Optional[str],
+    user_repo: InMemoryUserRepo,
+    cache: CacheTokens,
+    revocacion: ListaRevocacion,
+    alcance: Optional[str] = None
+) -> Usuario:
+    """
+    Valida el JWT y retorna el usuario; lanza 401 si no es válido.
+    
+    El claim `scope` del token tiene que coincidir con `alcance` (los tokens de
+    acceso no lo tienen). Los tickets no pasan por el cache: duran segundos y
+    el cache no distingue alcances.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="No se pudo validar las credenciales",
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    try:
-        payload = decode_access_token(token)
-        email: str = payload.get("email")
-        if email is None:
-            raise credentials_exception
-    except JWTError:
+    if not token:
         raise credentials_exception
     
-    user = user_repo.get(email)
-    if user is None:
-        raise credentials_exception
+    if revocacion.compartida:
+        # Otro worker pudo revocar tokens que este proceso tiene en cache
+        cache.sincronizar(revocacion.version())
+    
+    def verificar(token: str) -> Tuple[Usuario, Optional[float]]:
+        try:
+            payload = decode_access_token(token)
+            email: str = payload.get("email")
+            if email is None or payload.get("scope") != alcance:
+                raise credentials_exception
+        except JWTError:
+            raise credentials_exception
+        
+        if revocacion.revocado(payload):
+            raise credentials_exception
+        
+        if settings.AUTH_SIN_ESTADO:
+            user = _usuario_desde_claims(payload)
+        else:
+            user = user_repo.get(email)
+        if user is None:
+            raise credentials_exception
+        
+        return user, payload.get("exp")
     
+    if alcance is not None:
+        return verificar(token)[0]
+    return cache.validar(token, verificar)
+
+
+def _usuario_desde_claims(payload: dict) -> Optional[Usuario]:
+    """Arma el usuario con los claims del token (sin contraseña); None si le falta el rol"""
+    if not payload.get("rol"):
+        return None
+    try:
+        user = Usuario.desde_hash(payload["email"], "", payload["rol"])
+    except ValueError:
+        return None
+    user.matricula = payload.get("matricula")
     return user
 
 
 def get_current_enfermera(
-    current_user: Usuario = Depends(get_current_user)
+    current_user: Usuario = Depends(get_current_user),
+    directorio: DirectorioPersonal = Depends(get_directorio_personal)
 ) -> Enfermera:
     """
     Valida que el usuario autenticado sea una enfermera.
     
     Args:
         current_user: Usuario autenticado
+        directorio: Directorio del personal
         
     Returns:
-        Objeto Enfermera con los datos del usuario
+        Enfermera del usuario (compartida por todos sus requests)
         
     Raises:
         HTTPException 403: Si el usuario no es enfermera
@@ -124,29 +500,22 @@ def get_current_enfermera(
             detail="No tiene permisos para realizar esta acción. Solo enfermeras pueden registrar ingresos."
         )
     
-    # Crear objeto Enfermera a partir del Usuario
-    enfermera = Enfermera(
-        nombre=current_user.email.split("@")[0],  # Usar parte del email como nombre temporal
-        apellido="",
-        matricula=current_user.matricula,
-        cuil="",
-        email=current_user.email
-    )
-    
-    return enfermera
+    return directorio.enfermera(current_user)
 
 
 def get_current_medico(
-    current_user: Usuario = Depends(get_current_user)
+    current_user: Usuario = Depends(get_current_user),
+    directorio: DirectorioPersonal = Depends(get_directorio_personal)
 ) -> Doctor:
     """
     Valida que el usuario autenticado sea un médico.
     
     Args:
         current_user: Usuario autenticado
+        directorio: Directorio del personal
         
     Returns:
-        Objeto Doctor con los datos del usuario
+        Doctor del usuario (compartido por todos sus requests)
         
     Raises:
         HTTPException 403: Si el usuario no es médico
@@ -157,14 +526,4 @@ def get_current_medico(
             detail="No tiene permisos para realizar esta acción. Solo médicos pueden reclamar pacientes."
         )
     
-    # Crear objeto Doctor a partir del Usuario
-    doctor = Doctor(
-        cuil="",
-        nombre=current_user.email.split("@")[0],  # Usar parte del email como nombre temporal
-        apellido="",
-        matricula=current_user.matricula,
-        email=current_user.email
-    )
-    
-    return doctor
-
+    return directorio.medico(current_user)
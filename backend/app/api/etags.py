@@ -0,0 +1,71 @@
+"""
+ETags y GET condicionales (If-None-Match).
+
+Los ETags se arman a partir de versiones que el servicio mantiene al aplicar
+cada cambio, así que comprobar si un cliente tiene la última versión no
+requiere recorrer ni serializar los datos.
+"""
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+
+# El navegador guarda la respuesta pero la revalida en cada request
+CACHE_CONTROL = "private, no-cache"
+
+
+def generar_etag(*partes) -> str:
+    """
+    Arma un ETag débil a partir de sus partes (época, recurso, versión, ...).
+
+    Es débil porque la misma versión puede enviarse con distintas
+    codificaciones del mismo contenido.
+
+    Returns:
+        ETag, por ejemplo `W/"3f2a-pendientes-42"`
+    """
+    return 'W/"' + "-".join(str(parte) for parte in partes) + '"'
+
+
+def etag_coincide(request: Request, etag: str) -> bool:
+    """
+    Indica si el header If-None-Match del request incluye el ETag
+    (comparación débil, como indica RFC 9110 para If-None-Match).
+
+    Args:
+        request: Request HTTP
+        etag: ETag actual del recurso
+
+    Returns:
+        True si el cliente ya tiene esta versión
+    """
+    valor = request.headers.get("if-none-match")
+    if not valor:
+        return False
+    if valor.strip() == "*":
+        return True
+    opaco = etag.removeprefix("W/")
+    return any(candidato.strip().removeprefix("W/") == opaco for candidato in valor.split(","))
+
+
+def respuesta_condicional(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Resuelve un GET condicional.
+
+    Args:
+        request: Request HTTP
+        response: Response de la ruta (recibe el ETag si hay que enviar el recurso)
+        etag: ETag actual del recurso
+
+    Returns:
+        Una respuesta 304 Not Modified si el cliente ya tiene esta versión, o
+        None si la ruta debe construir la respuesta completa
+    """
+    if etag_coincide(request, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        )
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return None
@@ -0,0 +1,115 @@
+"""
+Difusión de las transiciones de los ingresos por server-sent events (SSE).
+
+Un único `DifusorSSE` se suscribe al bus de eventos del servicio. Cada
+evento se pasa al event loop de la aplicación, se serializa una sola vez y
+se reparte ya formateado a la cola de cada cliente conectado. Los clientes
+que no consumen a tiempo se desconectan (EventSource reconecta solo y el
+cliente vuelve a pedir la lista completa).
+"""
+import asyncio
+import json
+import threading
+from dataclasses import asdict
+from typing import Optional, Set
+
+from backend.app.services.eventos import EVENTO_FINALIZACION, EventoIngreso
+from backend.app.services.proyeccion_listas import ingreso_a_list_item
+from backend.app.services.servicio_emergencias import ServicioEmergencias
+
+
+def formatear_evento(evento: EventoIngreso) -> bytes:
+    """
+    Formatea un evento como mensaje SSE.
+
+    Las admisiones y los reclamos incluyen el item de lista del ingreso para
+    que el cliente lo agregue sin pedir la lista completa; las finalizaciones
+    solo el id.
+
+    Args:
+        evento: Evento a formatear
+
+    Returns:
+        Mensaje SSE (`id`, `event` y `data`)
+    """
+    datos = {
+        "id": evento.ingreso.id,
+        "estado": evento.estado.value,
+        "doctor": evento.ingreso.doctor_asignado.email if evento.ingreso.doctor_asignado else None,
+    }
+    if evento.tipo != EVENTO_FINALIZACION:
+        item = asdict(ingreso_a_list_item(evento.ingreso))
+        item["estado"] = evento.estado.value
+        datos["item"] = item
+    return (
+        f"id: {evento.secuencia}\n"
+        f"event: {evento.tipo}\n"
+        f"data: {json.dumps(datos, ensure_ascii=False, separators=(',', ':'))}\n\n"
+    ).encode("utf-8")
+
+
+class DifusorSSE:
+    """Reparte los eventos del servicio a los clientes SSE conectados"""
+
+    def __init__(self, servicio: ServicioEmergencias, max_pendientes: int = 256):
+        """
+        Args:
+            servicio: Servicio cuyos eventos se difunden
+            max_pendientes: Mensajes que puede acumular un cliente antes de ser desconectado
+        """
+        self.servicio = servicio
+        self.max_pendientes = max_pendientes
+        self._clientes: Set[asyncio.Queue] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._suscripcion: Optional[int] = None
+        self._lock = threading.Lock()
+
+        # Métricas
+        self.eventos_difundidos = 0
+        self.clientes_descartados = 0
+
+    def conectar(self) -> asyncio.Queue:
+        """
+        Registra un cliente. Debe llamarse desde el event loop de la aplicación.
+
+        Returns:
+            Cola de mensajes del cliente; None en la cola indica que debe cerrarse el stream
+        """
+        with self._lock:
+            if self._suscripcion is None:
+                self._loop = asyncio.get_running_loop()
+                self._suscripcion = self.servicio.eventos.suscribir(self._recibir)
+        cola: asyncio.Queue = asyncio.Queue(maxsize=self.max_pendientes)
+        self._clientes.add(cola)
+        return cola
+
+    def desconectar(self, cola: asyncio.Queue) -> None:
+        """Elimina un cliente"""
+        self._clientes.discard(cola)
+
+    @property
+    def clientes(self) -> int:
+        """Cantidad de clientes conectados"""
+        return len(self._clientes)
+
+    def _recibir(self, evento: EventoIngreso) -> None:
+        """Callback del bus (cualquier hilo): pasa el evento al event loop en orden"""
+        if self._clientes:
+            self._loop.call_soon_threadsafe(self._difundir, evento)
+
+    def _difundir(self, evento: EventoIngreso) -> None:
+        """Serializa el evento una vez y lo encola para cada cliente (en el event loop)"""
+        if not self._clientes:
+            return
+        mensaje = formatear_evento(evento)
+        for cola in list(self._clientes):
+            try:
+                cola.put_nowait(mensaje)
+            except asyncio.QueueFull:
+                # Cliente lento: se vacía su cola y se le indica que cierre
+                self._clientes.discard(cola)
+                while not cola.empty():
+                    cola.get_nowait()
+                cola.put_nowait(None)
+                self.clientes_descartados += 1
+        self.eventos_difundidos += 1
@@ -1,18 +1,32 @@
 """Rutas de autenticación"""
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from backend.app.api.schemas import LoginRequest, RegisterRequest, TokenResponse, UserInfo
-from backend.app.api.dependencies import get_user_repo
-from backend.app.services.auth_service import InMemoryUserRepo, register, login
-from backend.app.core.security import create_access_token
+from backend.app.api.admision_login import LimiteExcedido, LimitadorLogin
+from backend.app.api.cache_tokens import CacheTokens
+from backend.app.api.dependencies import (
+    get_cache_tokens,
+    get_current_user,
+    get_limitador_login,
+    get_lista_revocacion,
+    get_motor_credenciales,
+    get_user_repo,
+    oauth2_scheme,
+)
+from backend.app.services.auth_service import InMemoryUserRepo, register_async, login_async
+from backend.app.core.credenciales import MotorCredenciales, MotorSaturado
+from backend.app.core.revocacion import ListaRevocacion
+from backend.app.core.security import create_access_token, decode_access_token
+from backend.app.models.models import Usuario
 
 
 router = APIRouter(tags=["auth"])
 
 
 @router.post("/register", response_model=dict, status_code=status.HTTP_201_CREATED)
-def register_user(
+async def register_user(
     request: RegisterRequest,
-    user_repo: InMemoryUserRepo = Depends(get_user_repo)
+    user_repo: InMemoryUserRepo = Depends(get_user_repo),
+    motor: MotorCredenciales = Depends(get_motor_credenciales)
 ):
     """
     Registra un nuevo usuario en el sistema.
@@ -20,22 +34,24 @@ def register_user(
     Args:
         request: Datos del usuario a registrar (email, password, rol, matricula)
         user_repo: Repositorio de usuarios
+        motor: Motor de credenciales (bcrypt en un pool de procesos)
         
     Returns:
         Mensaje de confirmación
         
     Raises:
         HTTPException 400: Si los datos son inválidos o el usuario ya existe
+        HTTPException 503: Si hay demasiadas operaciones de autenticación en curso
     """
     try:
-        user = register(
+        user = await register_async(
             email=request.email,
             password=request.password,
             rol=request.rol,
-            repo=user_repo
+            repo=user_repo,
+            matricula=request.matricula,
+            motor=motor
         )
-        # Agregar matrícula al usuario
-        user.matricula = request.matricula
         
         return {
             "message": "Usuario registrado exitosamente",
@@ -47,32 +63,48 @@ def register_user(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    except MotorSaturado as e:
+        raise _servicio_saturado(e)
 
 
 @router.post("/login", response_model=TokenResponse)
-def login_user(
+async def login_user(
     request: LoginRequest,
-    user_repo: InMemoryUserRepo = Depends(get_user_repo)
+    http_request: Request,
+    user_repo: InMemoryUserRepo = Depends(get_user_repo),
+    motor: MotorCredenciales = Depends(get_motor_credenciales),
+    limitador: LimitadorLogin = Depends(get_limitador_login)
 ):
     """
     Autentica un usuario y retorna un token JWT.
     
+    Antes de verificar la contraseña, el intento pasa por el control de
+    admisión (límites por email y por cliente, y verificaciones simultáneas).
+    
     Args:
         request: Credenciales del usuario (email, password)
+        http_request: Request HTTP (para identificar al cliente)
         user_repo: Repositorio de usuarios
+        motor: Motor de credenciales (bcrypt en un pool de procesos)
+        limitador: Control de admisión de los intentos de login
         
     Returns:
         Token JWT y información del usuario
         
     Raises:
         HTTPException 401: Si las credenciales son inválidas
+        HTTPException 429: Si se superó algún límite de intentos (con Retry-After)
+        HTTPException 503: Si hay demasiadas operaciones de autenticación en curso
     """
+    cliente = http_request.client.host if http_request.client else None
     try:
-        user = login(
-            email=request.email,
-            password=request.password,
-            repo=user_repo
-        )
+        with limitador.admitir(request.email, cliente):
+            user = await login_async(
+                email=request.email,
+                password=request.password,
+                repo=user_repo,
+                motor=motor
+            )
         
         # Crear token JWT con información del usuario
         token_data = {
@@ -100,4 +132,54 @@ def login_user(
             detail=str(e),
             headers={"WWW-Authenticate": "Bearer"}
         )
+    except LimiteExcedido as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": e.retry_after}
+        )
+    except MotorSaturado as e:
+        raise _servicio_saturado(e)
+
+
+@router.post("/logout", response_model=dict)
+def logout_user(
+    token: str = Depends(oauth2_scheme),
+    current_user: Usuario = Depends(get_current_user),
+    revocacion: ListaRevocacion = Depends(get_lista_revocacion),
+    cache: CacheTokens = Depends(get_cache_tokens)
+):
+    """
+    Revoca el token con el que se hace el request (deja de valer aunque no haya vencido).
+    
+    Args:
+        token: Token JWT del header Authorization
+        current_user: Usuario autenticado (el token tiene que ser válido)
+        revocacion: Tokens revocados
+        cache: Cache de tokens verificados
+        
+    Returns:
+        Mensaje de confirmación
+        
+    Raises:
+        HTTPException 401: Si el token es inválido o ya fue revocado
+    """
+    payload = decode_access_token(token)
+    if payload.get("jti"):
+        revocacion.revocar(payload["jti"], payload["exp"])
+    else:
+        # Token emitido sin jti: se revocan todos los anteriores del usuario
+        revocacion.revocar_usuario(current_user.email)
+        cache.invalidar(current_user.email)
+    cache.quitar(token)
+    return {"message": "Sesión cerrada", "email": current_user.email}
+
+
+def _servicio_saturado(error: MotorSaturado) -> HTTPException:
+    """503 para reintentar en un segundo, cuando el motor de credenciales está saturado"""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(error),
+        headers={"Retry-After": "1"}
+    )
 
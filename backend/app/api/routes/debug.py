@@ -1,26 +1,56 @@
 """Rutas de debug para inspección de memoria"""
-from fastapi import APIRouter, Depends
-from typing import List, Dict, Any
-from backend.app.api.dependencies import get_user_repo, get_pacientes_repo
+from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Dict, Any, Optional
+from backend.app.api.dependencies import (
+    get_user_repo,
+    get_pacientes_repo,
+    get_gestor_snapshots,
+    get_archivo_ingresos,
+    get_cache_respuestas,
+    get_coalescedor_lecturas,
+    get_registro_canonico,
+    get_motor_credenciales,
+    get_cache_tokens,
+    get_lista_revocacion,
+    get_limitador_login,
+)
+from backend.app.api.cache_respuestas import CacheRespuestas
+from backend.app.api.cache_tokens import CacheTokens
+from backend.app.api.admision_login import LimitadorLogin
+from backend.app.api.coalescencia import CoalescedorLecturas
+from backend.app.core.credenciales import MotorCredenciales
+from backend.app.core.revocacion import ListaRevocacion
+from backend.app.persistence.archivo_ingresos import ArchivoIngresos
+from backend.app.persistence.snapshot import GestorSnapshots
 from backend.app.services.auth_service import InMemoryUserRepo
 from backend.app.repositories.paciente_repo_impl import InMemoryPacientesRepo
 from backend.app.models.models import Rol
+from backend.app.models.registro_canonico import RegistroCanonico
 
 
 router = APIRouter(tags=["debug"])
 
 
 @router.get("/memory/users", response_model=Dict[str, Any])
-def inspect_users(user_repo: InMemoryUserRepo = Depends(get_user_repo)):
+def inspect_users(
+    user_repo: InMemoryUserRepo = Depends(get_user_repo),
+    coalescedor: CoalescedorLecturas = Depends(get_coalescedor_lecturas)
+):
     """
     Inspecciona todos los usuarios en memoria.
     
     Args:
         user_repo: Repositorio de usuarios
+        coalescedor: Coalescedor de lecturas concurrentes
         
     Returns:
         Información detallada de todos los usuarios en memoria
     """
+    return coalescedor.ejecutar(("debug/memory/users",), lambda: _inspeccionar_usuarios(user_repo))
+
+
+def _inspeccionar_usuarios(user_repo: InMemoryUserRepo) -> Dict[str, Any]:
+    """Arma el detalle de los usuarios en memoria"""
     usuarios = user_repo.get_all()
     
     # Agrupar por rol
@@ -61,18 +91,26 @@ def inspect_users(user_repo: InMemoryUserRepo = Depends(get_user_repo)):
 
 
 @router.get("/memory/pacientes", response_model=Dict[str, Any])
-def inspect_pacientes(paciente_repo: InMemoryPacientesRepo = Depends(get_pacientes_repo)):
+def inspect_pacientes(
+    paciente_repo: InMemoryPacientesRepo = Depends(get_pacientes_repo),
+    coalescedor: CoalescedorLecturas = Depends(get_coalescedor_lecturas)
+):
     """
     Inspecciona todos los pacientes en memoria.
     
     Args:
         paciente_repo: Repositorio de pacientes
+        coalescedor: Coalescedor de lecturas concurrentes
         
     Returns:
         Información detallada de todos los pacientes en memoria
     """
-    # Acceder al diccionario interno del repositorio
-    pacientes = list(paciente_repo._pacientes.values())
+    return coalescedor.ejecutar(("debug/memory/pacientes",), lambda: _inspeccionar_pacientes(paciente_repo))
+
+
+def _inspeccionar_pacientes(paciente_repo: InMemoryPacientesRepo) -> Dict[str, Any]:
+    """Arma el detalle de los pacientes en memoria"""
+    pacientes = paciente_repo.obtener_todos()
     
     # Clasificar pacientes
     con_obra_social = [p for p in pacientes if p.afiliado is not None]
@@ -107,7 +145,8 @@ def inspect_pacientes(paciente_repo: InMemoryPacientesRepo = Depends(get_pacient
 @router.get("/memory/all", response_model=Dict[str, Any])
 def inspect_all_memory(
     user_repo: InMemoryUserRepo = Depends(get_user_repo),
-    paciente_repo: InMemoryPacientesRepo = Depends(get_pacientes_repo)
+    paciente_repo: InMemoryPacientesRepo = Depends(get_pacientes_repo),
+    coalescedor: CoalescedorLecturas = Depends(get_coalescedor_lecturas)
 ):
     """
     Inspecciona toda la memoria del sistema (usuarios y pacientes).
@@ -115,12 +154,23 @@ def inspect_all_memory(
     Args:
         user_repo: Repositorio de usuarios
         paciente_repo: Repositorio de pacientes
+        coalescedor: Coalescedor de lecturas concurrentes
         
     Returns:
         Información completa de la memoria del sistema
     """
+    return coalescedor.ejecutar(
+        ("debug/memory/all",), lambda: _inspeccionar_memoria(user_repo, paciente_repo)
+    )
+
+
+def _inspeccionar_memoria(
+    user_repo: InMemoryUserRepo,
+    paciente_repo: InMemoryPacientesRepo
+) -> Dict[str, Any]:
+    """Arma el resumen de usuarios y pacientes en memoria"""
     usuarios = user_repo.get_all()
-    pacientes = list(paciente_repo._pacientes.values())
+    pacientes = paciente_repo.obtener_todos()
     
     return {
         "resumen": {
@@ -148,3 +198,156 @@ def inspect_all_memory(
         ]
     }
 
+
+@router.post("/snapshot", response_model=Dict[str, Any], status_code=status.HTTP_202_ACCEPTED)
+def iniciar_snapshot(gestor: Optional[GestorSnapshots] = Depends(get_gestor_snapshots)):
+    """
+    Inicia un snapshot del estado en memoria en segundo plano.
+    
+    Args:
+        gestor: Gestor de snapshots
+        
+    Returns:
+        Indicación de si el snapshot se inició
+        
+    Raises:
+        HTTPException 404: Si los snapshots no están habilitados (SNAPSHOT_DIR)
+    """
+    if gestor is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Los snapshots no están habilitados"
+        )
+    
+    iniciado = gestor.guardar_en_segundo_plano()
+    return {
+        "iniciado": iniciado,
+        "mensaje": "Snapshot iniciado" if iniciado else "Ya hay un snapshot en curso"
+    }
+
+
+@router.get("/snapshot", response_model=Dict[str, Any])
+def estado_snapshot(gestor: Optional[GestorSnapshots] = Depends(get_gestor_snapshots)):
+    """
+    Informa el estado del último snapshot.
+    
+    Args:
+        gestor: Gestor de snapshots
+        
+    Returns:
+        Estado y métricas del último snapshot
+    """
+    if gestor is None:
+        return {"habilitado": False}
+    
+    return {
+        "habilitado": True,
+        "en_curso": gestor.en_curso,
+        "snapshots_realizados": gestor.snapshots_realizados,
+        "ultimo": gestor.ultimo_resultado
+    }
+
+
+@router.get("/archivo", response_model=Dict[str, Any])
+def estado_archivo(archivo: Optional[ArchivoIngresos] = Depends(get_archivo_ingresos)):
+    """
+    Informa el estado del archivo en disco de ingresos finalizados.
+    
+    Args:
+        archivo: Archivo de ingresos
+        
+    Returns:
+        Ingresos archivados, segmentos, bytes en disco y lecturas bajo demanda
+    """
+    if archivo is None:
+        return {"habilitado": False}
+    
+    return {"habilitado": True, **archivo.estadisticas()}
+
+
+@router.get("/cache", response_model=Dict[str, Any])
+def estado_cache(cache: CacheRespuestas = Depends(get_cache_respuestas)):
+    """
+    Informa el estado del cache de respuestas serializadas.
+    
+    Args:
+        cache: Cache de respuestas
+        
+    Returns:
+        Entradas, bytes guardados y tasa de aciertos
+    """
+    return cache.estadisticas()
+
+
+@router.get("/tokens", response_model=Dict[str, Any])
+def estado_cache_tokens(
+    cache: CacheTokens = Depends(get_cache_tokens),
+    revocacion: ListaRevocacion = Depends(get_lista_revocacion)
+):
+    """
+    Informa el estado del cache de tokens JWT verificados y de la lista de revocación.
+    
+    Args:
+        cache: Cache de tokens
+        revocacion: Tokens revocados
+        
+    Returns:
+        Entradas, tasa de aciertos, milisegundos ahorrados por request y revocaciones vigentes
+    """
+    return {**cache.estadisticas(), **revocacion.estadisticas()}
+
+
+@router.get("/coalescencia", response_model=Dict[str, Any])
+def estado_coalescencia(coalescedor: CoalescedorLecturas = Depends(get_coalescedor_lecturas)):
+    """
+    Informa cuántas lecturas concurrentes se resolvieron con un mismo cálculo.
+    
+    Args:
+        coalescedor: Coalescedor de lecturas
+        
+    Returns:
+        Cálculos hechos, requests coalescidos y cálculos en curso, por ruta
+    """
+    return coalescedor.estadisticas()
+
+
+@router.get("/registro-canonico", response_model=Dict[str, Any])
+def estado_registro_canonico(registro: RegistroCanonico = Depends(get_registro_canonico)):
+    """
+    Informa cuánta memoria ahorra compartir obras sociales y textos del domicilio.
+    
+    Args:
+        registro: Registro canónico
+        
+    Returns:
+        Valores internados, reutilizaciones y bytes ahorrados
+    """
+    return registro.estadisticas()
+
+
+@router.get("/credenciales", response_model=Dict[str, Any])
+def estado_credenciales(motor: MotorCredenciales = Depends(get_motor_credenciales)):
+    """
+    Informa el estado del motor de credenciales (bcrypt en un pool de procesos).
+    
+    Args:
+        motor: Motor de credenciales
+        
+    Returns:
+        Procesos, operaciones pendientes, completadas y rechazadas
+    """
+    return motor.estadisticas()
+
+
+@router.get("/login", response_model=Dict[str, Any])
+def estado_admision_login(limitador: LimitadorLogin = Depends(get_limitador_login)):
+    """
+    Informa el control de admisión de los intentos de login.
+    
+    Args:
+        limitador: Limitador de login
+        
+    Returns:
+        Intentos admitidos y rechazados por motivo, y verificaciones en curso
+    """
+    return limitador.estadisticas()
@@ -1,32 +1,60 @@
 """Rutas de urgencias"""
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from datetime import datetime
+import asyncio
+from typing import Callable, List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from datetime import datetime, timedelta
 
 from backend.app.api.schemas import (
     IngresoUrgenciaRequest,
     IngresoResponse,
+    IngresoLoteRequest,
+    IngresoLoteResponse,
+    ResultadoIngresoLote,
     IngresoListItem,
+    CambiosPendientesResponse,
     NivelEmergenciaItem,
     ReclamarResponse,
     AtencionRequest,
     AtencionResponse,
     IngresoDetalleResponse,
     PacienteResponse,
-    DomicilioResponse
+    DomicilioResponse,
+    TicketEventosResponse
 )
+from backend.app.api.cache_respuestas import (
+    CacheRespuestas,
+    RespuestaSerializada,
+    armar_respuesta,
+    serializar_respuesta,
+)
+from backend.app.api.codificacion import negociar_compresion, negociar_formato
+from backend.app.api.coalescencia import CoalescedorLecturas
+from backend.app.api.etags import generar_etag, respuesta_condicional
+from backend.app.api.eventos import DifusorSSE
 from backend.app.api.dependencies import (
     get_servicio_emergencias,
     get_current_user,
+    get_current_user_stream,
+    get_difusor_eventos,
+    get_cache_respuestas,
+    get_coalescedor_lecturas,
     get_current_enfermera,
     get_current_medico
 )
-from backend.app.services.servicio_emergencias import ServicioEmergencias
+from backend.app.core.config import settings
+from backend.app.core.security import ALCANCE_SSE, create_access_token
+from backend.app.services.proyeccion_listas import ingreso_a_list_item
+from backend.app.services.servicio_emergencias import PaginaFilas, ServicioEmergencias
 from backend.app.models.models import NivelEmergencia, Enfermera, Usuario, Doctor
 
 
 router = APIRouter(tags=["urgencias"])
 
+# Paginación de las listas de ingresos
+LIMITE_PAGINA_POR_DEFECTO = 20
+LIMITE_PAGINA_MAXIMO = 500
+
 
 @router.post("/ingresos", response_model=IngresoResponse, status_code=status.HTTP_201_CREATED)
 def registrar_ingreso(
@@ -100,21 +128,118 @@ def registrar_ingreso(
         )
 
 
+@router.post("/ingresos/batch", response_model=IngresoLoteResponse)
+def registrar_ingresos_lote(
+    request: IngresoLoteRequest,
+    enfermera: Enfermera = Depends(get_current_enfermera),
+    servicio: ServicioEmergencias = Depends(get_servicio_emergencias)
+):
+    """
+    Registra varios ingresos de urgencia en una sola operación.
+    
+    Pensado para incidentes con múltiples víctimas: todos los ingresos válidos
+    entran a la lista de espera juntos y se informa un resultado por ingreso.
+    Un ingreso inválido no impide la admisión de los demás.
+    
+    Requiere autenticación y que el usuario sea enfermera.
+    
+    Args:
+        request: Ingresos a registrar
+        enfermera: Enfermera autenticada (obtenida del token)
+        servicio: Servicio de emergencias
+        
+    Returns:
+        Resultado de cada ingreso, en el mismo orden del request
+        
+    Raises:
+        HTTPException 400: Si el lote está vacío o supera INGRESOS_LOTE_MAX
+        HTTPException 401: Si el token es inválido
+        HTTPException 403: Si el usuario no es enfermera
+    """
+    if not request.ingresos:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El lote no contiene ingresos"
+        )
+    if len(request.ingresos) > settings.INGRESOS_LOTE_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"El lote supera el máximo de {settings.INGRESOS_LOTE_MAX} ingresos"
+        )
+    
+    solicitudes = []
+    for item in request.ingresos:
+        solicitudes.append({
+            "cuil": item.cuil,
+            "informe": item.informe,
+            # Un nivel inválido se informa en el resultado del ingreso
+            "nivel_emergencia": NivelEmergencia.__members__.get(item.nivel_emergencia.upper()),
+            "temperatura": item.temperatura,
+            "frecuencia_cardiaca": item.frecuencia_cardiaca,
+            "frecuencia_respiratoria": item.frecuencia_respiratoria,
+            "frecuencia_sistolica": item.frecuencia_sistolica,
+            "frecuencia_diastolica": item.frecuencia_diastolica,
+            "nombre": item.nombre,
+            "apellido": item.apellido,
+            "obra_social": item.obra_social,
+            "numero_afiliado": item.numero_afiliado,
+            "domicilio": item.domicilio.__dict__ if item.domicilio else None,
+        })
+    
+    resultados = []
+    for item, resultado in zip(request.ingresos, servicio.registrar_urgencias_lote(enfermera, solicitudes)):
+        if resultado.ingreso is None:
+            error = resultado.error
+            if solicitudes[resultado.indice]["nivel_emergencia"] is None:
+                error = f"Nivel de emergencia inválido: {item.nivel_emergencia}"
+            resultados.append(ResultadoIngresoLote(indice=resultado.indice, exito=False, error=error))
+            continue
+        
+        ingreso = resultado.ingreso
+        resultados.append(ResultadoIngresoLote(
+            indice=resultado.indice,
+            exito=True,
+            ingreso=IngresoResponse(
+                id=ingreso.id,
+                cuil_paciente=ingreso.cuil_paciente,
+                nivel_emergencia=ingreso.nivel_emergencia.name,
+                estado=ingreso.estado,
+                fecha_ingreso=ingreso.fecha_ingreso.isoformat(),
+                mensaje_advertencia=resultado.mensaje_advertencia
+            )
+        ))
+    
+    admitidos = sum(1 for r in resultados if r.exito)
+    return IngresoLoteResponse(
+        total=len(resultados),
+        admitidos=admitidos,
+        rechazados=len(resultados) - admitidos,
+        resultados=resultados
+    )
+
+
 @router.get("/pacientes/{cuil}", response_model=PacienteResponse)
 def buscar_paciente(
     cuil: str,
+    request: Request,
+    response: Response,
     current_user: Usuario = Depends(get_current_user),
-    servicio: ServicioEmergencias = Depends(get_servicio_emergencias)
+    servicio: ServicioEmergencias = Depends(get_servicio_emergencias),
+    coalescedor: CoalescedorLecturas = Depends(get_coalescedor_lecturas)
 ):
     """
     Busca un paciente por su CUIL.
     
-    Requiere autenticación.
+    Requiere autenticación. Responde 304 si el header If-None-Match incluye
+    el ETag de la versión actual del paciente.
     
     Args:
         cuil: CUIL del paciente a buscar
+        request: Request HTTP (para el header If-None-Match)
+        response: Response HTTP (para el header ETag)
         current_user: Usuario autenticado
         servicio: Servicio de emergencias
+        coalescedor: Coalescedor de lecturas concurrentes
         
     Returns:
         Datos del paciente si existe
@@ -124,14 +249,25 @@ def buscar_paciente(
         HTTPException 401: Si el token es inválido
     """
     try:
-        paciente = servicio.pacientes_repo.obtener_paciente_por_cuil(cuil)
+        version = servicio.pacientes_repo.obtener_version_paciente(cuil)
         
-        if not paciente:
+        if version is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Paciente no encontrado"
             )
         
+        no_modificado = respuesta_condicional(
+            request, response, generar_etag(servicio.epoca, "paciente", cuil, version)
+        )
+        if no_modificado:
+            return no_modificado
+        
+        paciente = coalescedor.ejecutar(
+            ("paciente", cuil, version),
+            lambda: servicio.pacientes_repo.obtener_paciente_por_cuil(cuil)
+        )
+        
         # Construir respuesta de domicilio
         domicilio_response = DomicilioResponse(
             calle=paciente.domicilio.calle,
@@ -164,51 +300,89 @@ def buscar_paciente(
         )
 
 
-@router.get("/ingresos/pendientes", response_model=List[IngresoListItem])
+@router.get(
+    "/ingresos/pendientes",
+    response_model=Union[List[IngresoListItem], CambiosPendientesResponse]
+)
 def listar_ingresos_pendientes(
+    request: Request,
+    response: Response,
+    since: Optional[int] = Query(None, description="Versión de la lista que ya tiene el cliente"),
+    epoca: Optional[str] = Query(None, description="Época de esa versión (de la respuesta anterior)"),
+    limit: Optional[int] = Query(None, ge=1, le=LIMITE_PAGINA_MAXIMO, description="Tamaño de la página"),
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente (header X-Cursor-Siguiente)"),
     current_user: Usuario = Depends(get_current_user),
-    servicio: ServicioEmergencias = Depends(get_servicio_emergencias)
+    servicio: ServicioEmergencias = Depends(get_servicio_emergencias),
+    cache: CacheRespuestas = Depends(get_cache_respuestas),
+    coalescedor: CoalescedorLecturas = Depends(get_coalescedor_lecturas)
 ):
     """
     Lista todos los ingresos pendientes ordenados por prioridad.
     
-    Requiere autenticación.
+    Requiere autenticación. Responde 304 si el header If-None-Match incluye
+    el ETag de la versión actual de la lista.
+    
+    Con `since` responde solo los cambios desde esa versión (altas y bajas);
+    si ya no están disponibles, o `epoca` no coincide con la del servicio
+    (por ejemplo, después de un reinicio), responde la lista completa con
+    `completo=true`.
+    
+    Con `limit` y/o `cursor` responde solo una página en orden de atención; el
+    header `X-Cursor-Siguiente` trae el cursor de la página siguiente, si la hay.
+    
+    Responde MessagePack si el header Accept lo prefiere a JSON, y comprime las
+    listas grandes con gzip o brotli según Accept-Encoding.
     
     Args:
+        request: Request HTTP (para el header If-None-Match)
+        response: Response HTTP (para los headers ETag y X-Cursor-Siguiente)
+        since: Versión de la lista que ya tiene el cliente
+        epoca: Época de la versión `since`
+        limit: Tamaño de la página
+        cursor: Cursor de la página anterior
         current_user: Usuario autenticado
         servicio: Servicio de emergencias
+        cache: Cache de respuestas serializadas
+        coalescedor: Coalescedor de lecturas concurrentes
         
     Returns:
-        Lista de ingresos pendientes
+        Lista de ingresos pendientes, o sus cambios si se indica `since`
         
     Raises:
+        HTTPException 400: Si el cursor no es válido
         HTTPException 401: Si el token es inválido
     """
     try:
-        ingresos = servicio.obtener_ingresos_pendientes()
+        if since is not None:
+            return _cambios_pendientes(servicio, since, epoca)
         
-        # Convertir a schema de respuesta
-        items = []
-        for ingreso in ingresos:
-            item = IngresoListItem(
-                id=ingreso.id,
-                cuil_paciente=ingreso.cuil_paciente,
-                nombre_paciente=ingreso.paciente.nombre,
-                apellido_paciente=ingreso.paciente.apellido,
-                nivel_emergencia=ingreso.nivel_emergencia.name,
-                nivel_emergencia_nombre=ingreso.nivel_emergencia.value['nombre'],
-                estado=ingreso.estado,
-                fecha_ingreso=ingreso.fecha_ingreso.isoformat(),
-                temperatura=ingreso.temperatura.valor,
-                frecuencia_cardiaca=ingreso.frecuencia_cardiaca.valor,
-                frecuencia_respiratoria=ingreso.frecuencia_respiratoria.valor,
-                frecuencia_sistolica=ingreso.tension_arterial.frecuencia_sistolica,
-                frecuencia_diastolica=ingreso.tension_arterial.frecuencia_diastolica
+        # La versión se lee antes que la lista (ver ServicioEmergencias.version_pendientes)
+        version = servicio.version_pendientes()
+        no_modificado = respuesta_condicional(
+            request, response, generar_etag(servicio.epoca, "pendientes", version)
+        )
+        if no_modificado:
+            return no_modificado
+        
+        limite = None
+        if limit is not None or cursor is not None:
+            limite = limit or LIMITE_PAGINA_POR_DEFECTO
+        
+        formato = negociar_formato(request)
+        compresion = negociar_compresion(request)
+        serializada = _lista_serializada(
+            cache, coalescedor, ("pendientes", limite, cursor, formato, compresion), (servicio.epoca, version),
+            lambda: _serializar_lista(
+                servicio.obtener_pagina_pendientes, servicio.obtener_filas_pendientes, limite, cursor, formato, compresion
             )
-            items.append(item)
-        
-        return items
+        )
+        return armar_respuesta(serializada, response)
         
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -216,6 +390,91 @@ def listar_ingresos_pendientes(
         )
 
 
+def _lista_serializada(
+    cache: CacheRespuestas,
+    coalescedor: CoalescedorLecturas,
+    clave: tuple,
+    version: tuple,
+    serializar: Callable[[], RespuestaSerializada]
+) -> RespuestaSerializada:
+    """
+    Obtiene una lista serializada del cache o, si no está para esta versión, la
+    serializa y la guarda. Los requests concurrentes que no la encuentran en el
+    cache esperan la misma serialización en lugar de repetirla.
+    """
+    # Lecturas idénticas entre dos cambios de la lista reusan los mismos bytes
+    serializada = cache.obtener(clave, version)
+    if serializada is not None:
+        return serializada
+    
+    def serializar_y_guardar() -> RespuestaSerializada:
+        serializada = serializar()
+        cache.guardar(clave, version, serializada)
+        return serializada
+    
+    return coalescedor.ejecutar(clave + version, serializar_y_guardar)
+
+
+def _serializar_lista(
+    obtener_pagina: Callable[[int, Optional[str]], PaginaFilas],
+    obtener_todos: Callable[[], List[IngresoListItem]],
+    limite: Optional[int],
+    cursor: Optional[str],
+    formato: str,
+    compresion: Optional[str]
+) -> RespuestaSerializada:
+    """
+    Serializa una lista de ingresos desde la proyección del servicio: la
+    página pedida (con el cursor de la siguiente en el header
+    X-Cursor-Siguiente) o, sin límite, la lista completa.
+    
+    Raises:
+        ValueError: Si el cursor no es válido
+    """
+    if limite is None:
+        return serializar_respuesta(obtener_todos(), formato, compresion)
+    
+    pagina = obtener_pagina(limite, cursor)
+    headers = {}
+    if pagina.cursor_siguiente is not None:
+        headers["X-Cursor-Siguiente"] = pagina.cursor_siguiente
+    return serializar_respuesta(pagina.filas, formato, compresion, headers)
+
+
+def _cambios_pendientes(
+    servicio: ServicioEmergencias,
+    since: int,
+    epoca: Optional[str]
+) -> CambiosPendientesResponse:
+    """
+    Arma la respuesta de cambios de la lista de espera desde la versión `since`,
+    o la lista completa si los cambios no están disponibles.
+    """
+    cambios = None
+    if epoca is None or epoca == servicio.epoca:
+        cambios = servicio.obtener_cambios_pendientes(since)
+    
+    if cambios is None:
+        # La versión se lee antes que la lista (ver ServicioEmergencias.version_pendientes)
+        version = servicio.version_pendientes()
+        return CambiosPendientesResponse(
+            epoca=servicio.epoca,
+            version=version,
+            completo=True,
+            ingresos=servicio.obtener_filas_pendientes()
+        )
+    
+    # Las filas de las altas tienen el estado de la versión informada
+    # (PENDIENTE), aunque el ingreso se haya reclamado después
+    return CambiosPendientesResponse(
+        epoca=servicio.epoca,
+        version=cambios.version,
+        completo=False,
+        altas=cambios.altas,
+        bajas=cambios.bajas
+    )
+
+
 @router.get("/niveles-emergencia", response_model=List[NivelEmergenciaItem])
 def listar_niveles_emergencia():
     """
@@ -292,49 +551,72 @@ def reclamar_paciente(
 
 @router.get("/ingresos/en-proceso", response_model=List[IngresoListItem])
 def listar_ingresos_en_proceso(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=LIMITE_PAGINA_MAXIMO, description="Tamaño de la página"),
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente (header X-Cursor-Siguiente)"),
     current_user: Usuario = Depends(get_current_user),
-    servicio: ServicioEmergencias = Depends(get_servicio_emergencias)
+    servicio: ServicioEmergencias = Depends(get_servicio_emergencias),
+    cache: CacheRespuestas = Depends(get_cache_respuestas),
+    coalescedor: CoalescedorLecturas = Depends(get_coalescedor_lecturas)
 ):
     """
     Lista todos los ingresos en proceso (siendo atendidos).
     
-    Requiere autenticación.
+    Requiere autenticación. Responde 304 si el header If-None-Match incluye
+    el ETag de la versión actual de la lista.
+    
+    Con `limit` y/o `cursor` responde solo una página en orden de reclamo; el
+    header `X-Cursor-Siguiente` trae el cursor de la página siguiente, si la hay.
+    
+    Responde MessagePack si el header Accept lo prefiere a JSON, y comprime las
+    listas grandes con gzip o brotli según Accept-Encoding.
     
     Args:
+        request: Request HTTP (para el header If-None-Match)
+        response: Response HTTP (para los headers ETag y X-Cursor-Siguiente)
+        limit: Tamaño de la página
+        cursor: Cursor de la página anterior
         current_user: Usuario autenticado
         servicio: Servicio de emergencias
+        cache: Cache de respuestas serializadas
+        coalescedor: Coalescedor de lecturas concurrentes
         
     Returns:
         Lista de ingresos en proceso
         
     Raises:
+        HTTPException 400: Si el cursor no es válido
         HTTPException 401: Si el token es inválido
     """
     try:
-        ingresos = servicio.obtener_ingresos_en_proceso()
-        
-        # Convertir a schema de respuesta
-        items = []
-        for ingreso in ingresos:
-            item = IngresoListItem(
-                id=ingreso.id,
-                cuil_paciente=ingreso.cuil_paciente,
-                nombre_paciente=ingreso.paciente.nombre,
-                apellido_paciente=ingreso.paciente.apellido,
-                nivel_emergencia=ingreso.nivel_emergencia.name,
-                nivel_emergencia_nombre=ingreso.nivel_emergencia.value['nombre'],
-                estado=ingreso.estado,
-                fecha_ingreso=ingreso.fecha_ingreso.isoformat(),
-                temperatura=ingreso.temperatura.valor,
-                frecuencia_cardiaca=ingreso.frecuencia_cardiaca.valor,
-                frecuencia_respiratoria=ingreso.frecuencia_respiratoria.valor,
-                frecuencia_sistolica=ingreso.tension_arterial.frecuencia_sistolica,
-                frecuencia_diastolica=ingreso.tension_arterial.frecuencia_diastolica
+        # La versión se lee antes que la lista (ver ServicioEmergencias.version_en_proceso)
+        version = servicio.version_en_proceso()
+        no_modificado = respuesta_condicional(
+            request, response, generar_etag(servicio.epoca, "en_proceso", version)
+        )
+        if no_modificado:
+            return no_modificado
+        
+        limite = None
+        if limit is not None or cursor is not None:
+            limite = limit or LIMITE_PAGINA_POR_DEFECTO
+        
+        formato = negociar_formato(request)
+        compresion = negociar_compresion(request)
+        serializada = _lista_serializada(
+            cache, coalescedor, ("en_proceso", limite, cursor, formato, compresion), (servicio.epoca, version),
+            lambda: _serializar_lista(
+                servicio.obtener_pagina_en_proceso, servicio.obtener_filas_en_proceso, limite, cursor, formato, compresion
             )
-            items.append(item)
-        
-        return items
+        )
+        return armar_respuesta(serializada, response)
         
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -342,6 +624,134 @@ def listar_ingresos_en_proceso(
         )
 
 
+# Intervalo de los comentarios keep-alive del stream de eventos
+INTERVALO_KEEPALIVE_SEGUNDOS = 15
+
+
+@router.post("/eventos/ticket", response_model=TicketEventosResponse)
+def crear_ticket_eventos(current_user: Usuario = Depends(get_current_user)):
+    """
+    Emite un ticket para abrir el stream de eventos.
+    
+    EventSource no permite enviar el header Authorization, así que la
+    credencial viaja en la URL del stream. En lugar del token de acceso va este
+    ticket: vence a los SSE_TICKET_SEGUNDOS y solo vale en GET /eventos (claim
+    `scope`). El cliente pide uno nuevo cada vez que (re)conecta.
+    
+    Requiere autenticación.
+    
+    Args:
+        current_user: Usuario autenticado
+        
+    Returns:
+        Ticket y segundos de validez
+        
+    Raises:
+        HTTPException 401: Si el token es inválido
+    """
+    ticket = create_access_token(
+        data={
+            "email": current_user.email,
+            "rol": current_user.rol.value if current_user.rol else None,
+            "matricula": current_user.matricula,
+            "scope": ALCANCE_SSE
+        },
+        expires_delta=timedelta(seconds=settings.SSE_TICKET_SEGUNDOS)
+    )
+    return TicketEventosResponse(ticket=ticket, expires_in=settings.SSE_TICKET_SEGUNDOS)
+
+
+@router.get("/eventos")
+async def stream_eventos(
+    request: Request,
+    current_user: Usuario = Depends(get_current_user_stream),
+    difusor: DifusorSSE = Depends(get_difusor_eventos)
+):
+    """
+    Stream de server-sent events con los cambios de la lista de espera y de
+    los ingresos en proceso.
+    
+    Eventos:
+    - `admision`: ingreso nuevo en la lista de espera (incluye el item de lista)
+    - `reclamo`: el ingreso sale de la lista de espera y pasa a en proceso (incluye el item)
+    - `finalizacion`: el ingreso sale de la lista de ingresos en proceso
+    
+    El cliente debe conectarse primero al stream y luego pedir las listas
+    completas, aplicando los eventos de forma idempotente por id.
+    
+    Requiere autenticación (header Authorization o query param `ticket`, de
+    POST /eventos/ticket).
+    
+    Args:
+        request: Request HTTP (para detectar la desconexión del cliente)
+        current_user: Usuario autenticado
+        difusor: Difusor de eventos
+        
+    Returns:
+        Stream `text/event-stream`
+        
+    Raises:
+        HTTPException 401: Si el token es inválido
+    """
+    cola = difusor.conectar()
+    
+    async def generar():
+        try:
+            yield b"retry: 3000\n\n"
+            while True:
+                try:
+                    mensaje = await asyncio.wait_for(cola.get(), timeout=INTERVALO_KEEPALIVE_SEGUNDOS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield b": keep-alive\n\n"
+                    continue
+                if mensaje is None:
+                    break
+                yield mensaje
+        finally:
+            difusor.desconectar(cola)
+    
+    return StreamingResponse(
+        generar(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/mi-paciente", response_model=IngresoListItem)
+def obtener_mi_paciente(
+    doctor: Doctor = Depends(get_current_medico),
+    servicio: ServicioEmergencias = Depends(get_servicio_emergencias)
+):
+    """
+    Obtiene el paciente que el médico autenticado tiene actualmente en revisión.
+    
+    Requiere autenticación y que el usuario sea médico.
+    
+    Args:
+        doctor: Médico autenticado (obtenido del token)
+        servicio: Servicio de emergencias
+        
+    Returns:
+        Ingreso en proceso asignado al médico
+        
+    Raises:
+        HTTPException 404: Si el médico no tiene un paciente en revisión
+        HTTPException 401: Si el token es inválido
+        HTTPException 403: Si el usuario no es médico
+    """
+    ingreso = servicio.obtener_ingreso_asignado(doctor.email)
+    
+    if not ingreso:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="El médico no tiene un paciente en revisión"
+        )
+    
+    return ingreso_a_list_item(ingreso)
+
+
 @router.post("/atencion", response_model=AtencionResponse, status_code=status.HTTP_201_CREATED)
 def registrar_atencion(
     request: AtencionRequest,
@@ -395,18 +805,25 @@ def registrar_atencion(
 @router.get("/ingresos/{ingreso_id}", response_model=IngresoDetalleResponse)
 def obtener_detalle_ingreso(
     ingreso_id: str,
+    request: Request,
+    response: Response,
     current_user: Usuario = Depends(get_current_user),
-    servicio: ServicioEmergencias = Depends(get_servicio_emergencias)
+    servicio: ServicioEmergencias = Depends(get_servicio_emergencias),
+    coalescedor: CoalescedorLecturas = Depends(get_coalescedor_lecturas)
 ):
     """
     Obtiene el detalle completo de un ingreso.
     
-    Requiere autenticación.
+    Requiere autenticación. Responde 304 si el header If-None-Match incluye
+    el ETag de la versión actual del ingreso.
     
     Args:
         ingreso_id: ID del ingreso
+        request: Request HTTP (para el header If-None-Match)
+        response: Response HTTP (para el header ETag)
         current_user: Usuario autenticado
         servicio: Servicio de emergencias
+        coalescedor: Coalescedor de lecturas concurrentes
         
     Returns:
         Detalle completo del ingreso
@@ -416,7 +833,22 @@ def obtener_detalle_ingreso(
         HTTPException 401: Si el token es inválido
     """
     try:
-        ingreso = servicio.obtener_ingreso_por_id(ingreso_id)
+        version = servicio.version_ingreso(ingreso_id)
+        if version is not None:
+            no_modificado = respuesta_condicional(
+                request, response, generar_etag(servicio.epoca, "ingreso", ingreso_id, version)
+            )
+            if no_modificado:
+                return no_modificado
+        
+        if version is None:
+            ingreso = servicio.obtener_ingreso_por_id(ingreso_id)
+        else:
+            # Los finalizados pueden leerse del archivo en disco: una sola lectura por versión
+            ingreso = coalescedor.ejecutar(
+                ("ingreso", ingreso_id, version),
+                lambda: servicio.obtener_ingreso_por_id(ingreso_id)
+            )
         
         if not ingreso:
             raise HTTPException(
@@ -1,8 +1,11 @@
 """Schemas para request/response de la API"""
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
+# La fila de las listas es el modelo de lectura del servicio; la API la responde tal cual
+from backend.app.services.proyeccion_listas import IngresoListItem
+
 
 # ============= Auth Schemas =============
 
@@ -38,6 +41,13 @@ class TokenResponse:
     user_info: UserInfo
 
 
+@dataclass
+class TicketEventosResponse:
+    """Schema para response del ticket del stream de eventos"""
+    ticket: str
+    expires_in: int
+
+
 # ============= Urgencias Schemas =============
 
 @dataclass
@@ -103,21 +113,39 @@ class IngresoResponse:
 
 
 @dataclass
-class IngresoListItem:
-    """Schema para item de lista de ingresos pendientes"""
-    id: str
-    cuil_paciente: str
-    nombre_paciente: str
-    apellido_paciente: str
-    nivel_emergencia: str
-    nivel_emergencia_nombre: str
-    estado: str
-    fecha_ingreso: str
-    temperatura: float
-    frecuencia_cardiaca: float
-    frecuencia_respiratoria: float
-    frecuencia_sistolica: float
-    frecuencia_diastolica: float
+class IngresoLoteRequest:
+    """Schema para request de admisión de varios ingresos (incidente con múltiples víctimas)"""
+    ingresos: List[IngresoUrgenciaRequest]
+
+
+@dataclass
+class ResultadoIngresoLote:
+    """Schema para el resultado de cada ingreso de un lote"""
+    indice: int
+    exito: bool
+    ingreso: Optional[IngresoResponse] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class IngresoLoteResponse:
+    """Schema para response de admisión en lote"""
+    total: int
+    admitidos: int
+    rechazados: int
+    resultados: List[ResultadoIngresoLote]
+
+
+@dataclass
+class CambiosPendientesResponse:
+    """Schema para response de cambios de la lista de espera (GET /ingresos/pendientes?since=)"""
+    epoca: str
+    version: int
+    # True si los cambios ya no están disponibles: `ingresos` trae la lista completa
+    completo: bool
+    altas: List[IngresoListItem] = field(default_factory=list)
+    bajas: List[str] = field(default_factory=list)
+    ingresos: List[IngresoListItem] = field(default_factory=list)
 
 
 @dataclass
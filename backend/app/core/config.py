@@ -11,6 +11,20 @@ class Settings:
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "1440"))  # 24 horas
     
+    # Duración de los tickets de POST /api/urgencias/eventos/ticket: EventSource
+    # no permite enviar headers, así que el ticket viaja en la URL del stream
+    SSE_TICKET_SEGUNDOS: int = int(os.getenv("SSE_TICKET_SEGUNDOS", "60"))
+    
+    # Con AUTH_SIN_ESTADO el usuario de cada request sale de los claims del JWT
+    # (email, rol, matrícula) sin consultar el repositorio de usuarios
+    AUTH_SIN_ESTADO: bool = os.getenv("AUTH_SIN_ESTADO", "false").lower() == "true"
+    
+    # Tokens ya verificados que se guardan por proceso, y segundos máximos que se
+    # usa cada uno sin volver a verificarlo (acota lo que tarda en verse un
+    # cambio del usuario hecho por otro worker)
+    TOKENS_CACHE_MAX: int = int(os.getenv("TOKENS_CACHE_MAX", "4096"))
+    TOKENS_CACHE_TTL_SEGUNDOS: float = float(os.getenv("TOKENS_CACHE_TTL_SEGUNDOS", "300"))
+    
     # CORS Configuration
     CORS_ORIGINS: list = [
         "http://localhost:3000",
@@ -18,6 +32,57 @@ class Settings:
         "http://127.0.0.1:3000",
     ]
     
+    # Cantidad máxima de ingresos por request en POST /ingresos/batch
+    INGRESOS_LOTE_MAX: int = int(os.getenv("INGRESOS_LOTE_MAX", "200"))
+    
+    # Cambios de la lista de espera que se guardan para GET /ingresos/pendientes?since=
+    CAMBIOS_PENDIENTES_MAX: int = int(os.getenv("CAMBIOS_PENDIENTES_MAX", "1024"))
+    
+    # Las listas a partir de este tamaño se comprimen (gzip, o brotli si está
+    # instalado) cuando el cliente lo acepta
+    COMPRESION_MIN_BYTES: int = int(os.getenv("COMPRESION_MIN_BYTES", "1024"))
+    
+    # bcrypt corre en un pool de procesos propio (por defecto, la mitad de los
+    # núcleos); con más operaciones pendientes que BCRYPT_MAX_PENDIENTES, los
+    # logins y registros nuevos responden 503
+    BCRYPT_PROCESOS: int = int(os.getenv("BCRYPT_PROCESOS", str(max(1, (os.cpu_count() or 2) // 2))))
+    BCRYPT_MAX_PENDIENTES: int = int(os.getenv("BCRYPT_MAX_PENDIENTES", "64"))
+    
+    # Intentos de login: ráfaga y recarga por minuto por email y por cliente (IP),
+    # y verificaciones de contraseña simultáneas por proceso (el resto, 429)
+    LOGIN_EMAIL_CAPACIDAD: float = float(os.getenv("LOGIN_EMAIL_CAPACIDAD", "5"))
+    LOGIN_EMAIL_POR_MINUTO: float = float(os.getenv("LOGIN_EMAIL_POR_MINUTO", "5"))
+    LOGIN_CLIENTE_CAPACIDAD: float = float(os.getenv("LOGIN_CLIENTE_CAPACIDAD", "30"))
+    LOGIN_CLIENTE_POR_MINUTO: float = float(os.getenv("LOGIN_CLIENTE_POR_MINUTO", "60"))
+    LOGIN_MAX_VERIFICACIONES: int = int(os.getenv("LOGIN_MAX_VERIFICACIONES", "16"))
+    
+    # Costo de bcrypt. Si BCRYPT_COSTO no está definido se calibra al iniciar:
+    # el mayor costo cuyo hash tarda a lo sumo BCRYPT_PRESUPUESTO_MS, sin bajar
+    # de BCRYPT_COSTO_MINIMO
+    BCRYPT_COSTO: Optional[int] = int(os.environ["BCRYPT_COSTO"]) if os.getenv("BCRYPT_COSTO") else None
+    BCRYPT_PRESUPUESTO_MS: float = float(os.getenv("BCRYPT_PRESUPUESTO_MS", "250"))
+    BCRYPT_COSTO_MINIMO: int = int(os.getenv("BCRYPT_COSTO_MINIMO", "10"))
+    
+    # Almacenamiento del estado: "memoria" (un solo proceso) o "sqlite" (compartido
+    # entre varios workers de uvicorn; el WAL, los snapshots y el archivo no se usan)
+    STORAGE_BACKEND: str = os.getenv("STORAGE_BACKEND", "memoria").lower()
+    SQLITE_PATH: str = os.getenv("SQLITE_PATH", "guardia.db")
+    
+    # Persistencia (WAL). Si WAL_PATH no está definido el estado vive solo en memoria
+    WAL_PATH: Optional[str] = os.getenv("WAL_PATH")
+    WAL_ESPERAR_FSYNC: bool = os.getenv("WAL_ESPERAR_FSYNC", "true").lower() == "true"
+    WAL_DEMORA_COMMIT_MS: float = float(os.getenv("WAL_DEMORA_COMMIT_MS", "0"))
+    
+    # Snapshots en segundo plano. Si SNAPSHOT_DIR no está definido no se generan
+    SNAPSHOT_DIR: Optional[str] = os.getenv("SNAPSHOT_DIR")
+    SNAPSHOT_INTERVALO_SEGUNDOS: float = float(os.getenv("SNAPSHOT_INTERVALO_SEGUNDOS", "300"))
+    
+    # Archivo de ingresos finalizados. Si ARCHIVO_DIR no está definido quedan todos en memoria
+    ARCHIVO_DIR: Optional[str] = os.getenv("ARCHIVO_DIR")
+    ARCHIVO_ANTIGUEDAD_HORAS: float = float(os.getenv("ARCHIVO_ANTIGUEDAD_HORAS", "24"))
+    ARCHIVO_INTERVALO_SEGUNDOS: float = float(os.getenv("ARCHIVO_INTERVALO_SEGUNDOS", "600"))
+    ARCHIVO_TAMANIO_SEGMENTO_MB: int = int(os.getenv("ARCHIVO_TAMANIO_SEGMENTO_MB", "64"))
+    
     # App Configuration
     APP_NAME: str = "API Módulo de Urgencias"
     APP_VERSION: str = "1.0.0"
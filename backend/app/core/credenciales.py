@@ -0,0 +1,265 @@
+"""
+Hash y verificación de contraseñas con bcrypt.
+
+bcrypt es deliberadamente caro (decenas a cientos de milisegundos de CPU).
+Las rutas de autenticación lo delegan al motor de credenciales, que lo corre
+en un pool de procesos propio y acotado: una ola de logins en el cambio de
+turno no ocupa el threadpool de FastAPI ni compite por el GIL con las rutas
+de la guardia, y si se acumulan demasiadas operaciones pendientes las nuevas
+se rechazan en lugar de encolarse sin límite.
+
+El costo de bcrypt (cada punto duplica el trabajo) se calibra al iniciar la
+API para que un hash tarde a lo sumo BCRYPT_PRESUPUESTO_MS en este hardware,
+sin bajar de BCRYPT_COSTO_MINIMO. Los hashes hechos con otro costo se
+rehacen en segundo plano la próxima vez que el usuario inicia sesión.
+
+Este módulo solo depende de bcrypt y de la configuración: los procesos del
+pool lo importan para ejecutar las funciones de hash.
+"""
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+import bcrypt
+
+from .config import settings
+
+
+# Costo de bcrypt.gensalt() mientras no se configure ni se calibre
+COSTO_POR_DEFECTO = 12
+
+
+def hashear_password(password: str, costo: Optional[int] = None) -> str:
+    """
+    Hashea una contraseña con bcrypt.
+
+    Args:
+        password: Contraseña en texto plano
+        costo: Costo de bcrypt (por defecto, el del motor del proceso)
+
+    Returns:
+        Hash bcrypt (incluye la sal y el costo)
+    """
+    if costo is None:
+        costo = motor_credenciales.costo
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(costo)).decode('utf-8')
+
+
+def verificar_password(password: str, password_hash: str) -> bool:
+    """
+    Verifica una contraseña contra un hash bcrypt.
+
+    Args:
+        password: Contraseña en texto plano
+        password_hash: Hash guardado
+
+    Returns:
+        True si la contraseña coincide
+    """
+    return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+
+
+def costo_de_hash(password_hash: str) -> Optional[int]:
+    """
+    Costo con que se hizo un hash bcrypt ("$2b$12$..." -> 12).
+
+    Returns:
+        El costo, o None si el hash no tiene el formato de bcrypt
+    """
+    partes = password_hash.split("$")
+    if len(partes) < 4 or not partes[2].isdigit():
+        return None
+    return int(partes[2])
+
+
+class MotorSaturado(Exception):
+    """Hay demasiadas operaciones de bcrypt pendientes; conviene reintentar más tarde"""
+
+
+class MotorCredenciales:
+    """
+    Corre bcrypt en un pool de procesos acotado, esperándolo desde el event loop.
+
+    El pool se crea con el primer uso (con el método spawn: el proceso de la
+    API tiene threads en curso y no conviene forkearlo). Los procesos del pool
+    no comparten el estado del motor: el costo se les pasa en cada hash. Es
+    thread-safe.
+    """
+
+    def __init__(self, procesos: int, max_pendientes: int, costo: int = COSTO_POR_DEFECTO):
+        self._procesos = procesos
+        self._max_pendientes = max_pendientes
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pendientes = 0
+
+        # Costo de los hashes nuevos y cómo se eligió
+        self.costo = costo
+        self._origen_costo = "por defecto"
+        self._calibracion_ms: Dict[int, float] = {}
+
+        # Métricas
+        self._hashes = 0
+        self._verificaciones = 0
+        self._rechazadas = 0
+        self._rehashes = 0
+        self._segundos_hashes = 0.0
+        self._segundos_verificaciones = 0.0
+
+    def configurar_costo(self, costo: int) -> None:
+        """
+        Fija el costo de los hashes nuevos sin calibrar.
+
+        Args:
+            costo: Costo de bcrypt (4 a 31)
+        """
+        with self._lock:
+            self.costo = costo
+            self._origen_costo = "configurado"
+
+    def calibrar(self, presupuesto_ms: float, minimo: int, maximo: int = 31) -> int:
+        """
+        Elige el mayor costo cuyo hash tarda a lo sumo `presupuesto_ms` en este
+        proceso, sin bajar de `minimo`.
+
+        Mide desde el mínimo y sube de a un punto mientras el doble del último
+        tiempo entre en el presupuesto, así que en total tarda menos de dos
+        veces el presupuesto (salvo que el mínimo ya lo supere).
+
+        Args:
+            presupuesto_ms: Tiempo máximo de un hash, en milisegundos
+            minimo: Costo mínimo aceptable, aunque exceda el presupuesto
+            maximo: Costo máximo
+
+        Returns:
+            El costo elegido (también queda como costo del motor)
+        """
+        mediciones: Dict[int, float] = {}
+        costo = minimo
+        while True:
+            inicio = time.perf_counter()
+            hashear_password("calibracion-bcrypt", costo)
+            mediciones[costo] = (time.perf_counter() - inicio) * 1000
+            if costo >= maximo or mediciones[costo] * 2 > presupuesto_ms:
+                break
+            costo += 1
+        if mediciones[costo] > presupuesto_ms and costo > minimo:
+            costo -= 1
+        with self._lock:
+            self.costo = costo
+            self._origen_costo = "calibrado"
+            self._calibracion_ms = mediciones
+        return costo
+
+    def necesita_rehash(self, password_hash: str) -> bool:
+        """
+        Indica si un hash se hizo con un costo desactualizado.
+
+        Un costo calibrado solo sube los hashes más baratos: cada worker
+        calibra por su cuenta y, si bajara los más caros, dos workers con
+        mediciones apenas distintas rehashearían al mismo usuario en cada
+        login. Un costo configurado (igual en todos los workers) también baja
+        los más caros.
+
+        Args:
+            password_hash: Hash guardado
+
+        Returns:
+            True si conviene rehacerlo con el costo actual
+        """
+        costo = costo_de_hash(password_hash)
+        if costo is None:
+            return False
+        return costo < self.costo or (costo > self.costo and self._origen_costo == "configurado")
+
+    async def hashear(self, password: str) -> str:
+        """
+        Hashea una contraseña en el pool, con el costo actual.
+
+        Raises:
+            MotorSaturado: Si ya hay `max_pendientes` operaciones pendientes
+        """
+        inicio = time.perf_counter()
+        resultado = await self._ejecutar(hashear_password, password, self.costo)
+        with self._lock:
+            self._hashes += 1
+            self._segundos_hashes += time.perf_counter() - inicio
+        return resultado
+
+    async def verificar(self, password: str, password_hash: str) -> bool:
+        """
+        Verifica una contraseña en el pool.
+
+        Raises:
+            MotorSaturado: Si ya hay `max_pendientes` operaciones pendientes
+        """
+        inicio = time.perf_counter()
+        resultado = await self._ejecutar(verificar_password, password, password_hash)
+        with self._lock:
+            self._verificaciones += 1
+            self._segundos_verificaciones += time.perf_counter() - inicio
+        return resultado
+
+    def registrar_rehash(self) -> None:
+        """Cuenta un hash rehecho con el costo actual"""
+        with self._lock:
+            self._rehashes += 1
+
+    def estadisticas(self) -> Dict[str, Any]:
+        """
+        Métricas del motor.
+
+        Returns:
+            Procesos, costo y calibración, operaciones pendientes, completadas
+            y rechazadas, y tiempos promedio (incluida la espera en el pool)
+        """
+        with self._lock:
+            return {
+                "procesos": self._procesos,
+                "max_pendientes": self._max_pendientes,
+                "costo": self.costo,
+                "origen_costo": self._origen_costo,
+                "calibracion_ms": {str(costo): ms for costo, ms in self._calibracion_ms.items()},
+                "pendientes": self._pendientes,
+                "hashes": self._hashes,
+                "verificaciones": self._verificaciones,
+                "rehashes": self._rehashes,
+                "rechazadas": self._rechazadas,
+                "ms_promedio_hash": self._segundos_hashes / self._hashes * 1000 if self._hashes else 0.0,
+                "ms_promedio_verificacion": (
+                    self._segundos_verificaciones / self._verificaciones * 1000 if self._verificaciones else 0.0
+                ),
+            }
+
+    def cerrar(self) -> None:
+        """Termina los procesos del pool (se vuelve a crear si se usa otra vez)"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    async def _ejecutar(self, funcion: Callable, *args) -> Any:
+        """Reserva un lugar en la cola del motor y corre la función en el pool"""
+        with self._lock:
+            if self._pendientes >= self._max_pendientes:
+                self._rechazadas += 1
+                raise MotorSaturado("Hay demasiadas operaciones de autenticación en curso")
+            self._pendientes += 1
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self._procesos,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            pool = self._pool
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, funcion, *args)
+        finally:
+            with self._lock:
+                self._pendientes -= 1
+
+
+# Motor del proceso, compartido por todas las rutas de autenticación
+motor_credenciales = MotorCredenciales(settings.BCRYPT_PROCESOS, settings.BCRYPT_MAX_PENDIENTES)
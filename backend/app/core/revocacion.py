@@ -0,0 +1,123 @@
+"""
+Revocación de tokens JWT antes de que venzan.
+
+Los tokens se verifican sin consultar ningún almacenamiento (y, con
+AUTH_SIN_ESTADO, el usuario sale de los claims del propio token), así que
+para invalidarlos antes de su `exp` se guarda:
+
+- el id (`jti`) de cada token revocado (por ejemplo, al cerrar sesión), y
+- por usuario, el instante a partir del cual sus tokens anteriores dejan de
+  valer (por ejemplo, cuando cambia su rol o su matrícula).
+
+Cada entrada se descarta sola cuando ya no puede quedar ningún token vigente
+al que afecte, así que el tamaño depende de las revocaciones recientes y no
+de la cantidad de tokens emitidos.
+"""
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+
+def clave_jti(jti: str) -> Union[bytes, str]:
+    """Los jti que emite create_access_token son 32 dígitos hex: se guardan como 16 bytes"""
+    try:
+        return bytes.fromhex(jti)
+    except ValueError:
+        return jti
+
+
+class ListaRevocacion:
+    """
+    Tokens revocados por jti y cortes por usuario. Es thread-safe.
+
+    Vive en la memoria del proceso: con varios workers se usa
+    ListaRevocacionSQLite, que guarda las revocaciones en la base compartida.
+    """
+
+    # Otros procesos no ven estas revocaciones
+    compartida = False
+
+    def __init__(self, duracion_tokens: float):
+        """
+        Args:
+            duracion_tokens: Segundos que dura un token desde que se emite
+                (cuánto tiempo hay que recordar el corte de un usuario)
+        """
+        self.duracion_tokens = duracion_tokens
+        self._lock = threading.Lock()
+        # jti -> exp del token
+        self._revocados: Dict[Union[bytes, str], float] = {}
+        # email -> los tokens emitidos antes de este instante no valen
+        self._cortes: Dict[str, int] = {}
+        # (vencimiento, orden, tipo, clave) para descartar las entradas que ya no hacen falta
+        self._vencimientos: List[Tuple[float, int, int, Any]] = []
+        self._orden = itertools.count()
+
+    def revocar(self, jti: str, exp: float) -> None:
+        """
+        Revoca un token.
+
+        Args:
+            jti: Id del token
+            exp: Vencimiento del token (timestamp); hasta entonces se recuerda
+        """
+        clave = clave_jti(jti)
+        with self._lock:
+            self._purgar()
+            self._revocados[clave] = exp
+            heapq.heappush(self._vencimientos, (exp, next(self._orden), 0, clave))
+
+    def revocar_usuario(self, email: str, desde: Optional[float] = None) -> None:
+        """
+        Revoca los tokens de un usuario emitidos antes de un instante.
+
+        Args:
+            email: Email del usuario
+            desde: Timestamp del corte (por defecto, ahora). Los claims `iat`
+                tienen resolución de segundos: un token emitido en el mismo
+                segundo del corte sigue valiendo
+        """
+        corte = int(time.time() if desde is None else desde)
+        with self._lock:
+            self._purgar()
+            self._cortes[email] = max(corte, self._cortes.get(email, corte))
+            heapq.heappush(self._vencimientos, (corte + self.duracion_tokens, next(self._orden), 1, email))
+
+    def revocado(self, payload: Dict[str, Any]) -> bool:
+        """
+        Indica si un token verificado fue revocado.
+
+        Args:
+            payload: Claims del token (se usan jti, email e iat)
+
+        Returns:
+            True si el token no debe aceptarse
+        """
+        jti = payload.get("jti")
+        email = payload.get("email")
+        with self._lock:
+            if jti is not None and clave_jti(jti) in self._revocados:
+                return True
+            corte = self._cortes.get(email)
+            return corte is not None and payload.get("iat", 0) < corte
+
+    def estadisticas(self) -> Dict[str, Any]:
+        """Tokens revocados y usuarios con corte que todavía se recuerdan"""
+        with self._lock:
+            self._purgar()
+            return {"tokens_revocados": len(self._revocados), "usuarios_con_corte": len(self._cortes)}
+
+    def _purgar(self) -> None:
+        """Descarta las entradas que ya no afectan a ningún token vigente (con el lock tomado)"""
+        ahora = time.time()
+        while self._vencimientos and self._vencimientos[0][0] <= ahora:
+            vence, _, tipo, clave = heapq.heappop(self._vencimientos)
+            if tipo == 0:
+                if self._revocados.get(clave) == vence:
+                    del self._revocados[clave]
+            else:
+                corte = self._cortes.get(clave)
+                if corte is not None and corte + self.duracion_tokens <= ahora:
+                    del self._cortes[clave]
@@ -1,10 +1,16 @@
 """Funciones de seguridad y JWT"""
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from jose import JWTError, jwt
 from .config import settings
 
 
+# Claim `scope` de los tickets del stream de eventos: solo valen en GET /eventos,
+# y los tokens de acceso (sin `scope`) no valen ahí como query param
+ALCANCE_SSE = "sse"
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Crea un token JWT con los datos proporcionados.
@@ -14,16 +20,18 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expires_delta: Tiempo de expiración del token (opcional)
         
     Returns:
-        Token JWT codificado como string
+        Token JWT codificado como string (con un id `jti` para poder revocarlo
+        y la fecha de emisión `iat`)
     """
     to_encode = data.copy()
+    ahora = datetime.utcnow()
     
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = ahora + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = ahora + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": ahora, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     
     return encoded_jwt
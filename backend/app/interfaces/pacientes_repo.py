@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import List, Optional
 from ..models.models import Paciente
 
 
@@ -16,8 +16,18 @@ class PacientesRepo(ABC):
         """Obtiene un paciente por su CUIL"""
         pass
     
+    @abstractmethod
+    def obtener_version_paciente(self, cuil: str) -> Optional[int]:
+        """Obtiene la versión de un paciente (cambia cada vez que se guarda), None si no existe"""
+        pass
+    
     @abstractmethod
     def existe_paciente(self, cuil: str) -> bool:
         """Verifica si existe un paciente con el CUIL dado"""
         pass
+    
+    @abstractmethod
+    def obtener_todos(self) -> List[Paciente]:
+        """Obtiene todos los pacientes del repositorio"""
+        pass
 
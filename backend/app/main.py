@@ -5,6 +5,12 @@ from datetime import datetime
 
 from backend.app.core.config import settings
 from backend.app.api.routes import auth, urgencias, debug
+from backend.app.api.dependencies import (
+    get_pacientes_repo,
+    get_servicio_emergencias,
+    get_motor_credenciales,
+    cerrar_persistencia
+)
 
 
 # Crear instancia de FastAPI
@@ -22,6 +28,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Headers de respuesta que el frontend necesita leer
+    expose_headers=["ETag", "X-Cursor-Siguiente"],
 )
 
 
@@ -31,6 +39,32 @@ app.include_router(urgencias.router, prefix=f"{settings.API_PREFIX}/urgencias",
 app.include_router(debug.router, prefix=f"{settings.API_PREFIX}/debug", tags=["debug"])
 
 
+# Ciclo de vida
+@app.on_event("startup")
+def startup():
+    """
+    Inicializa el servicio de emergencias al arrancar, reconstruyendo el
+    estado desde el WAL si la persistencia está habilitada, y elige el costo
+    de bcrypt (configurado o calibrado en este hardware).
+    """
+    get_servicio_emergencias(get_pacientes_repo())
+    motor = get_motor_credenciales()
+    if settings.BCRYPT_COSTO is not None:
+        motor.configurar_costo(settings.BCRYPT_COSTO)
+    else:
+        motor.calibrar(settings.BCRYPT_PRESUPUESTO_MS, settings.BCRYPT_COSTO_MINIMO)
+
+
+@app.on_event("shutdown")
+def shutdown():
+    """
+    Vuelca a disco los registros pendientes del WAL y termina los procesos
+    del motor de credenciales.
+    """
+    cerrar_persistencia()
+    get_motor_credenciales().cerrar()
+
+
 # Endpoints raíz
 @app.get("/")
 def root():
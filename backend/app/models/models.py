@@ -1,51 +1,134 @@
+from abc import ABC, abstractmethod
 from enum import Enum
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 import re
 
-import bcrypt
+from backend.app.core.credenciales import hashear_password, verificar_password
 
 
 # ============= Value Objects =============
 
-class Frecuencia:
+@lru_cache(maxsize=8192, typed=True)
+def _instancia_compartida(tipo: type, *valores) -> "ValueObject":
+    """Una instancia por tipo y valores (las excepciones de validación no se cachean)"""
+    return tipo(*valores)
+
+
+class ValueObject(ABC):
+    """
+    Clase base para value objects inmutables.
+
+    Al ser inmutables se comparan por valor y una misma instancia puede
+    compartirse entre todos los ingresos con los mismos valores (ver
+    `compartido`). Las subclases asignan sus atributos con `_asignar` y
+    retornan en `_valores` los argumentos de su constructor.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def compartido(cls, *valores) -> "ValueObject":
+        """
+        Retorna una instancia compartida con estos valores, validada igual que
+        con el constructor.
+
+        Raises:
+            ValueError: Si algún valor es inválido
+        """
+        return _instancia_compartida(cls, *valores)
+
+    def _asignar(self, nombre: str, valor) -> None:
+        object.__setattr__(self, nombre, valor)
+
+    @abstractmethod
+    def _valores(self) -> tuple:
+        """Argumentos del constructor que identifican al value object"""
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError(f"{self.__class__.__name__} es inmutable")
+
+    def __delattr__(self, nombre):
+        raise AttributeError(f"{self.__class__.__name__} es inmutable")
+
+    def __eq__(self, otro) -> bool:
+        return type(otro) is type(self) and otro._valores() == self._valores()
+
+    def __hash__(self) -> int:
+        return hash((type(self), self._valores()))
+
+    def __reduce__(self):
+        # Pickle no puede asignar los slots de un objeto inmutable: se
+        # reconstruye como instancia compartida (por ejemplo, al cargar un snapshot)
+        return (_instancia_compartida, (self.__class__, *self._valores()))
+
+
+class Frecuencia(ValueObject):
     """Clase base para value objects de frecuencia"""
+    __slots__ = ("valor",)
+
     def __init__(self, valor: float):
         if valor < 0:
             raise ValueError(f"La {self.__class__.__name__} no puede ser negativa")
-        self.valor = valor
+        self._asignar("valor", valor)
+
+    def _valores(self) -> tuple:
+        return (self.valor,)
 
 
 class Temperatura(Frecuencia):
     """Value object para temperatura corporal"""
-    pass
+    __slots__ = ()
 
 
 class FrecuenciaCardiaca(Frecuencia):
     """Value object para frecuencia cardíaca"""
+    __slots__ = ()
+
     def __init__(self, valor: float):
         if valor < 0:
             raise ValueError("La Frecuencia Cardiaca no puede ser negativa")
-        self.valor = valor
+        self._asignar("valor", valor)
 
 
 class FrecuenciaRespiratoria(Frecuencia):
     """Value object para frecuencia respiratoria"""
+    __slots__ = ()
+
     def __init__(self, valor: float):
         if valor < 0:
             raise ValueError("La Frecuencia Respiratoria no puede ser negativa")
-        self.valor = valor
+        self._asignar("valor", valor)
 
 
-class TensionArterial:
+class TensionArterial(ValueObject):
     """Value object para tensión arterial (sistólica/diastólica)"""
+    __slots__ = ("frecuencia_sistolica", "frecuencia_diastolica")
+
     def __init__(self, frecuencia_sistolica: float, frecuencia_diastolica: float):
         if frecuencia_sistolica < 0:
             raise ValueError("La Frecuencia Sistolica no puede ser negativa")
         if frecuencia_diastolica < 0:
             raise ValueError("La Frecuencia Diastolica no puede ser negativa")
-        self.frecuencia_sistolica = frecuencia_sistolica
-        self.frecuencia_diastolica = frecuencia_diastolica
+        self._asignar("frecuencia_sistolica", frecuencia_sistolica)
+        self._asignar("frecuencia_diastolica", frecuencia_diastolica)
+
+    def _valores(self) -> tuple:
+        return (self.frecuencia_sistolica, self.frecuencia_diastolica)
+
+
+class ObraSocial(ValueObject):
+    """
+    Value object para obra social. Es inmutable porque el registro canónico
+    comparte una misma instancia entre todos sus afiliados.
+    """
+    __slots__ = ("nombre",)
+
+    def __init__(self, nombre: str):
+        self._asignar("nombre", nombre)
+
+    def _valores(self) -> tuple:
+        return (self.nombre,)
 
 
 # ============= Enums =============
@@ -88,14 +171,10 @@ class EstadoIngreso(Enum):
 
 # ============= Entidades =============
 
-class ObraSocial:
-    """Entidad para obra social"""
-    def __init__(self, nombre: str):
-        self.nombre = nombre
-
-
 class Afiliado:
     """Entidad para afiliación de paciente a obra social"""
+    __slots__ = ("obra_social", "numero_afiliado")
+
     def __init__(self, obra_social: ObraSocial, numero_afiliado: str):
         if not obra_social:
             raise ValueError("La obra social es obligatoria")
@@ -107,6 +186,8 @@ class Afiliado:
 
 class Domicilio:
     """Entidad para domicilio"""
+    __slots__ = ("calle", "numero", "localidad", "ciudad", "provincia", "pais")
+
     def __init__(self, calle: str, numero: int, localidad: str, ciudad: str, provincia: str, pais: str):
         self.calle = calle
         self.numero = numero
@@ -118,6 +199,8 @@ class Domicilio:
 
 class Persona:
     """Clase base para personas en el sistema"""
+    __slots__ = ("cuil", "nombre", "apellido", "email")
+
     def __init__(self, cuil: str, nombre: str, apellido: str, email: str = ""):
         self.cuil = cuil
         self.nombre = nombre
@@ -130,6 +213,8 @@ class Persona:
 
 class Paciente(Persona):
     """Entidad para paciente"""
+    __slots__ = ("domicilio", "afiliado")
+
     def __init__(
         self,
         nombre: str,
@@ -159,6 +244,8 @@ class Paciente(Persona):
 
 class Doctor(Persona):
     """Entidad para doctor"""
+    __slots__ = ("matricula",)
+
     def __init__(self, cuil: str, nombre: str, apellido: str, matricula: str, email: str = ""):
         super().__init__(cuil, nombre, apellido, email)
         self.matricula = matricula
@@ -166,6 +253,8 @@ class Doctor(Persona):
 
 class Enfermera(Persona):
     """Entidad para enfermera"""
+    __slots__ = ("matricula",)
+
     def __init__(self, nombre: str, apellido: str, matricula: str = "", cuil: str = "", email: str = ""):
         # Para mantener compatibilidad con tests que solo pasan nombre y apellido
         super().__init__(cuil, nombre, apellido, email)
@@ -178,6 +267,21 @@ class Usuario:
     Ahora el constructor acepta un parámetro opcional `rol` (miembro de `Rol` o `str`).
     """
     def __init__(self, email: str, password: str, rol: Optional[object] = None):
+        self.validar_credenciales(email, password)
+
+        self.email = email
+        self.password_hash = self._hash_password(password)
+        # rol por defecto no asignado; puede asignarse con set_rol o pasarse al constructor
+        self.rol = None
+        self.id = None  # ID será asignado por el repositorio
+        self.matricula = None
+        if rol is not None:
+            # delega la validación y normalización a set_rol
+            self.set_rol(rol)
+
+    @staticmethod
+    def validar_credenciales(email: str, password: str) -> None:
+        """Valida el email y la contraseña de un usuario nuevo; lanza ValueError si no son válidos"""
         # Validaciones básicas por historia de usuario IS2025-005
         if not email or not isinstance(email, str):
             raise ValueError("El email es obligatorio")
@@ -188,15 +292,21 @@ class Usuario:
         if not password or not isinstance(password, str) or len(password) < 8:
             raise ValueError("La contraseña debe tener al menos 8 caracteres")
 
-        self.email = email
-        self.password_hash = self._hash_password(password)
-        # rol por defecto no asignado; puede asignarse con set_rol o pasarse al constructor
-        self.rol = None
-        self.id = None  # ID será asignado por el repositorio
-        self.matricula = None
+    @classmethod
+    def desde_hash(cls, email: str, password_hash: str, rol: Optional[object] = None) -> "Usuario":
+        """Reconstruye un usuario a partir de un hash ya calculado (sin volver a hashear).
+
+        Se usa al restaurar usuarios desde disco.
+        """
+        usuario = cls.__new__(cls)
+        usuario.email = email
+        usuario.password_hash = password_hash
+        usuario.rol = None
+        usuario.id = None
+        usuario.matricula = None
         if rol is not None:
-            # delega la validación y normalización a set_rol
-            self.set_rol(rol)
+            usuario.set_rol(rol)
+        return usuario
 
     def set_rol(self, rol):
         """Asigna el rol al usuario. Acepta un miembro de `Rol` o un string.
@@ -220,12 +330,12 @@ class Usuario:
 
     def _hash_password(self, password: str) -> str:
         """Hashea la contraseña usando bcrypt"""
-        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        return hashear_password(password)
 
 
     def verificar_password(self, password: str) -> bool:
         """Verifica si el password coincide con el hash guardado"""
-        return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
+        return verificar_password(password, self.password_hash)
 
 class Rol(Enum):
     MEDICO = "MEDICO"
@@ -236,7 +346,15 @@ class Rol(Enum):
 
 class Atencion:
     """Entidad para atención médica"""
-    def __init__(self, doctor: Doctor, informe: str, ingreso: Optional['Ingreso'] = None):
+    __slots__ = ("doctor", "informe", "ingreso", "fecha")
+
+    def __init__(
+        self,
+        doctor: Doctor,
+        informe: str,
+        ingreso: Optional['Ingreso'] = None,
+        fecha: Optional[datetime] = None
+    ):
         if not doctor:
             raise ValueError("El doctor es obligatorio")
         if not informe or not isinstance(informe, str) or not informe.strip():
@@ -245,10 +363,27 @@ class Atencion:
         self.doctor = doctor
         self.informe = informe
         self.ingreso = ingreso
+        self.fecha = fecha if fecha else datetime.now()
 
 
 class Ingreso:
     """Entidad principal para ingreso a urgencias"""
+    __slots__ = (
+        "id",
+        "paciente",
+        "enfermera",
+        "nivel_emergencia",
+        "descripcion",
+        "temperatura",
+        "frecuencia_cardiaca",
+        "frecuencia_respiratoria",
+        "tension_arterial",
+        "fecha_ingreso",
+        "atencion",
+        "estado_ingreso",
+        "doctor_asignado",
+    )
+
     def __init__(
         self,
         id_uuid: str,
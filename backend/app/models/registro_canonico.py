@@ -0,0 +1,159 @@
+"""
+Registro canónico de obras sociales y textos repetidos del domicilio.
+
+Casi todos los pacientes comparten un puñado de obras sociales y de
+localidades, ciudades, provincias y países, pero cada alta crea su propia
+ObraSocial y sus propias copias de esos textos (cada request JSON los
+decodifica de nuevo). El registro entrega siempre la misma instancia para un
+mismo valor, de modo que las copias nuevas se descartan en cuanto termina el
+alta, y lleva la cuenta de los bytes que eso ahorra.
+"""
+import sys
+import threading
+from typing import Any, Dict, Optional
+
+from backend.app.models.models import Domicilio, ObraSocial
+
+
+# Campos del domicilio con pocos valores distintos (la calle y el número no se internan)
+CAMPOS_DOMICILIO = ("localidad", "ciudad", "provincia", "pais")
+
+
+class RegistroCanonico:
+    """
+    Instancias canónicas de obras sociales y de los textos de baja
+    cardinalidad del domicilio. Es thread-safe.
+
+    Los registros están acotados: si se llenan (por ejemplo, por datos
+    cargados con errores de tipeo), los valores nuevos se usan tal cual, sin
+    internarlos.
+    """
+
+    def __init__(self, max_textos: int = 4096, max_obras_sociales: int = 1024):
+        self._lock = threading.Lock()
+        self._textos: Dict[str, str] = {}
+        self._obras_sociales: Dict[str, ObraSocial] = {}
+        self._max_textos = max_textos
+        self._max_obras_sociales = max_obras_sociales
+
+        # Métricas
+        self._reutilizaciones = 0
+        self._bytes_ahorrados = 0
+        self._sin_internar = 0
+
+    def texto(self, valor: Optional[str]) -> Optional[str]:
+        """
+        Retorna la instancia canónica de un texto.
+
+        Args:
+            valor: Texto a internar (None se retorna tal cual)
+
+        Returns:
+            Un texto igual a `valor`, el mismo objeto para todos los valores iguales
+        """
+        if not isinstance(valor, str):
+            return valor
+        with self._lock:
+            return self._texto(valor)
+
+    def obra_social(self, nombre: str) -> ObraSocial:
+        """
+        Retorna la obra social canónica de un nombre, creándola la primera vez.
+
+        Args:
+            nombre: Nombre de la obra social
+
+        Returns:
+            La misma instancia de ObraSocial para todos los pacientes de esa obra social
+        """
+        with self._lock:
+            canonica = self._obras_sociales.get(nombre)
+            if canonica is not None:
+                self._reutilizar(sys.getsizeof(canonica))
+                if canonica.nombre is not nombre:
+                    self._bytes_ahorrados += sys.getsizeof(nombre)
+                return canonica
+            obra_social = ObraSocial(self._texto(nombre))
+            if len(self._obras_sociales) < self._max_obras_sociales:
+                self._obras_sociales[nombre] = obra_social
+            else:
+                self._sin_internar += 1
+            return obra_social
+
+    def domicilio(
+        self,
+        calle: str,
+        numero: int,
+        localidad: str,
+        ciudad: str,
+        provincia: str,
+        pais: str
+    ) -> Domicilio:
+        """
+        Crea un domicilio con los textos de baja cardinalidad internados.
+
+        Returns:
+            Domicilio nuevo que comparte localidad, ciudad, provincia y país con los demás
+        """
+        with self._lock:
+            return Domicilio(
+                calle, numero, self._texto(localidad), self._texto(ciudad),
+                self._texto(provincia), self._texto(pais)
+            )
+
+    def internar_domicilio(self, domicilio: Domicilio) -> Domicilio:
+        """
+        Reemplaza en un domicilio ya creado los textos de baja cardinalidad
+        por sus instancias canónicas.
+
+        Args:
+            domicilio: Domicilio a internar (se modifica)
+
+        Returns:
+            El mismo domicilio
+        """
+        with self._lock:
+            for campo in CAMPOS_DOMICILIO:
+                setattr(domicilio, campo, self._texto(getattr(domicilio, campo)))
+        return domicilio
+
+    def estadisticas(self) -> Dict[str, Any]:
+        """
+        Métricas del registro.
+
+        Returns:
+            Valores internados, reutilizaciones y bytes ahorrados
+        """
+        with self._lock:
+            return {
+                "textos": len(self._textos),
+                "obras_sociales": len(self._obras_sociales),
+                "reutilizaciones": self._reutilizaciones,
+                "sin_internar": self._sin_internar,
+                "bytes_ahorrados": self._bytes_ahorrados,
+            }
+
+    def _texto(self, valor: Optional[str]) -> Optional[str]:
+        """Versión de `texto` para usar con el lock tomado"""
+        if not isinstance(valor, str):
+            return valor
+        canonico = self._textos.get(valor)
+        if canonico is None:
+            if len(self._textos) < self._max_textos:
+                self._textos[valor] = valor
+            else:
+                self._sin_internar += 1
+            return valor
+        if canonico is not valor:
+            self._reutilizar(sys.getsizeof(valor))
+        return canonico
+
+    def _reutilizar(self, bytes_ahorrados: int) -> None:
+        """Cuenta una copia evitada (con el lock tomado)"""
+        self._reutilizaciones += 1
+        self._bytes_ahorrados += bytes_ahorrados
+
+
+# Registro del proceso, compartido por el servicio de emergencias, el alta de
+# pacientes y la carga desde la persistencia
+registro_canonico = RegistroCanonico()
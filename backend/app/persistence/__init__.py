@@ -0,0 +1 @@
+# Persistence module (WAL, serialización del estado)
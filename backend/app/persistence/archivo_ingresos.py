@@ -0,0 +1,198 @@
+"""
+Archivo en disco de ingresos finalizados.
+
+Los ingresos finalizados hace más de cierto tiempo se mueven de memoria a
+segmentos append-only (`segmento-000001.jsonl`, ...): una línea JSON por
+ingreso, sin los datos del paciente (se vuelve a enlazar con el repositorio
+por CUIL al leerlo). Cada segmento tiene un índice (`segmento-000001.idx`)
+con una línea `id offset largo` por ingreso, que se carga completo en memoria
+al abrir el archivo: en memoria solo queda una entrada chica por ingreso
+archivado y el ingreso completo se lee del disco bajo demanda.
+
+Los datos se sincronizan a disco antes que el índice, así que una entrada
+del índice siempre apunta a un registro completo.
+"""
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from backend.app.interfaces.pacientes_repo import PacientesRepo
+from backend.app.models.models import Ingreso
+from backend.app.persistence.serializacion import ingreso_a_dict, ingreso_desde_dict
+
+
+PREFIJO = "segmento-"
+EXTENSION_DATOS = ".jsonl"
+EXTENSION_INDICE = ".idx"
+
+
+class ArchivoIngresos:
+    """Segmentos append-only e indexados de ingresos finalizados"""
+
+    def __init__(self, directorio: str, tamanio_max_segmento: int = 64 * 1024 * 1024):
+        """
+        Abre (o crea) el archivo y carga los índices de todos los segmentos.
+
+        Args:
+            directorio: Directorio de los segmentos
+            tamanio_max_segmento: Tamaño en bytes a partir del cual se abre un segmento nuevo
+        """
+        self.directorio = Path(directorio)
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        self.tamanio_max_segmento = tamanio_max_segmento
+
+        self._lock = threading.Lock()
+        # Índice id -> (número de segmento, offset, largo)
+        self._indice: Dict[str, Tuple[int, int, int]] = {}
+        # Descriptores abiertos para lectura, por número de segmento
+        self._lectores: Dict[int, int] = {}
+
+        self._segmento_actual = 0
+        for numero in self._numeros_de_segmento():
+            self._cargar_indice(numero)
+            self._segmento_actual = numero
+        if self._segmento_actual == 0:
+            self._segmento_actual = 1
+
+        # Métricas
+        self.lecturas = 0
+
+    def archivar(self, ingresos: Iterable[Ingreso]) -> int:
+        """
+        Agrega ingresos al segmento actual y los indexa.
+
+        Args:
+            ingresos: Ingresos finalizados a archivar
+
+        Returns:
+            Cantidad de ingresos escritos
+        """
+        with self._lock:
+            ruta_datos = self._ruta(self._segmento_actual, EXTENSION_DATOS)
+            offset = ruta_datos.stat().st_size if ruta_datos.exists() else 0
+            if offset >= self.tamanio_max_segmento:
+                self._segmento_actual += 1
+                ruta_datos = self._ruta(self._segmento_actual, EXTENSION_DATOS)
+                offset = 0
+
+            lineas = []
+            entradas = []
+            for ingreso in ingresos:
+                linea = json.dumps(
+                    ingreso_a_dict(ingreso, incluir_paciente=False),
+                    separators=(",", ":"),
+                    ensure_ascii=False
+                ).encode("utf-8") + b"\n"
+                lineas.append(linea)
+                entradas.append((ingreso.id, offset, len(linea)))
+                offset += len(linea)
+            if not lineas:
+                return 0
+
+            with open(ruta_datos, "ab") as archivo:
+                archivo.write(b"".join(lineas))
+                archivo.flush()
+                os.fsync(archivo.fileno())
+
+            with open(self._ruta(self._segmento_actual, EXTENSION_INDICE), "ab") as archivo:
+                archivo.write("".join(f"{i} {o} {l}\n" for i, o, l in entradas).encode("ascii"))
+                archivo.flush()
+                os.fsync(archivo.fileno())
+
+            for ingreso_id, inicio, largo in entradas:
+                self._indice[ingreso_id] = (self._segmento_actual, inicio, largo)
+            return len(entradas)
+
+    def contiene(self, ingreso_id: str) -> bool:
+        """Indica si el ingreso está archivado"""
+        return ingreso_id in self._indice
+
+    def obtener(self, ingreso_id: str, pacientes_repo: PacientesRepo) -> Optional[Ingreso]:
+        """
+        Lee un ingreso archivado desde disco.
+
+        Args:
+            ingreso_id: ID del ingreso
+            pacientes_repo: Repositorio del que se toma el paciente del ingreso
+
+        Returns:
+            El ingreso reconstruido o None si no está archivado
+        """
+        entrada = self._indice.get(ingreso_id)
+        if entrada is None:
+            return None
+
+        numero, offset, largo = entrada
+        datos = json.loads(os.pread(self._lector(numero), largo, offset))
+        self.lecturas += 1
+        return ingreso_desde_dict(datos, pacientes_repo.obtener_paciente_por_cuil(datos["cuil"]))
+
+    def estadisticas(self) -> Dict[str, int]:
+        """Cantidad de ingresos archivados, segmentos y bytes en disco"""
+        segmentos = self._numeros_de_segmento()
+        return {
+            "ingresos_archivados": len(self._indice),
+            "segmentos": len(segmentos),
+            "bytes": sum(self._ruta(n, EXTENSION_DATOS).stat().st_size for n in segmentos),
+            "lecturas": self.lecturas,
+        }
+
+    def cerrar(self) -> None:
+        """Cierra los descriptores de lectura"""
+        with self._lock:
+            for descriptor in self._lectores.values():
+                os.close(descriptor)
+            self._lectores.clear()
+
+    def __len__(self) -> int:
+        return len(self._indice)
+
+    def _lector(self, numero: int) -> int:
+        """Descriptor de lectura del segmento (se abre una sola vez)"""
+        descriptor = self._lectores.get(numero)
+        if descriptor is None:
+            with self._lock:
+                descriptor = self._lectores.get(numero)
+                if descriptor is None:
+                    descriptor = os.open(self._ruta(numero, EXTENSION_DATOS), os.O_RDONLY)
+                    self._lectores[numero] = descriptor
+        return descriptor
+
+    def _cargar_indice(self, numero: int) -> None:
+        """
+        Carga el índice de un segmento.
+
+        Se descartan las entradas que apuntan más allá del final de los datos
+        y una última línea incompleta (corte durante una escritura).
+        """
+        ruta_datos = self._ruta(numero, EXTENSION_DATOS)
+        ruta_indice = self._ruta(numero, EXTENSION_INDICE)
+        if not ruta_indice.exists():
+            return
+
+        tamanio = ruta_datos.stat().st_size if ruta_datos.exists() else 0
+        with open(ruta_indice, "r+b") as archivo:
+            completo = 0
+            for linea in archivo:
+                if not linea.endswith(b"\n"):
+                    # Truncar para que la próxima entrada empiece en una línea nueva
+                    archivo.truncate(completo)
+                    break
+                completo += len(linea)
+                ingreso_id, offset, largo = linea.split()
+                offset, largo = int(offset), int(largo)
+                if offset + largo <= tamanio:
+                    self._indice[ingreso_id.decode("ascii")] = (numero, offset, largo)
+
+    def _numeros_de_segmento(self) -> List[int]:
+        """Números de los segmentos existentes, en orden"""
+        return sorted(
+            int(ruta.name[len(PREFIJO):-len(EXTENSION_DATOS)])
+            for ruta in self.directorio.glob(f"{PREFIJO}*{EXTENSION_DATOS}")
+        )
+
+    def _ruta(self, numero: int, extension: str) -> Path:
+        """Ruta del archivo de datos o de índice de un segmento"""
+        return self.directorio / f"{PREFIJO}{numero:06d}{extension}"
@@ -0,0 +1,244 @@
+"""Conversión de entidades del dominio a diccionarios planos y viceversa"""
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from backend.app.models.models import (
+    Afiliado,
+    Atencion,
+    Doctor,
+    Enfermera,
+    EstadoIngreso,
+    FrecuenciaCardiaca,
+    FrecuenciaRespiratoria,
+    Ingreso,
+    NivelEmergencia,
+    Paciente,
+    Temperatura,
+    TensionArterial,
+    Usuario,
+)
+from backend.app.models.registro_canonico import registro_canonico
+
+
+def paciente_a_dict(paciente: Paciente) -> Dict[str, Any]:
+    """
+    Convierte un paciente (con domicilio y afiliación) a diccionario.
+
+    Args:
+        paciente: Paciente a convertir
+
+    Returns:
+        Diccionario con los datos del paciente
+    """
+    domicilio = paciente.domicilio
+    afiliado = paciente.afiliado
+    return {
+        "cuil": paciente.cuil,
+        "nombre": paciente.nombre,
+        "apellido": paciente.apellido,
+        "email": paciente.email,
+        "domicilio": {
+            "calle": domicilio.calle,
+            "numero": domicilio.numero,
+            "localidad": domicilio.localidad,
+            "ciudad": domicilio.ciudad,
+            "provincia": domicilio.provincia,
+            "pais": domicilio.pais,
+        },
+        "afiliado": {
+            "obra_social": afiliado.obra_social.nombre,
+            "numero_afiliado": afiliado.numero_afiliado,
+        } if afiliado else None,
+    }
+
+
+def paciente_desde_dict(datos: Dict[str, Any]) -> Paciente:
+    """
+    Reconstruye un paciente a partir de un diccionario, con la obra social y
+    los textos del domicilio del registro canónico.
+
+    Args:
+        datos: Diccionario generado por paciente_a_dict
+
+    Returns:
+        Paciente reconstruido
+    """
+    afiliado = None
+    if datos.get("afiliado"):
+        afiliado = Afiliado(
+            registro_canonico.obra_social(datos["afiliado"]["obra_social"]),
+            datos["afiliado"]["numero_afiliado"]
+        )
+    return Paciente(
+        nombre=datos["nombre"],
+        apellido=datos["apellido"],
+        cuil=datos["cuil"],
+        domicilio=registro_canonico.domicilio(**datos["domicilio"]),
+        afiliado=afiliado,
+        email=datos.get("email", "")
+    )
+
+
+def personal_a_dict(persona) -> Dict[str, Any]:
+    """
+    Convierte una enfermera o un doctor a diccionario.
+
+    Args:
+        persona: Enfermera o Doctor
+
+    Returns:
+        Diccionario con los datos del personal
+    """
+    return {
+        "cuil": persona.cuil,
+        "nombre": persona.nombre,
+        "apellido": persona.apellido,
+        "matricula": persona.matricula,
+        "email": persona.email,
+    }
+
+
+def enfermera_desde_dict(datos: Dict[str, Any]) -> Enfermera:
+    """Reconstruye una enfermera a partir de un diccionario"""
+    return Enfermera(
+        nombre=datos["nombre"],
+        apellido=datos["apellido"],
+        matricula=datos["matricula"],
+        cuil=datos["cuil"],
+        email=datos["email"]
+    )
+
+
+def doctor_desde_dict(datos: Dict[str, Any]) -> Doctor:
+    """Reconstruye un doctor a partir de un diccionario"""
+    return Doctor(
+        cuil=datos["cuil"],
+        nombre=datos["nombre"],
+        apellido=datos["apellido"],
+        matricula=datos["matricula"],
+        email=datos["email"]
+    )
+
+
+def ingreso_a_dict(ingreso: Ingreso, incluir_paciente: bool = True) -> Dict[str, Any]:
+    """
+    Convierte un ingreso a diccionario, incluyendo su estado, el doctor
+    asignado y la atención si existen.
+
+    Args:
+        ingreso: Ingreso a convertir
+        incluir_paciente: Si es False solo se guarda el CUIL del paciente
+
+    Returns:
+        Diccionario con los datos del ingreso
+    """
+    atencion = ingreso.atencion
+    return {
+        "id": ingreso.id,
+        "cuil": ingreso.cuil_paciente,
+        "paciente": paciente_a_dict(ingreso.paciente) if incluir_paciente else None,
+        "enfermera": personal_a_dict(ingreso.enfermera),
+        "nivel": ingreso.nivel_emergencia.name,
+        "descripcion": ingreso.descripcion,
+        "signos": [
+            ingreso.temperatura.valor,
+            ingreso.frecuencia_cardiaca.valor,
+            ingreso.frecuencia_respiratoria.valor,
+            ingreso.tension_arterial.frecuencia_sistolica,
+            ingreso.tension_arterial.frecuencia_diastolica,
+        ],
+        "fecha": ingreso.fecha_ingreso.isoformat(),
+        "estado": ingreso.estado_ingreso.value,
+        "doctor": personal_a_dict(ingreso.doctor_asignado) if ingreso.doctor_asignado else None,
+        "atencion": atencion_a_dict(atencion) if atencion else None,
+    }
+
+
+def atencion_a_dict(atencion: Atencion) -> Dict[str, Any]:
+    """
+    Convierte una atención a diccionario (sin el ingreso, que la contiene).
+
+    Args:
+        atencion: Atención a convertir
+
+    Returns:
+        Diccionario con el doctor, el informe y la fecha
+    """
+    return {
+        "doctor": personal_a_dict(atencion.doctor),
+        "informe": atencion.informe,
+        "fecha": atencion.fecha.isoformat(),
+    }
+
+
+def ingreso_desde_dict(datos: Dict[str, Any], paciente: Optional[Paciente] = None) -> Ingreso:
+    """
+    Reconstruye un ingreso a partir de un diccionario.
+
+    Args:
+        datos: Diccionario generado por ingreso_a_dict
+        paciente: Paciente ya existente a asociar; si es None se usa el
+            paciente guardado en el diccionario
+
+    Returns:
+        Ingreso reconstruido con su estado, doctor y atención
+
+    Raises:
+        ValueError: Si no se indica paciente y el diccionario no lo incluye
+    """
+    if paciente is None:
+        if not datos.get("paciente"):
+            raise ValueError(f"El ingreso {datos['id']} no incluye los datos del paciente")
+        paciente = paciente_desde_dict(datos["paciente"])
+
+    temperatura, cardiaca, respiratoria, sistolica, diastolica = datos["signos"]
+    ingreso = Ingreso(
+        id_uuid=datos["id"],
+        paciente=paciente,
+        enfermera=enfermera_desde_dict(datos["enfermera"]),
+        nivel_emergencia=NivelEmergencia[datos["nivel"]],
+        descripcion=datos["descripcion"],
+        temperatura=Temperatura.compartido(temperatura),
+        frecuencia_cardiaca=FrecuenciaCardiaca.compartido(cardiaca),
+        frecuencia_respiratoria=FrecuenciaRespiratoria.compartido(respiratoria),
+        tension_arterial=TensionArterial.compartido(sistolica, diastolica),
+        fecha_ingreso=datetime.fromisoformat(datos["fecha"])
+    )
+    ingreso.estado_ingreso = EstadoIngreso(datos.get("estado", EstadoIngreso.PENDIENTE.value))
+    if datos.get("doctor"):
+        ingreso.doctor_asignado = doctor_desde_dict(datos["doctor"])
+    if datos.get("atencion"):
+        ingreso.atencion = Atencion(
+            doctor=doctor_desde_dict(datos["atencion"]["doctor"]),
+            informe=datos["atencion"]["informe"],
+            ingreso=ingreso,
+            fecha=datetime.fromisoformat(datos["atencion"]["fecha"]) if datos["atencion"].get("fecha") else None
+        )
+    return ingreso
+
+
+def usuario_a_dict(usuario: Usuario) -> Dict[str, Any]:
+    """
+    Convierte un usuario a diccionario (solo se guarda el hash de la contraseña).
+
+    Args:
+        usuario: Usuario a convertir
+
+    Returns:
+        Diccionario con los datos del usuario
+    """
+    return {
+        "email": usuario.email,
+        "password_hash": usuario.password_hash,
+        "rol": usuario.rol.value if usuario.rol else None,
+        "matricula": usuario.matricula,
+        "id": usuario.id,
+    }
+
+
+def usuario_desde_dict(datos: Dict[str, Any]) -> Usuario:
+    """Reconstruye un usuario a partir de un diccionario"""
+    usuario = Usuario.desde_hash(datos["email"], datos["password_hash"], datos.get("rol"))
+    usuario.matricula = datos.get("matricula")
+    usuario.id = datos.get("id")
+    return usuario
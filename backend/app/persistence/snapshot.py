@@ -0,0 +1,321 @@
+"""
+Snapshots en segundo plano del estado en memoria (repositorios y guardia).
+
+`GestorSnapshots.guardar_en_segundo_plano` hace un fork del proceso mientras
+tiene tomados los locks del servicio: el hijo recibe una copia copy-on-write
+del estado en ese instante, la serializa y la escribe a disco, mientras el
+padre libera los locks enseguida y sigue atendiendo requests (al estilo de
+un BGSAVE). En plataformas sin `os.fork` la imagen se arma en el proceso con
+los locks tomados y solo la escritura a disco pasa a segundo plano.
+
+La imagen registra el último LSN del WAL que incluye, así que al iniciar se
+carga el snapshot más reciente y luego se reproduce el WAL desde ese LSN.
+Una vez escrito el snapshot, el WAL descarta los registros hasta ese LSN:
+el arranque no vuelve a reproducir (ni a reconstruir en memoria) el
+historial ya incluido en el snapshot, como los ingresos archivados.
+
+El fork ocurre mientras corren otros hilos (el escritor del WAL, el
+archivado, los snapshots periódicos, el threadpool de uvicorn). El hijo solo
+hereda el hilo que hizo el fork, y cualquier lock que otro hilo tuviera
+tomado en ese instante queda tomado para siempre en el hijo. Por eso el hijo
+no toma ningún lock: lee el estado con `capturar_imagen` (que solo recorre
+diccionarios y listas), lo serializa con pickle, escribe un archivo nuevo y
+termina con `os._exit`. No usa el WAL, el archivo de ingresos, el logging ni
+ningún método del servicio que tome sus locks (los del servicio, además,
+quedan tomados en el hijo porque el fork se hace dentro de bloquear_estado).
+"""
+import os
+import pickle
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.app.interfaces.pacientes_repo import PacientesRepo
+from backend.app.models.models import Ingreso
+from backend.app.persistence.serializacion import (
+    ingreso_a_dict,
+    ingreso_desde_dict,
+    paciente_a_dict,
+    paciente_desde_dict,
+    usuario_a_dict,
+    usuario_desde_dict,
+)
+from backend.app.persistence.wal import WriteAheadLog
+from backend.app.services.auth_service import InMemoryUserRepo
+from backend.app.services.servicio_emergencias import ServicioEmergencias
+
+
+FORMATO_IMAGEN = 1
+PREFIJO = "snapshot-"
+EXTENSION = ".pickle"
+
+
+def capturar_imagen(
+    user_repo: InMemoryUserRepo,
+    pacientes_repo: PacientesRepo,
+    servicio: ServicioEmergencias,
+    lsn: int
+) -> Dict[str, Any]:
+    """
+    Arma la imagen del estado como estructuras planas.
+
+    No toma locks: el llamador debe garantizar que el estado no cambie
+    (bloquear_estado() tomado o proceso hijo de un fork). Solo usa métodos
+    de los repositorios y del servicio que no toman locks, así que es seguro
+    llamarla en el hijo de un fork.
+
+    Args:
+        user_repo: Repositorio de usuarios
+        pacientes_repo: Repositorio de pacientes
+        servicio: Servicio de emergencias
+        lsn: Último LSN del WAL incluido en la imagen
+
+    Returns:
+        Imagen serializable del estado
+    """
+    return {
+        "formato": FORMATO_IMAGEN,
+        "lsn": lsn,
+        "creado": datetime.now().isoformat(),
+        "usuarios": [usuario_a_dict(u) for u in user_repo.get_all()],
+        "pacientes": [paciente_a_dict(p) for p in pacientes_repo.obtener_todos()],
+        "ingresos": [ingreso_a_dict(i, incluir_paciente=False) for i in servicio.exportar_ingresos()],
+    }
+
+
+def escribir_imagen(imagen: Dict[str, Any], directorio: Path) -> Path:
+    """
+    Escribe la imagen de forma atómica (archivo temporal + fsync + rename).
+
+    Args:
+        imagen: Imagen a escribir
+        directorio: Directorio de snapshots
+
+    Returns:
+        Ruta del snapshot escrito
+    """
+    nombre = f"{PREFIJO}{datetime.now().strftime('%Y%m%dT%H%M%S%f')}-{imagen['lsn']:012d}{EXTENSION}"
+    destino = directorio / nombre
+    temporal = directorio / f".{nombre}.{os.getpid()}.tmp"
+    with open(temporal, "wb") as archivo:
+        pickle.dump(imagen, archivo, protocol=pickle.HIGHEST_PROTOCOL)
+        archivo.flush()
+        os.fsync(archivo.fileno())
+    os.replace(temporal, destino)
+    return destino
+
+
+def listar_snapshots(directorio: str) -> List[Path]:
+    """Lista los snapshots del directorio, del más antiguo al más reciente"""
+    ruta = Path(directorio)
+    if not ruta.exists():
+        return []
+    return sorted(ruta.glob(f"{PREFIJO}*{EXTENSION}"))
+
+
+def cargar_ultima_imagen(directorio: str) -> Optional[Dict[str, Any]]:
+    """
+    Carga el snapshot más reciente del directorio.
+
+    Args:
+        directorio: Directorio de snapshots
+
+    Returns:
+        La imagen o None si no hay snapshots
+    """
+    snapshots = listar_snapshots(directorio)
+    if not snapshots:
+        return None
+    with open(snapshots[-1], "rb") as archivo:
+        return pickle.load(archivo)
+
+
+def restaurar_imagen(
+    imagen: Dict[str, Any],
+    user_repo: InMemoryUserRepo,
+    pacientes_repo: PacientesRepo
+) -> Tuple[List[Ingreso], int]:
+    """
+    Restaura usuarios y pacientes en sus repositorios y reconstruye los ingresos.
+
+    Args:
+        imagen: Imagen cargada con cargar_ultima_imagen
+        user_repo: Repositorio de usuarios a completar
+        pacientes_repo: Repositorio de pacientes a completar
+
+    Returns:
+        Tupla (ingresos, lsn): ingresos listos para ServicioEmergencias.cargar_ingresos
+        y LSN desde el que debe continuar el replay del WAL
+
+    Raises:
+        ValueError: Si el formato de la imagen no es compatible
+    """
+    if imagen.get("formato") != FORMATO_IMAGEN:
+        raise ValueError(f"Formato de snapshot no soportado: {imagen.get('formato')}")
+
+    for datos in imagen["usuarios"]:
+        user_repo.save(usuario_desde_dict(datos))
+    for datos in imagen["pacientes"]:
+        pacientes_repo.guardar_paciente(paciente_desde_dict(datos))
+
+    ingresos = []
+    for datos in imagen["ingresos"]:
+        paciente = pacientes_repo.obtener_paciente_por_cuil(datos["cuil"])
+        ingresos.append(ingreso_desde_dict(datos, paciente))
+    return ingresos, imagen["lsn"]
+
+
+class GestorSnapshots:
+    """Genera snapshots en segundo plano y conserva los más recientes"""
+
+    def __init__(
+        self,
+        directorio: str,
+        user_repo: InMemoryUserRepo,
+        pacientes_repo: PacientesRepo,
+        servicio: ServicioEmergencias,
+        wal: Optional[WriteAheadLog] = None,
+        conservar: int = 2
+    ):
+        self.directorio = Path(directorio)
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        self.user_repo = user_repo
+        self.pacientes_repo = pacientes_repo
+        self.servicio = servicio
+        self.wal = wal
+        self.conservar = conservar
+
+        self._lock = threading.Lock()
+        self._en_curso = False
+        self._detener = threading.Event()
+        self._hilo_periodico: Optional[threading.Thread] = None
+
+        # Métricas del último snapshot
+        self.snapshots_realizados = 0
+        self.ultimo_resultado: Optional[Dict[str, Any]] = None
+
+    def guardar_en_segundo_plano(self) -> bool:
+        """
+        Inicia un snapshot en segundo plano.
+
+        Returns:
+            True si se inició, False si ya había uno en curso
+        """
+        with self._lock:
+            if self._en_curso:
+                return False
+            self._en_curso = True
+
+        inicio = time.perf_counter()
+        try:
+            with self.servicio.bloquear_estado():
+                lsn = self.wal.ultimo_lsn if self.wal else 0
+                if hasattr(os, "fork"):
+                    pid = os.fork()
+                    if pid == 0:
+                        self._escribir_en_hijo(lsn)
+                    imagen = None
+                else:
+                    imagen = capturar_imagen(self.user_repo, self.pacientes_repo, self.servicio, lsn)
+            bloqueo_ms = (time.perf_counter() - inicio) * 1000
+        except BaseException:
+            with self._lock:
+                self._en_curso = False
+            raise
+
+        if imagen is None:
+            objetivo, argumentos = self._esperar_hijo, (pid, lsn, inicio, bloqueo_ms)
+        else:
+            objetivo, argumentos = self._escribir_en_hilo, (imagen, inicio, bloqueo_ms)
+        threading.Thread(target=objetivo, args=argumentos, name="snapshot", daemon=True).start()
+        return True
+
+    def iniciar_periodico(self, intervalo_segundos: float) -> None:
+        """
+        Lanza un hilo que genera un snapshot cada `intervalo_segundos`.
+
+        Args:
+            intervalo_segundos: Período entre snapshots
+        """
+        def ciclo():
+            while not self._detener.wait(intervalo_segundos):
+                self.guardar_en_segundo_plano()
+
+        self._hilo_periodico = threading.Thread(target=ciclo, name="snapshot-periodico", daemon=True)
+        self._hilo_periodico.start()
+
+    def detener(self) -> None:
+        """Detiene los snapshots periódicos"""
+        self._detener.set()
+
+    @property
+    def en_curso(self) -> bool:
+        """Indica si hay un snapshot en curso"""
+        return self._en_curso
+
+    def _escribir_en_hijo(self, lsn: int) -> None:
+        """
+        Cuerpo del proceso hijo: serializa la copia del estado y termina.
+
+        No debe tomar locks (ver el docstring del módulo): los que tenían
+        otros hilos del padre al hacer el fork nunca se liberan en el hijo.
+        """
+        codigo = 0
+        try:
+            imagen = capturar_imagen(self.user_repo, self.pacientes_repo, self.servicio, lsn)
+            escribir_imagen(imagen, self.directorio)
+        except BaseException:
+            codigo = 1
+        finally:
+            # Salir sin ejecutar handlers heredados del padre (uvicorn, atexit, etc.)
+            os._exit(codigo)
+
+    def _esperar_hijo(self, pid: int, lsn: int, inicio: float, bloqueo_ms: float) -> None:
+        """Espera al proceso hijo y registra el resultado"""
+        _, estado = os.waitpid(pid, 0)
+        exito = os.waitstatus_to_exitcode(estado) == 0
+        ruta = next((s for s in reversed(listar_snapshots(str(self.directorio)))
+                     if s.stem.endswith(f"-{lsn:012d}")), None) if exito else None
+        self._finalizar(exito, ruta, lsn, inicio, bloqueo_ms)
+
+    def _escribir_en_hilo(self, imagen: Dict[str, Any], inicio: float, bloqueo_ms: float) -> None:
+        """Escritura a disco en un hilo (plataformas sin fork)"""
+        try:
+            ruta = escribir_imagen(imagen, self.directorio)
+            self._finalizar(True, ruta, imagen["lsn"], inicio, bloqueo_ms)
+        except OSError:
+            self._finalizar(False, None, imagen["lsn"], inicio, bloqueo_ms)
+
+    def _finalizar(
+        self,
+        exito: bool,
+        ruta: Optional[Path],
+        lsn: int,
+        inicio: float,
+        bloqueo_ms: float
+    ) -> None:
+        """Registra métricas, compacta el WAL hasta el LSN del snapshot y elimina los snapshots más antiguos"""
+        descartados = 0
+        if exito:
+            try:
+                descartados = self.wal.compactar(lsn) if self.wal is not None else 0
+            except OSError:
+                # El snapshot es válido igual: el WAL conserva los registros
+                descartados = 0
+            for viejo in listar_snapshots(str(self.directorio))[:-self.conservar]:
+                viejo.unlink(missing_ok=True)
+        with self._lock:
+            self.ultimo_resultado = {
+                "exito": exito,
+                "ruta": str(ruta) if ruta else None,
+                "duracion_ms": round((time.perf_counter() - inicio) * 1000, 2),
+                "bloqueo_ms": round(bloqueo_ms, 2),
+                "registros_wal_descartados": descartados,
+                "fork": hasattr(os, "fork"),
+                "finalizado": datetime.now().isoformat(),
+            }
+            if exito:
+                self.snapshots_realizados += 1
+            self._en_curso = False
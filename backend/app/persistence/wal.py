@@ -0,0 +1,426 @@
+"""
+Write-ahead log (WAL) del estado de la guardia.
+
+Cada admisión, reclamo, atención y archivado se registra como una línea JSON
+compacta en un archivo append-only. Un único hilo escritor vuelca los registros
+acumulados y hace un solo fsync por lote (group commit): mientras un fsync
+está en curso, los registros nuevos se acumulan y viajan juntos en el
+siguiente, así que el costo del fsync se reparte entre todas las
+operaciones concurrentes.
+
+Al iniciar, `reproducir` reconstruye los ingresos a partir del log. Los
+registros ya incluidos en un snapshot se descartan con `compactar`, así que el
+log solo crece con las operaciones posteriores al último snapshot.
+"""
+import json
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from backend.app.interfaces.pacientes_repo import PacientesRepo
+from backend.app.models.models import Atencion, Doctor, EstadoIngreso, Ingreso, Paciente
+from backend.app.persistence.serializacion import (
+    doctor_desde_dict,
+    ingreso_a_dict,
+    ingreso_desde_dict,
+    paciente_a_dict,
+    paciente_desde_dict,
+    personal_a_dict,
+)
+
+
+OP_ADMISION = "admision"
+OP_RECLAMO = "reclamo"
+OP_ATENCION = "atencion"
+OP_ARCHIVO = "archivo"
+
+# Tamaño del bloque que se lee del final del archivo para encontrar el último LSN
+_BLOQUE_COLA = 64 * 1024
+
+
+class WriteAheadLog:
+    """Log append-only con group commit"""
+
+    def __init__(
+        self,
+        ruta: str,
+        esperar_fsync: bool = True,
+        demora_commit_ms: float = 0,
+        lsn_inicial: int = 0
+    ):
+        """
+        Abre (o crea) el log.
+
+        Args:
+            ruta: Ruta del archivo del log
+            esperar_fsync: Si es True, `confirmar` bloquea hasta que el registro
+                esté en disco; si es False la durabilidad es asíncrona
+            demora_commit_ms: Espera adicional antes de cada fsync para juntar
+                lotes más grandes (0 = solo se agrupa lo que llega durante el fsync anterior)
+            lsn_inicial: LSN mínimo desde el que continuar la secuencia (por ejemplo,
+                el LSN de un snapshot si el archivo del log se perdió)
+        """
+        self.ruta = Path(ruta)
+        self.ruta.parent.mkdir(parents=True, exist_ok=True)
+        self.esperar_fsync = esperar_fsync
+        self._demora_commit = demora_commit_ms / 1000
+
+        self._ultimo_lsn = max(self._recuperar_ultimo_lsn(), lsn_inicial)
+        self._lsn_durable = self._ultimo_lsn
+        self._archivo = open(self.ruta, "ab")
+
+        self._cond = threading.Condition()
+        # Protege el archivo: el hilo escritor y `compactar` no lo usan a la vez
+        self._lock_archivo = threading.Lock()
+        self._buffer: List[bytes] = []
+        self._cerrado = False
+        self._error: Optional[BaseException] = None
+
+        # Métricas de group commit
+        self.registros_escritos = 0
+        self.fsyncs = 0
+        self.compactaciones = 0
+
+        self._hilo = threading.Thread(target=self._escritor, name="wal-group-commit", daemon=True)
+        self._hilo.start()
+
+    @property
+    def ultimo_lsn(self) -> int:
+        """Número de secuencia del último registro aceptado"""
+        return self._ultimo_lsn
+
+    @property
+    def lsn_durable(self) -> int:
+        """Número de secuencia del último registro sincronizado a disco"""
+        return self._lsn_durable
+
+    def registrar(self, registro: Dict[str, Any]) -> int:
+        """
+        Agrega un registro al log sin esperar a que llegue a disco.
+
+        Args:
+            registro: Registro a agregar (se le asigna el campo `lsn`)
+
+        Returns:
+            LSN asignado al registro
+
+        Raises:
+            RuntimeError: Si el log está cerrado o falló una escritura anterior
+        """
+        with self._cond:
+            if self._cerrado:
+                raise RuntimeError("El WAL está cerrado")
+            if self._error is not None:
+                raise RuntimeError(f"El WAL falló al escribir en disco: {self._error}")
+            self._ultimo_lsn += 1
+            registro["lsn"] = self._ultimo_lsn
+            linea = json.dumps(registro, separators=(",", ":"), ensure_ascii=False)
+            self._buffer.append(linea.encode("utf-8") + b"\n")
+            self._cond.notify_all()
+            return self._ultimo_lsn
+
+    def esperar(self, lsn: int, timeout: Optional[float] = None) -> bool:
+        """
+        Bloquea hasta que el registro `lsn` esté sincronizado a disco.
+
+        Args:
+            lsn: LSN a esperar
+            timeout: Tiempo máximo de espera en segundos
+
+        Returns:
+            True si el registro es durable, False si venció el timeout
+
+        Raises:
+            RuntimeError: Si el hilo escritor falló
+        """
+        with self._cond:
+            durable = self._cond.wait_for(
+                lambda: self._lsn_durable >= lsn or self._error is not None,
+                timeout
+            )
+            if self._error is not None:
+                raise RuntimeError(f"El WAL falló al escribir en disco: {self._error}")
+            return durable
+
+    def confirmar(self, lsn: int) -> None:
+        """
+        Espera la durabilidad del registro si el log está en modo síncrono.
+
+        Args:
+            lsn: LSN a confirmar
+        """
+        if self.esperar_fsync:
+            self.esperar(lsn)
+
+    def cerrar(self) -> None:
+        """Vuelca los registros pendientes, sincroniza y cierra el archivo"""
+        with self._cond:
+            if self._cerrado:
+                return
+            self._cerrado = True
+            self._cond.notify_all()
+        self._hilo.join()
+        with self._lock_archivo:
+            self._archivo.close()
+
+    def compactar(self, hasta_lsn: int) -> int:
+        """
+        Descarta los registros con LSN menor o igual a `hasta_lsn` (por ejemplo,
+        los que ya incluye un snapshot escrito en disco).
+
+        Los registros posteriores se copian a un archivo nuevo que reemplaza al
+        log con un rename atómico. Mientras tanto el hilo escritor no escribe,
+        pero las operaciones siguen registrándose en el buffer.
+
+        Args:
+            hasta_lsn: Último LSN que ya no hace falta reproducir
+
+        Returns:
+            Cantidad de registros descartados
+        """
+        with self._lock_archivo:
+            if self._archivo.closed:
+                return 0
+            descartados = 0
+            temporal = self.ruta.with_name(f".{self.ruta.name}.compactando")
+            with open(self.ruta, "rb") as origen:
+                while True:
+                    inicio = origen.tell()
+                    linea = origen.readline()
+                    if not linea.endswith(b"\n") or json.loads(linea)["lsn"] > hasta_lsn:
+                        origen.seek(inicio)
+                        break
+                    descartados += 1
+                if descartados == 0:
+                    return 0
+                with open(temporal, "wb") as destino:
+                    shutil.copyfileobj(origen, destino)
+                    destino.flush()
+                    os.fsync(destino.fileno())
+            self._archivo.close()
+            try:
+                os.replace(temporal, self.ruta)
+                _sincronizar_directorio(self.ruta.parent)
+            finally:
+                self._archivo = open(self.ruta, "ab")
+            self.compactaciones += 1
+            return descartados
+
+    def _escritor(self) -> None:
+        """Hilo escritor: vuelca lotes de registros con un fsync por lote"""
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._buffer or self._cerrado)
+                if not self._buffer and self._cerrado:
+                    return
+
+            if self._demora_commit:
+                time.sleep(self._demora_commit)
+
+            with self._cond:
+                lote, self._buffer = self._buffer, []
+                lsn_lote = self._ultimo_lsn
+
+            try:
+                with self._lock_archivo:
+                    self._archivo.write(b"".join(lote))
+                    self._archivo.flush()
+                    os.fsync(self._archivo.fileno())
+            except OSError as e:
+                with self._cond:
+                    self._error = e
+                    self._cond.notify_all()
+                return
+
+            with self._cond:
+                self._lsn_durable = lsn_lote
+                self.registros_escritos += len(lote)
+                self.fsyncs += 1
+                self._cond.notify_all()
+
+    def _recuperar_ultimo_lsn(self) -> int:
+        """
+        Obtiene el último LSN del archivo existente.
+
+        Si la última línea quedó incompleta (corte durante una escritura) se
+        trunca el archivo hasta el último registro completo.
+        """
+        if not self.ruta.exists():
+            return 0
+
+        with open(self.ruta, "r+b") as archivo:
+            tamanio = archivo.seek(0, os.SEEK_END)
+            inicio = max(0, tamanio - _BLOQUE_COLA)
+            archivo.seek(inicio)
+            cola = archivo.read()
+
+            fin = cola.rfind(b"\n")
+            if fin + 1 != len(cola):
+                # Registro incompleto al final del archivo
+                archivo.truncate(inicio + fin + 1)
+            if fin < 0:
+                return 0
+
+            anterior = cola.rfind(b"\n", 0, fin)
+            return json.loads(cola[anterior + 1:fin])["lsn"]
+
+
+def _sincronizar_directorio(directorio: Path) -> None:
+    """Hace durable un rename dentro del directorio (no disponible en Windows)"""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    descriptor = os.open(directorio, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+# ============= Registros =============
+
+def registro_admision(ingreso: Ingreso, paciente_nuevo: Optional[Paciente] = None) -> Dict[str, Any]:
+    """
+    Crea el registro de una admisión.
+
+    Los datos completos del paciente solo se guardan cuando la admisión lo
+    dio de alta; en el resto de los casos alcanza con el CUIL.
+
+    Args:
+        ingreso: Ingreso admitido
+        paciente_nuevo: Paciente creado durante la admisión, si corresponde
+
+    Returns:
+        Registro listo para `WriteAheadLog.registrar`
+    """
+    datos = ingreso_a_dict(ingreso, incluir_paciente=False)
+    for clave in ("paciente", "estado", "doctor", "atencion"):
+        del datos[clave]
+    registro = {"op": OP_ADMISION, "ingreso": datos}
+    if paciente_nuevo is not None:
+        registro["paciente"] = paciente_a_dict(paciente_nuevo)
+    return registro
+
+
+def registro_reclamo(ingreso_id: str, doctor: Optional[Doctor]) -> Dict[str, Any]:
+    """Crea el registro del reclamo de un ingreso por un doctor"""
+    return {
+        "op": OP_RECLAMO,
+        "id": ingreso_id,
+        "doctor": personal_a_dict(doctor) if doctor else None,
+    }
+
+
+def registro_atencion(ingreso_id: str, atencion: Atencion) -> Dict[str, Any]:
+    """Crea el registro de la atención que finaliza un ingreso"""
+    return {
+        "op": OP_ATENCION,
+        "id": ingreso_id,
+        "doctor": personal_a_dict(atencion.doctor),
+        "informe": atencion.informe,
+        "fecha": atencion.fecha.isoformat(),
+    }
+
+
+def registro_archivo(ingreso_ids: List[str]) -> Dict[str, Any]:
+    """Crea el registro de los ingresos finalizados que se movieron al archivo en disco"""
+    return {"op": OP_ARCHIVO, "ids": ingreso_ids}
+
+
+# ============= Lectura y replay =============
+
+def leer_registros(ruta: str, desde_lsn: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    Lee los registros del log en orden.
+
+    Args:
+        ruta: Ruta del archivo del log
+        desde_lsn: Solo se retornan registros con LSN mayor a este valor
+
+    Yields:
+        Registros del log; una última línea incompleta se ignora
+    """
+    if not Path(ruta).exists():
+        return
+
+    with open(ruta, "rb") as archivo:
+        for linea in archivo:
+            if not linea.endswith(b"\n"):
+                break
+            registro = json.loads(linea)
+            if registro["lsn"] > desde_lsn:
+                yield registro
+
+
+def reproducir(
+    registros: Iterable[Dict[str, Any]],
+    pacientes_repo: PacientesRepo,
+    ingresos_iniciales: Iterable[Ingreso] = ()
+) -> List[Ingreso]:
+    """
+    Reconstruye los ingresos aplicando los registros del log.
+
+    Los pacientes dados de alta en las admisiones se guardan en el repositorio.
+    Los ingresos archivados se descartan en cuanto aparece su registro de
+    archivado, así que no quedan en memoria hasta el final del replay.
+
+    Args:
+        registros: Registros del log en orden de LSN
+        pacientes_repo: Repositorio donde se restauran los pacientes
+        ingresos_iniciales: Ingresos ya restaurados (por ejemplo, desde un
+            snapshot) sobre los que se aplican los registros
+
+    Returns:
+        Ingresos ordenados por su última transición: dentro de cada estado
+        quedan en el mismo orden en que se admitieron, reclamaron o finalizaron
+
+    Raises:
+        ValueError: Si el log referencia ingresos o pacientes inexistentes
+    """
+    ingresos: "OrderedDict[str, Ingreso]" = OrderedDict((i.id, i) for i in ingresos_iniciales)
+
+    for registro in registros:
+        op = registro["op"]
+
+        if op == OP_ADMISION:
+            datos = registro["ingreso"]
+            if registro.get("paciente"):
+                paciente = paciente_desde_dict(registro["paciente"])
+                pacientes_repo.guardar_paciente(paciente)
+            else:
+                paciente = pacientes_repo.obtener_paciente_por_cuil(datos["cuil"])
+                if paciente is None:
+                    raise ValueError(f"WAL inconsistente: paciente {datos['cuil']} inexistente (lsn {registro['lsn']})")
+            ingresos[datos["id"]] = ingreso_desde_dict(datos, paciente)
+            continue
+
+        if op == OP_ARCHIVO:
+            for ingreso_id in registro["ids"]:
+                ingresos.pop(ingreso_id, None)
+            continue
+
+        ingreso = ingresos.get(registro["id"])
+        if ingreso is None:
+            raise ValueError(f"WAL inconsistente: ingreso {registro['id']} inexistente (lsn {registro['lsn']})")
+
+        if op == OP_RECLAMO:
+            ingreso.estado_ingreso = EstadoIngreso.EN_PROCESO
+            ingreso.doctor_asignado = doctor_desde_dict(registro["doctor"]) if registro["doctor"] else None
+        elif op == OP_ATENCION:
+            ingreso.atencion = Atencion(
+                doctor=doctor_desde_dict(registro["doctor"]),
+                informe=registro["informe"],
+                ingreso=ingreso,
+                fecha=datetime.fromisoformat(registro["fecha"])
+            )
+            ingreso.estado_ingreso = EstadoIngreso.FINALIZADO
+        else:
+            raise ValueError(f"WAL inconsistente: operación desconocida '{op}' (lsn {registro['lsn']})")
+
+        ingresos.move_to_end(ingreso.id)
+
+    return list(ingresos.values())
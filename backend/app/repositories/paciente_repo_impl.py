@@ -1,5 +1,5 @@
 """Implementación en memoria del repositorio de pacientes"""
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from backend.app.interfaces.pacientes_repo import PacientesRepo
 from backend.app.models.models import Paciente
 
@@ -9,6 +9,8 @@ class InMemoryPacientesRepo(PacientesRepo):
     
     def __init__(self):
         self._pacientes: Dict[str, Paciente] = {}
+        # Versión de cada paciente: aumenta cada vez que se guarda
+        self._versiones: Dict[str, int] = {}
     
     def guardar_paciente(self, paciente: Paciente) -> None:
         """
@@ -18,6 +20,7 @@ class InMemoryPacientesRepo(PacientesRepo):
             paciente: Paciente a guardar
         """
         self._pacientes[paciente.cuil] = paciente
+        self._versiones[paciente.cuil] = self._versiones.get(paciente.cuil, 0) + 1
     
     def obtener_paciente_por_cuil(self, cuil: str) -> Optional[Paciente]:
         """
@@ -31,6 +34,18 @@ class InMemoryPacientesRepo(PacientesRepo):
         """
         return self._pacientes.get(cuil)
     
+    def obtener_version_paciente(self, cuil: str) -> Optional[int]:
+        """
+        Obtiene la versión de un paciente (aumenta cada vez que se guarda).
+        
+        Args:
+            cuil: CUIL del paciente
+            
+        Returns:
+            Versión del paciente o None si no existe
+        """
+        return self._versiones.get(cuil)
+    
     def existe_paciente(self, cuil: str) -> bool:
         """
         Verifica si existe un paciente con el CUIL dado.
@@ -42,4 +57,12 @@ class InMemoryPacientesRepo(PacientesRepo):
             True si existe, False en caso contrario
         """
         return cuil in self._pacientes
-
+    
+    def obtener_todos(self) -> List[Paciente]:
+        """
+        Obtiene todos los pacientes del repositorio.
+        
+        Returns:
+            Lista de pacientes
+        """
+        return list(self._pacientes.values())
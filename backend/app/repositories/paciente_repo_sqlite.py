@@ -0,0 +1,81 @@
+"""Implementación SQLite del repositorio de pacientes (compartido entre procesos)"""
+import json
+from typing import List, Optional
+from backend.app.interfaces.pacientes_repo import PacientesRepo
+from backend.app.models.models import Paciente
+from backend.app.persistence.serializacion import paciente_a_dict, paciente_desde_dict
+from backend.app.repositories.sqlite_db import BaseSQLite
+
+
+class SQLitePacientesRepo(PacientesRepo):
+    """Repositorio de pacientes sobre la base SQLite compartida"""
+
+    def __init__(self, db: BaseSQLite):
+        self.db = db
+
+    def guardar_paciente(self, paciente: Paciente) -> None:
+        """
+        Guarda (o reemplaza) un paciente en el repositorio.
+
+        Args:
+            paciente: Paciente a guardar
+        """
+        self.db.conexion().execute(
+            "INSERT INTO pacientes (cuil, datos) VALUES (?, ?) "
+            "ON CONFLICT (cuil) DO UPDATE SET datos = excluded.datos, version = version + 1",
+            (paciente.cuil, json.dumps(paciente_a_dict(paciente), ensure_ascii=False))
+        )
+
+    def obtener_paciente_por_cuil(self, cuil: str) -> Optional[Paciente]:
+        """
+        Obtiene un paciente por su CUIL.
+
+        Args:
+            cuil: CUIL del paciente
+
+        Returns:
+            Paciente si existe, None en caso contrario
+        """
+        fila = self.db.conexion().execute(
+            "SELECT datos FROM pacientes WHERE cuil = ?", (cuil,)
+        ).fetchone()
+        return paciente_desde_dict(json.loads(fila[0])) if fila else None
+
+    def obtener_version_paciente(self, cuil: str) -> Optional[int]:
+        """
+        Obtiene la versión de un paciente (aumenta cada vez que se guarda).
+
+        Args:
+            cuil: CUIL del paciente
+
+        Returns:
+            Versión del paciente o None si no existe
+        """
+        fila = self.db.conexion().execute(
+            "SELECT version FROM pacientes WHERE cuil = ?", (cuil,)
+        ).fetchone()
+        return fila[0] if fila else None
+
+    def existe_paciente(self, cuil: str) -> bool:
+        """
+        Verifica si existe un paciente con el CUIL dado.
+
+        Args:
+            cuil: CUIL del paciente
+
+        Returns:
+            True si existe, False en caso contrario
+        """
+        return self.db.conexion().execute(
+            "SELECT 1 FROM pacientes WHERE cuil = ?", (cuil,)
+        ).fetchone() is not None
+
+    def obtener_todos(self) -> List[Paciente]:
+        """
+        Obtiene todos los pacientes del repositorio.
+
+        Returns:
+            Lista de pacientes
+        """
+        filas = self.db.conexion().execute("SELECT datos FROM pacientes ORDER BY cuil").fetchall()
+        return [paciente_desde_dict(json.loads(datos)) for (datos,) in filas]
@@ -0,0 +1,110 @@
+"""Implementación SQLite de la lista de revocación (compartida entre procesos)"""
+import time
+from typing import Any, Dict, Optional
+from backend.app.core.revocacion import clave_jti
+from backend.app.repositories.sqlite_db import BaseSQLite
+
+
+class ListaRevocacionSQLite:
+    """
+    Tokens revocados y cortes por usuario sobre la base SQLite compartida.
+
+    Misma interfaz que ListaRevocacion: un logout o un cambio de usuario en un
+    worker invalida el token en todos. Cada revocación incrementa la versión
+    'revocaciones' en la misma transacción, para que los demás workers
+    descarten los tokens que tienen en cache (ver `version`).
+    """
+
+    # Todos los procesos ven estas revocaciones
+    compartida = True
+
+    def __init__(self, db: BaseSQLite, duracion_tokens: float):
+        """
+        Args:
+            db: Base SQLite compartida
+            duracion_tokens: Segundos que dura un token desde que se emite
+                (cuánto tiempo hay que recordar el corte de un usuario)
+        """
+        self.db = db
+        self.duracion_tokens = duracion_tokens
+
+    def revocar(self, jti: str, exp: float) -> None:
+        """
+        Revoca un token.
+
+        Args:
+            jti: Id del token
+            exp: Vencimiento del token (timestamp); hasta entonces se recuerda
+        """
+        with self.db.transaccion() as conexion:
+            self._purgar(conexion)
+            conexion.execute(
+                "INSERT OR REPLACE INTO tokens_revocados (jti, exp) VALUES (?, ?)", (clave_jti(jti), exp)
+            )
+            self._nueva_version(conexion)
+
+    def revocar_usuario(self, email: str, desde: Optional[float] = None) -> None:
+        """
+        Revoca los tokens de un usuario emitidos antes de un instante.
+
+        Args:
+            email: Email del usuario
+            desde: Timestamp del corte (por defecto, ahora). Los claims `iat`
+                tienen resolución de segundos: un token emitido en el mismo
+                segundo del corte sigue valiendo
+        """
+        corte = int(time.time() if desde is None else desde)
+        with self.db.transaccion() as conexion:
+            self._purgar(conexion)
+            conexion.execute(
+                "INSERT INTO cortes_usuarios (email, corte, vence) VALUES (?, ?, ?) "
+                "ON CONFLICT (email) DO UPDATE SET "
+                "corte = max(corte, excluded.corte), vence = max(vence, excluded.vence)",
+                (email, corte, corte + self.duracion_tokens)
+            )
+            self._nueva_version(conexion)
+
+    def revocado(self, payload: Dict[str, Any]) -> bool:
+        """
+        Indica si un token verificado fue revocado.
+
+        Args:
+            payload: Claims del token (se usan jti, email e iat)
+
+        Returns:
+            True si el token no debe aceptarse
+        """
+        jti = payload.get("jti")
+        revocado, corte = self.db.conexion().execute(
+            "SELECT EXISTS (SELECT 1 FROM tokens_revocados WHERE jti = ?), "
+            "(SELECT corte FROM cortes_usuarios WHERE email = ?)",
+            (clave_jti(jti) if jti is not None else None, payload.get("email"))
+        ).fetchone()
+        return bool(revocado) or (corte is not None and payload.get("iat", 0) < corte)
+
+    def version(self) -> int:
+        """Cantidad de revocaciones hechas por cualquier proceso sobre esta base"""
+        return self.db.conexion().execute(
+            "SELECT valor FROM versiones WHERE nombre = 'revocaciones'"
+        ).fetchone()[0]
+
+    def estadisticas(self) -> Dict[str, Any]:
+        """Tokens revocados y usuarios con corte que todavía afectan a algún token vigente"""
+        ahora = time.time()
+        tokens, usuarios = self.db.conexion().execute(
+            "SELECT (SELECT COUNT(*) FROM tokens_revocados WHERE exp > ?), "
+            "(SELECT COUNT(*) FROM cortes_usuarios WHERE vence > ?)",
+            (ahora, ahora)
+        ).fetchone()
+        return {"tokens_revocados": tokens, "usuarios_con_corte": usuarios}
+
+    @staticmethod
+    def _purgar(conexion) -> None:
+        """Descarta las entradas que ya no afectan a ningún token vigente (dentro de la transacción)"""
+        ahora = time.time()
+        conexion.execute("DELETE FROM tokens_revocados WHERE exp <= ?", (ahora,))
+        conexion.execute("DELETE FROM cortes_usuarios WHERE vence <= ?", (ahora,))
+
+    @staticmethod
+    def _nueva_version(conexion) -> None:
+        conexion.execute("UPDATE versiones SET valor = valor + 1 WHERE nombre = 'revocaciones'")
@@ -0,0 +1,149 @@
+"""
+Base de datos SQLite compartida entre procesos.
+
+Permite correr la API con varios workers de uvicorn: usuarios, pacientes,
+ingresos y tokens revocados viven en un mismo archivo SQLite en modo WAL (lectores concurrentes
+con un único escritor a la vez). Cada hilo de cada proceso usa su propia
+conexión.
+"""
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS usuarios (
+    email TEXT PRIMARY KEY,
+    password_hash TEXT NOT NULL,
+    rol TEXT,
+    matricula TEXT,
+    id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_usuarios_rol ON usuarios (rol);
+
+CREATE TABLE IF NOT EXISTS pacientes (
+    cuil TEXT PRIMARY KEY,
+    datos TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 1
+);
+
+CREATE TABLE IF NOT EXISTS ingresos (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    cuil TEXT NOT NULL REFERENCES pacientes (cuil),
+    estado TEXT NOT NULL,
+    nivel INTEGER NOT NULL,
+    fecha TEXT NOT NULL,
+    doctor_email TEXT,
+    datos TEXT NOT NULL,
+    doctor TEXT,
+    atencion TEXT,
+    -- Fila de las listas (IngresoListItem en JSON), armada al insertar el ingreso
+    fila TEXT NOT NULL
+);
+-- Lista de espera: solo indexa los pendientes, en orden de atención
+CREATE INDEX IF NOT EXISTS idx_ingresos_cola
+    ON ingresos (nivel, fecha, seq) WHERE estado = 'PENDIENTE';
+-- Un doctor tiene a lo sumo un ingreso en proceso
+CREATE UNIQUE INDEX IF NOT EXISTS idx_ingresos_asignacion
+    ON ingresos (doctor_email) WHERE estado = 'EN_PROCESO' AND doctor_email IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_ingresos_en_proceso
+    ON ingresos (seq) WHERE estado = 'EN_PROCESO';
+
+-- Versiones de la lista de espera y de la de ingresos en proceso (para GET
+-- condicionales). Los triggers las actualizan en la misma transacción que el
+-- cambio, sin importar qué proceso lo hizo. La época distingue esta base de
+-- otra creada en la misma ruta.
+CREATE TABLE IF NOT EXISTS versiones (
+    nombre TEXT PRIMARY KEY,
+    valor INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO versiones (nombre, valor) VALUES
+    ('epoca', abs(random())), ('pendientes', 0), ('en_proceso', 0), ('revocaciones', 0);
+
+CREATE TRIGGER IF NOT EXISTS trg_version_admision
+AFTER INSERT ON ingresos
+BEGIN
+    UPDATE versiones SET valor = valor + 1
+    WHERE (nombre = 'pendientes' AND new.estado = 'PENDIENTE')
+       OR (nombre = 'en_proceso' AND new.estado = 'EN_PROCESO');
+END;
+CREATE TRIGGER IF NOT EXISTS trg_version_transicion
+AFTER UPDATE OF estado ON ingresos
+WHEN old.estado != new.estado
+BEGIN
+    UPDATE versiones SET valor = valor + 1
+    WHERE (nombre = 'pendientes' AND 'PENDIENTE' IN (old.estado, new.estado))
+       OR (nombre = 'en_proceso' AND 'EN_PROCESO' IN (old.estado, new.estado));
+END;
+
+-- Tokens revocados antes de su vencimiento (ver ListaRevocacionSQLite)
+CREATE TABLE IF NOT EXISTS tokens_revocados (
+    jti BLOB PRIMARY KEY,
+    exp REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tokens_revocados_exp ON tokens_revocados (exp);
+-- Por usuario, los tokens emitidos antes de `corte` no valen
+CREATE TABLE IF NOT EXISTS cortes_usuarios (
+    email TEXT PRIMARY KEY,
+    corte INTEGER NOT NULL,
+    vence REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_cortes_usuarios_vence ON cortes_usuarios (vence);
+"""
+
+
+class BaseSQLite:
+    """Conexiones por hilo a una base SQLite en modo WAL"""
+
+    def __init__(self, ruta: str, timeout: float = 30.0):
+        """
+        Abre (o crea) la base y su esquema.
+
+        Args:
+            ruta: Ruta del archivo de la base
+            timeout: Segundos que una escritura espera el lock de otro proceso
+        """
+        self.ruta = str(ruta)
+        Path(self.ruta).parent.mkdir(parents=True, exist_ok=True)
+        self.timeout = timeout
+        self._local = threading.local()
+        self.conexion().executescript(ESQUEMA)
+
+    def conexion(self) -> sqlite3.Connection:
+        """
+        Retorna la conexión del hilo actual, creándola si hace falta.
+
+        Las conexiones no se comparten entre procesos: si el proceso actual es
+        un fork del que creó la conexión, se abre una nueva.
+        """
+        conexion = getattr(self._local, "conexion", None)
+        if conexion is None or self._local.pid != os.getpid():
+            # Autocommit: las transacciones se abren explícitamente con transaccion()
+            conexion = sqlite3.connect(self.ruta, timeout=self.timeout, isolation_level=None)
+            conexion.execute("PRAGMA journal_mode=WAL")
+            conexion.execute("PRAGMA synchronous=NORMAL")
+            conexion.execute("PRAGMA foreign_keys=ON")
+            self._local.conexion = conexion
+            self._local.pid = os.getpid()
+        return conexion
+
+    @contextmanager
+    def transaccion(self) -> Iterator[sqlite3.Connection]:
+        """
+        Abre una transacción de escritura (BEGIN IMMEDIATE).
+
+        El lock de escritura se toma al empezar, así que las lecturas dentro de
+        la transacción no pueden quedar desactualizadas por otro proceso.
+        """
+        conexion = self.conexion()
+        conexion.execute("BEGIN IMMEDIATE")
+        try:
+            yield conexion
+        except BaseException:
+            conexion.execute("ROLLBACK")
+            raise
+        conexion.execute("COMMIT")
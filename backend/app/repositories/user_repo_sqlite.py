@@ -0,0 +1,76 @@
+"""Implementación SQLite del repositorio de usuarios (compartido entre procesos)"""
+from typing import Callable, List, Optional
+from backend.app.models.models import Usuario, Rol
+from backend.app.persistence.serializacion import usuario_desde_dict
+from backend.app.repositories.sqlite_db import BaseSQLite
+
+
+_COLUMNAS = "email, password_hash, rol, matricula, id"
+
+
+class SQLiteUserRepo:
+    """Repositorio de usuarios sobre la base SQLite compartida, clave por email."""
+
+    def __init__(self, db: BaseSQLite):
+        self.db = db
+        self._suscriptores: List[Callable[[str], None]] = []
+
+    def get(self, email: str) -> Optional[Usuario]:
+        fila = self.db.conexion().execute(
+            f"SELECT {_COLUMNAS} FROM usuarios WHERE email = ?", (email,)
+        ).fetchone()
+        return self._desde_fila(fila) if fila else None
+
+    def save(self, user: Usuario) -> None:
+        self.db.conexion().execute(
+            f"INSERT OR REPLACE INTO usuarios ({_COLUMNAS}) VALUES (?, ?, ?, ?, ?)",
+            (user.email, user.password_hash, user.rol.value if user.rol else None, user.matricula, user.id)
+        )
+        for callback in self._suscriptores:
+            callback(user.email)
+
+    def reemplazar_password_hash(self, email: str, anterior: str, nuevo: str) -> bool:
+        """
+        Reemplaza el hash de la contraseña si sigue siendo `anterior`.
+
+        No avisa a los suscriptores: los datos del usuario no cambian.
+        """
+        cursor = self.db.conexion().execute(
+            "UPDATE usuarios SET password_hash = ? WHERE email = ? AND password_hash = ?",
+            (nuevo, email, anterior)
+        )
+        return cursor.rowcount == 1
+
+    def suscribir_cambios(self, callback: Callable[[str], None]) -> None:
+        """
+        Registra una función que recibe el email de cada usuario guardado por
+        este proceso (los cambios de otros workers no se notifican).
+        """
+        self._suscriptores.append(callback)
+
+    def get_all(self) -> List[Usuario]:
+        """Retorna todos los usuarios almacenados"""
+        filas = self.db.conexion().execute(f"SELECT {_COLUMNAS} FROM usuarios ORDER BY email").fetchall()
+        return [self._desde_fila(fila) for fila in filas]
+
+    def get_all_by_rol(self, rol: Rol) -> List[Usuario]:
+        """Retorna todos los usuarios de un rol específico (MEDICO o ENFERMERA)"""
+        filas = self.db.conexion().execute(
+            f"SELECT {_COLUMNAS} FROM usuarios WHERE rol = ? ORDER BY email", (rol.value,)
+        ).fetchall()
+        return [self._desde_fila(fila) for fila in filas]
+
+    def count(self) -> int:
+        """Retorna la cantidad total de usuarios"""
+        return self.db.conexion().execute("SELECT COUNT(*) FROM usuarios").fetchone()[0]
+
+    @staticmethod
+    def _desde_fila(fila) -> Usuario:
+        email, password_hash, rol, matricula, id_usuario = fila
+        return usuario_desde_dict({
+            "email": email,
+            "password_hash": password_hash,
+            "rol": rol,
+            "matricula": matricula,
+            "id": id_usuario,
+        })
@@ -0,0 +1,130 @@
+"""
+Benchmark de la cola de ingresos pendientes.
+
+Compara la implementación anterior (lista que se reordena completa en cada
+admisión y se consume con pop(0)) contra ColaPrioridadIngresos (min-heap),
+con 10.000 y 100.000 ingresos ya esperando en la cola.
+"""
+
+import sys
+import random
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Agregar el directorio raíz al path para poder importar los módulos
+root_dir = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(root_dir))
+
+from backend.app.models.models import (
+    Domicilio,
+    Enfermera,
+    FrecuenciaCardiaca,
+    FrecuenciaRespiratoria,
+    Ingreso,
+    NivelEmergencia,
+    Paciente,
+    Temperatura,
+    TensionArterial,
+)
+from backend.app.services.cola_prioridad import ColaPrioridadIngresos
+
+
+TAMANIOS = [10_000, 100_000]
+OPERACIONES = 200
+
+
+def crear_ingresos(cantidad: int, inicio: datetime) -> list:
+    """Crea ingresos con niveles aleatorios y fechas crecientes"""
+    domicilio = Domicilio("San Martín", 123, "Yerba Buena", "Yerba Buena", "Tucumán", "Argentina")
+    paciente = Paciente("Juan", "Pérez", "20-12345678-9", domicilio)
+    enfermera = Enfermera("Ana", "López")
+    niveles = list(NivelEmergencia)
+    ingresos = []
+    for i in range(cantidad):
+        ingresos.append(Ingreso(
+            id_uuid=str(i),
+            paciente=paciente,
+            enfermera=enfermera,
+            nivel_emergencia=random.choice(niveles),
+            descripcion="benchmark",
+            temperatura=Temperatura(37.0),
+            frecuencia_cardiaca=FrecuenciaCardiaca(80),
+            frecuencia_respiratoria=FrecuenciaRespiratoria(16),
+            tension_arterial=TensionArterial(120, 80),
+            fecha_ingreso=inicio + timedelta(seconds=i)
+        ))
+    return ingresos
+
+
+def clave_lista(ingreso: Ingreso):
+    return (ingreso.nivel_emergencia.value['nivel'], ingreso.fecha_ingreso)
+
+
+def medir_lista(espera: list, nuevos: list) -> tuple:
+    """Implementación anterior: append + sort por admisión, pop(0) por reclamo"""
+    cola = sorted(espera, key=clave_lista)
+
+    inicio = time.perf_counter()
+    for ingreso in nuevos:
+        cola.append(ingreso)
+        cola.sort(key=clave_lista)
+    admision = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for _ in range(len(nuevos)):
+        cola.pop(0)
+    reclamo = time.perf_counter() - inicio
+
+    return admision, reclamo
+
+
+def medir_heap(espera: list, nuevos: list) -> tuple:
+    """Implementación actual: ColaPrioridadIngresos"""
+    cola = ColaPrioridadIngresos()
+    for ingreso in espera:
+        cola.encolar(ingreso)
+
+    inicio = time.perf_counter()
+    for ingreso in nuevos:
+        cola.encolar(ingreso)
+    admision = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for _ in range(len(nuevos)):
+        cola.desencolar()
+    reclamo = time.perf_counter() - inicio
+
+    return admision, reclamo
+
+
+def formatear(segundos: float) -> str:
+    """Formatea el costo promedio por operación en microsegundos"""
+    return f"{segundos / OPERACIONES * 1_000_000:10.2f} µs/op"
+
+
+def main():
+    random.seed(42)
+    print("\n" + "=" * 80)
+    print("⏱️  BENCHMARK - Cola de ingresos pendientes")
+    print("=" * 80)
+    print(f"Operaciones medidas por escenario: {OPERACIONES} admisiones + {OPERACIONES} reclamos\n")
+
+    for tamanio in TAMANIOS:
+        ingresos = crear_ingresos(tamanio + OPERACIONES, datetime(2024, 11, 20, 8, 0))
+        espera, nuevos = ingresos[:tamanio], ingresos[tamanio:]
+
+        lista_admision, lista_reclamo = medir_lista(espera, nuevos)
+        heap_admision, heap_reclamo = medir_heap(espera, nuevos)
+
+        print(f"--- {tamanio:,} ingresos en espera ---")
+        print(f"  Lista (sort + pop(0))  admisión: {formatear(lista_admision)}   reclamo: {formatear(lista_reclamo)}")
+        print(f"  Heap                   admisión: {formatear(heap_admision)}   reclamo: {formatear(heap_reclamo)}")
+        print(f"  Mejora                 admisión: {lista_admision / heap_admision:9.1f}x"
+              f"        reclamo: {lista_reclamo / heap_reclamo:9.1f}x\n")
+
+    print("=" * 80 + "\n")
+
+
+if __name__ == "__main__":
+    main()
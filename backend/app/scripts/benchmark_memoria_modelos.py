@@ -0,0 +1,164 @@
+"""
+Benchmark de memoria de los modelos del dominio.
+
+Crea 100.000 ingresos (cada uno con su paciente, domicilio, afiliación y
+signos vitales) y mide con tracemalloc cuántos bytes ocupa cada ingreso.
+La línea de base copia cada objeto a una clase con un `__dict__` por
+instancia, como eran los modelos antes de `__slots__`. Luego compara los
+signos vitales creados uno por ingreso contra los value objects compartidos
+(`compartido`), que es como los crea el servicio, y agrega el registro
+canónico de obras sociales y textos del domicilio. Los textos se copian en
+cada alta, como los que decodifica cada request JSON.
+"""
+
+import gc
+from enum import Enum
+import random
+import sys
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Agregar el directorio raíz al path para poder importar los módulos
+root_dir = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(root_dir))
+
+from backend.app.models import models
+from backend.app.models.models import (
+    Afiliado,
+    Domicilio,
+    Enfermera,
+    FrecuenciaCardiaca,
+    FrecuenciaRespiratoria,
+    Ingreso,
+    NivelEmergencia,
+    ObraSocial,
+    Paciente,
+    Temperatura,
+    TensionArterial,
+)
+from backend.app.models.registro_canonico import RegistroCanonico
+
+
+CANTIDAD = 100_000
+OBRAS_SOCIALES = ["OSDE", "Swiss Medical", "PAMI", "IOMA", "Galeno"]
+LOCALIDADES = ["Yerba Buena", "San Miguel de Tucumán", "Tafí Viejo", "Banda del Río Salí"]
+
+
+def signos_vitales(compartidos: bool) -> tuple:
+    """Signos vitales con la variabilidad de una guardia real"""
+    valores = (
+        (Temperatura, (round(random.uniform(35.5, 40.0), 1),)),
+        (FrecuenciaCardiaca, (random.randint(50, 140),)),
+        (FrecuenciaRespiratoria, (random.randint(10, 30),)),
+        (TensionArterial, (random.randint(90, 180), random.randint(50, 110))),
+    )
+    if compartidos:
+        return tuple(tipo.compartido(*args) for tipo, args in valores)
+    return tuple(tipo(*args) for tipo, args in valores)
+
+
+_CLASES_CON_DICT = {}
+
+
+def con_dict(objeto, copias: dict):
+    """
+    El mismo objeto del dominio en una clase sin `__slots__`, con los
+    atributos asignados en el orden de su constructor. Los textos, fechas y
+    enums se reutilizan; `copias` (id -> copia) reutiliza las copias de los
+    objetos compartidos que siguen vivos, como las enfermeras.
+    """
+    tipo = type(objeto)
+    if tipo.__module__ != models.__name__ or isinstance(objeto, Enum):
+        return objeto
+    if id(objeto) in copias:
+        return copias[id(objeto)]
+    clase = _CLASES_CON_DICT.get(tipo)
+    if clase is None:
+        clase = _CLASES_CON_DICT[tipo] = type(tipo.__name__, (), {})
+    copia_dict = clase()
+    for base in reversed(tipo.__mro__):
+        for atributo in base.__dict__.get("__slots__", ()):
+            setattr(copia_dict, atributo, con_dict(getattr(objeto, atributo), copias))
+    return copia_dict
+
+
+def copia(texto: str) -> str:
+    """Un texto igual en otro objeto, como el que decodifica cada request"""
+    return "".join(list(texto))
+
+
+def crear_ingresos(
+    cantidad: int, compartidos: bool, registro: RegistroCanonico = None, dicts: bool = False
+) -> list:
+    """Crea ingresos con pacientes distintos y datos variados"""
+    random.seed(42)
+    crear_domicilio = registro.domicilio if registro else Domicilio
+    crear_obra_social = registro.obra_social if registro else ObraSocial
+    enfermeras = [Enfermera(f"Enfermera{i}", "Guardia") for i in range(20)]
+    copias = {id(enfermera): con_dict(enfermera, {}) for enfermera in enfermeras} if dicts else {}
+    niveles = list(NivelEmergencia)
+    inicio = datetime(2025, 1, 1, 8, 0)
+    ingresos = []
+    for i in range(cantidad):
+        domicilio = crear_domicilio(
+            f"Calle {random.randint(1, 500)}", random.randint(1, 5000),
+            copia(random.choice(LOCALIDADES)), copia("Tucumán"), copia("Tucumán"), copia("Argentina")
+        )
+        afiliado = None
+        if i % 2 == 0:
+            obra_social = crear_obra_social(copia(random.choice(OBRAS_SOCIALES)))
+            afiliado = Afiliado(obra_social, str(random.randint(10**6, 10**7)))
+        paciente = Paciente(f"Nombre{i}", f"Apellido{i}", f"20-{10_000_000 + i}-9", domicilio, afiliado)
+        temperatura, cardiaca, respiratoria, tension = signos_vitales(compartidos)
+        ingreso = Ingreso(
+            id_uuid=str(uuid.uuid4()),
+            paciente=paciente,
+            enfermera=random.choice(enfermeras),
+            nivel_emergencia=random.choice(niveles),
+            descripcion="Dolor abdominal",
+            temperatura=temperatura,
+            frecuencia_cardiaca=cardiaca,
+            frecuencia_respiratoria=respiratoria,
+            tension_arterial=tension,
+            fecha_ingreso=inicio + timedelta(seconds=i)
+        )
+        ingresos.append(con_dict(ingreso, copias) if dicts else ingreso)
+    return ingresos
+
+
+def medir(compartidos: bool, registro: RegistroCanonico = None, dicts: bool = False) -> int:
+    """Bytes retenidos por CANTIDAD ingresos"""
+    gc.collect()
+    tracemalloc.start()
+    antes = tracemalloc.take_snapshot()
+    ingresos = crear_ingresos(CANTIDAD, compartidos, registro, dicts)
+    gc.collect()
+    despues = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in despues.compare_to(antes, "filename"))
+    del ingresos
+    return total
+
+
+def main():
+    print(f"Memoria de {CANTIDAD:,} ingresos (tracemalloc)\n")
+    registro = RegistroCanonico()
+    escenarios = [
+        ("modelos con __dict__", False, None, True),
+        ("signos vitales por ingreso", False, None, False),
+        ("signos vitales compartidos", True, None, False),
+        ("+ registro canónico", True, registro, False),
+    ]
+    for nombre, compartidos, registro_escenario, dicts in escenarios:
+        total = medir(compartidos, registro_escenario, dicts)
+        print(f"  {nombre:<28} {total / 2**20:8.1f} MB   {total / CANTIDAD:7.0f} bytes/ingreso")
+
+    estadisticas = registro.estadisticas()
+    print(f"\nRegistro canónico: {estadisticas['reutilizaciones']:,} copias evitadas, "
+          f"{estadisticas['bytes_ahorrados'] / 2**20:.1f} MB ahorrados")
+
+
+if __name__ == "__main__":
+    main()
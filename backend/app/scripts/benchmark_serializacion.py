@@ -0,0 +1,134 @@
+"""
+Benchmark de la serialización de las listas de ingresos.
+
+Compara, para una lista de 1.000 ingresos, el camino genérico de FastAPI
+(validación del response_model + jsonable_encoder + JSONResponse), asdict +
+json.dumps y el codificador de api.codificacion (con y sin orjson), y mide
+los bytes enviados con y sin compresión. msgpack y brotli se miden solo si
+están instalados.
+"""
+
+import asyncio
+import json
+import sys
+import time
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+from unittest.mock import patch
+
+# Agregar el directorio raíz al path para poder importar los módulos
+root_dir = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(root_dir))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from backend.app.api import codificacion
+from backend.app.api.codificacion import FORMATO_MSGPACK, codificar, comprimir
+from backend.app.services.proyeccion_listas import IngresoListItem, ingreso_a_list_item
+from backend.app.models.models import (
+    Domicilio,
+    Enfermera,
+    FrecuenciaCardiaca,
+    FrecuenciaRespiratoria,
+    Ingreso,
+    NivelEmergencia,
+    Paciente,
+    Temperatura,
+    TensionArterial,
+)
+
+
+CANTIDAD = 1_000
+REPETICIONES = 50
+
+
+def crear_items(cantidad: int) -> List[IngresoListItem]:
+    """Crea los items de lista de `cantidad` ingresos pendientes"""
+    domicilio = Domicilio("San Martín", 123, "Yerba Buena", "Yerba Buena", "Tucumán", "Argentina")
+    enfermera = Enfermera("Ana", "López")
+    niveles = list(NivelEmergencia)
+    inicio = datetime(2025, 1, 1, 8, 0)
+    items = []
+    for i in range(cantidad):
+        paciente = Paciente("Juan", f"Pérez {i}", f"20-{10_000_000 + i}-9", domicilio)
+        ingreso = Ingreso(
+            id_uuid=f"{i:08d}-0000-4000-8000-000000000000",
+            paciente=paciente,
+            enfermera=enfermera,
+            nivel_emergencia=niveles[i % len(niveles)],
+            descripcion="benchmark",
+            temperatura=Temperatura(37.0 + (i % 20) / 10),
+            frecuencia_cardiaca=FrecuenciaCardiaca(60 + i % 60),
+            frecuencia_respiratoria=FrecuenciaRespiratoria(12 + i % 10),
+            tension_arterial=TensionArterial(110 + i % 30, 70 + i % 20),
+            fecha_ingreso=inicio + timedelta(seconds=i)
+        )
+        items.append(ingreso_a_list_item(ingreso))
+    return items
+
+
+def medir(funcion) -> tuple:
+    """Devuelve (milisegundos por llamada, resultado de la última llamada)"""
+    funcion()
+    inicio = time.perf_counter()
+    for _ in range(REPETICIONES):
+        resultado = funcion()
+    return (time.perf_counter() - inicio) / REPETICIONES * 1000, resultado
+
+
+def main():
+    items = crear_items(CANTIDAD)
+    campo = create_response_field(name="respuesta", type_=List[IngresoListItem])
+
+    def fastapi_generico() -> bytes:
+        contenido = asyncio.run(serialize_response(field=campo, response_content=items, is_coroutine=False))
+        return JSONResponse(contenido).body
+
+    def asdict_json() -> bytes:
+        return json.dumps([asdict(item) for item in items], ensure_ascii=False, separators=(",", ":")).encode()
+
+    def codificador_sin_orjson() -> bytes:
+        with patch.object(codificacion, "orjson", None):
+            return codificar(items)
+
+    casos = [
+        ("FastAPI genérico (response_model)", fastapi_generico),
+        ("asdict + json.dumps", asdict_json),
+        ("codificador precompilado (json)", codificador_sin_orjson),
+    ]
+    if codificacion.orjson is not None:
+        casos.append(("codificador precompilado (orjson)", lambda: codificar(items)))
+    if codificacion.msgpack is not None:
+        casos.append(("codificador precompilado (msgpack)", lambda: codificar(items, FORMATO_MSGPACK)))
+
+    print(f"Serialización de {CANTIDAD:,} ingresos (promedio de {REPETICIONES} repeticiones)\n")
+    print(f"{'Codificación':<38} {'ms':>9} {'bytes':>10}")
+    base = None
+    for nombre, funcion in casos:
+        ms, contenido = medir(funcion)
+        base = base or ms
+        print(f"{nombre:<38} {ms:>9.2f} {len(contenido):>10,}   x{base / ms:.1f}")
+
+    json_plano = codificar(items)
+    print(f"\nBytes enviados (JSON de {len(json_plano):,} bytes)\n")
+    print(f"{'Compresión':<38} {'ms':>9} {'bytes':>10}")
+    compresiones = ["gzip"] + (["br"] if codificacion.brotli is not None else [])
+    for compresion in compresiones:
+        ms, contenido = medir(lambda: comprimir(json_plano, compresion))
+        print(f"{compresion:<38} {ms:>9.2f} {len(contenido):>10,}   {len(contenido) / len(json_plano):.0%}")
+    if codificacion.msgpack is not None:
+        empaquetado = codificar(items, FORMATO_MSGPACK)
+        ms, contenido = medir(lambda: comprimir(empaquetado, "gzip"))
+        print(f"{'msgpack + gzip':<38} {ms:>9.2f} {len(contenido):>10,}   {len(contenido) / len(json_plano):.0%}")
+
+    faltantes = [nombre for nombre in ("orjson", "msgpack", "brotli") if getattr(codificacion, nombre) is None]
+    if faltantes:
+        print(f"\nNo instalados (no se midieron): {', '.join(faltantes)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Benchmark del write-ahead log de la guardia.
+
+1. Compara la latencia de admisión con un fsync por registro contra el
+   group commit de WriteAheadLog, con varias enfermeras admitiendo en paralelo.
+2. Genera el log de 24 horas de una guardia con mucha demanda (admisión,
+   reclamo y atención de cada paciente) y mide cuánto tarda el replay.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Agregar el directorio raíz al path para poder importar los módulos
+root_dir = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(root_dir))
+
+from backend.app.models.models import Doctor, Enfermera, NivelEmergencia
+from backend.app.persistence.wal import WriteAheadLog, leer_registros, reproducir
+from backend.app.repositories.paciente_repo_impl import InMemoryPacientesRepo
+from backend.app.services.servicio_emergencias import ServicioEmergencias
+
+
+ENFERMERAS = 16
+ADMISIONES_POR_ENFERMERA = 100
+INGRESOS_POR_HORA = 400
+DOCTORES_DE_GUARDIA = 12
+
+DOMICILIO = {
+    "calle": "San Martín",
+    "numero": 123,
+    "localidad": "Yerba Buena",
+    "ciudad": "Yerba Buena",
+    "provincia": "Tucumán",
+    "pais": "Argentina"
+}
+
+
+class WALFsyncPorRegistro:
+    """Variante ingenua: cada registro se escribe y sincroniza en el hilo que lo genera"""
+
+    def __init__(self, ruta: str):
+        self._archivo = open(ruta, "ab")
+        self._lock = threading.Lock()
+        self._ultimo_lsn = 0
+        self.fsyncs = 0
+
+    def registrar(self, registro) -> int:
+        with self._lock:
+            self._ultimo_lsn += 1
+            registro["lsn"] = self._ultimo_lsn
+            linea = json.dumps(registro, separators=(",", ":"), ensure_ascii=False)
+            self._archivo.write(linea.encode("utf-8") + b"\n")
+            self._archivo.flush()
+            os.fsync(self._archivo.fileno())
+            self.fsyncs += 1
+            return self._ultimo_lsn
+
+    def confirmar(self, lsn: int) -> None:
+        pass
+
+    def cerrar(self) -> None:
+        self._archivo.close()
+
+
+def admitir(servicio: ServicioEmergencias, enfermera: Enfermera, cuil: str, nivel: NivelEmergencia):
+    servicio.registrar_urgencia(
+        cuil=cuil,
+        enfermera=enfermera,
+        informe="Dolor abdominal agudo",
+        nivel_emergencia=nivel,
+        temperatura=37.5,
+        frecuencia_cardiaca=85,
+        frecuencia_respiratoria=18,
+        frecuencia_sistolica=120,
+        frecuencia_diastolica=80,
+        nombre="Juan",
+        apellido="Pérez",
+        obra_social="OSDE",
+        numero_afiliado="123456",
+        domicilio=DOMICILIO
+    )
+
+
+def medir_admisiones(wal: WriteAheadLog) -> tuple:
+    """Admite en paralelo y retorna (admisiones/s, latencia media en ms, fsyncs)"""
+    servicio = ServicioEmergencias(InMemoryPacientesRepo(), wal=wal)
+    niveles = list(NivelEmergencia)
+    latencias = []
+    lock = threading.Lock()
+    inicio = threading.Barrier(ENFERMERAS + 1)
+
+    def enfermera_loop(numero: int):
+        enfermera = Enfermera(f"Enfermera{numero}", "Test", email=f"enf{numero}@hospital.com")
+        propias = []
+        inicio.wait()
+        for i in range(ADMISIONES_POR_ENFERMERA):
+            t0 = time.perf_counter()
+            admitir(servicio, enfermera, f"20-{numero:02d}{i:06d}-1", niveles[i % len(niveles)])
+            propias.append(time.perf_counter() - t0)
+        with lock:
+            latencias.extend(propias)
+
+    hilos = [threading.Thread(target=enfermera_loop, args=(n,)) for n in range(ENFERMERAS)]
+    for hilo in hilos:
+        hilo.start()
+    inicio.wait()
+    t0 = time.perf_counter()
+    for hilo in hilos:
+        hilo.join()
+    duracion = time.perf_counter() - t0
+    wal.cerrar()
+
+    return len(latencias) / duracion, sum(latencias) / len(latencias) * 1000, wal.fsyncs
+
+
+def generar_log_24h(ruta: str) -> int:
+    """Simula 24 horas de guardia sobre un WAL y retorna la cantidad de ingresos"""
+    wal = WriteAheadLog(ruta, esperar_fsync=False)
+    servicio = ServicioEmergencias(InMemoryPacientesRepo(), wal=wal)
+    enfermera = Enfermera("Ana", "López", matricula="ENF-1", email="ana@hospital.com")
+    doctores = [
+        Doctor("", f"Doctor{n}", "Guardia", f"MP-{n}", email=f"doctor{n}@hospital.com")
+        for n in range(DOCTORES_DE_GUARDIA)
+    ]
+    niveles = list(NivelEmergencia)
+    total = INGRESOS_POR_HORA * 24
+
+    for i in range(total):
+        # Pacientes recurrentes: uno de cada cuatro ya tiene historia en la guardia
+        cuil = f"20-{i // 4 if i % 4 == 0 else i:08d}-1"
+        admitir(servicio, enfermera, cuil, niveles[i % len(niveles)])
+        doctor = doctores[i % len(doctores)]
+        ingreso = servicio.reclamar_siguiente_paciente(doctor)
+        servicio.registrar_atencion(ingreso.id, doctor, "Paciente estabilizado, se otorga el alta.")
+
+    wal.cerrar()
+    return total
+
+
+def main():
+    print("\n" + "=" * 80)
+    print("💾 BENCHMARK - Write-ahead log de la guardia")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directorio:
+        print(f"\n--- Admisiones concurrentes ({ENFERMERAS} enfermeras x {ADMISIONES_POR_ENFERMERA}) ---")
+        for nombre, wal in [
+            ("fsync por registro", WALFsyncPorRegistro(os.path.join(directorio, "naive.wal"))),
+            ("group commit      ", WriteAheadLog(os.path.join(directorio, "group.wal"))),
+        ]:
+            por_segundo, latencia, fsyncs = medir_admisiones(wal)
+            print(f"  {nombre}: {por_segundo:8.0f} admisiones/s   latencia media: {latencia:7.3f} ms   fsyncs: {fsyncs}")
+
+        ruta = os.path.join(directorio, "24h.wal")
+        print(f"\n--- Replay de 24 horas ({INGRESOS_POR_HORA} ingresos/hora) ---")
+        total = generar_log_24h(ruta)
+        registros = total * 3
+        tamanio = os.path.getsize(ruta)
+        print(f"  Log generado: {total:,} ingresos, {registros:,} registros, {tamanio / 1024 / 1024:.2f} MB "
+              f"({tamanio / registros:.0f} bytes/registro)")
+
+        t0 = time.perf_counter()
+        repo = InMemoryPacientesRepo()
+        servicio = ServicioEmergencias(repo)
+        servicio.cargar_ingresos(reproducir(leer_registros(ruta), repo))
+        duracion = time.perf_counter() - t0
+        print(f"  Replay completo: {duracion:.3f} s ({registros / duracion:,.0f} registros/s)")
+
+    print("\n" + "=" * 80 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Benchmark del backend SQLite compartido con varios procesos.
+
+Simula N workers de uvicorn sobre la misma base: cada proceso admite
+pacientes y los reclama/finaliza con sus propios doctores. Mide el
+throughput total de operaciones (admisión + reclamo + atención) para 1, 2
+y 4 procesos y verifica que ningún ingreso se haya reclamado dos veces.
+
+Las escrituras se serializan en el lock de escritura de SQLite: el script
+mide también cuánto tiempo lo tiene tomado cada operación, que fija el
+techo de throughput con cualquier cantidad de procesos.
+"""
+
+import multiprocessing
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List
+
+# Agregar el directorio raíz al path para poder importar los módulos
+root_dir = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(root_dir))
+
+from backend.app.models.models import Doctor, Enfermera, NivelEmergencia
+from backend.app.repositories.paciente_repo_sqlite import SQLitePacientesRepo
+from backend.app.repositories.sqlite_db import BaseSQLite
+from backend.app.services.servicio_emergencias_sqlite import ServicioEmergenciasSQLite
+
+
+PROCESOS = [1, 2, 4]
+INGRESOS_POR_PROCESO = 500
+
+DOMICILIO = {
+    "calle": "San Martín",
+    "numero": 123,
+    "localidad": "Yerba Buena",
+    "ciudad": "Yerba Buena",
+    "provincia": "Tucumán",
+    "pais": "Argentina"
+}
+
+
+class BaseSQLiteCronometrada(BaseSQLite):
+    """Acumula el tiempo que las transacciones tienen tomado el lock de escritura"""
+
+    def __init__(self, ruta: str):
+        super().__init__(ruta)
+        self.segundos_escritura = 0.0
+
+    @contextmanager
+    def transaccion(self):
+        inicio = time.perf_counter()
+        with super().transaccion() as conexion:
+            yield conexion
+        self.segundos_escritura += time.perf_counter() - inicio
+
+
+def operar(servicio: ServicioEmergenciasSQLite, numero: int) -> List[str]:
+    """Admite, reclama y finaliza INGRESOS_POR_PROCESO ingresos; retorna los ids reclamados"""
+    enfermera = Enfermera(f"Enfermera{numero}", "Test", email=f"enf{numero}@hospital.com")
+    doctor = Doctor("", f"Doctor{numero}", "Guardia", f"MP-{numero}", email=f"doctor{numero}@hospital.com")
+    niveles = list(NivelEmergencia)
+    propios = []
+    for i in range(INGRESOS_POR_PROCESO):
+        servicio.registrar_urgencia(
+            cuil=f"20-{numero:02d}{i:06d}-1",
+            enfermera=enfermera,
+            informe="Dolor abdominal agudo",
+            nivel_emergencia=niveles[i % len(niveles)],
+            temperatura=37.5,
+            frecuencia_cardiaca=85,
+            frecuencia_respiratoria=18,
+            frecuencia_sistolica=120,
+            frecuencia_diastolica=80,
+            nombre="Juan",
+            apellido="Pérez",
+            obra_social="OSDE",
+            numero_afiliado="123456",
+            domicilio=DOMICILIO
+        )
+        ingreso = servicio.reclamar_siguiente_paciente(doctor)
+        servicio.registrar_atencion(ingreso.id, doctor, "Paciente estabilizado, se otorga el alta.")
+        propios.append(ingreso.id)
+    return propios
+
+
+def worker(ruta: str, numero: int, inicio, reclamados) -> None:
+    """Cuerpo de cada proceso: espera a los demás y opera sobre la base compartida"""
+    db = BaseSQLite(ruta)
+    servicio = ServicioEmergenciasSQLite(db, SQLitePacientesRepo(db))
+    inicio.wait()
+    reclamados.put(operar(servicio, numero))
+
+
+def medir(procesos: int) -> tuple:
+    """Retorna (operaciones/s, reclamos duplicados)"""
+    contexto = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = str(Path(directorio) / "guardia.db")
+        BaseSQLite(ruta)
+        inicio = contexto.Barrier(procesos + 1)
+        reclamados = contexto.Queue()
+        workers = [contexto.Process(target=worker, args=(ruta, n, inicio, reclamados)) for n in range(procesos)]
+        for proceso in workers:
+            proceso.start()
+        inicio.wait()
+        t0 = time.perf_counter()
+        ids = [i for _ in workers for i in reclamados.get()]
+        duracion = time.perf_counter() - t0
+        for proceso in workers:
+            proceso.join()
+
+    operaciones = len(ids) * 3
+    return operaciones / duracion, len(ids) - len(set(ids))
+
+
+def medir_lock_escritura() -> tuple:
+    """Retorna (ms de lock de escritura por operación, fracción de cada operación) en un solo proceso"""
+    with tempfile.TemporaryDirectory() as directorio:
+        db = BaseSQLiteCronometrada(str(Path(directorio) / "guardia.db"))
+        servicio = ServicioEmergenciasSQLite(db, SQLitePacientesRepo(db))
+        t0 = time.perf_counter()
+        ids = operar(servicio, 0)
+        duracion = time.perf_counter() - t0
+    operaciones = len(ids) * 3
+    return db.segundos_escritura / operaciones * 1000, db.segundos_escritura / duracion
+
+
+def main():
+    print("\n" + "=" * 80)
+    print("🗄️  BENCHMARK - Backend SQLite compartido entre procesos")
+    print("=" * 80)
+    print(f"\nCada proceso: {INGRESOS_POR_PROCESO} admisiones + reclamos + atenciones\n")
+
+    base = None
+    for procesos in PROCESOS:
+        por_segundo, duplicados = medir(procesos)
+        base = base or por_segundo
+        print(f"  {procesos} proceso(s): {por_segundo:8.0f} operaciones/s   "
+              f"(x{por_segundo / base:.2f})   reclamos duplicados: {duplicados}")
+
+    ms_lock, fraccion = medir_lock_escritura()
+    print(f"\n  Lock de escritura: {ms_lock:.3f} ms por operación ({fraccion:.0%} de cada operación)")
+    print(f"  Techo con cualquier cantidad de procesos: {1000 / ms_lock:8.0f} operaciones/s")
+
+    print("\n" + "=" * 80 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Stress test de reclamos concurrentes.
+
+Simula N doctores que reclaman y finalizan pacientes en paralelo mientras
+varias enfermeras siguen admitiendo ingresos, y mide los reclamos por
+segundo que sostiene ServicioEmergencias. Al final verifica que ningún
+ingreso se haya reclamado dos veces ni perdido.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Agregar el directorio raíz al path para poder importar los módulos
+root_dir = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(root_dir))
+
+from backend.app.models.models import Doctor, Enfermera, NivelEmergencia
+from backend.app.repositories.paciente_repo_impl import InMemoryPacientesRepo
+from backend.app.services.servicio_emergencias import ServicioEmergencias
+
+
+DOCTORES = [1, 4, 16, 64]
+ENFERMERAS = 4
+INGRESOS_INICIALES = 5_000
+ADMISIONES_POR_ENFERMERA = 2_500
+
+DOMICILIO = {
+    "calle": "San Martín",
+    "numero": 123,
+    "localidad": "Yerba Buena",
+    "ciudad": "Yerba Buena",
+    "provincia": "Tucumán",
+    "pais": "Argentina"
+}
+
+
+def admitir(servicio: ServicioEmergencias, enfermera: Enfermera, prefijo: int, cantidad: int):
+    """Admite `cantidad` ingresos con niveles rotativos"""
+    niveles = list(NivelEmergencia)
+    for i in range(cantidad):
+        servicio.registrar_urgencia(
+            cuil=f"20-{prefijo:02d}{i:06d}-1",
+            enfermera=enfermera,
+            informe="Stress test",
+            nivel_emergencia=niveles[i % len(niveles)],
+            temperatura=37.0,
+            frecuencia_cardiaca=80,
+            frecuencia_respiratoria=16,
+            frecuencia_sistolica=120,
+            frecuencia_diastolica=80,
+            nombre="Juan",
+            apellido="Pérez",
+            obra_social=None,
+            domicilio=DOMICILIO
+        )
+
+
+def ejecutar(cantidad_doctores: int) -> dict:
+    """Ejecuta un escenario y retorna las métricas"""
+    servicio = ServicioEmergencias(InMemoryPacientesRepo())
+    enfermera = Enfermera("Ana", "López", email="ana@hospital.com")
+    admitir(servicio, enfermera, 99, INGRESOS_INICIALES)
+
+    total = INGRESOS_INICIALES + ENFERMERAS * ADMISIONES_POR_ENFERMERA
+    reclamados = []
+    lock = threading.Lock()
+    inicio = threading.Barrier(cantidad_doctores + ENFERMERAS + 1)
+
+    def doctor_loop(numero: int):
+        doctor = Doctor("", f"Doctor{numero}", "Stress", f"MP-{numero}", email=f"doctor{numero}@hospital.com")
+        inicio.wait()
+        while True:
+            with lock:
+                if len(reclamados) >= total:
+                    break
+            try:
+                ingreso = servicio.reclamar_siguiente_paciente(doctor)
+            except ValueError:
+                # Cola vacía momentáneamente: ceder el GIL a las enfermeras
+                time.sleep(0)
+                continue
+            servicio.registrar_atencion(ingreso.id, doctor, "Alta médica")
+            with lock:
+                reclamados.append(ingreso.id)
+
+    def enfermera_loop(numero: int):
+        inicio.wait()
+        admitir(servicio, enfermera, numero, ADMISIONES_POR_ENFERMERA)
+
+    hilos = [threading.Thread(target=doctor_loop, args=(n,)) for n in range(cantidad_doctores)]
+    hilos += [threading.Thread(target=enfermera_loop, args=(n,)) for n in range(ENFERMERAS)]
+    for hilo in hilos:
+        hilo.start()
+
+    inicio.wait()
+    t0 = time.perf_counter()
+    for hilo in hilos:
+        hilo.join()
+    duracion = time.perf_counter() - t0
+
+    return {
+        "doctores": cantidad_doctores,
+        "reclamos": len(reclamados),
+        "duplicados": len(reclamados) - len(set(reclamados)),
+        "pendientes": len(servicio.obtener_ingresos_pendientes()),
+        "reclamos_por_segundo": len(reclamados) / duracion,
+    }
+
+
+def main():
+    print("\n" + "=" * 80)
+    print("🔥 STRESS TEST - Reclamos concurrentes")
+    print("=" * 80)
+    print(f"Cola inicial: {INGRESOS_INICIALES:,} ingresos | "
+          f"{ENFERMERAS} enfermeras admitiendo {ADMISIONES_POR_ENFERMERA:,} ingresos cada una\n")
+
+    for cantidad in DOCTORES:
+        resultado = ejecutar(cantidad)
+        estado = "✅" if resultado["duplicados"] == 0 and resultado["pendientes"] == 0 else "❌"
+        print(f"  {estado} {resultado['doctores']:3d} doctores: "
+              f"{resultado['reclamos_por_segundo']:10.0f} reclamos/s  "
+              f"(reclamos: {resultado['reclamos']:,}, duplicados: {resultado['duplicados']}, "
+              f"pendientes: {resultado['pendientes']})")
+
+    print("\n" + "=" * 80 + "\n")
+
+
+if __name__ == "__main__":
+    main()
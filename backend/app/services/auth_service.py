@@ -1,4 +1,6 @@
-from typing import Optional, Dict, List
+import asyncio
+from typing import Callable, Optional, Dict, List
+from ..core.credenciales import MotorCredenciales, MotorSaturado, motor_credenciales
 from ..models.models import Usuario, Rol
 
 
@@ -10,12 +12,30 @@ class InMemoryUserRepo:
     """Repositorio simple en memoria para usuarios, clave por email."""
     def __init__(self):
         self._store: Dict[str, Usuario] = {}
+        self._suscriptores: List[Callable[[str], None]] = []
 
     def get(self, email: str) -> Optional[Usuario]:
         return self._store.get(email)
 
     def save(self, user: Usuario) -> None:
         self._store[user.email] = user
+        for callback in self._suscriptores:
+            callback(user.email)
+
+    def suscribir_cambios(self, callback: Callable[[str], None]) -> None:
+        """Registra una función que recibe el email de cada usuario guardado"""
+        self._suscriptores.append(callback)
+
+    def reemplazar_password_hash(self, email: str, anterior: str, nuevo: str) -> bool:
+        """Reemplaza el hash de la contraseña si sigue siendo `anterior`.
+
+        No avisa a los suscriptores: los datos del usuario no cambian.
+        """
+        user = self._store.get(email)
+        if user is None or user.password_hash != anterior:
+            return False
+        user.password_hash = nuevo
+        return True
 
     def get_all(self) -> List[Usuario]:
         """Retorna todos los usuarios almacenados en memoria"""
@@ -67,7 +87,13 @@ class InMemoryUserRepo:
         print(f"{'='*80}\n")
 
 
-def register(email: str, password: str, rol, repo: Optional[InMemoryUserRepo] = None) -> Usuario:
+def register(
+    email: str,
+    password: str,
+    rol,
+    repo: Optional[InMemoryUserRepo] = None,
+    matricula: Optional[str] = None
+) -> Usuario:
     """Registra un nuevo usuario. Valida email, contraseña y rol.
 
     Lanza ValueError en caso de datos inválidos o si el usuario ya existe.
@@ -79,6 +105,7 @@ def register(email: str, password: str, rol, repo: Optional[InMemoryUserRepo] =
     user = Usuario(email, password)  
     
     user.set_rol(rol)
+    user.matricula = matricula
 
     
     if repo.get(user.email) is not None:
@@ -101,3 +128,92 @@ def login(email: str, password: str, repo: Optional[InMemoryUserRepo] = None) ->
         raise ValueError("Usuario o contraseña inválidos")
 
     return user
+
+
+async def register_async(
+    email: str,
+    password: str,
+    rol,
+    repo: Optional[InMemoryUserRepo] = None,
+    matricula: Optional[str] = None,
+    motor: Optional[MotorCredenciales] = None
+) -> Usuario:
+    """Igual que `register`, pero el hash de la contraseña corre en el motor de
+    credenciales (un pool de procesos) sin bloquear el hilo que lo llama.
+
+    Lanza ValueError en caso de datos inválidos o si el usuario ya existe, y
+    MotorSaturado si el motor tiene demasiadas operaciones pendientes.
+    """
+    if repo is None:
+        repo = InMemoryUserRepo()
+    if motor is None:
+        motor = motor_credenciales
+
+    Usuario.validar_credenciales(email, password)
+    user = Usuario.desde_hash(email, "")
+    user.set_rol(rol)
+    user.matricula = matricula
+
+    if repo.get(user.email) is not None:
+        raise ValueError("Usuario ya existe")
+
+    user.password_hash = await motor.hashear(password)
+
+    # Otro registro del mismo email pudo terminar mientras se hasheaba
+    if repo.get(user.email) is not None:
+        raise ValueError("Usuario ya existe")
+
+    repo.save(user)
+    return user
+
+
+async def login_async(
+    email: str,
+    password: str,
+    repo: Optional[InMemoryUserRepo] = None,
+    motor: Optional[MotorCredenciales] = None
+) -> Usuario:
+    """Igual que `login`, pero la verificación de la contraseña corre en el
+    motor de credenciales sin bloquear el hilo que lo llama.
+
+    Lanza ValueError('Usuario o contraseña inválidos') si las credenciales no
+    son válidas, y MotorSaturado si el motor tiene demasiadas operaciones pendientes.
+    """
+    if repo is None:
+        repo = InMemoryUserRepo()
+    if motor is None:
+        motor = motor_credenciales
+
+    user = repo.get(email)
+
+    if user is None or not await motor.verificar(password, user.password_hash):
+        raise ValueError("Usuario o contraseña inválidos")
+
+    # Rehacer en segundo plano un hash con costo desactualizado (la respuesta no lo espera)
+    if motor.necesita_rehash(user.password_hash) and user.email not in _rehashes_en_curso:
+        tarea = asyncio.create_task(_rehashear(user.email, password, user.password_hash, repo, motor))
+        _rehashes_en_curso[user.email] = tarea
+        tarea.add_done_callback(lambda _: _rehashes_en_curso.pop(user.email, None))
+
+    return user
+
+
+# Rehashes en segundo plano por email (también evita que el event loop descarte las tareas)
+_rehashes_en_curso: Dict[str, "asyncio.Task"] = {}
+
+
+async def _rehashear(
+    email: str,
+    password: str,
+    anterior: str,
+    repo: InMemoryUserRepo,
+    motor: MotorCredenciales
+) -> None:
+    """Rehashea la contraseña con el costo actual, salvo que el hash haya cambiado mientras tanto"""
+    try:
+        nuevo = await motor.hashear(password)
+    except MotorSaturado:
+        # Se intenta de nuevo en el próximo login
+        return
+    if repo.reemplazar_password_hash(email, anterior, nuevo):
+        motor.registrar_rehash()
@@ -0,0 +1,100 @@
+"""Cola de prioridad de ingresos pendientes (min-heap)"""
+import heapq
+import itertools
+from datetime import datetime
+from typing import Iterator, List, Tuple
+
+from backend.app.models.models import Ingreso
+
+
+class ColaPrioridadIngresos:
+    """
+    Cola de prioridad para los ingresos pendientes de atención.
+
+    Los ingresos se ordenan por nivel de emergencia (menor número = mayor
+    prioridad), luego por fecha/hora de ingreso y, ante empates, por orden
+    de llegada a la cola. Encolar y desencolar cuestan O(log n).
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[int, datetime, int, Ingreso]] = []
+        self._secuencia = itertools.count()
+
+    @staticmethod
+    def clave(ingreso: Ingreso, secuencia: int) -> Tuple[int, datetime, int]:
+        """
+        Calcula la clave de ordenamiento de un ingreso.
+
+        Args:
+            ingreso: Ingreso a ordenar
+            secuencia: Orden de llegada del ingreso a la cola
+
+        Returns:
+            Tupla (nivel, fecha_ingreso, secuencia)
+        """
+        return (ingreso.nivel_emergencia.value['nivel'], ingreso.fecha_ingreso, secuencia)
+
+    def encolar(self, ingreso: Ingreso) -> None:
+        """
+        Agrega un ingreso a la cola en O(log n).
+
+        Args:
+            ingreso: Ingreso a encolar
+        """
+        nivel, fecha, secuencia = self.clave(ingreso, next(self._secuencia))
+        heapq.heappush(self._heap, (nivel, fecha, secuencia, ingreso))
+
+    def encolar_lote(self, ingresos: List[Ingreso]) -> None:
+        """
+        Agrega varios ingresos a la cola en una sola operación.
+
+        Si el lote es grande respecto de la cola, se agregan todos al final y se
+        reconstruye el heap en O(n + k); si no, se insertan uno a uno en O(k log n).
+
+        Args:
+            ingresos: Ingresos a encolar, en orden de llegada
+        """
+        entradas = [
+            (*self.clave(ingreso, next(self._secuencia)), ingreso)
+            for ingreso in ingresos
+        ]
+        total = len(self._heap) + len(entradas)
+        if len(entradas) * total.bit_length() > total:
+            self._heap.extend(entradas)
+            heapq.heapify(self._heap)
+        else:
+            for entrada in entradas:
+                heapq.heappush(self._heap, entrada)
+
+    def desencolar(self) -> Ingreso:
+        """
+        Quita y retorna el ingreso de mayor prioridad en O(log n).
+
+        Returns:
+            El ingreso de mayor prioridad
+
+        Raises:
+            IndexError: Si la cola está vacía
+        """
+        if not self._heap:
+            raise IndexError("La cola de ingresos está vacía")
+        return heapq.heappop(self._heap)[-1]
+
+    def ordenados(self) -> List[Ingreso]:
+        """
+        Retorna los ingresos de la cola en orden de atención.
+
+        Returns:
+            Lista nueva con los ingresos ordenados por prioridad
+        """
+        return [entrada[-1] for entrada in sorted(self._heap)]
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __bool__(self) -> bool:
+        return bool(self._heap)
+
+    def __iter__(self) -> Iterator[Ingreso]:
+        """Itera los ingresos en orden de atención"""
+        return iter(self.ordenados())
@@ -0,0 +1,107 @@
+"""
+Directorio del personal autenticado (enfermeras y médicos), clave por email.
+
+Las rutas de urgencias reciben la enfermera o el médico que hace el request,
+y los ingresos guardan esa referencia. El directorio arma el objeto una sola
+vez por usuario a partir del repositorio de usuarios y todos los requests (e
+ingresos) de esa persona comparten la misma instancia, que no se modifica:
+si el usuario cambia, se arma una nueva.
+"""
+import threading
+from typing import Dict, Optional, Tuple, Union
+
+from backend.app.models.models import Doctor, Enfermera, Rol, Usuario
+
+
+Personal = Union[Enfermera, Doctor]
+
+
+class DirectorioPersonal:
+    """
+    Enfermeras y médicos compartidos, armados desde los usuarios.
+
+    Una entrada se descarta cuando el repositorio avisa que se guardó el
+    usuario (`suscribir_cambios`) y también si el rol o la matrícula del
+    usuario ya no coinciden con los de la entrada, lo que cubre los cambios
+    hechos por otros workers sobre la base SQLite compartida. Es thread-safe.
+    """
+
+    def __init__(self, user_repo=None):
+        self._lock = threading.Lock()
+        # email -> (rol, matrícula, persona) con que se armó la entrada
+        self._personal: Dict[str, Tuple[Rol, Optional[str], Personal]] = {}
+        if user_repo is not None:
+            user_repo.suscribir_cambios(self.invalidar)
+
+    def enfermera(self, usuario: Usuario) -> Enfermera:
+        """
+        Retorna la enfermera compartida de un usuario con rol ENFERMERA.
+
+        Args:
+            usuario: Usuario autenticado
+
+        Returns:
+            La misma Enfermera para todos los requests del usuario
+        """
+        return self._obtener(usuario, Rol.ENFERMERA)
+
+    def medico(self, usuario: Usuario) -> Doctor:
+        """
+        Retorna el médico compartido de un usuario con rol MEDICO.
+
+        Args:
+            usuario: Usuario autenticado
+
+        Returns:
+            El mismo Doctor para todos los requests del usuario
+        """
+        return self._obtener(usuario, Rol.MEDICO)
+
+    def invalidar(self, email: Optional[str] = None) -> None:
+        """
+        Descarta la entrada de un usuario (o todas).
+
+        Args:
+            email: Email del usuario; None para vaciar el directorio
+        """
+        with self._lock:
+            if email is None:
+                self._personal.clear()
+            else:
+                self._personal.pop(email, None)
+
+    def __len__(self) -> int:
+        return len(self._personal)
+
+    def _obtener(self, usuario: Usuario, rol: Rol) -> Personal:
+        """Retorna la entrada vigente del usuario o la arma"""
+        with self._lock:
+            entrada = self._personal.get(usuario.email)
+            if entrada is not None and entrada[:2] == (usuario.rol, usuario.matricula):
+                return entrada[2]
+            persona = _crear_personal(usuario, rol)
+            self._personal[usuario.email] = (usuario.rol, usuario.matricula, persona)
+            return persona
+
+
+def _crear_personal(usuario: Usuario, rol: Rol) -> Personal:
+    """
+    Arma la enfermera o el médico de un usuario. El usuario no guarda nombre
+    ni apellido, así que el nombre es la parte local del email.
+    """
+    nombre = usuario.email.split("@")[0]
+    if rol == Rol.ENFERMERA:
+        return Enfermera(
+            nombre=nombre,
+            apellido="",
+            matricula=usuario.matricula,
+            cuil="",
+            email=usuario.email
+        )
+    return Doctor(
+        cuil="",
+        nombre=nombre,
+        apellido="",
+        matricula=usuario.matricula,
+        email=usuario.email
+    )
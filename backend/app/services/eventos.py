@@ -0,0 +1,80 @@
+"""Bus de eventos de las transiciones de los ingresos (admisión, reclamo, finalización)"""
+import itertools
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict
+
+from backend.app.models.models import EstadoIngreso, Ingreso
+
+
+EVENTO_ADMISION = "admision"
+EVENTO_RECLAMO = "reclamo"
+EVENTO_FINALIZACION = "finalizacion"
+
+
+@dataclass(frozen=True)
+class EventoIngreso:
+    """Transición de un ingreso"""
+    tipo: str
+    ingreso: Ingreso
+    # Estado del ingreso al momento de la transición (el ingreso puede seguir cambiando)
+    estado: EstadoIngreso
+    # Número de evento, creciente en el orden en que se aplicaron las transiciones
+    secuencia: int
+
+
+class BusEventos:
+    """
+    Registro de suscriptores a las transiciones de los ingresos.
+
+    `publicar` se llama dentro del lock que aplica la transición, así que los
+    suscriptores reciben los eventos en el mismo orden en que cambió el
+    estado. Los callbacks se ejecutan en el hilo que publica y deben ser
+    inmediatos (por ejemplo, pasar el evento a otro hilo o event loop).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._suscriptores: Dict[int, Callable[[EventoIngreso], None]] = {}
+        self._ids = itertools.count(1)
+        self._secuencia = itertools.count(1)
+
+    def suscribir(self, callback: Callable[[EventoIngreso], None]) -> int:
+        """
+        Registra un suscriptor.
+
+        Args:
+            callback: Función que recibe cada evento
+
+        Returns:
+            Identificador de la suscripción (para desuscribir)
+        """
+        with self._lock:
+            suscripcion = next(self._ids)
+            self._suscriptores[suscripcion] = callback
+            return suscripcion
+
+    def desuscribir(self, suscripcion: int) -> None:
+        """Elimina un suscriptor"""
+        with self._lock:
+            self._suscriptores.pop(suscripcion, None)
+
+    def publicar(self, tipo: str, ingreso: Ingreso) -> None:
+        """
+        Notifica una transición a todos los suscriptores.
+
+        Un suscriptor que lanza una excepción se da de baja: un cliente roto
+        no puede afectar a la operación que publicó el evento.
+
+        Args:
+            tipo: Tipo de evento (EVENTO_ADMISION, EVENTO_RECLAMO o EVENTO_FINALIZACION)
+            ingreso: Ingreso que cambió de estado
+        """
+        if not self._suscriptores:
+            return
+        evento = EventoIngreso(tipo, ingreso, ingreso.estado_ingreso, next(self._secuencia))
+        for suscripcion, callback in list(self._suscriptores.items()):
+            try:
+                callback(evento)
+            except Exception:
+                self.desuscribir(suscripcion)
@@ -1,5 +1,6 @@
 from typing import Optional, Dict, List
 from ..models.models import Paciente, Domicilio, ObraSocial, Afiliado
+from ..models.registro_canonico import RegistroCanonico, registro_canonico
 
 
 class InMemoryPacienteRepo:
@@ -89,14 +90,20 @@ def registrar_paciente(
     nombre: str,
     domicilio: Domicilio,
     afiliado: Optional[Afiliado] = None,
-    repo: Optional[InMemoryPacienteRepo] = None
+    repo: Optional[InMemoryPacienteRepo] = None,
+    registro: Optional[RegistroCanonico] = None
 ) -> Paciente:
     """Registra un nuevo paciente. Valida todos los campos mandatorios.
 
+    El domicilio y la obra social del afiliado se reemplazan por sus instancias
+    canónicas del registro (por defecto, el del proceso).
+
     Lanza ValueError en caso de datos inválidos o si la obra social no existe/no está afiliado.
     """
     if repo is None:
         repo = InMemoryPacienteRepo()
+    if registro is None:
+        registro = registro_canonico
 
     # Validar campos mandatorios
     if not cuil or not isinstance(cuil, str):
@@ -146,6 +153,11 @@ def registrar_paciente(
     if repo.get(paciente.cuil) is not None:
         raise ValueError("El paciente ya existe")
 
+    # Compartir los textos del domicilio y la obra social con los demás pacientes
+    registro.internar_domicilio(domicilio)
+    if afiliado is not None:
+        afiliado.obra_social = registro.obra_social(afiliado.obra_social.nombre)
+
     repo.save(paciente)
     return paciente
 
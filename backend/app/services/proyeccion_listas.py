@@ -0,0 +1,154 @@
+"""
+Proyección de las listas de ingresos (modelo de lectura).
+
+Las rutas de lista responden filas planas (IngresoListItem). En lugar de
+armarlas en cada request recorriendo el grafo de cada ingreso (paciente,
+signos vitales, nivel de emergencia), ServicioEmergencias arma la fila una
+sola vez cuando el ingreso entra a una lista y la mantiene aquí, ordenada,
+hasta que sale. Las lecturas copian filas ya armadas y en orden, sin tocar
+los objetos del dominio.
+"""
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass, replace
+from operator import itemgetter
+from typing import Dict, List, Optional, Tuple
+
+from backend.app.models.models import EstadoIngreso, Ingreso
+
+
+_clave = itemgetter(0)
+
+
+@dataclass
+class IngresoListItem:
+    """Schema para item de lista de ingresos pendientes"""
+    id: str
+    cuil_paciente: str
+    nombre_paciente: str
+    apellido_paciente: str
+    nivel_emergencia: str
+    nivel_emergencia_nombre: str
+    estado: str
+    fecha_ingreso: str
+    temperatura: float
+    frecuencia_cardiaca: float
+    frecuencia_respiratoria: float
+    frecuencia_sistolica: float
+    frecuencia_diastolica: float
+
+
+def ingreso_a_list_item(ingreso: Ingreso) -> IngresoListItem:
+    """
+    Convierte un ingreso al schema de item de lista.
+    
+    Args:
+        ingreso: Ingreso a convertir
+        
+    Returns:
+        Item de lista con los datos del ingreso
+    """
+    return IngresoListItem(
+        id=ingreso.id,
+        cuil_paciente=ingreso.cuil_paciente,
+        nombre_paciente=ingreso.paciente.nombre,
+        apellido_paciente=ingreso.paciente.apellido,
+        nivel_emergencia=ingreso.nivel_emergencia.name,
+        nivel_emergencia_nombre=ingreso.nivel_emergencia.value['nombre'],
+        estado=ingreso.estado,
+        fecha_ingreso=ingreso.fecha_ingreso.isoformat(),
+        temperatura=ingreso.temperatura.valor,
+        frecuencia_cardiaca=ingreso.frecuencia_cardiaca.valor,
+        frecuencia_respiratoria=ingreso.frecuencia_respiratoria.valor,
+        frecuencia_sistolica=ingreso.tension_arterial.frecuencia_sistolica,
+        frecuencia_diastolica=ingreso.tension_arterial.frecuencia_diastolica
+    )
+
+
+def fila_con_estado(fila: IngresoListItem, estado: EstadoIngreso) -> IngresoListItem:
+    """
+    Retorna una copia de la fila con otro estado.
+
+    Las filas no se modifican una vez creadas: pueden estar siendo
+    serializadas por otro request o guardadas en el buffer de cambios.
+
+    Args:
+        fila: Fila original
+        estado: Nuevo estado del ingreso
+
+    Returns:
+        Fila con el estado indicado
+    """
+    return replace(fila, estado=estado.value)
+
+
+class ListaFilas:
+    """
+    Filas de una lista de ingresos ordenadas por una clave única (por
+    ejemplo, nivel, fecha de ingreso y orden de llegada).
+
+    Agregar y quitar cuestan una búsqueda binaria más el corrimiento de la
+    lista (memmove, despreciable frente a recorrer los ingresos); leer la
+    lista completa o una página no requiere ordenar. No es thread-safe: la
+    protege el lock de la lista correspondiente del servicio.
+    """
+
+    def __init__(self):
+        self._entradas: List[Tuple[tuple, IngresoListItem]] = []
+        self._clave_por_id: Dict[str, tuple] = {}
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def agregar(self, clave: tuple, fila: IngresoListItem) -> None:
+        """
+        Agrega la fila de un ingreso en la posición de su clave.
+
+        Args:
+            clave: Clave de orden (única)
+            fila: Fila del ingreso
+        """
+        self._clave_por_id[fila.id] = clave
+        insort(self._entradas, (clave, fila), key=_clave)
+
+    def quitar(self, ingreso_id: str) -> Optional[Tuple[tuple, IngresoListItem]]:
+        """
+        Quita la fila de un ingreso.
+
+        Args:
+            ingreso_id: ID del ingreso
+
+        Returns:
+            La entrada quitada (clave, fila), o None si el ingreso no estaba en la lista
+        """
+        clave = self._clave_por_id.pop(ingreso_id, None)
+        if clave is None:
+            return None
+        return self._entradas.pop(bisect_left(self._entradas, clave, key=_clave))
+
+    def vaciar(self) -> None:
+        """Quita todas las filas"""
+        self._entradas.clear()
+        self._clave_por_id.clear()
+
+    def filas(self) -> List[IngresoListItem]:
+        """Todas las filas, en orden"""
+        return [fila for _, fila in self._entradas]
+
+    def posteriores(
+        self,
+        despues_de: Optional[tuple],
+        cantidad: int
+    ) -> List[Tuple[tuple, IngresoListItem]]:
+        """
+        Primeras entradas (clave, fila) con clave mayor que `despues_de`.
+
+        Args:
+            despues_de: Clave de la última entrada ya entregada; None para empezar desde el principio
+            cantidad: Cantidad máxima de entradas
+
+        Returns:
+            Las entradas en orden
+        """
+        inicio = 0 if despues_de is None else bisect_right(self._entradas, despues_de, key=_clave)
+        return self._entradas[inicio:inicio + cantidad]
+
@@ -1,4 +1,12 @@
-from typing import List, Optional, Tuple
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+import base64
+import itertools
+import json
+import threading
 import uuid
 from backend.app.models.models import (
     Enfermera,
@@ -13,17 +21,175 @@ from backend.app.models.models import (
     Atencion,
     EstadoIngreso
 )
+from backend.app.models.registro_canonico import RegistroCanonico, registro_canonico
 from backend.app.interfaces.pacientes_repo import PacientesRepo
+from backend.app.services.cola_prioridad import ColaPrioridadIngresos
+from backend.app.services.proyeccion_listas import (
+    IngresoListItem,
+    ListaFilas,
+    fila_con_estado,
+    ingreso_a_list_item,
+)
+from backend.app.services.eventos import (
+    EVENTO_ADMISION,
+    EVENTO_FINALIZACION,
+    EVENTO_RECLAMO,
+    BusEventos,
+)
+from backend.app.persistence.archivo_ingresos import ArchivoIngresos
+from backend.app.persistence.wal import (
+    WriteAheadLog,
+    registro_admision,
+    registro_archivo,
+    registro_atencion,
+    registro_reclamo,
+)
+
+
+# Un ingreso solo cambia en sus transiciones de estado, que siempre avanzan
+# (PENDIENTE -> EN_PROCESO -> FINALIZADO): su estado alcanza como versión
+_VERSION_POR_ESTADO = {
+    EstadoIngreso.PENDIENTE: 1,
+    EstadoIngreso.EN_PROCESO: 2,
+    EstadoIngreso.FINALIZADO: 3,
+}
+
+
+def _codificar_cursor(epoca: str, lista: str, *clave) -> str:
+    """Arma un cursor opaco con la época, la lista y la clave del último ingreso de una página"""
+    contenido = json.dumps([epoca, lista, *clave], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(contenido).decode("ascii").rstrip("=")
+
+
+def _decodificar_cursor(cursor: str, epoca: str, lista: str) -> list:
+    """
+    Obtiene la clave guardada en un cursor de _codificar_cursor.
+    
+    Raises:
+        ValueError: Si el cursor está mal formado, es de otra lista o de otra época
+    """
+    try:
+        partes = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        raise ValueError("El cursor de paginación no es válido")
+    if not isinstance(partes, list) or partes[:2] != [epoca, lista]:
+        raise ValueError("El cursor de paginación no es válido o está vencido")
+    return partes[2:]
+
+
+@dataclass
+class ResultadoAdmision:
+    """Resultado de una solicitud dentro de un lote de admisiones"""
+    indice: int
+    ingreso: Optional[Ingreso] = None
+    mensaje_advertencia: Optional[str] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class CambiosPendientes:
+    """Cambios de la lista de espera desde una versión anterior"""
+    version: int
+    # Filas de los ingresos que entraron a la lista y siguen en ella, en orden de atención
+    altas: List[IngresoListItem]
+    # IDs de los ingresos que estaban en la lista en la versión pedida y ya salieron
+    bajas: List[str]
+
+
+@dataclass
+class PaginaFilas:
+    """Una página de una lista de ingresos"""
+    filas: List[IngresoListItem]
+    # Cursor para pedir la página siguiente; None si no hay más ingresos
+    cursor_siguiente: Optional[str]
 
 
 class ServicioEmergencias:
-    """Servicio para gestionar el módulo de urgencias"""
+    """
+    Servicio para gestionar el módulo de urgencias.
+
+    Es seguro para usar desde varios hilos (FastAPI ejecuta las rutas sync en un
+    threadpool). El estado se protege con locks de grano fino para que admisiones
+    y reclamos no se bloqueen más de lo necesario:
+
+    - ``_lock_pacientes``: alta automática de pacientes (evita crear dos veces el mismo CUIL)
+    - ``_lock_cola``: cola de pendientes e índice por id
+    - ``_lock_asignaciones``: ingresos en proceso, asignaciones por doctor y finalizados
+
+    Cuando se necesitan dos locks se toman siempre en el orden
+    ``_lock_asignaciones`` -> ``_lock_cola``.
+
+    Si se indica un WAL, cada transición se registra en él dentro del mismo
+    lock que la aplica, y se espera su durabilidad después de liberarlo.
+
+    Cada admisión, reclamo y finalización se publica en ``eventos`` (dentro del
+    lock que la aplica) para que los suscriptores reciban los cambios en orden.
+
+    Si se indica un archivo de ingresos, `archivar_finalizados` mueve los
+    finalizados antiguos a disco y `obtener_ingreso_por_id` los sigue
+    encontrando leyéndolos bajo demanda.
+
+    La lista de espera y la de ingresos en proceso tienen cada una una versión
+    que aumenta con cada cambio (`version_pendientes`, `version_en_proceso`),
+    para que la API responda GET condicionales sin recorrer las listas. Los
+    últimos cambios de la lista de espera se guardan en un buffer circular
+    acotado para poder informar solo lo que cambió desde una versión dada
+    (`obtener_cambios_pendientes`).
     
-    def __init__(self, pacientes_repo: PacientesRepo):
+    Las rutas de lista leen una proyección de esas listas (`obtener_filas_*`,
+    `obtener_pagina_*`): filas planas que se arman una vez, cuando el ingreso
+    entra a la lista, y se actualizan en la misma transición (y con el mismo
+    lock) que la lista y su versión.
+    """
+    
+    def __init__(
+        self,
+        pacientes_repo: PacientesRepo,
+        wal: Optional[WriteAheadLog] = None,
+        archivo: Optional[ArchivoIngresos] = None,
+        max_cambios: int = 1024,
+        registro: Optional[RegistroCanonico] = None
+    ):
         self.pacientes_repo = pacientes_repo
-        self._ingresos_pendientes: List[Ingreso] = []
-        self._ingresos_en_proceso: List[Ingreso] = []
-        self._ingresos_finalizados: List[Ingreso] = []
+        # Obras sociales y textos del domicilio compartidos entre pacientes
+        self._registro = registro if registro is not None else registro_canonico
+        self._wal = wal
+        # Pacientes dados de alta cuyos datos todavía no viajaron en ninguna
+        # admisión del WAL, por CUIL (se agregan con _lock_pacientes y se
+        # sacan con _lock_cola, en la primera admisión que llegue al WAL)
+        self._pacientes_sin_registrar: Dict[str, Paciente] = {}
+        self._archivo = archivo
+        self._lock_pacientes = threading.Lock()
+        self._lock_cola = threading.Lock()
+        self._lock_asignaciones = threading.Lock()
+        # Serializa los archivados (uno a la vez)
+        self._lock_archivado = threading.Lock()
+        self._ingresos_pendientes = ColaPrioridadIngresos()
+        self._ingresos_en_proceso: Dict[str, Ingreso] = {}
+        # Finalizados en orden de finalización (los más antiguos a la izquierda)
+        self._ingresos_finalizados: Deque[Ingreso] = deque()
+        # Índice primario id -> ingreso, válido para todos los estados del ingreso
+        self._ingresos_por_id: Dict[str, Ingreso] = {}
+        # Asignaciones activas email del doctor -> ingreso en proceso
+        self._asignaciones_por_doctor: Dict[str, Ingreso] = {}
+        # Proyección de las listas: filas ordenadas por (nivel, fecha, orden de
+        # llegada) y por orden de reclamo (se modifican con el lock de cada lista)
+        self._filas_pendientes = ListaFilas()
+        self._filas_en_proceso = ListaFilas()
+        self._llegadas = itertools.count(1)
+        self._reclamos = itertools.count(1)
+        # Transiciones de estado de los ingresos
+        self.eventos = BusEventos()
+        # Versiones de las listas (se modifican con el lock de cada lista tomado)
+        self._version_pendientes = 0
+        self._version_en_proceso = 0
+        # Distingue las versiones de esta instancia de las de un proceso anterior
+        self.epoca = uuid.uuid4().hex[:12]
+        # Últimos cambios de la lista de espera: (versión, es_alta, (clave, fila)).
+        # Están todos los posteriores a _cambios_base (se modifican con _lock_cola)
+        self._cambios_pendientes: Deque[Tuple[int, bool, tuple]] = deque()
+        self._cambios_base = 0
+        self._max_cambios = max_cambios
     
     def registrar_urgencia(
         self,
@@ -76,7 +242,112 @@ class ServicioEmergencias:
             ValueError: Si los signos vitales son inválidos o si faltan campos mandatorios
             Exception: Si el paciente no existe y no se proporcionan los datos necesarios para crearlo
         """
-        # Validar campos mandatorios básicos
+        self._validar_campos_obligatorios(
+            cuil, informe, nivel_emergencia, temperatura, frecuencia_cardiaca,
+            frecuencia_respiratoria, frecuencia_sistolica, frecuencia_diastolica
+        )
+
+        # Crear value objects (aquí se validan los valores) antes de dar de alta
+        # al paciente: una admisión inválida no deja pacientes en el repositorio
+        signos = self._crear_signos_vitales(
+            temperatura, frecuencia_cardiaca, frecuencia_respiratoria,
+            frecuencia_sistolica, frecuencia_diastolica
+        )
+
+        with self._lock_pacientes:
+            paciente, mensaje_advertencia = self._obtener_o_crear_paciente(
+                cuil, nombre, apellido, obra_social, numero_afiliado, domicilio
+            )
+
+        ingreso = self._crear_ingreso(paciente, enfermera, nivel_emergencia, informe, signos)
+
+        self._admitir(ingreso)
+
+        return ingreso, mensaje_advertencia
+    
+    def registrar_urgencias_lote(
+        self,
+        enfermera: Enfermera,
+        solicitudes: List[dict]
+    ) -> List[ResultadoAdmision]:
+        """
+        Registra varios ingresos de urgencia en una sola operación (por ejemplo,
+        en un incidente con múltiples víctimas).
+        
+        Cada solicitud tiene los mismos campos que los argumentos de
+        registrar_urgencia (salvo la enfermera). El lote se procesa en tres pasos:
+        
+        1. Una pasada de validación de campos obligatorios y signos vitales, sin locks.
+        2. Alta de todos los pacientes inexistentes con una sola toma del lock de pacientes.
+        3. Inserción de todos los ingresos válidos en la cola en una sola operación.
+        
+        Las solicitudes inválidas no impiden la admisión de las demás.
+        
+        Args:
+            enfermera: Enfermera que registra los ingresos
+            solicitudes: Datos de cada ingreso
+            
+        Returns:
+            Un resultado por solicitud, en el mismo orden
+        """
+        resultados = [ResultadoAdmision(indice) for indice in range(len(solicitudes))]
+        
+        validas = []
+        for resultado, datos in zip(resultados, solicitudes):
+            try:
+                self._validar_campos_obligatorios(
+                    datos.get("cuil"), datos.get("informe"), datos.get("nivel_emergencia"),
+                    datos.get("temperatura"), datos.get("frecuencia_cardiaca"),
+                    datos.get("frecuencia_respiratoria"), datos.get("frecuencia_sistolica"),
+                    datos.get("frecuencia_diastolica")
+                )
+                signos = self._crear_signos_vitales(
+                    datos["temperatura"], datos["frecuencia_cardiaca"], datos["frecuencia_respiratoria"],
+                    datos["frecuencia_sistolica"], datos["frecuencia_diastolica"]
+                )
+            except ValueError as e:
+                resultado.error = str(e)
+                continue
+            validas.append((resultado, datos, signos))
+        
+        admitidos = []
+        with self._lock_pacientes:
+            for resultado, datos, signos in validas:
+                try:
+                    paciente, mensaje_advertencia = self._obtener_o_crear_paciente(
+                        datos["cuil"], datos.get("nombre"), datos.get("apellido"),
+                        datos.get("obra_social"), datos.get("numero_afiliado"), datos.get("domicilio")
+                    )
+                except ValueError as e:
+                    resultado.error = str(e)
+                    continue
+                resultado.ingreso = self._crear_ingreso(
+                    paciente, enfermera, datos["nivel_emergencia"], datos["informe"], signos
+                )
+                resultado.mensaje_advertencia = mensaje_advertencia
+                admitidos.append(resultado.ingreso)
+        
+        if admitidos:
+            self._admitir_lote(admitidos)
+        return resultados
+    
+    @staticmethod
+    def _validar_campos_obligatorios(
+        cuil: Optional[str],
+        informe: Optional[str],
+        nivel_emergencia: Optional[NivelEmergencia],
+        temperatura: Optional[float],
+        frecuencia_cardiaca: Optional[float],
+        frecuencia_respiratoria: Optional[float],
+        frecuencia_sistolica: Optional[float],
+        frecuencia_diastolica: Optional[float]
+    ) -> None:
+        """
+        Valida que estén presentes los campos mandatorios de un ingreso.
+        
+        Raises:
+            ValueError: Si falta algún campo
+        """
         if cuil is None:
             raise ValueError("El campo cuil es obligatorio")
 
@@ -97,70 +368,136 @@ class ServicioEmergencias:
 
         if frecuencia_sistolica is None or frecuencia_diastolica is None:
             raise ValueError("El campo tension arterial es obligatorio")
-
-        mensaje_advertencia = None
-
+    
+    @staticmethod
+    def _crear_signos_vitales(
+        temperatura: float,
+        frecuencia_cardiaca: float,
+        frecuencia_respiratoria: float,
+        frecuencia_sistolica: float,
+        frecuencia_diastolica: float
+    ) -> Tuple[Temperatura, FrecuenciaCardiaca, FrecuenciaRespiratoria, TensionArterial]:
+        """
+        Crea los value objects de signos vitales (aquí se validan los valores).
+        Son inmutables, así que los ingresos con los mismos valores comparten
+        la misma instancia.
+        
+        Raises:
+            ValueError: Si algún valor es inválido
+        """
+        return (
+            Temperatura.compartido(temperatura),
+            FrecuenciaCardiaca.compartido(frecuencia_cardiaca),
+            FrecuenciaRespiratoria.compartido(frecuencia_respiratoria),
+            TensionArterial.compartido(frecuencia_sistolica, frecuencia_diastolica),
+        )
+    
+    def _obtener_o_crear_paciente(
+        self,
+        cuil: str,
+        nombre: Optional[str],
+        apellido: Optional[str],
+        obra_social: Optional[str],
+        numero_afiliado: Optional[str],
+        domicilio: Optional[dict]
+    ) -> Tuple[Paciente, Optional[str]]:
+        """
+        Busca el paciente por CUIL y, si no existe, lo da de alta.
+        
+        Los datos de un paciente nuevo viajan en el WAL con la primera admisión
+        que se registre para su CUIL (que no es necesariamente la que lo creó).
+        
+        Debe llamarse con ``_lock_pacientes`` tomado.
+        
+        Returns:
+            Tupla (paciente, mensaje_advertencia); el mensaje es None si el
+            paciente ya existía
+            
+        Raises:
+            ValueError: Si el paciente no existe y faltan datos para crearlo
+        """
         # Verificar que el paciente existe
         paciente = self.pacientes_repo.obtener_paciente_por_cuil(cuil)
+        if paciente is not None:
+            return paciente, None
 
-        if paciente is None:
-            # Validar campos necesarios para crear el paciente
-            if nombre is None:
-                raise ValueError("El campo nombre es obligatorio")
+        # Validar campos necesarios para crear el paciente
+        if nombre is None:
+            raise ValueError("El campo nombre es obligatorio")
 
-            if apellido is None:
-                raise ValueError("El campo apellido es obligatorio")
+        if apellido is None:
+            raise ValueError("El campo apellido es obligatorio")
 
-            if domicilio is None:
-                raise ValueError("El campo domicilio es obligatorio para crear un paciente nuevo")
+        if domicilio is None:
+            raise ValueError("El campo domicilio es obligatorio para crear un paciente nuevo")
 
-            # Validar obra social y número de afiliado
-            if obra_social and obra_social.strip() and obra_social.lower() != "sin obra social":
-                # Si hay obra social, el número de afiliado es obligatorio
-                if not numero_afiliado or not numero_afiliado.strip():
-                    raise ValueError("El campo número de afiliado es obligatorio cuando se ingresa una obra social")
-            
-            # Si no hay obra social, establecer valor por defecto
-            if not obra_social or not obra_social.strip():
-                obra_social = "sin obra social"
+        # Validar obra social y número de afiliado
+        if obra_social and obra_social.strip() and obra_social.lower() != "sin obra social":
+            # Si hay obra social, el número de afiliado es obligatorio
+            if not numero_afiliado or not numero_afiliado.strip():
+                raise ValueError("El campo número de afiliado es obligatorio cuando se ingresa una obra social")
 
-            # Crear el paciente automáticamente
-            mensaje_advertencia = "El paciente no existe en el sistema y debe ser registrado antes de proceder al ingreso"
-            
-            # Crear objeto Domicilio
-            from backend.app.models.models import Domicilio, ObraSocial, Afiliado
-            domicilio_obj = Domicilio(
-                calle=domicilio.get('calle'),
-                numero=domicilio.get('numero'),
-                localidad=domicilio.get('localidad'),
-                ciudad=domicilio.get('ciudad'),
-                provincia=domicilio.get('provincia'),
-                pais=domicilio.get('pais')
-            )
-            
-            # Crear obra social y afiliado si se proporcionó
-            afiliado = None
-            if obra_social and obra_social.lower() != "sin obra social":
-                obra_social_obj = ObraSocial(obra_social)
-                # Usar el número de afiliado proporcionado o "000000" como fallback
-                num_afiliado = numero_afiliado if numero_afiliado and numero_afiliado.strip() else "000000"
-                afiliado = Afiliado(obra_social_obj, num_afiliado)
-            
-            paciente = Paciente(nombre, apellido, cuil, domicilio_obj, afiliado)
-            self.pacientes_repo.guardar_paciente(paciente)
+        # Si no hay obra social, establecer valor por defecto
+        if not obra_social or not obra_social.strip():
+            obra_social = "sin obra social"
 
-        # Crear value objects (aquí se validan los valores)
-        temp = Temperatura(temperatura)
-        fc = FrecuenciaCardiaca(frecuencia_cardiaca)
-        fr = FrecuenciaRespiratoria(frecuencia_respiratoria)
-        ta = TensionArterial(frecuencia_sistolica, frecuencia_diastolica)
+        # Crear el paciente automáticamente
+        mensaje_advertencia = "El paciente no existe en el sistema y debe ser registrado antes de proceder al ingreso"
 
-        # Generar UUID para el ingreso
-        ingreso_id = str(uuid.uuid4())
+        # Crear objeto Domicilio (con los textos repetidos internados)
+        from backend.app.models.models import Afiliado
+        domicilio_obj = self._registro.domicilio(
+            calle=domicilio.get('calle'),
+            numero=domicilio.get('numero'),
+            localidad=domicilio.get('localidad'),
+            ciudad=domicilio.get('ciudad'),
+            provincia=domicilio.get('provincia'),
+            pais=domicilio.get('pais')
+        )
+
+        # Crear obra social y afiliado si se proporcionó
+        afiliado = None
+        if obra_social and obra_social.lower() != "sin obra social":
+            obra_social_obj = self._registro.obra_social(obra_social)
+            # Usar el número de afiliado proporcionado o "000000" como fallback
+            num_afiliado = numero_afiliado if numero_afiliado and numero_afiliado.strip() else "000000"
+            afiliado = Afiliado(obra_social_obj, num_afiliado)
 
-        # Crear el ingreso
-        ingreso = Ingreso(
-            id_uuid=ingreso_id,
+        paciente = Paciente(nombre, apellido, cuil, domicilio_obj, afiliado)
+        existente = self._guardar_paciente_nuevo(paciente)
+        if existente is not None:
+            # Otro proceso dio de alta el mismo CUIL después de la búsqueda
+            return existente, None
+        if self._wal is not None:
+            self._pacientes_sin_registrar[cuil] = paciente
+        return paciente, mensaje_advertencia
+    
+    def _guardar_paciente_nuevo(self, paciente: Paciente) -> Optional[Paciente]:
+        """
+        Guarda un paciente que no existía al buscarlo. En memoria la búsqueda
+        y el alta ocurren bajo ``_lock_pacientes``, así que nadie pudo crearlo antes.
+        
+        Args:
+            paciente: Paciente nuevo
+            
+        Returns:
+            None si se guardó; el paciente ya existente si otro proceso lo dio de alta antes
+        """
+        self.pacientes_repo.guardar_paciente(paciente)
+        return None
+    
+    @staticmethod
+    def _crear_ingreso(
+        paciente: Paciente,
+        enfermera: Enfermera,
+        nivel_emergencia: NivelEmergencia,
+        informe: str,
+        signos: Tuple[Temperatura, FrecuenciaCardiaca, FrecuenciaRespiratoria, TensionArterial]
+    ) -> Ingreso:
+        """Crea el ingreso con un UUID nuevo a partir de los signos vitales ya validados"""
+        temp, fc, fr, ta = signos
+        return Ingreso(
+            id_uuid=str(uuid.uuid4()),
             paciente=paciente,
             enfermera=enfermera,
             nivel_emergencia=nivel_emergencia,
@@ -170,16 +507,46 @@ class ServicioEmergencias:
             frecuencia_respiratoria=fr,
             tension_arterial=ta
         )
-
-        # Agregar a la lista de ingresos pendientes
-        self._ingresos_pendientes.append(ingreso)
-
-        # Ordenar por prioridad (nivel, menor número = mayor prioridad) y por fecha/hora de llegada
-        self._ingresos_pendientes.sort(
-            key=lambda x: (x.nivel_emergencia.value['nivel'], x.fecha_ingreso)
-        )
-
-        return ingreso, mensaje_advertencia
+    
+    def _admitir(self, ingreso: Ingreso) -> None:
+        """
+        Agrega el ingreso a la cola de pendientes, ordenada por prioridad (nivel,
+        menor número = mayor prioridad) y por fecha/hora de llegada.
+        
+        Args:
+            ingreso: Ingreso ya validado
+        """
+        fila = ingreso_a_list_item(ingreso)
+        with self._lock_cola:
+            lsn = self._registrar_admision_en_wal(ingreso)
+            self._ingresos_pendientes.encolar(ingreso)
+            self._ingresos_por_id[ingreso.id] = ingreso
+            self._version_pendientes += 1
+            self._registrar_cambio_pendiente(True, self._agregar_fila_pendiente(ingreso, fila))
+            self.eventos.publicar(EVENTO_ADMISION, ingreso)
+        self._confirmar_wal(lsn)
+    
+    def _admitir_lote(self, ingresos: List[Ingreso]) -> None:
+        """
+        Agrega varios ingresos a la cola con una sola toma del lock y una sola
+        espera de durabilidad del WAL.
+        
+        Args:
+            ingresos: Ingresos ya validados
+        """
+        filas = [ingreso_a_list_item(ingreso) for ingreso in ingresos]
+        with self._lock_cola:
+            lsn = None
+            for ingreso in ingresos:
+                lsn = self._registrar_admision_en_wal(ingreso)
+            self._ingresos_pendientes.encolar_lote(ingresos)
+            self._version_pendientes += 1
+            for ingreso, fila in zip(ingresos, filas):
+                self._ingresos_por_id[ingreso.id] = ingreso
+                self._registrar_cambio_pendiente(True, self._agregar_fila_pendiente(ingreso, fila))
+                self.eventos.publicar(EVENTO_ADMISION, ingreso)
+        # El group commit hace durables todos los registros anteriores junto con el último
+        self._confirmar_wal(lsn)
     
     def obtener_ingresos_pendientes(self) -> List[Ingreso]:
         """
@@ -188,7 +555,57 @@ class ServicioEmergencias:
         Returns:
             Lista de ingresos pendientes ordenados
         """
-        return self._ingresos_pendientes.copy()
+        with self._lock_cola:
+            return self._ingresos_pendientes.ordenados()
+    
+    def obtener_filas_pendientes(self) -> List[IngresoListItem]:
+        """
+        Obtiene las filas de la lista de espera en orden de atención, desde la
+        proyección (sin recorrer ni ordenar los ingresos).
+        
+        Returns:
+            Filas de los ingresos pendientes
+        """
+        with self._lock_cola:
+            return self._filas_pendientes.filas()
+    
+    def obtener_pagina_pendientes(self, limite: int, cursor: Optional[str] = None) -> PaginaFilas:
+        """
+        Obtiene una página de las filas de la lista de espera, en orden de
+        atención, sin copiar la lista completa.
+        
+        El cursor guarda la clave (nivel, fecha de ingreso, orden de llegada)
+        del último ingreso entregado, así que las páginas siguientes no
+        repiten ni saltean ingresos aunque la lista cambie entre requests:
+        las altas posteriores al cursor aparecen en la página que corresponda.
+        
+        Args:
+            limite: Cantidad máxima de ingresos de la página
+            cursor: Cursor de la página anterior; None para la primera página
+            
+        Returns:
+            Las filas de la página y el cursor de la siguiente
+            
+        Raises:
+            ValueError: Si el cursor no es válido
+        """
+        despues_de = None
+        if cursor is not None:
+            try:
+                nivel, fecha, secuencia = _decodificar_cursor(cursor, self.epoca, "pendientes")
+                despues_de = (int(nivel), datetime.fromisoformat(fecha), int(secuencia))
+            except (TypeError, ValueError):
+                raise ValueError("El cursor de paginación no es válido o está vencido")
+        
+        with self._lock_cola:
+            # Uno más que el límite para saber si hay página siguiente
+            entradas = self._filas_pendientes.posteriores(despues_de, limite + 1)
+        
+        siguiente = None
+        if len(entradas) > limite:
+            nivel, fecha, secuencia = entradas[limite - 1][0]
+            siguiente = _codificar_cursor(self.epoca, "pendientes", nivel, fecha.isoformat(), secuencia)
+        return PaginaFilas([fila for _, fila in entradas[:limite]], siguiente)
     
     def atender_siguiente(self) -> Ingreso:
         """
@@ -200,11 +617,16 @@ class ServicioEmergencias:
         Raises:
             Exception: Si no hay pacientes pendientes
         """
-        if not self._ingresos_pendientes:
-            raise Exception("No hay pacientes pendientes para atender")
-        
-        ingreso = self._ingresos_pendientes.pop(0)
-        ingreso.estado_ingreso = ingreso.estado_ingreso.__class__.EN_PROCESO
+        with self._lock_cola:
+            if not self._ingresos_pendientes:
+                raise Exception("No hay pacientes pendientes para atender")
+            
+            ingreso, lsn = self._desencolar_y_registrar(None)
+            self._version_pendientes += 1
+            self._registrar_cambio_pendiente(False, self._filas_pendientes.quitar(ingreso.id))
+            ingreso.estado_ingreso = ingreso.estado_ingreso.__class__.EN_PROCESO
+            self.eventos.publicar(EVENTO_RECLAMO, ingreso)
+        self._confirmar_wal(lsn)
         return ingreso
     
     def reclamar_siguiente_paciente(self, doctor: Doctor) -> Ingreso:
@@ -226,40 +648,107 @@ class ServicioEmergencias:
         if not doctor:
             raise ValueError("El doctor es obligatorio")
         
-        # Verificar que el doctor no tenga otro paciente en proceso
-        for ingreso in self._ingresos_en_proceso:
-            if ingreso.doctor_asignado and ingreso.doctor_asignado.email == doctor.email:
+        with self._lock_asignaciones:
+            # Verificar que el doctor no tenga otro paciente en proceso
+            ingreso = self._asignaciones_por_doctor.get(doctor.email)
+            if ingreso is not None:
                 raise ValueError(
                     f"El doctor ya tiene un paciente en revisión. "
                     f"Debe finalizar la atención del paciente {ingreso.paciente.nombre} "
                     f"{ingreso.paciente.apellido} antes de reclamar otro."
                 )
+            
+            # Obtener el primer paciente (mayor prioridad); solo esta parte
+            # compite con las admisiones concurrentes
+            with self._lock_cola:
+                if not self._ingresos_pendientes:
+                    raise ValueError("No hay pacientes en la lista de espera")
+                ingreso, lsn = self._desencolar_y_registrar(doctor)
+                self._version_pendientes += 1
+                entrada = self._filas_pendientes.quitar(ingreso.id)
+                self._registrar_cambio_pendiente(False, entrada)
+            
+            # Cambiar estado a EN_PROCESO
+            ingreso.estado_ingreso = EstadoIngreso.EN_PROCESO
+            
+            # Asignar doctor al ingreso
+            ingreso.doctor_asignado = doctor
+            
+            # Agregar a ingresos en proceso
+            self._ingresos_en_proceso[ingreso.id] = ingreso
+            self._filas_en_proceso.agregar(
+                (next(self._reclamos),), fila_con_estado(entrada[1], EstadoIngreso.EN_PROCESO)
+            )
+            self._asignaciones_por_doctor[doctor.email] = ingreso
+            self._version_en_proceso += 1
+            self.eventos.publicar(EVENTO_RECLAMO, ingreso)
+        self._confirmar_wal(lsn)
         
-        if not self._ingresos_pendientes:
-            raise ValueError("No hay pacientes en la lista de espera")
+        return ingreso
+    
+    def obtener_ingresos_en_proceso(self) -> List[Ingreso]:
+        """
+        Obtiene la lista de ingresos que están siendo atendidos (estado EN_PROCESO).
         
-        # Obtener el primer paciente (mayor prioridad)
-        ingreso = self._ingresos_pendientes.pop(0)
+        Returns:
+            Lista de ingresos en proceso
+        """
+        with self._lock_asignaciones:
+            return list(self._ingresos_en_proceso.values())
+    
+    def obtener_filas_en_proceso(self) -> List[IngresoListItem]:
+        """
+        Obtiene las filas de la lista de ingresos en proceso, en orden de
+        reclamo, desde la proyección.
         
-        # Cambiar estado a EN_PROCESO
-        ingreso.estado_ingreso = EstadoIngreso.EN_PROCESO
+        Returns:
+            Filas de los ingresos en proceso
+        """
+        with self._lock_asignaciones:
+            return self._filas_en_proceso.filas()
+    
+    def obtener_pagina_en_proceso(self, limite: int, cursor: Optional[str] = None) -> PaginaFilas:
+        """
+        Obtiene una página de las filas de la lista de ingresos en proceso, en
+        orden de reclamo.
         
-        # Asignar doctor al ingreso
-        ingreso.doctor_asignado = doctor
+        Args:
+            limite: Cantidad máxima de ingresos de la página
+            cursor: Cursor de la página anterior; None para la primera página
+            
+        Returns:
+            Las filas de la página y el cursor de la siguiente
+            
+        Raises:
+            ValueError: Si el cursor no es válido
+        """
+        despues_de = None
+        if cursor is not None:
+            try:
+                (orden,) = _decodificar_cursor(cursor, self.epoca, "en_proceso")
+                despues_de = (int(orden),)
+            except (TypeError, ValueError):
+                raise ValueError("El cursor de paginación no es válido o está vencido")
         
-        # Agregar a lista de ingresos en proceso
-        self._ingresos_en_proceso.append(ingreso)
+        with self._lock_asignaciones:
+            entradas = self._filas_en_proceso.posteriores(despues_de, limite + 1)
         
-        return ingreso
+        siguiente = None
+        if len(entradas) > limite:
+            siguiente = _codificar_cursor(self.epoca, "en_proceso", *entradas[limite - 1][0])
+        return PaginaFilas([fila for _, fila in entradas[:limite]], siguiente)
     
-    def obtener_ingresos_en_proceso(self) -> List[Ingreso]:
+    def obtener_ingreso_asignado(self, email_doctor: str) -> Optional[Ingreso]:
         """
-        Obtiene la lista de ingresos que están siendo atendidos (estado EN_PROCESO).
+        Obtiene en O(1) el ingreso que el doctor tiene actualmente en revisión.
         
+        Args:
+            email_doctor: Email del doctor
+            
         Returns:
-            Lista de ingresos en proceso
+            El ingreso en proceso asignado al doctor o None si no tiene ninguno
         """
-        return self._ingresos_en_proceso.copy()
+        return self._asignaciones_por_doctor.get(email_doctor)
     
     def registrar_atencion(self, ingreso_id: str, doctor: Doctor, informe: str) -> Atencion:
         """
@@ -286,34 +775,41 @@ class ServicioEmergencias:
         if not doctor:
             raise ValueError("El doctor es obligatorio")
         
-        # Buscar el ingreso en la lista de ingresos en proceso
-        ingreso = None
-        for ing in self._ingresos_en_proceso:
-            if ing.id == ingreso_id:
-                ingreso = ing
-                break
+        with self._lock_asignaciones:
+            # Buscar el ingreso entre los ingresos en proceso
+            ingreso = self._ingresos_en_proceso.get(ingreso_id)
         
-        if not ingreso:
-            raise ValueError("El ingreso no existe o no está en proceso")
+            if not ingreso:
+                raise ValueError("El ingreso no existe o no está en proceso")
         
-        # Crear la atención
-        atencion = Atencion(doctor=doctor, informe=informe, ingreso=ingreso)
+            # Crear la atención
+            atencion = Atencion(doctor=doctor, informe=informe, ingreso=ingreso)
+            lsn = self._registrar_en_wal(registro_atencion(ingreso.id, atencion))
         
-        # Asociar la atención al ingreso
-        ingreso.atencion = atencion
+            # Asociar la atención al ingreso
+            ingreso.atencion = atencion
         
-        # Cambiar estado a FINALIZADO
-        ingreso.estado_ingreso = EstadoIngreso.FINALIZADO
+            # Cambiar estado a FINALIZADO
+            ingreso.estado_ingreso = EstadoIngreso.FINALIZADO
         
-        # Mover de en_proceso a finalizados
-        self._ingresos_en_proceso.remove(ingreso)
-        self._ingresos_finalizados.append(ingreso)
+            # Mover de en_proceso a finalizados
+            del self._ingresos_en_proceso[ingreso.id]
+            self._filas_en_proceso.quitar(ingreso.id)
+            if ingreso.doctor_asignado is not None:
+                self._asignaciones_por_doctor.pop(ingreso.doctor_asignado.email, None)
+            self._ingresos_finalizados.append(ingreso)
+            self._version_en_proceso += 1
+            self.eventos.publicar(EVENTO_FINALIZACION, ingreso)
+        self._confirmar_wal(lsn)
         
         return atencion
     
     def obtener_ingreso_por_id(self, ingreso_id: str) -> Optional[Ingreso]:
         """
-        Obtiene un ingreso por su ID, buscando en todas las listas.
+        Obtiene un ingreso por su ID en O(1), sin importar su estado.
+        
+        Los ingresos archivados se leen desde disco; el resultado no queda
+        en memoria.
         
         Args:
             ingreso_id: ID del ingreso a buscar
@@ -321,19 +817,258 @@ class ServicioEmergencias:
         Returns:
             El ingreso encontrado o None si no existe
         """
-        # Buscar en pendientes
-        for ingreso in self._ingresos_pendientes:
-            if ingreso.id == ingreso_id:
-                return ingreso
+        ingreso = self._ingresos_por_id.get(ingreso_id)
+        if ingreso is None and self._archivo is not None:
+            ingreso = self._archivo.obtener(ingreso_id, self.pacientes_repo)
+        return ingreso
+    
+    def version_pendientes(self) -> int:
+        """
+        Versión de la lista de espera: aumenta con cada admisión o reclamo.
         
-        # Buscar en proceso
-        for ingreso in self._ingresos_en_proceso:
-            if ingreso.id == ingreso_id:
-                return ingreso
+        Debe leerse antes que la lista: si hay un cambio entre ambas lecturas,
+        la versión queda más vieja que la lista obtenida y el próximo GET
+        condicional simplemente la vuelve a enviar.
         
-        # Buscar en finalizados
-        for ingreso in self._ingresos_finalizados:
-            if ingreso.id == ingreso_id:
-                return ingreso
+        Returns:
+            Versión actual de la lista de espera
+        """
+        return self._version_pendientes
+    
+    def obtener_cambios_pendientes(self, desde: int) -> Optional[CambiosPendientes]:
+        """
+        Obtiene los cambios de la lista de espera posteriores a una versión.
         
+        Un ingreso que entró y salió de la lista después de `desde` no aparece.
+        La prioridad de un ingreso no cambia mientras espera, así que no hay
+        reordenamientos: cada alta se ubica por nivel y fecha de ingreso.
+        
+        Args:
+            desde: Versión de la lista que tiene el cliente
+            
+        Returns:
+            Los cambios hasta la versión actual, o None si ya no están en el
+            buffer (o la versión no corresponde a esta instancia) y el cliente
+            debe pedir la lista completa
+        """
+        with self._lock_cola:
+            if desde < self._cambios_base or desde > self._version_pendientes:
+                return None
+            altas: Dict[str, tuple] = {}
+            bajas = []
+            # Solo se recorren los cambios posteriores a `desde`, del más reciente hacia atrás
+            posteriores = []
+            for cambio in reversed(self._cambios_pendientes):
+                if cambio[0] <= desde:
+                    break
+                posteriores.append(cambio)
+            for _, es_alta, (clave, fila) in reversed(posteriores):
+                if es_alta:
+                    altas[fila.id] = (clave, fila)
+                elif altas.pop(fila.id, None) is None:
+                    bajas.append(fila.id)
+            version = self._version_pendientes
+        
+        ordenadas = [fila for _, fila in sorted(altas.values(), key=lambda entrada: entrada[0])]
+        return CambiosPendientes(version=version, altas=ordenadas, bajas=bajas)
+    
+    def version_en_proceso(self) -> int:
+        """
+        Versión de la lista de ingresos en proceso: aumenta con cada reclamo
+        o atención registrada. Debe leerse antes que la lista (ver version_pendientes).
+        
+        Returns:
+            Versión actual de la lista de ingresos en proceso
+        """
+        return self._version_en_proceso
+    
+    def version_ingreso(self, ingreso_id: str) -> Optional[int]:
+        """
+        Versión de un ingreso, sin leer los archivados desde disco.
+        
+        Args:
+            ingreso_id: ID del ingreso
+            
+        Returns:
+            Versión del ingreso o None si no existe
+        """
+        ingreso = self._ingresos_por_id.get(ingreso_id)
+        if ingreso is not None:
+            return _VERSION_POR_ESTADO[ingreso.estado_ingreso]
+        if self._archivo is not None and self._archivo.contiene(ingreso_id):
+            return _VERSION_POR_ESTADO[EstadoIngreso.FINALIZADO]
         return None
+    
+    def archivar_finalizados(self, antiguedad: timedelta, ahora: Optional[datetime] = None) -> int:
+        """
+        Mueve a disco los ingresos finalizados hace más de `antiguedad`.
+        
+        Los ingresos se escriben en el archivo fuera de los locks y recién
+        después se sacan de memoria, así que en todo momento se encuentran
+        en alguno de los dos lugares. El WAL registra el archivado para que
+        un replay los descarte apenas lo encuentra (no hace falta esperar
+        su fsync: si se pierde, cargar_ingresos los descarta igual).
+        
+        Args:
+            antiguedad: Tiempo mínimo desde la finalización para archivar un ingreso
+            ahora: Momento de referencia (por defecto, el actual)
+            
+        Returns:
+            Cantidad de ingresos archivados (0 si no hay archivo configurado)
+        """
+        if self._archivo is None:
+            return 0
+        
+        limite = (ahora or datetime.now()) - antiguedad
+        with self._lock_archivado:
+            with self._lock_asignaciones:
+                candidatos = []
+                for ingreso in self._ingresos_finalizados:
+                    if self._fecha_finalizacion(ingreso) > limite:
+                        break
+                    candidatos.append(ingreso)
+            if not candidatos:
+                return 0
+            
+            self._archivo.archivar(candidatos)
+            
+            # Solo se agregan finalizados por la derecha, así que los
+            # candidatos siguen siendo los primeros de la lista
+            with self._lock_asignaciones, self._lock_cola:
+                for _ in candidatos:
+                    ingreso = self._ingresos_finalizados.popleft()
+                    self._ingresos_por_id.pop(ingreso.id, None)
+                self._registrar_en_wal(registro_archivo([ingreso.id for ingreso in candidatos]))
+        return len(candidatos)
+    
+    def cargar_ingresos(self, ingresos: Iterable[Ingreso]) -> None:
+        """
+        Carga ingresos reconstruidos desde disco (WAL o snapshot) sin registrarlos en el WAL.
+        
+        Cada ingreso se ubica según su estado. Dentro de cada estado se respeta el
+        orden recibido: orden de admisión para pendientes, de reclamo para los que
+        están en proceso y de finalización para los finalizados.
+        
+        Args:
+            ingresos: Ingresos a cargar
+        """
+        with self._lock_asignaciones, self._lock_cola:
+            for ingreso in ingresos:
+                self._ingresos_por_id[ingreso.id] = ingreso
+                if ingreso.estado_ingreso == EstadoIngreso.PENDIENTE:
+                    self._ingresos_pendientes.encolar(ingreso)
+                    self._agregar_fila_pendiente(ingreso, ingreso_a_list_item(ingreso))
+                elif ingreso.estado_ingreso == EstadoIngreso.EN_PROCESO:
+                    # Los ingresos tomados con atender_siguiente no tienen doctor
+                    # ni figuran en la lista de ingresos en proceso
+                    if ingreso.doctor_asignado is not None:
+                        self._ingresos_en_proceso[ingreso.id] = ingreso
+                        self._filas_en_proceso.agregar((next(self._reclamos),), ingreso_a_list_item(ingreso))
+                        self._asignaciones_por_doctor[ingreso.doctor_asignado.email] = ingreso
+                elif self._archivo is None or not self._archivo.contiene(ingreso.id):
+                    self._ingresos_finalizados.append(ingreso)
+                else:
+                    # Ya archivado antes de que el WAL o el snapshot lo volvieran a cargar
+                    del self._ingresos_por_id[ingreso.id]
+            self._version_pendientes += 1
+            self._version_en_proceso += 1
+            # Los cambios anteriores a la carga ya no alcanzan para reconstruir la lista
+            self._cambios_pendientes.clear()
+            self._cambios_base = self._version_pendientes
+    
+    @contextmanager
+    def bloquear_estado(self) -> Iterator[None]:
+        """
+        Toma todos los locks del servicio para obtener una vista consistente del estado.
+        
+        Mientras está tomado no se aplican admisiones, reclamos ni atenciones.
+        Se usa, por ejemplo, para hacer el fork de un snapshot.
+        """
+        with self._lock_pacientes, self._lock_asignaciones, self._lock_cola:
+            yield
+    
+    def exportar_ingresos(self) -> List[Ingreso]:
+        """
+        Retorna todos los ingresos en memoria en el orden que espera cargar_ingresos.
+        
+        No toma locks: debe llamarse dentro de bloquear_estado() o en un proceso
+        hijo creado mientras ese bloqueo estaba tomado.
+        
+        Returns:
+            Pendientes en orden de atención, luego en proceso y luego finalizados
+        """
+        en_proceso = list(self._ingresos_en_proceso.values())
+        # Ingresos tomados con atender_siguiente: solo figuran en el índice por id
+        sin_doctor = [
+            ingreso for ingreso in self._ingresos_por_id.values()
+            if ingreso.estado_ingreso == EstadoIngreso.EN_PROCESO and ingreso.doctor_asignado is None
+        ]
+        return self._ingresos_pendientes.ordenados() + en_proceso + sin_doctor + list(self._ingresos_finalizados)
+    
+    @staticmethod
+    def _fecha_finalizacion(ingreso: Ingreso) -> datetime:
+        """Fecha de la atención que finalizó el ingreso (o de ingreso si no tiene)"""
+        return ingreso.atencion.fecha if ingreso.atencion else ingreso.fecha_ingreso
+    
+    def _agregar_fila_pendiente(self, ingreso: Ingreso, fila: IngresoListItem) -> tuple:
+        """
+        Agrega la fila de un ingreso a la proyección de la lista de espera, con
+        la misma prioridad que en la cola. Debe llamarse con ``_lock_cola`` tomado.
+        
+        Returns:
+            La entrada agregada (clave, fila)
+        """
+        clave = (ingreso.nivel_emergencia.value['nivel'], ingreso.fecha_ingreso, next(self._llegadas))
+        self._filas_pendientes.agregar(clave, fila)
+        return clave, fila
+    
+    def _registrar_cambio_pendiente(self, es_alta: bool, entrada: tuple) -> None:
+        """
+        Agrega un cambio de la lista de espera (entrada (clave, fila) de la
+        proyección) al buffer con la versión actual, descartando el más antiguo
+        si está lleno. Debe llamarse con ``_lock_cola`` tomado.
+        """
+        self._cambios_pendientes.append((self._version_pendientes, es_alta, entrada))
+        if len(self._cambios_pendientes) > self._max_cambios:
+            self._cambios_base = self._cambios_pendientes.popleft()[0]
+    
+    def _registrar_en_wal(self, registro: dict) -> Optional[int]:
+        """Agrega un registro al WAL (si hay uno configurado) y retorna su LSN"""
+        if self._wal is None:
+            return None
+        return self._wal.registrar(registro)
+    
+    def _desencolar_y_registrar(self, doctor: Optional[Doctor]) -> Tuple[Ingreso, Optional[int]]:
+        """
+        Quita el ingreso de mayor prioridad de la cola y registra su reclamo en
+        el WAL, antes de cualquier otro cambio de estado. Debe llamarse con
+        ``_lock_cola`` tomado.
+        
+        Raises:
+            RuntimeError: Si el WAL no acepta el registro (el ingreso vuelve a la
+                cola con su misma prioridad; su fila y la versión no cambiaron)
+        """
+        ingreso = self._ingresos_pendientes.desencolar()
+        try:
+            lsn = self._registrar_en_wal(registro_reclamo(ingreso.id, doctor))
+        except BaseException:
+            self._ingresos_pendientes.encolar(ingreso)
+            raise
+        return ingreso, lsn
+    
+    def _registrar_admision_en_wal(self, ingreso: Ingreso) -> Optional[int]:
+        """
+        Agrega al WAL la admisión de un ingreso, con los datos de su paciente si
+        todavía no se registraron. Debe llamarse con ``_lock_cola`` tomado: así
+        el registro con los datos del paciente precede a cualquier otra admisión
+        de su CUIL, aunque la haya iniciado una request que no lo creó.
+        """
+        if self._wal is None:
+            return None
+        paciente_nuevo = self._pacientes_sin_registrar.pop(ingreso.paciente.cuil, None)
+        return self._wal.registrar(registro_admision(ingreso, paciente_nuevo))
+    
+    def _confirmar_wal(self, lsn: Optional[int]) -> None:
+        """Espera la durabilidad del registro según la configuración del WAL"""
+        if lsn is not None:
+            self._wal.confirmar(lsn)
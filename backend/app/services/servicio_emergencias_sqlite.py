@@ -0,0 +1,488 @@
+"""
+Servicio de urgencias sobre la base SQLite compartida.
+
+Misma interfaz que ServicioEmergencias, pero la lista de espera, los ingresos
+en proceso y los finalizados viven en la tabla `ingresos`, así que varios
+procesos (workers de uvicorn) comparten una única guardia. Cada transición
+es una transacción: el reclamo toma el lock de escritura de SQLite (BEGIN
+IMMEDIATE) antes de elegir al siguiente paciente, por lo que dos workers
+nunca reclaman el mismo ingreso, y un índice único impide que un doctor
+tenga dos ingresos en proceso.
+
+Los eventos de `eventos` solo incluyen las transiciones hechas por este
+proceso; los de otros workers no se ven. Las versiones de las listas, en
+cambio, viven en la tabla `versiones` (las actualizan triggers), así que
+reflejan los cambios de todos los workers. No hay buffer de cambios de la
+lista de espera: `obtener_cambios_pendientes` siempre remite a la lista completa.
+
+Las escrituras se serializan en el lock de escritura de SQLite, así que
+dentro de cada transacción solo se leen y escriben filas: los JSON se arman
+antes de abrirla y los ingresos se reconstruyen después del COMMIT.
+
+La proyección de las listas es la columna `fila`: la fila de lista de cada
+ingreso se arma una vez al insertarlo, y las lecturas de lista solo leen esa
+columna y el estado, sin reconstruir ingresos ni pacientes.
+"""
+import json
+from dataclasses import asdict
+from typing import Iterable, List, Optional, Tuple
+
+from backend.app.interfaces.pacientes_repo import PacientesRepo
+from backend.app.models.models import Atencion, Doctor, EstadoIngreso, Ingreso, Paciente
+from backend.app.persistence.serializacion import (
+    atencion_a_dict,
+    ingreso_a_dict,
+    ingreso_desde_dict,
+    paciente_a_dict,
+    paciente_desde_dict,
+    personal_a_dict,
+)
+from backend.app.repositories.sqlite_db import BaseSQLite
+from backend.app.services.proyeccion_listas import IngresoListItem, ingreso_a_list_item
+from backend.app.services.servicio_emergencias import (
+    _VERSION_POR_ESTADO,
+    _codificar_cursor,
+    _decodificar_cursor,
+    CambiosPendientes,
+    PaginaFilas,
+    ServicioEmergencias,
+)
+from backend.app.services.eventos import EVENTO_ADMISION, EVENTO_FINALIZACION, EVENTO_RECLAMO
+
+
+_SELECT_INGRESO = (
+    "SELECT i.datos, i.estado, i.doctor, i.atencion, p.datos "
+    "FROM ingresos i JOIN pacientes p ON p.cuil = i.cuil"
+)
+_LISTA_EN_PROCESO = "WHERE i.estado = 'EN_PROCESO' AND i.doctor_email IS NOT NULL"
+_ORDEN_COLA = "ORDER BY i.nivel, i.fecha, i.seq"
+
+
+class ServicioEmergenciasSQLite(ServicioEmergencias):
+    """Servicio de urgencias cuyo estado se comparte entre procesos vía SQLite"""
+
+    def __init__(self, db: BaseSQLite, pacientes_repo: PacientesRepo):
+        super().__init__(pacientes_repo)
+        self.db = db
+        # Todos los workers comparten la época de la base
+        self.epoca = str(self._leer_version("epoca"))
+
+    def _guardar_paciente_nuevo(self, paciente: Paciente) -> Optional[Paciente]:
+        """
+        Inserta el paciente solo si su CUIL no existe. `_lock_pacientes` no
+        alcanza a los demás workers: si dos admiten a la vez el mismo CUIL
+        nuevo, uno solo lo inserta y el otro usa el paciente ya guardado (y no
+        informa que lo creó).
+
+        Returns:
+            None si se insertó; el paciente existente si otro worker lo insertó antes
+        """
+        datos = json.dumps(paciente_a_dict(paciente), ensure_ascii=False)
+        with self.db.transaccion() as conexion:
+            insertados = conexion.execute(
+                "INSERT INTO pacientes (cuil, datos) VALUES (?, ?) ON CONFLICT (cuil) DO NOTHING",
+                (paciente.cuil, datos)
+            ).rowcount
+        if insertados == 1:
+            return None
+        return self.pacientes_repo.obtener_paciente_por_cuil(paciente.cuil)
+
+    def _admitir(self, ingreso: Ingreso) -> None:
+        """Inserta el ingreso como pendiente (la cola es el índice idx_ingresos_cola)"""
+        fila = self._fila(ingreso)
+        with self.db.transaccion() as conexion:
+            self._insertar(conexion, fila)
+        self.eventos.publicar(EVENTO_ADMISION, ingreso)
+
+    def _admitir_lote(self, ingresos: List[Ingreso]) -> None:
+        """Inserta todos los ingresos del lote en una sola transacción"""
+        filas = [self._fila(ingreso) for ingreso in ingresos]
+        with self.db.transaccion() as conexion:
+            for fila in filas:
+                self._insertar(conexion, fila)
+        for ingreso in ingresos:
+            self.eventos.publicar(EVENTO_ADMISION, ingreso)
+
+    def obtener_ingresos_pendientes(self) -> List[Ingreso]:
+        """
+        Obtiene la lista de ingresos pendientes ordenados por prioridad y hora de llegada.
+
+        Returns:
+            Lista de ingresos pendientes ordenados
+        """
+        return self._consultar(f"WHERE i.estado = 'PENDIENTE' {_ORDEN_COLA}")
+
+    def obtener_filas_pendientes(self) -> List[IngresoListItem]:
+        """
+        Obtiene las filas de la lista de espera en orden de atención.
+
+        Returns:
+            Filas de los ingresos pendientes
+        """
+        return [fila for _, fila in self._consultar_filas("i.seq", f"WHERE i.estado = 'PENDIENTE' {_ORDEN_COLA}")]
+
+    def obtener_pagina_pendientes(self, limite: int, cursor: Optional[str] = None) -> PaginaFilas:
+        """
+        Obtiene una página de las filas de la lista de espera, en orden de atención.
+
+        El cursor guarda la clave (nivel, fecha, seq) del último ingreso
+        entregado y la página siguiente es un rango de idx_ingresos_cola, así
+        que cualquier worker puede continuar la paginación.
+
+        Args:
+            limite: Cantidad máxima de ingresos de la página
+            cursor: Cursor de la página anterior; None para la primera página
+
+        Returns:
+            Las filas de la página y el cursor de la siguiente
+
+        Raises:
+            ValueError: Si el cursor no es válido
+        """
+        condicion, parametros = "WHERE i.estado = 'PENDIENTE'", ()
+        if cursor is not None:
+            try:
+                nivel, fecha, seq = _decodificar_cursor(cursor, self.epoca, "pendientes")
+                parametros = (int(nivel), str(fecha), int(seq))
+            except (TypeError, ValueError):
+                raise ValueError("El cursor de paginación no es válido o está vencido")
+            condicion += " AND (i.nivel, i.fecha, i.seq) > (?, ?, ?)"
+
+        filas = self._consultar_filas(
+            "i.nivel, i.fecha, i.seq", f"{condicion} {_ORDEN_COLA} LIMIT ?", parametros + (limite + 1,)
+        )
+        siguiente = None
+        if len(filas) > limite:
+            siguiente = _codificar_cursor(self.epoca, "pendientes", *filas[limite - 1][0])
+        return PaginaFilas([fila for _, fila in filas[:limite]], siguiente)
+
+    def atender_siguiente(self) -> Ingreso:
+        """
+        Atiende al siguiente paciente en la cola de urgencias.
+
+        Returns:
+            El ingreso atendido
+
+        Raises:
+            Exception: Si no hay pacientes pendientes
+        """
+        with self.db.transaccion() as conexion:
+            seq = self._siguiente_pendiente(conexion)
+            if seq is None:
+                raise Exception("No hay pacientes pendientes para atender")
+            conexion.execute("UPDATE ingresos SET estado = 'EN_PROCESO' WHERE seq = ?", (seq,))
+            fila = conexion.execute(f"{_SELECT_INGRESO} WHERE i.seq = ?", (seq,)).fetchone()
+        ingreso = self._reconstruir(*fila)
+        self.eventos.publicar(EVENTO_RECLAMO, ingreso)
+        return ingreso
+
+    def reclamar_siguiente_paciente(self, doctor: Doctor) -> Ingreso:
+        """
+        Reclama el siguiente paciente en la lista de espera para ser atendido por un médico.
+
+        La elección y la actualización ocurren en la misma transacción de
+        escritura, así que el reclamo es atómico entre procesos.
+
+        Args:
+            doctor: Médico que reclama el paciente
+
+        Returns:
+            El ingreso reclamado
+
+        Raises:
+            ValueError: Si no hay pacientes en la lista de espera o si el doctor ya tiene un paciente en revisión
+        """
+        if not doctor:
+            raise ValueError("El doctor es obligatorio")
+
+        datos_doctor = json.dumps(personal_a_dict(doctor), ensure_ascii=False)
+        with self.db.transaccion() as conexion:
+            actual = conexion.execute(
+                f"{_SELECT_INGRESO} WHERE i.estado = 'EN_PROCESO' AND i.doctor_email = ?", (doctor.email,)
+            ).fetchone()
+            if actual:
+                paciente = self._reconstruir(*actual).paciente
+                raise ValueError(
+                    f"El doctor ya tiene un paciente en revisión. "
+                    f"Debe finalizar la atención del paciente {paciente.nombre} "
+                    f"{paciente.apellido} antes de reclamar otro."
+                )
+
+            seq = self._siguiente_pendiente(conexion)
+            if seq is None:
+                raise ValueError("No hay pacientes en la lista de espera")
+            conexion.execute(
+                "UPDATE ingresos SET estado = 'EN_PROCESO', doctor_email = ?, doctor = ? WHERE seq = ?",
+                (doctor.email, datos_doctor, seq)
+            )
+            fila = conexion.execute(f"{_SELECT_INGRESO} WHERE i.seq = ?", (seq,)).fetchone()
+        ingreso = self._reconstruir(*fila)
+        self.eventos.publicar(EVENTO_RECLAMO, ingreso)
+        return ingreso
+
+    def obtener_ingresos_en_proceso(self) -> List[Ingreso]:
+        """
+        Obtiene la lista de ingresos que están siendo atendidos (estado EN_PROCESO).
+
+        Returns:
+            Lista de ingresos en proceso
+        """
+        return self._consultar(f"{_LISTA_EN_PROCESO} ORDER BY i.seq")
+
+    def obtener_filas_en_proceso(self) -> List[IngresoListItem]:
+        """
+        Obtiene las filas de la lista de ingresos en proceso, en el mismo
+        orden que obtener_ingresos_en_proceso.
+
+        Returns:
+            Filas de los ingresos en proceso
+        """
+        return [fila for _, fila in self._consultar_filas("i.seq", f"{_LISTA_EN_PROCESO} ORDER BY i.seq")]
+
+    def obtener_pagina_en_proceso(self, limite: int, cursor: Optional[str] = None) -> PaginaFilas:
+        """
+        Obtiene una página de las filas de la lista de ingresos en proceso, en
+        el mismo orden que obtener_ingresos_en_proceso.
+
+        Args:
+            limite: Cantidad máxima de ingresos de la página
+            cursor: Cursor de la página anterior; None para la primera página
+
+        Returns:
+            Las filas de la página y el cursor de la siguiente
+
+        Raises:
+            ValueError: Si el cursor no es válido
+        """
+        despues_de = 0
+        if cursor is not None:
+            try:
+                (despues_de,) = _decodificar_cursor(cursor, self.epoca, "en_proceso")
+                despues_de = int(despues_de)
+            except (TypeError, ValueError):
+                raise ValueError("El cursor de paginación no es válido o está vencido")
+
+        filas = self._consultar_filas(
+            "i.seq", f"{_LISTA_EN_PROCESO} AND i.seq > ? ORDER BY i.seq LIMIT ?", (despues_de, limite + 1)
+        )
+        siguiente = None
+        if len(filas) > limite:
+            siguiente = _codificar_cursor(self.epoca, "en_proceso", *filas[limite - 1][0])
+        return PaginaFilas([fila for _, fila in filas[:limite]], siguiente)
+
+    def obtener_ingreso_asignado(self, email_doctor: str) -> Optional[Ingreso]:
+        """
+        Obtiene el ingreso que el doctor tiene actualmente en revisión.
+
+        Args:
+            email_doctor: Email del doctor
+
+        Returns:
+            El ingreso en proceso asignado al doctor o None si no tiene ninguno
+        """
+        ingresos = self._consultar("WHERE i.estado = 'EN_PROCESO' AND i.doctor_email = ?", (email_doctor,))
+        return ingresos[0] if ingresos else None
+
+    def registrar_atencion(self, ingreso_id: str, doctor: Doctor, informe: str) -> Atencion:
+        """
+        Registra la atención médica de un paciente y finaliza el ingreso.
+
+        Args:
+            ingreso_id: ID del ingreso a atender
+            doctor: Médico que registra la atención
+            informe: Informe de atención (mandatorio)
+
+        Returns:
+            La atención creada
+
+        Raises:
+            ValueError: Si el informe está vacío o el ingreso no existe/no está en proceso
+        """
+        if not informe or not informe.strip():
+            raise ValueError("El informe del paciente se ha omitido")
+
+        if not doctor:
+            raise ValueError("El doctor es obligatorio")
+
+        atencion = Atencion(doctor=doctor, informe=informe)
+        datos_atencion = json.dumps(atencion_a_dict(atencion), ensure_ascii=False)
+        with self.db.transaccion() as conexion:
+            cursor = conexion.execute(
+                "UPDATE ingresos SET estado = 'FINALIZADO', atencion = ? "
+                "WHERE id = ? AND estado = 'EN_PROCESO' AND doctor_email IS NOT NULL",
+                (datos_atencion, ingreso_id)
+            )
+            if cursor.rowcount == 0:
+                raise ValueError("El ingreso no existe o no está en proceso")
+            fila = conexion.execute(f"{_SELECT_INGRESO} WHERE i.id = ?", (ingreso_id,)).fetchone()
+        ingreso = self._reconstruir(*fila)
+        atencion.ingreso = ingreso
+        ingreso.atencion = atencion
+        self.eventos.publicar(EVENTO_FINALIZACION, ingreso)
+
+        return atencion
+
+    def obtener_ingreso_por_id(self, ingreso_id: str) -> Optional[Ingreso]:
+        """
+        Obtiene un ingreso por su ID (índice único), sin importar su estado.
+
+        Args:
+            ingreso_id: ID del ingreso a buscar
+
+        Returns:
+            El ingreso encontrado o None si no existe
+        """
+        ingresos = self._consultar("WHERE i.id = ?", (ingreso_id,))
+        return ingresos[0] if ingresos else None
+
+    def cargar_ingresos(self, ingresos: Iterable[Ingreso]) -> None:
+        """
+        Importa ingresos (por ejemplo, reconstruidos desde un WAL) a la base.
+
+        Los ingresos que ya existen se ignoran.
+
+        Args:
+            ingresos: Ingresos a importar
+        """
+        filas = [self._fila(ingreso) for ingreso in ingresos]
+        with self.db.transaccion() as conexion:
+            for fila in filas:
+                self._insertar(conexion, fila)
+
+    def exportar_ingresos(self) -> List[Ingreso]:
+        """
+        Retorna todos los ingresos de la base: pendientes en orden de atención,
+        luego en proceso y luego finalizados.
+        """
+        return (
+            self.obtener_ingresos_pendientes()
+            + self._consultar("WHERE i.estado = 'EN_PROCESO' ORDER BY i.seq")
+            + self._consultar("WHERE i.estado = 'FINALIZADO' ORDER BY i.seq")
+        )
+
+    def version_pendientes(self) -> int:
+        """
+        Versión de la lista de espera, compartida entre procesos.
+
+        Returns:
+            Versión actual de la lista de espera
+        """
+        return self._leer_version("pendientes")
+
+    def obtener_cambios_pendientes(self, desde: int) -> Optional[CambiosPendientes]:
+        """
+        Sin buffer de cambios compartido entre procesos: el cliente siempre
+        recibe la lista completa.
+
+        Args:
+            desde: Versión de la lista que tiene el cliente
+
+        Returns:
+            Lista vacía de cambios si el cliente ya tiene la versión actual, None si no
+        """
+        version = self.version_pendientes()
+        return CambiosPendientes(version=version, altas=[], bajas=[]) if desde == version else None
+
+    def version_en_proceso(self) -> int:
+        """
+        Versión de la lista de ingresos en proceso, compartida entre procesos.
+
+        Returns:
+            Versión actual de la lista de ingresos en proceso
+        """
+        return self._leer_version("en_proceso")
+
+    def version_ingreso(self, ingreso_id: str) -> Optional[int]:
+        """
+        Versión de un ingreso, sin reconstruirlo.
+
+        Args:
+            ingreso_id: ID del ingreso
+
+        Returns:
+            Versión del ingreso o None si no existe
+        """
+        fila = self.db.conexion().execute(
+            "SELECT estado FROM ingresos WHERE id = ?", (ingreso_id,)
+        ).fetchone()
+        return _VERSION_POR_ESTADO[EstadoIngreso(fila[0])] if fila else None
+
+    def _leer_version(self, nombre: str) -> int:
+        """Lee un valor de la tabla versiones"""
+        return self.db.conexion().execute(
+            "SELECT valor FROM versiones WHERE nombre = ?", (nombre,)
+        ).fetchone()[0]
+
+    @staticmethod
+    def _fila(ingreso: Ingreso) -> tuple:
+        """Valores de la fila de un ingreso con su estado actual (se arman fuera de la transacción)"""
+        datos = ingreso_a_dict(ingreso, incluir_paciente=False)
+        doctor, atencion = datos.pop("doctor"), datos.pop("atencion")
+        for clave in ("paciente", "estado"):
+            del datos[clave]
+        return (
+            ingreso.id,
+            ingreso.cuil_paciente,
+            ingreso.estado_ingreso.value,
+            ingreso.nivel_emergencia.value["nivel"],
+            ingreso.fecha_ingreso.isoformat(timespec="microseconds"),
+            doctor["email"] if doctor else None,
+            json.dumps(datos, ensure_ascii=False),
+            json.dumps(doctor, ensure_ascii=False) if doctor else None,
+            json.dumps(atencion, ensure_ascii=False) if atencion else None,
+            json.dumps(asdict(ingreso_a_list_item(ingreso)), ensure_ascii=False),
+        )
+
+    @staticmethod
+    def _insertar(conexion, fila: tuple) -> None:
+        """Inserta la fila de un ingreso (ignorada si el id ya existe)"""
+        conexion.execute(
+            "INSERT OR IGNORE INTO ingresos "
+            "(id, cuil, estado, nivel, fecha, doctor_email, datos, doctor, atencion, fila) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            fila
+        )
+
+    @staticmethod
+    def _siguiente_pendiente(conexion) -> Optional[int]:
+        """Secuencia del próximo ingreso de la lista de espera (usa idx_ingresos_cola)"""
+        fila = conexion.execute(
+            f"SELECT i.seq FROM ingresos i WHERE i.estado = 'PENDIENTE' {_ORDEN_COLA} LIMIT 1"
+        ).fetchone()
+        return fila[0] if fila else None
+
+    def _consultar(self, condicion: str, parametros: tuple = ()) -> List[Ingreso]:
+        """Reconstruye los ingresos que cumplen la condición, con su paciente"""
+        return [
+            self._reconstruir(*fila)
+            for fila in self.db.conexion().execute(f"{_SELECT_INGRESO} {condicion}", parametros)
+        ]
+
+    def _consultar_filas(
+        self,
+        columnas_clave: str,
+        condicion: str,
+        parametros: tuple = ()
+    ) -> List[Tuple[tuple, IngresoListItem]]:
+        """
+        Lee las filas de lista de los ingresos que cumplen la condición, cada
+        una junto con las columnas indicadas (clave de paginación). No lee
+        los datos del ingreso ni del paciente.
+        """
+        filas = []
+        for fila, estado, *clave in self.db.conexion().execute(
+            f"SELECT i.fila, i.estado, {columnas_clave} FROM ingresos i {condicion}", parametros
+        ):
+            datos = json.loads(fila)
+            datos["estado"] = estado
+            filas.append((tuple(clave), IngresoListItem(**datos)))
+        return filas
+
+    @staticmethod
+    def _reconstruir(datos: str, estado: str, doctor: Optional[str], atencion: Optional[str], paciente: str) -> Ingreso:
+        """Reconstruye un ingreso a partir de una fila de _SELECT_INGRESO"""
+        registro = json.loads(datos)
+        registro["estado"] = estado
+        registro["doctor"] = json.loads(doctor) if doctor else None
+        registro["atencion"] = json.loads(atencion) if atencion else None
+        return ingreso_desde_dict(registro, paciente_desde_dict(json.loads(paciente)))
@@ -1,4 +1,4 @@
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from ..interfaces.pacientes_repo import PacientesRepo
 from ..models.models import Paciente
 
@@ -8,16 +8,26 @@ class DBPacientes(PacientesRepo):
     
     def __init__(self):
         self._pacientes: Dict[str, Paciente] = {}
+        self._versiones: Dict[str, int] = {}
     
     def guardar_paciente(self, paciente: Paciente) -> None:
         """Guarda un paciente en el mock de base de datos"""
         self._pacientes[paciente.cuil] = paciente
+        self._versiones[paciente.cuil] = self._versiones.get(paciente.cuil, 0) + 1
     
     def obtener_paciente_por_cuil(self, cuil: str) -> Optional[Paciente]:
         """Obtiene un paciente por su CUIL"""
         return self._pacientes.get(cuil)
     
+    def obtener_version_paciente(self, cuil: str) -> Optional[int]:
+        """Obtiene la versión de un paciente (cantidad de veces que se guardó)"""
+        return self._versiones.get(cuil)
+    
     def existe_paciente(self, cuil: str) -> bool:
         """Verifica si existe un paciente con el CUIL dado"""
         return cuil in self._pacientes
+    
+    def obtener_todos(self) -> List[Paciente]:
+        """Obtiene todos los pacientes del mock"""
+        return list(self._pacientes.values())
 
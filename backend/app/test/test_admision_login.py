@@ -0,0 +1,111 @@
+import asyncio
+import unittest
+from fastapi import HTTPException, Request
+from ..api.admision_login import BaldesTokens, LimiteExcedido, LimitadorLogin
+from ..api.routes.auth import LoginRequest, login_user
+from ..core.credenciales import MotorCredenciales, hashear_password
+from ..models.models import Rol, Usuario
+from ..services.auth_service import InMemoryUserRepo
+
+
+class Reloj:
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self):
+        return self.ahora
+
+
+def crear_request(cliente: str = "10.0.0.1") -> Request:
+    return Request({"type": "http", "method": "POST", "path": "/", "headers": [], "client": (cliente, 5000)})
+
+
+class TestLimitadorLogin(unittest.TestCase):
+
+    def setUp(self):
+        self.reloj = Reloj()
+        self.limitador = LimitadorLogin(
+            BaldesTokens(capacidad=2, por_minuto=6),
+            BaldesTokens(capacidad=3, por_minuto=60),
+            max_verificaciones=2,
+            reloj=self.reloj
+        )
+
+    def intentar(self, email: str = "ana@hospital.com", cliente: str = "10.0.0.1"):
+        with self.limitador.admitir(email, cliente):
+            pass
+
+    def test_agota_y_recarga_el_balde_del_email(self):
+        self.intentar()
+        self.intentar()
+        with self.assertRaises(LimiteExcedido) as context:
+            self.intentar(cliente="10.0.0.2")
+        # Un token cada 10 segundos
+        self.assertAlmostEqual(context.exception.espera, 10)
+        self.assertEqual(context.exception.retry_after, "10")
+
+        self.reloj.ahora = 10
+        self.intentar()
+        self.assertEqual(self.limitador.estadisticas()["rechazados_por_email"], 1)
+
+    def test_agota_el_balde_del_cliente_sin_consumir_el_del_email(self):
+        for email in ("a@hospital.com", "b@hospital.com", "c@hospital.com"):
+            self.intentar(email=email)
+        with self.assertRaises(LimiteExcedido) as context:
+            self.intentar(email="d@hospital.com")
+        self.assertEqual(context.exception.retry_after, "1")
+
+        # El intento rechazado no gastó el token del email
+        self.intentar(email="d@hospital.com", cliente="10.0.0.2")
+        self.intentar(email="d@hospital.com", cliente="10.0.0.2")
+        self.assertEqual(self.limitador.estadisticas()["rechazados_por_cliente"], 1)
+
+    def test_acota_las_verificaciones_simultaneas(self):
+        with self.limitador.admitir("a@hospital.com", "10.0.0.1"):
+            with self.limitador.admitir("b@hospital.com", "10.0.0.2"):
+                with self.assertRaises(LimiteExcedido):
+                    self.intentar(email="c@hospital.com", cliente="10.0.0.3")
+                self.assertEqual(self.limitador.estadisticas()["verificaciones_en_curso"], 2)
+        self.intentar(email="c@hospital.com", cliente="10.0.0.3")
+
+        estadisticas = self.limitador.estadisticas()
+        self.assertEqual((estadisticas["verificaciones_en_curso"], estadisticas["rechazados_por_concurrencia"]), (0, 1))
+        self.assertEqual(estadisticas["admitidos"], 3)
+
+    def test_descarta_las_claves_menos_usadas(self):
+        baldes = BaldesTokens(capacidad=1, por_minuto=1, max_claves=2)
+        for clave in ("a", "b", "c"):
+            baldes.consumir(clave, 0)
+
+        self.assertEqual(len(baldes), 2)
+        self.assertEqual(baldes.espera("a", 0), 0)
+        self.assertGreater(baldes.espera("c", 0), 0)
+
+
+class TestLoginConAdmision(unittest.TestCase):
+
+    def test_responde_429_sin_verificar_la_contrasena(self):
+        repo = InMemoryUserRepo()
+        repo.save(Usuario.desde_hash("ana@hospital.com", hashear_password("password123", 4), Rol.ENFERMERA))
+        motor = MotorCredenciales(procesos=1, max_pendientes=4, costo=4)
+        limitador = LimitadorLogin(BaldesTokens(1, 1), BaldesTokens(10, 10), max_verificaciones=4)
+        credenciales = LoginRequest(email="ana@hospital.com", password="incorrecta")
+
+        def login():
+            return asyncio.run(login_user(credenciales, crear_request(), repo, motor, limitador))
+
+        try:
+            with self.assertRaises(HTTPException) as context:
+                login()
+            self.assertEqual(context.exception.status_code, 401)
+            with self.assertRaises(HTTPException) as context:
+                login()
+        finally:
+            motor.cerrar()
+        self.assertEqual(context.exception.status_code, 429)
+        self.assertEqual(context.exception.headers["Retry-After"], "60")
+        self.assertEqual(motor.estadisticas()["verificaciones"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
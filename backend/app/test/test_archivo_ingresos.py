@@ -0,0 +1,115 @@
+import unittest
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from ..persistence.archivo_ingresos import ArchivoIngresos
+from ..persistence.wal import WriteAheadLog, leer_registros, reproducir
+from ..services.servicio_emergencias import ServicioEmergencias
+from ..models.models import Doctor, EstadoIngreso
+from .mocks import DBPacientes
+from .test_servicio_emergencias import registrar
+
+
+class TestArchivoIngresos(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.doctor = Doctor("20-30000000-1", "Gregorio", "House", "MP-1", email="house@hospital.com")
+        self.pacientes_repo = DBPacientes()
+        self.archivo = ArchivoIngresos(self.directorio.name)
+        self.servicio = ServicioEmergencias(self.pacientes_repo, archivo=self.archivo)
+
+    def tearDown(self):
+        self.archivo.cerrar()
+        self.directorio.cleanup()
+
+    def finalizar(self, cuil: str):
+        registrar(self.servicio, cuil)
+        ingreso = self.servicio.reclamar_siguiente_paciente(self.doctor)
+        self.servicio.registrar_atencion(ingreso.id, self.doctor, f"Alta de {cuil}")
+        return ingreso
+
+    def test_archiva_solo_los_finalizados_antiguos(self):
+        viejo = self.finalizar("20-11111111-1")
+        reciente = self.finalizar("20-22222222-2")
+        pendiente = registrar(self.servicio, "20-33333333-3")
+        reciente.atencion.fecha = viejo.atencion.fecha + timedelta(hours=2)
+
+        archivados = self.servicio.archivar_finalizados(
+            timedelta(hours=1), ahora=viejo.atencion.fecha + timedelta(hours=2)
+        )
+
+        self.assertEqual(archivados, 1)
+        self.assertTrue(self.archivo.contiene(viejo.id))
+        self.assertNotIn(viejo.id, self.servicio._ingresos_por_id)
+        self.assertEqual([i.id for i in self.servicio._ingresos_finalizados], [reciente.id])
+        self.assertIs(self.servicio.obtener_ingreso_por_id(pendiente.id), pendiente)
+
+    def test_lectura_bajo_demanda_de_un_ingreso_archivado(self):
+        ingreso = self.finalizar("20-11111111-1")
+        self.servicio.archivar_finalizados(timedelta(0), ahora=datetime.now() + timedelta(seconds=1))
+
+        leido = self.servicio.obtener_ingreso_por_id(ingreso.id)
+
+        self.assertIsNot(leido, ingreso)
+        self.assertEqual(leido.id, ingreso.id)
+        self.assertEqual(leido.estado_ingreso, EstadoIngreso.FINALIZADO)
+        self.assertEqual(leido.atencion.informe, "Alta de 20-11111111-1")
+        self.assertEqual(leido.atencion.fecha, ingreso.atencion.fecha)
+        self.assertIs(leido.paciente, self.pacientes_repo.obtener_paciente_por_cuil("20-11111111-1"))
+        self.assertEqual(self.archivo.lecturas, 1)
+
+    def test_indices_se_recuperan_al_reabrir_y_segmentos_rotan(self):
+        self.archivo.tamanio_max_segmento = 1
+        ingresos = []
+        for n in range(3):
+            # Un archivado por ingreso para forzar la rotación de segmentos
+            ingresos.append(self.finalizar(f"20-{n:08d}-1"))
+            self.servicio.archivar_finalizados(timedelta(0), ahora=datetime.now() + timedelta(seconds=1))
+
+        reabierto = ArchivoIngresos(self.directorio.name)
+
+        self.assertEqual(reabierto.estadisticas()["segmentos"], 3)
+        self.assertEqual(len(reabierto), 3)
+        for ingreso in ingresos:
+            self.assertEqual(reabierto.obtener(ingreso.id, self.pacientes_repo).descripcion, ingreso.descripcion)
+        reabierto.cerrar()
+
+    def test_entrada_incompleta_del_indice_se_descarta(self):
+        ingreso = self.finalizar("20-11111111-1")
+        self.servicio.archivar_finalizados(timedelta(0), ahora=datetime.now() + timedelta(seconds=1))
+        with open(Path(self.directorio.name) / "segmento-000001.idx", "ab") as indice:
+            indice.write(b"id-cortado 99")
+
+        reabierto = ArchivoIngresos(self.directorio.name)
+
+        self.assertEqual(len(reabierto), 1)
+        self.assertTrue(reabierto.contiene(ingreso.id))
+        reabierto.cerrar()
+
+    def test_replay_descarta_los_archivados(self):
+        """El WAL registra el archivado y el replay no reconstruye esos ingresos"""
+        wal = WriteAheadLog(str(Path(self.directorio.name) / "guardia.wal"))
+        servicio = ServicioEmergencias(self.pacientes_repo, wal=wal, archivo=self.archivo)
+        registrar(servicio, "20-11111111-1")
+        archivado = servicio.reclamar_siguiente_paciente(self.doctor)
+        servicio.registrar_atencion(archivado.id, self.doctor, "Alta")
+        pendiente = registrar(servicio, "20-22222222-2")
+        servicio.archivar_finalizados(timedelta(0), ahora=datetime.now() + timedelta(seconds=1))
+        wal.cerrar()
+
+        registros = list(leer_registros(str(wal.ruta)))
+        self.assertEqual(registros[-1]["ids"], [archivado.id])
+        ingresos = reproducir(registros, DBPacientes())
+        self.assertEqual([i.id for i in ingresos], [pendiente.id])
+
+    def test_cargar_ingresos_omite_los_ya_archivados(self):
+        """Un replay del WAL no vuelve a traer a memoria los ingresos archivados"""
+        ingreso = self.finalizar("20-11111111-1")
+        self.servicio.archivar_finalizados(timedelta(0), ahora=datetime.now() + timedelta(seconds=1))
+
+        restaurado = ServicioEmergencias(self.pacientes_repo, archivo=self.archivo)
+        restaurado.cargar_ingresos([ingreso])
+
+        self.assertEqual(len(restaurado._ingresos_finalizados), 0)
+        self.assertEqual(restaurado.obtener_ingreso_por_id(ingreso.id).id, ingreso.id)
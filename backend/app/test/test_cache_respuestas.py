@@ -0,0 +1,95 @@
+import json
+import unittest
+from fastapi import Request, Response
+from ..api.cache_respuestas import CacheRespuestas, RespuestaSerializada
+from ..api.coalescencia import CoalescedorLecturas
+from ..api.routes.urgencias import listar_ingresos_en_proceso, listar_ingresos_pendientes
+from ..services.servicio_emergencias import ServicioEmergencias
+from ..models.models import Doctor
+from .mocks import DBPacientes
+from .test_servicio_emergencias import registrar
+
+
+def crear_request() -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": []})
+
+
+class TestCacheRespuestas(unittest.TestCase):
+
+    def test_solo_sirve_la_version_guardada(self):
+        cache = CacheRespuestas()
+        cache.guardar(("pendientes",), 1, RespuestaSerializada(b"[]"))
+
+        self.assertEqual(cache.obtener(("pendientes",), 1).contenido, b"[]")
+        self.assertIsNone(cache.obtener(("pendientes",), 2))
+        self.assertIsNone(cache.obtener(("en_proceso",), 1))
+        self.assertEqual((cache.aciertos, cache.fallos), (1, 2))
+
+    def test_descarta_las_claves_menos_usadas(self):
+        cache = CacheRespuestas(max_entradas=2)
+        for clave in ("a", "b"):
+            cache.guardar(clave, 1, RespuestaSerializada(b"[]"))
+        cache.obtener("a", 1)
+        cache.guardar("c", 1, RespuestaSerializada(b"[]"))
+
+        self.assertIsNone(cache.obtener("b", 1))
+        self.assertIsNotNone(cache.obtener("a", 1))
+        self.assertEqual(cache.estadisticas()["entradas"], 2)
+
+
+class TestListasCacheadas(unittest.TestCase):
+
+    def setUp(self):
+        self.servicio = ServicioEmergencias(DBPacientes())
+        self.cache = CacheRespuestas()
+        self.doctor = Doctor("20-30000000-1", "Gregorio", "House", "MP-1", email="house@hospital.com")
+
+    def listar(self, ruta=listar_ingresos_pendientes, limit=None, cursor=None, **extra):
+        return ruta(
+            crear_request(), Response(), limit=limit, cursor=cursor,
+            current_user=None, servicio=self.servicio, cache=self.cache,
+            coalescedor=CoalescedorLecturas(), **extra
+        )
+
+    def listar_pendientes(self, limit=None, cursor=None):
+        return self.listar(limit=limit, cursor=cursor, since=None, epoca=None)
+
+    def test_lecturas_identicas_reusan_los_bytes(self):
+        registrar(self.servicio, "20-11111111-1")
+
+        primera = self.listar_pendientes()
+        segunda = self.listar_pendientes()
+
+        self.assertIs(primera.body, segunda.body)
+        self.assertEqual(self.cache.aciertos, 1)
+        self.assertEqual(primera.headers["content-type"], "application/json")
+        self.assertIn("etag", segunda.headers)
+
+    def test_cada_cambio_invalida_la_lista_afectada(self):
+        registrar(self.servicio, "20-11111111-1")
+        antes = self.listar_pendientes()
+        en_proceso_antes = self.listar(listar_ingresos_en_proceso)
+
+        registrar(self.servicio, "20-22222222-2")
+        self.assertEqual(len(json.loads(self.listar_pendientes().body)), 2)
+        self.assertIs(self.listar(listar_ingresos_en_proceso).body, en_proceso_antes.body)
+
+        ingreso = self.servicio.reclamar_siguiente_paciente(self.doctor)
+        self.assertEqual(len(json.loads(self.listar_pendientes().body)), 1)
+        self.assertEqual(len(json.loads(self.listar(listar_ingresos_en_proceso).body)), 1)
+
+        self.servicio.registrar_atencion(ingreso.id, self.doctor, "Alta")
+        self.assertEqual(json.loads(self.listar(listar_ingresos_en_proceso).body), [])
+        self.assertNotEqual(antes.body, self.listar_pendientes().body)
+
+    def test_paginas_guardan_su_cursor(self):
+        for numero in range(3):
+            registrar(self.servicio, f"20-{numero:08d}-1")
+
+        primera = self.listar_pendientes(limit=2)
+        repetida = self.listar_pendientes(limit=2)
+
+        self.assertEqual(repetida.headers["x-cursor-siguiente"], primera.headers["x-cursor-siguiente"])
+        ultima = self.listar_pendientes(limit=2, cursor=primera.headers["x-cursor-siguiente"])
+        self.assertEqual(len(json.loads(ultima.body)), 1)
+        self.assertNotIn("x-cursor-siguiente", ultima.headers)
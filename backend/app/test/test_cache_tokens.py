@@ -0,0 +1,83 @@
+import time
+import unittest
+from datetime import timedelta
+from fastapi import HTTPException
+from ..api.cache_tokens import CacheTokens
+from ..api.dependencies import get_current_user
+from ..core.revocacion import ListaRevocacion
+from ..core.security import create_access_token
+from ..models.models import Rol
+from ..services.auth_service import InMemoryUserRepo, register
+
+
+class TestCacheTokens(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = CacheTokens(max_entradas=2)
+        self.repo = InMemoryUserRepo()
+        self.usuario = register("ana@hospital.com", "password123", Rol.ENFERMERA, self.repo)
+        self.verificaciones = []
+
+    def verificar(self, vence_en: float = 60):
+        def verificar(token):
+            self.verificaciones.append(token)
+            return self.usuario, time.time() + vence_en
+        return verificar
+
+    def test_verifica_una_sola_vez(self):
+        for _ in range(3):
+            self.assertIs(self.cache.validar("token", self.verificar()), self.usuario)
+
+        self.assertEqual(self.verificaciones, ["token"])
+        estadisticas = self.cache.estadisticas()
+        self.assertEqual((estadisticas["aciertos"], estadisticas["fallos"]), (2, 1))
+        self.assertAlmostEqual(estadisticas["tasa_aciertos"], 2 / 3)
+
+    def test_respeta_el_vencimiento(self):
+        self.cache.validar("token", self.verificar(vence_en=-1))
+        self.cache.validar("token", self.verificar())
+
+        self.assertEqual(len(self.verificaciones), 2)
+
+    def test_desalojo_lru(self):
+        for token in ("a", "b", "a", "c", "a", "b"):
+            self.cache.validar(token, self.verificar())
+
+        self.assertEqual(self.verificaciones, ["a", "b", "c", "b"])
+
+    def test_invalidar_por_usuario(self):
+        self.cache.validar("token", self.verificar())
+        self.cache.invalidar("otro@hospital.com")
+        self.cache.validar("token", self.verificar())
+        self.cache.invalidar(self.usuario.email)
+        self.cache.validar("token", self.verificar())
+
+        self.assertEqual(len(self.verificaciones), 2)
+
+    def test_no_guarda_lo_verificado_antes_de_una_invalidacion(self):
+        def verificar_e_invalidar(token):
+            self.cache.invalidar(self.usuario.email)
+            return self.usuario, time.time() + 60
+
+        self.cache.validar("token", verificar_e_invalidar)
+        self.assertEqual(self.cache.estadisticas()["entradas"], 0)
+
+    def test_get_current_user(self):
+        self.repo.suscribir_cambios(self.cache.invalidar)
+        token = create_access_token({"email": self.usuario.email, "rol": "ENFERMERA"})
+
+        self.assertIs(get_current_user(token, self.repo, self.cache, ListaRevocacion(3600)), self.usuario)
+        self.assertIs(get_current_user(token, self.repo, self.cache, ListaRevocacion(3600)), self.usuario)
+        self.assertEqual(self.cache.estadisticas()["aciertos"], 1)
+
+        self.repo.save(self.usuario)
+        self.assertEqual(self.cache.estadisticas()["entradas"], 0)
+
+        vencido = create_access_token({"email": self.usuario.email}, expires_delta=timedelta(minutes=-1))
+        with self.assertRaises(HTTPException) as context:
+            get_current_user(vencido, self.repo, self.cache, ListaRevocacion(3600))
+        self.assertEqual(context.exception.status_code, 401)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import threading
+import time
+import unittest
+from ..api.coalescencia import CoalescedorLecturas
+
+
+class TestCoalescedorLecturas(unittest.TestCase):
+
+    def setUp(self):
+        self.coalescedor = CoalescedorLecturas()
+        self.liberar = threading.Event()
+        self.llamadas = 0
+
+    def calcular(self):
+        self.llamadas += 1
+        self.liberar.wait(5)
+        return object()
+
+    def fallar(self):
+        self.llamadas += 1
+        self.liberar.wait(5)
+        raise ValueError("cursor inválido")
+
+    def lanzar(self, cantidad, calcular, clave=("pendientes", 1)):
+        """Lanza `cantidad` lecturas concurrentes y espera a que todas estén en vuelo"""
+        resultados = [None] * cantidad
+
+        def leer(i):
+            try:
+                resultados[i] = self.coalescedor.ejecutar(clave, calcular)
+            except Exception as e:
+                resultados[i] = e
+
+        hilos = [threading.Thread(target=leer, args=(i,)) for i in range(cantidad)]
+        for hilo in hilos:
+            hilo.start()
+        while sum(self.coalescedor.estadisticas()[m] for m in ("ejecuciones", "coalescidas")) < cantidad:
+            time.sleep(0.001)
+        self.liberar.set()
+        for hilo in hilos:
+            hilo.join(5)
+        return resultados
+
+    def test_lecturas_concurrentes_comparten_un_calculo(self):
+        resultados = self.lanzar(8, self.calcular)
+
+        self.assertEqual(self.llamadas, 1)
+        self.assertTrue(all(r is resultados[0] for r in resultados))
+        estadisticas = self.coalescedor.estadisticas()
+        self.assertEqual((estadisticas["ejecuciones"], estadisticas["coalescidas"]), (1, 7))
+        self.assertEqual(estadisticas["por_ruta"]["pendientes"], {"ejecuciones": 1, "coalescidas": 7})
+        self.assertEqual(estadisticas["en_curso"], 0)
+
+    def test_el_error_llega_a_todos_los_que_esperaban(self):
+        resultados = self.lanzar(4, self.fallar)
+
+        self.assertEqual(self.llamadas, 1)
+        self.assertTrue(all(isinstance(r, ValueError) for r in resultados))
+        self.assertEqual(self.coalescedor.estadisticas()["en_curso"], 0)
+
+    def test_lecturas_sucesivas_calculan_de_nuevo(self):
+        self.liberar.set()
+        primera = self.coalescedor.ejecutar(("pendientes", 1), self.calcular)
+        segunda = self.coalescedor.ejecutar(("pendientes", 1), self.calcular)
+
+        self.assertIsNot(primera, segunda)
+        self.assertEqual(self.llamadas, 2)
+        self.assertEqual(self.coalescedor.estadisticas()["coalescidas"], 0)
+
+    def test_claves_distintas_no_se_comparten(self):
+        self.liberar.set()
+        self.coalescedor.ejecutar(("pendientes", 1), self.calcular)
+        self.coalescedor.ejecutar(("pendientes", 2), self.calcular)
+
+        self.assertEqual(self.llamadas, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import gzip
+import json
+import unittest
+from dataclasses import asdict
+from unittest.mock import patch
+from fastapi import Request
+from ..api import codificacion
+from ..api.cache_respuestas import serializar_respuesta
+from ..api.codificacion import (
+    FORMATO_JSON,
+    FORMATO_MSGPACK,
+    codificar,
+    negociar_compresion,
+    negociar_formato,
+)
+from ..api.schemas import IngresoListItem
+from ..core.config import settings
+
+
+def crear_request(**headers) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(nombre.replace("_", "-").encode(), valor.encode()) for nombre, valor in headers.items()],
+    })
+
+
+def crear_items(cantidad: int):
+    return [
+        IngresoListItem(
+            id=str(i), cuil_paciente="20-12345678-9", nombre_paciente="Juan", apellido_paciente="Pérez",
+            nivel_emergencia="CRITICA", nivel_emergencia_nombre="Crítica", estado="PENDIENTE",
+            fecha_ingreso="2025-01-01T10:00:00", temperatura=37.5, frecuencia_cardiaca=80.0,
+            frecuencia_respiratoria=16.0, frecuencia_sistolica=120.0, frecuencia_diastolica=80.0
+        )
+        for i in range(cantidad)
+    ]
+
+
+class TestCodificar(unittest.TestCase):
+
+    def test_json_igual_al_de_asdict(self):
+        items = crear_items(3)
+        esperado = [asdict(item) for item in items]
+
+        self.assertEqual(json.loads(codificar(items)), esperado)
+        with patch.object(codificacion, "orjson", None):
+            contenido = codificar(items)
+        self.assertEqual(json.loads(contenido), esperado)
+        self.assertIn("Pérez".encode("utf-8"), contenido)
+
+    def test_lista_vacia(self):
+        self.assertEqual(codificar([]), b"[]")
+
+    def test_msgpack(self):
+        items = crear_items(2)
+        contenido = codificar(items, FORMATO_MSGPACK)
+        self.assertEqual(codificacion.msgpack.unpackb(contenido), [asdict(item) for item in items])
+
+
+class TestNegociacion(unittest.TestCase):
+
+    def test_json_por_defecto(self):
+        self.assertEqual(negociar_formato(crear_request()), FORMATO_JSON)
+        self.assertEqual(negociar_formato(crear_request(accept="*/*")), FORMATO_JSON)
+
+    def test_msgpack_solo_si_se_prefiere(self):
+        with patch.object(codificacion, "msgpack", object()):
+            self.assertEqual(negociar_formato(crear_request(accept="application/msgpack")), FORMATO_MSGPACK)
+            self.assertEqual(
+                negociar_formato(crear_request(accept="application/json, application/msgpack;q=0.5")),
+                FORMATO_JSON
+            )
+        with patch.object(codificacion, "msgpack", None):
+            self.assertEqual(negociar_formato(crear_request(accept="application/msgpack")), FORMATO_JSON)
+
+    def test_compresion(self):
+        self.assertIsNone(negociar_compresion(crear_request()))
+        self.assertIsNone(negociar_compresion(crear_request(accept_encoding="gzip;q=0")))
+        with patch.object(codificacion, "brotli", None):
+            self.assertEqual(negociar_compresion(crear_request(accept_encoding="gzip, deflate, br")), "gzip")
+
+    def test_brotli_si_el_cliente_lo_acepta(self):
+        self.assertEqual(negociar_compresion(crear_request(accept_encoding="gzip, deflate, br")), "br")
+        self.assertEqual(negociar_compresion(crear_request(accept_encoding="gzip, br;q=0")), "gzip")
+
+
+class TestSerializarRespuesta(unittest.TestCase):
+
+    def test_comprime_solo_sobre_el_umbral(self):
+        chica = serializar_respuesta(crear_items(1), compresion="gzip")
+        grande = serializar_respuesta(crear_items(50), compresion="gzip")
+
+        self.assertNotIn("Content-Encoding", chica.headers)
+        self.assertLess(len(chica.contenido), settings.COMPRESION_MIN_BYTES)
+        self.assertEqual(grande.headers["Content-Encoding"], "gzip")
+        self.assertEqual(len(json.loads(gzip.decompress(grande.contenido))), 50)
+        self.assertEqual(grande.headers["Vary"], "Accept, Accept-Encoding")
+
+    def test_brotli_y_msgpack(self):
+        items = crear_items(50)
+        respuesta = serializar_respuesta(items, formato=FORMATO_MSGPACK, compresion="br")
+
+        self.assertEqual(respuesta.headers["Content-Encoding"], "br")
+        contenido = codificacion.msgpack.unpackb(codificacion.brotli.decompress(respuesta.contenido))
+        self.assertEqual(contenido, [asdict(item) for item in items])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+from datetime import datetime, timedelta
+from ..services.cola_prioridad import ColaPrioridadIngresos
+from ..services.servicio_emergencias import ServicioEmergencias
+from ..models.models import (
+    Domicilio,
+    Enfermera,
+    FrecuenciaCardiaca,
+    FrecuenciaRespiratoria,
+    Ingreso,
+    NivelEmergencia,
+    Paciente,
+    Temperatura,
+    TensionArterial,
+)
+from .mocks import DBPacientes
+
+
+def crear_ingreso(id_uuid: str, nivel: NivelEmergencia, fecha: datetime) -> Ingreso:
+    domicilio = Domicilio("San Martín", 123, "Yerba Buena", "Yerba Buena", "Tucumán", "Argentina")
+    return Ingreso(
+        id_uuid=id_uuid,
+        paciente=Paciente("Juan", "Pérez", "20-12345678-9", domicilio),
+        enfermera=Enfermera("Ana", "López"),
+        nivel_emergencia=nivel,
+        descripcion="Dolor abdominal",
+        temperatura=Temperatura(37.0),
+        frecuencia_cardiaca=FrecuenciaCardiaca(80),
+        frecuencia_respiratoria=FrecuenciaRespiratoria(16),
+        tension_arterial=TensionArterial(120, 80),
+        fecha_ingreso=fecha
+    )
+
+
+class TestColaPrioridadIngresos(unittest.TestCase):
+
+    def setUp(self):
+        self.cola = ColaPrioridadIngresos()
+        self.ahora = datetime(2024, 11, 20, 10, 0)
+
+    def test_desencola_por_nivel_y_fecha(self):
+        """El nivel de emergencia manda; a igual nivel, el que llegó antes"""
+        self.cola.encolar(crear_ingreso("a", NivelEmergencia.URGENCIA, self.ahora))
+        self.cola.encolar(crear_ingreso("b", NivelEmergencia.CRITICA, self.ahora + timedelta(minutes=5)))
+        self.cola.encolar(crear_ingreso("c", NivelEmergencia.URGENCIA, self.ahora - timedelta(minutes=1)))
+
+        self.assertEqual([i.id for i in self.cola.ordenados()], ["b", "c", "a"])
+        self.assertEqual(self.cola.desencolar().id, "b")
+        self.assertEqual(self.cola.desencolar().id, "c")
+        self.assertEqual(self.cola.desencolar().id, "a")
+
+    def test_empate_respeta_orden_de_llegada(self):
+        """Con mismo nivel y misma fecha se respeta el orden de encolado"""
+        for id_uuid in ["1", "2", "3"]:
+            self.cola.encolar(crear_ingreso(id_uuid, NivelEmergencia.EMERGENCIA, self.ahora))
+
+        self.assertEqual([self.cola.desencolar().id for _ in range(3)], ["1", "2", "3"])
+
+    def test_encolar_lote_equivale_a_encolar_uno_a_uno(self):
+        """El lote se ordena igual que si se encolara ingreso por ingreso"""
+        niveles = list(NivelEmergencia)
+        existentes = [crear_ingreso(f"e{n}", niveles[n % 5], self.ahora) for n in range(3)]
+        lote = [crear_ingreso(f"l{n}", niveles[(n * 3) % 5], self.ahora) for n in range(20)]
+        referencia = ColaPrioridadIngresos()
+        for ingreso in existentes:
+            self.cola.encolar(ingreso)
+        for ingreso in existentes + lote:
+            referencia.encolar(ingreso)
+
+        self.cola.encolar_lote(lote)
+
+        self.assertEqual([i.id for i in self.cola.ordenados()], [i.id for i in referencia.ordenados()])
+        self.assertEqual(
+            [self.cola.desencolar().id for _ in range(len(self.cola))],
+            [referencia.desencolar().id for _ in range(len(referencia))]
+        )
+
+    def test_cola_vacia(self):
+        self.assertFalse(self.cola)
+        with self.assertRaises(IndexError):
+            self.cola.desencolar()
+
+    def test_servicio_mantiene_orden_de_prioridad(self):
+        """ServicioEmergencias atiende primero al de mayor prioridad"""
+        servicio = ServicioEmergencias(DBPacientes())
+        domicilio = {"calle": "San Martín", "numero": 123, "localidad": "Yerba Buena",
+                     "ciudad": "Yerba Buena", "provincia": "Tucumán", "pais": "Argentina"}
+        niveles = [NivelEmergencia.SIN_URGENCIA, NivelEmergencia.CRITICA, NivelEmergencia.SIN_URGENCIA]
+        cuils = ["20-11111111-1", "20-22222222-2", "20-33333333-3"]
+
+        for cuil, nivel in zip(cuils, niveles):
+            servicio.registrar_urgencia(
+                cuil=cuil, enfermera=Enfermera("Ana", "López"), informe="Dolor",
+                nivel_emergencia=nivel, temperatura=37, frecuencia_cardiaca=80,
+                frecuencia_respiratoria=16, frecuencia_sistolica=120, frecuencia_diastolica=80,
+                nombre="Juan", apellido="Pérez", obra_social=None, domicilio=domicilio
+            )
+
+        pendientes = servicio.obtener_ingresos_pendientes()
+        self.assertEqual([i.cuil_paciente for i in pendientes], [cuils[1], cuils[0], cuils[2]])
+        self.assertEqual(servicio.atender_siguiente().cuil_paciente, cuils[1])
+        self.assertEqual(len(servicio.obtener_ingresos_pendientes()), 2)
@@ -0,0 +1,55 @@
+import unittest
+import threading
+from ..services.servicio_emergencias import ServicioEmergencias
+from ..models.models import Doctor, NivelEmergencia
+from .mocks import DBPacientes
+from .test_servicio_emergencias import registrar
+
+
+class TestConcurrenciaServicioEmergencias(unittest.TestCase):
+
+    def test_reclamos_y_admisiones_concurrentes(self):
+        """Cada ingreso se reclama una sola vez aunque doctores y enfermeras operen en paralelo"""
+        servicio = ServicioEmergencias(DBPacientes())
+        cantidad_doctores = 8
+        admisiones_por_hilo = 50
+        cantidad_enfermeras = 4
+        total = cantidad_enfermeras * admisiones_por_hilo
+
+        reclamados = []
+        lock_reclamados = threading.Lock()
+        inicio = threading.Barrier(cantidad_doctores + cantidad_enfermeras)
+
+        def admitir(numero_hilo: int):
+            inicio.wait()
+            for i in range(admisiones_por_hilo):
+                cuil = f"20-{numero_hilo:02d}{i:06d}-1"
+                registrar(servicio, cuil, list(NivelEmergencia)[i % len(NivelEmergencia)])
+
+        def reclamar(numero_doctor: int):
+            doctor = Doctor("", f"Doctor{numero_doctor}", "Test", f"MP-{numero_doctor}",
+                            email=f"doctor{numero_doctor}@hospital.com")
+            inicio.wait()
+            while True:
+                with lock_reclamados:
+                    if len(reclamados) >= total:
+                        return
+                try:
+                    ingreso = servicio.reclamar_siguiente_paciente(doctor)
+                except ValueError:
+                    continue
+                with lock_reclamados:
+                    reclamados.append(ingreso.id)
+                servicio.registrar_atencion(ingreso.id, doctor, "Alta médica")
+
+        hilos = [threading.Thread(target=admitir, args=(n,)) for n in range(cantidad_enfermeras)]
+        hilos += [threading.Thread(target=reclamar, args=(n,)) for n in range(cantidad_doctores)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join(timeout=30)
+
+        self.assertEqual(len(reclamados), total)
+        self.assertEqual(len(set(reclamados)), total)
+        self.assertEqual(servicio.obtener_ingresos_pendientes(), [])
+        self.assertEqual(servicio.obtener_ingresos_en_proceso(), [])
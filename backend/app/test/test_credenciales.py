@@ -0,0 +1,128 @@
+import asyncio
+import unittest
+from ..core.credenciales import (
+    MotorCredenciales,
+    MotorSaturado,
+    costo_de_hash,
+    hashear_password,
+    verificar_password,
+)
+from ..models.models import Rol, Usuario
+from ..services import auth_service
+from ..services.auth_service import InMemoryUserRepo, login_async, register_async
+
+
+class TestMotorCredenciales(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.motor = MotorCredenciales(procesos=1, max_pendientes=4)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.motor.cerrar()
+
+    def test_hashear_y_verificar_en_el_pool(self):
+        password_hash = asyncio.run(self.motor.hashear("password123"))
+
+        self.assertTrue(verificar_password("password123", password_hash))
+        self.assertTrue(asyncio.run(self.motor.verificar("password123", password_hash)))
+        self.assertFalse(asyncio.run(self.motor.verificar("otra-clave", password_hash)))
+
+    def test_rechaza_sobre_el_limite_de_pendientes(self):
+        motor = MotorCredenciales(procesos=1, max_pendientes=1)
+
+        async def dos_a_la_vez():
+            return await asyncio.gather(
+                motor.hashear("password123"), motor.hashear("password123"), return_exceptions=True
+            )
+
+        try:
+            primero, segundo = asyncio.run(dos_a_la_vez())
+        finally:
+            motor.cerrar()
+        self.assertIsInstance(primero, str)
+        self.assertIsInstance(segundo, MotorSaturado)
+        self.assertEqual(motor.estadisticas()["rechazadas"], 1)
+        self.assertEqual(motor.estadisticas()["pendientes"], 0)
+
+    def test_register_y_login_async(self):
+        repo = InMemoryUserRepo()
+        user = asyncio.run(register_async(
+            "ana@hospital.com", "password123", "enfermera", repo, matricula="MN-1", motor=self.motor
+        ))
+
+        self.assertEqual((user.rol, user.matricula), (Rol.ENFERMERA, "MN-1"))
+        self.assertIs(asyncio.run(login_async("ana@hospital.com", "password123", repo, self.motor)), user)
+        with self.assertRaises(ValueError) as context:
+            asyncio.run(login_async("ana@hospital.com", "incorrecta", repo, self.motor))
+        self.assertEqual(str(context.exception), "Usuario o contraseña inválidos")
+        with self.assertRaises(ValueError):
+            asyncio.run(register_async("ana@hospital.com", "password123", "enfermera", repo, motor=self.motor))
+
+    def test_register_async_valida_antes_de_hashear(self):
+        hashes = self.motor.estadisticas()["hashes"]
+        for email, password, rol in [("mail-invalido", "password123", "medico"),
+                                     ("ana@hospital.com", "corta", "medico"),
+                                     ("ana@hospital.com", "password123", None)]:
+            with self.assertRaises(ValueError):
+                asyncio.run(register_async(email, password, rol, InMemoryUserRepo(), motor=self.motor))
+        self.assertEqual(self.motor.estadisticas()["hashes"], hashes)
+
+
+class TestCostoBcrypt(unittest.TestCase):
+
+    def test_costo_de_hash(self):
+        self.assertEqual(costo_de_hash(hashear_password("password123", 5)), 5)
+        self.assertIsNone(costo_de_hash("no-es-bcrypt"))
+
+    def test_calibrar_respeta_presupuesto_y_minimo(self):
+        motor = MotorCredenciales(procesos=1, max_pendientes=1)
+        costo = motor.calibrar(presupuesto_ms=20, minimo=4, maximo=8)
+        estadisticas = motor.estadisticas()
+
+        self.assertTrue(4 <= costo <= 8)
+        self.assertEqual((estadisticas["costo"], estadisticas["origen_costo"]), (costo, "calibrado"))
+        self.assertIn(str(costo), estadisticas["calibracion_ms"])
+        if costo > 4:
+            self.assertLessEqual(estadisticas["calibracion_ms"][str(costo)], 20)
+        # Con un presupuesto imposible queda el mínimo
+        self.assertEqual(motor.calibrar(presupuesto_ms=0, minimo=4), 4)
+
+    def test_necesita_rehash(self):
+        motor = MotorCredenciales(procesos=1, max_pendientes=1)
+        barato, caro = hashear_password("password123", 4), hashear_password("password123", 6)
+        motor.calibrar(presupuesto_ms=0, minimo=5)
+
+        self.assertTrue(motor.necesita_rehash(barato))
+        self.assertFalse(motor.necesita_rehash(caro))
+        motor.configurar_costo(5)
+        self.assertTrue(motor.necesita_rehash(caro))
+        self.assertFalse(motor.necesita_rehash(hashear_password("password123", 5)))
+
+    def test_login_rehashea_en_segundo_plano(self):
+        motor = MotorCredenciales(procesos=1, max_pendientes=4)
+        motor.configurar_costo(5)
+        repo = InMemoryUserRepo()
+        cambios = []
+        repo.suscribir_cambios(cambios.append)
+        usuario = Usuario.desde_hash("ana@hospital.com", hashear_password("password123", 4), Rol.ENFERMERA)
+        repo.save(usuario)
+
+        async def login_y_esperar_rehash():
+            await login_async("ana@hospital.com", "password123", repo, motor)
+            await asyncio.gather(*auth_service._rehashes_en_curso.values())
+
+        try:
+            asyncio.run(login_y_esperar_rehash())
+        finally:
+            motor.cerrar()
+        self.assertEqual(costo_de_hash(usuario.password_hash), 5)
+        self.assertTrue(verificar_password("password123", usuario.password_hash))
+        self.assertEqual(motor.estadisticas()["rehashes"], 1)
+        # El rehash no cuenta como un cambio del usuario (no revoca sus tokens)
+        self.assertEqual(cambios, ["ana@hospital.com"])
+
+
+if __name__ == '__main__':
+    unittest.main()
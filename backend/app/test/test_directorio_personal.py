@@ -0,0 +1,50 @@
+import unittest
+from fastapi import HTTPException
+from ..api.dependencies import get_current_enfermera, get_current_medico
+from ..models.models import Doctor, Enfermera, Rol, Usuario
+from ..services.auth_service import InMemoryUserRepo, register
+from ..services.directorio_personal import DirectorioPersonal
+
+
+class TestDirectorioPersonal(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = InMemoryUserRepo()
+        self.directorio = DirectorioPersonal(self.repo)
+        self.enfermera = register("ana@hospital.com", "password123", Rol.ENFERMERA, self.repo, matricula="MN-1")
+        self.medico = register("house@hospital.com", "password123", Rol.MEDICO, self.repo, matricula="MP-1")
+
+    def test_misma_instancia_para_todos_los_requests(self):
+        enfermera = get_current_enfermera(self.enfermera, self.directorio)
+
+        self.assertIsInstance(enfermera, Enfermera)
+        self.assertEqual((enfermera.nombre, enfermera.matricula, enfermera.email), ("ana", "MN-1", "ana@hospital.com"))
+        self.assertIs(get_current_enfermera(self.repo.get("ana@hospital.com"), self.directorio), enfermera)
+        self.assertIsInstance(get_current_medico(self.medico, self.directorio), Doctor)
+        self.assertEqual(len(self.directorio), 2)
+
+    def test_rol_incorrecto(self):
+        with self.assertRaises(HTTPException) as context:
+            get_current_medico(self.enfermera, self.directorio)
+        self.assertEqual(context.exception.status_code, 403)
+
+    def test_guardar_el_usuario_invalida_la_entrada(self):
+        anterior = self.directorio.medico(self.medico)
+        self.repo.save(self.medico)
+
+        self.assertEqual(len(self.directorio), 0)
+        self.assertIsNot(self.directorio.medico(self.medico), anterior)
+
+    def test_cambio_de_matricula_sin_aviso(self):
+        """Un usuario leído de otra fuente con otra matrícula arma una nueva entrada"""
+        anterior = self.directorio.enfermera(self.enfermera)
+        usuario = Usuario.desde_hash(self.enfermera.email, self.enfermera.password_hash, Rol.ENFERMERA)
+        usuario.matricula = "MN-2"
+
+        enfermera = self.directorio.enfermera(usuario)
+        self.assertIsNot(enfermera, anterior)
+        self.assertEqual((anterior.matricula, enfermera.matricula), ("MN-1", "MN-2"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+from fastapi import Request, Response
+from ..api.etags import generar_etag, respuesta_condicional
+
+
+def crear_request(if_none_match: str = None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+class TestEtags(unittest.TestCase):
+
+    def setUp(self):
+        self.etag = generar_etag("abc", "pendientes", 7)
+
+    def test_sin_if_none_match_agrega_el_etag(self):
+        response = Response()
+
+        self.assertIsNone(respuesta_condicional(crear_request(), response, self.etag))
+        self.assertEqual(response.headers["ETag"], 'W/"abc-pendientes-7"')
+
+    def test_etag_vigente_responde_304(self):
+        for valor in ('W/"abc-pendientes-7"', '"abc-pendientes-7"', 'W/"viejo", W/"abc-pendientes-7"', "*"):
+            respuesta = respuesta_condicional(crear_request(valor), Response(), self.etag)
+            self.assertEqual(respuesta.status_code, 304, valor)
+            self.assertEqual(respuesta.headers["ETag"], self.etag)
+
+    def test_etag_de_otra_version_no_coincide(self):
+        anterior = generar_etag("abc", "pendientes", 6)
+        otra_epoca = generar_etag("xyz", "pendientes", 7)
+
+        self.assertIsNone(respuesta_condicional(crear_request(anterior), Response(), self.etag))
+        self.assertIsNone(respuesta_condicional(crear_request(otra_epoca), Response(), self.etag))
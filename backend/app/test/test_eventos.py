@@ -0,0 +1,151 @@
+import unittest
+import asyncio
+import json
+import threading
+from fastapi import HTTPException
+from ..api.cache_tokens import CacheTokens
+from ..api.dependencies import get_current_user, get_current_user_stream
+from ..api.eventos import DifusorSSE
+from ..api.routes.urgencias import crear_ticket_eventos
+from ..core.revocacion import ListaRevocacion
+from ..core.security import create_access_token
+from ..services.auth_service import InMemoryUserRepo, register
+from ..services.servicio_emergencias import ServicioEmergencias
+from ..services.eventos import EVENTO_ADMISION, EVENTO_FINALIZACION, EVENTO_RECLAMO
+from ..models.models import Doctor, EstadoIngreso, Rol
+from .mocks import DBPacientes
+from .test_servicio_emergencias import registrar
+
+
+def parsear(mensaje: bytes) -> dict:
+    """Convierte un mensaje SSE en un diccionario campo -> valor"""
+    campos = dict(linea.split(": ", 1) for linea in mensaje.decode("utf-8").strip().split("\n"))
+    campos["data"] = json.loads(campos["data"])
+    return campos
+
+
+class TestBusEventos(unittest.TestCase):
+
+    def setUp(self):
+        self.servicio = ServicioEmergencias(DBPacientes())
+        self.doctor = Doctor("20-30000000-1", "Gregorio", "House", "MP-1", email="house@hospital.com")
+        self.eventos = []
+        self.servicio.eventos.suscribir(self.eventos.append)
+
+    def test_transiciones_en_orden(self):
+        ingreso = registrar(self.servicio, "20-11111111-1")
+        self.servicio.reclamar_siguiente_paciente(self.doctor)
+        self.servicio.registrar_atencion(ingreso.id, self.doctor, "Alta")
+
+        self.assertEqual(
+            [(e.tipo, e.estado) for e in self.eventos],
+            [
+                (EVENTO_ADMISION, EstadoIngreso.PENDIENTE),
+                (EVENTO_RECLAMO, EstadoIngreso.EN_PROCESO),
+                (EVENTO_FINALIZACION, EstadoIngreso.FINALIZADO),
+            ]
+        )
+        self.assertEqual([e.secuencia for e in self.eventos], [1, 2, 3])
+        self.assertTrue(all(e.ingreso is ingreso for e in self.eventos))
+
+    def test_suscriptor_con_error_se_da_de_baja(self):
+        def roto(evento):
+            raise RuntimeError("cliente roto")
+
+        self.servicio.eventos.suscribir(roto)
+        registrar(self.servicio, "20-11111111-1")
+        registrar(self.servicio, "20-22222222-2")
+
+        self.assertEqual(len(self.eventos), 2)
+        self.assertEqual(len(self.servicio.eventos._suscriptores), 1)
+
+
+class TestDifusorSSE(unittest.TestCase):
+
+    def setUp(self):
+        self.servicio = ServicioEmergencias(DBPacientes())
+        self.doctor = Doctor("20-30000000-1", "Gregorio", "House", "MP-1", email="house@hospital.com")
+
+    def test_difunde_deltas_publicados_desde_otros_hilos(self):
+        async def escenario():
+            difusor = DifusorSSE(self.servicio)
+            cola_a, cola_b = difusor.conectar(), difusor.conectar()
+
+            def operaciones():
+                ingreso = registrar(self.servicio, "20-11111111-1")
+                self.servicio.reclamar_siguiente_paciente(self.doctor)
+                self.servicio.registrar_atencion(ingreso.id, self.doctor, "Alta")
+
+            await asyncio.get_running_loop().run_in_executor(None, operaciones)
+            mensajes = [await asyncio.wait_for(cola_a.get(), 1) for _ in range(3)]
+            self.assertEqual(cola_b.qsize(), 3)
+            return mensajes
+
+        admision, reclamo, finalizacion = [parsear(m) for m in asyncio.run(escenario())]
+
+        self.assertEqual(admision["event"], "admision")
+        self.assertEqual(admision["data"]["item"]["estado"], "PENDIENTE")
+        self.assertEqual(admision["data"]["item"]["cuil_paciente"], "20-11111111-1")
+        self.assertEqual(reclamo["event"], "reclamo")
+        self.assertEqual(reclamo["data"]["doctor"], "house@hospital.com")
+        self.assertEqual(reclamo["data"]["item"]["estado"], "EN_PROCESO")
+        self.assertEqual(finalizacion["event"], "finalizacion")
+        self.assertNotIn("item", finalizacion["data"])
+        self.assertEqual(len({admision["data"]["id"], reclamo["data"]["id"], finalizacion["data"]["id"]}), 1)
+        self.assertEqual([int(m["id"]) for m in (admision, reclamo, finalizacion)], [1, 2, 3])
+
+    def test_cliente_lento_se_desconecta(self):
+        async def escenario():
+            difusor = DifusorSSE(self.servicio, max_pendientes=2)
+            cola = difusor.conectar()
+            hilo = threading.Thread(target=lambda: [registrar(self.servicio, f"20-{n:08d}-1") for n in range(3)])
+            hilo.start()
+            hilo.join()
+            # Dejar que el event loop procese los callbacks encolados
+            await asyncio.sleep(0.05)
+            return difusor, await cola.get()
+
+        difusor, mensaje = asyncio.run(escenario())
+
+        self.assertIsNone(mensaje)
+        self.assertEqual(difusor.clientes, 0)
+        self.assertEqual(difusor.clientes_descartados, 1)
+
+
+class TestTicketEventos(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = InMemoryUserRepo()
+        self.usuario = register("house@hospital.com", "password123", Rol.MEDICO, self.repo, matricula="MP-1")
+        self.cache = CacheTokens()
+        self.revocacion = ListaRevocacion(3600)
+        self.token = create_access_token({"email": self.usuario.email, "rol": "MEDICO"})
+
+    def usuario_stream(self, ticket=None, token_header=None):
+        return get_current_user_stream(token_header, ticket, self.repo, self.cache, self.revocacion)
+
+    def test_ticket_abre_el_stream(self):
+        respuesta = crear_ticket_eventos(self.usuario)
+
+        self.assertLessEqual(respuesta.expires_in, 60)
+        self.assertIs(self.usuario_stream(ticket=respuesta.ticket), self.usuario)
+        self.assertIs(self.usuario_stream(token_header=self.token), self.usuario)
+
+    def test_token_de_acceso_no_vale_en_la_url(self):
+        with self.assertRaises(HTTPException) as context:
+            self.usuario_stream(ticket=self.token)
+        self.assertEqual(context.exception.status_code, 401)
+
+    def test_ticket_no_vale_en_otras_rutas(self):
+        ticket = crear_ticket_eventos(self.usuario).ticket
+        # Aunque el stream ya lo haya aceptado, no queda en el cache de tokens
+        self.usuario_stream(ticket=ticket)
+
+        for autenticar in (
+            lambda: get_current_user(ticket, self.repo, self.cache, self.revocacion),
+            lambda: self.usuario_stream(token_header=ticket),
+        ):
+            with self.assertRaises(HTTPException) as context:
+                autenticar()
+            self.assertEqual(context.exception.status_code, 401)
+
@@ -1,5 +1,15 @@
+import pickle
 import unittest
-from ..models.models import Usuario, Rol
+from ..models.models import (
+    Domicilio,
+    FrecuenciaCardiaca,
+    Paciente,
+    Rol,
+    Temperatura,
+    TensionArterial,
+    Usuario,
+    ValueObject,
+)
 
 class TestUsuarioRol(unittest.TestCase):
 
@@ -27,5 +37,48 @@ class TestUsuarioRol(unittest.TestCase):
             u.set_rol("invalidrole")
 
 
+class TestValueObjects(unittest.TestCase):
+
+    def test_son_inmutables(self):
+        temperatura = Temperatura(37.5)
+        with self.assertRaises(AttributeError):
+            temperatura.valor = 40
+
+    def test_se_comparan_por_valor(self):
+        self.assertEqual(TensionArterial(120, 80), TensionArterial(120, 80))
+        self.assertNotEqual(Temperatura(80), FrecuenciaCardiaca(80))
+        self.assertEqual(len({Temperatura(37.5), Temperatura(37.5)}), 1)
+
+    def test_instancias_compartidas(self):
+        self.assertIs(Temperatura.compartido(37.5), Temperatura.compartido(37.5))
+        self.assertIsNot(Temperatura.compartido(37.5), Temperatura.compartido(38.0))
+        self.assertIs(pickle.loads(pickle.dumps(TensionArterial(120, 80))), TensionArterial.compartido(120, 80))
+
+    def test_compartido_valida_igual_que_el_constructor(self):
+        with self.assertRaisesRegex(ValueError, "Frecuencia Cardiaca no puede ser negativa"):
+            FrecuenciaCardiaca.compartido(-1)
+        with self.assertRaisesRegex(ValueError, "Frecuencia Diastolica no puede ser negativa"):
+            TensionArterial.compartido(120, -1)
+
+    def test_subclase_sin_valores_no_se_instancia(self):
+        class SinValores(ValueObject):
+            __slots__ = ()
+
+        with self.assertRaises(TypeError):
+            SinValores()
+
+
+class TestModelosCompactos(unittest.TestCase):
+
+    def test_sin_diccionario_por_instancia(self):
+        domicilio = Domicilio("San Martín", 123, "Yerba Buena", "Yerba Buena", "Tucumán", "Argentina")
+        paciente = Paciente("Juan", "Pérez", "20-12345678-9", domicilio)
+
+        for objeto in (domicilio, paciente, Temperatura(37.5)):
+            self.assertFalse(hasattr(objeto, "__dict__"))
+        with self.assertRaises(AttributeError):
+            paciente.telefono = "123"
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+from ..models.models import EstadoIngreso
+from ..services.proyeccion_listas import IngresoListItem, ListaFilas, fila_con_estado
+
+
+def crear_fila(ingreso_id: str) -> IngresoListItem:
+    return IngresoListItem(
+        id=ingreso_id, cuil_paciente="20-12345678-9", nombre_paciente="Juan", apellido_paciente="Pérez",
+        nivel_emergencia="URGENCIA", nivel_emergencia_nombre="Urgencia", estado="PENDIENTE",
+        fecha_ingreso="2025-01-01T10:00:00", temperatura=37.5, frecuencia_cardiaca=80,
+        frecuencia_respiratoria=16, frecuencia_sistolica=120, frecuencia_diastolica=80
+    )
+
+
+class TestListaFilas(unittest.TestCase):
+
+    def setUp(self):
+        self.lista = ListaFilas()
+        for clave, ingreso_id in [((2, 1), "b"), ((1, 2), "a"), ((3, 3), "d"), ((2, 4), "c")]:
+            self.lista.agregar(clave, crear_fila(ingreso_id))
+
+    def test_filas_en_orden_de_clave(self):
+        self.assertEqual([fila.id for fila in self.lista.filas()], ["a", "b", "c", "d"])
+
+    def test_quitar(self):
+        clave, fila = self.lista.quitar("c")
+
+        self.assertEqual((clave, fila.id), ((2, 4), "c"))
+        self.assertIsNone(self.lista.quitar("c"))
+        self.assertEqual([fila.id for fila in self.lista.filas()], ["a", "b", "d"])
+
+    def test_posteriores_a_una_clave(self):
+        self.assertEqual([fila.id for _, fila in self.lista.posteriores(None, 2)], ["a", "b"])
+        self.assertEqual([fila.id for _, fila in self.lista.posteriores((2, 1), 2)], ["c", "d"])
+        self.assertEqual(self.lista.posteriores((3, 3), 2), [])
+
+    def test_fila_con_estado_no_modifica_la_original(self):
+        fila = crear_fila("a")
+        en_proceso = fila_con_estado(fila, EstadoIngreso.EN_PROCESO)
+
+        self.assertEqual((fila.estado, en_proceso.estado), ("PENDIENTE", "EN_PROCESO"))
+
+
+if __name__ == '__main__':
+    unittest.main()
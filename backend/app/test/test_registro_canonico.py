@@ -0,0 +1,116 @@
+import unittest
+from unittest.mock import Mock
+from ..models.models import Afiliado, Domicilio, Enfermera, NivelEmergencia, ObraSocial
+from ..models.registro_canonico import RegistroCanonico
+from ..services.paciente_service import registrar_paciente
+from ..services.servicio_emergencias import ServicioEmergencias
+from .mocks import DBPacientes
+
+
+def copia(texto: str) -> str:
+    """Un texto igual pero en otro objeto (como los que decodifica cada request)"""
+    return "".join(list(texto))
+
+
+def domicilio_dict() -> dict:
+    return {
+        "calle": copia("San Martín"), "numero": 123, "localidad": copia("Yerba Buena"),
+        "ciudad": copia("Yerba Buena"), "provincia": copia("Tucumán"), "pais": copia("Argentina")
+    }
+
+
+class TestRegistroCanonico(unittest.TestCase):
+
+    def setUp(self):
+        self.registro = RegistroCanonico()
+
+    def test_texto_retorna_la_misma_instancia(self):
+        primero = self.registro.texto(copia("Tucumán"))
+        segundo = copia("Tucumán")
+
+        self.assertIs(self.registro.texto(segundo), primero)
+        self.assertIsNone(self.registro.texto(None))
+        estadisticas = self.registro.estadisticas()
+        self.assertEqual((estadisticas["textos"], estadisticas["reutilizaciones"]), (1, 1))
+        self.assertGreater(estadisticas["bytes_ahorrados"], 0)
+
+    def test_obra_social_compartida(self):
+        osde = self.registro.obra_social(copia("OSDE"))
+
+        self.assertIs(self.registro.obra_social(copia("OSDE")), osde)
+        self.assertIsNot(self.registro.obra_social("PAMI"), osde)
+        self.assertEqual(self.registro.estadisticas()["obras_sociales"], 2)
+
+    def test_obra_social_compartida_es_inmutable(self):
+        osde = self.registro.obra_social("OSDE")
+
+        with self.assertRaises(AttributeError):
+            osde.nombre = "PAMI"
+        self.assertEqual(self.registro.obra_social("OSDE").nombre, "OSDE")
+
+    def test_domicilio_comparte_solo_los_campos_de_baja_cardinalidad(self):
+        primero = self.registro.domicilio(**domicilio_dict())
+        datos = domicilio_dict()
+        segundo = self.registro.domicilio(**datos)
+
+        for campo in ("localidad", "ciudad", "provincia", "pais"):
+            self.assertIs(getattr(segundo, campo), getattr(primero, campo))
+        self.assertIs(segundo.calle, datos["calle"])
+
+    def test_internar_domicilio_existente(self):
+        primero = self.registro.domicilio(**domicilio_dict())
+        domicilio = self.registro.internar_domicilio(Domicilio(**domicilio_dict()))
+
+        self.assertIs(domicilio.provincia, primero.provincia)
+
+    def test_registro_acotado(self):
+        registro = RegistroCanonico(max_textos=1)
+        registro.texto("Tucumán")
+        otro = copia("Salta")
+
+        self.assertIs(registro.texto(otro), otro)
+        self.assertIsNot(registro.texto(copia("Salta")), otro)
+        self.assertEqual(registro.estadisticas()["sin_internar"], 2)
+
+
+class TestInterningEnAltas(unittest.TestCase):
+
+    def setUp(self):
+        self.registro = RegistroCanonico()
+
+    def test_servicio_emergencias_comparte_obra_social_y_domicilio(self):
+        servicio = ServicioEmergencias(DBPacientes(), registro=self.registro)
+        pacientes = []
+        for cuil in ("20-12345678-9", "27-98765432-1"):
+            ingreso, _ = servicio.registrar_urgencia(
+                cuil=cuil, enfermera=Enfermera("Ana", "López"), informe="Dolor abdominal",
+                nivel_emergencia=NivelEmergencia.URGENCIA, temperatura=37.5, frecuencia_cardiaca=85,
+                frecuencia_respiratoria=18, frecuencia_sistolica=120, frecuencia_diastolica=80,
+                nombre="Juan", apellido="Pérez", obra_social=copia("OSDE"), numero_afiliado="123456",
+                domicilio=domicilio_dict()
+            )
+            pacientes.append(ingreso.paciente)
+
+        primero, segundo = pacientes
+        self.assertIs(segundo.afiliado.obra_social, primero.afiliado.obra_social)
+        self.assertIs(segundo.domicilio.localidad, primero.domicilio.localidad)
+        self.assertGreater(self.registro.estadisticas()["bytes_ahorrados"], 0)
+
+    def test_registrar_paciente_comparte_obra_social_y_domicilio(self):
+        repo = Mock()
+        repo.get.return_value = None
+        pacientes = [
+            registrar_paciente(
+                cuil=cuil, apellido="Pérez", nombre="Juan", domicilio=Domicilio(**domicilio_dict()),
+                afiliado=Afiliado(ObraSocial(copia("OSDE")), "123456"), repo=repo, registro=self.registro
+            )
+            for cuil in ("20-12345678-9", "27-98765432-1")
+        ]
+
+        primero, segundo = pacientes
+        self.assertIs(segundo.afiliado.obra_social, primero.afiliado.obra_social)
+        self.assertIs(segundo.domicilio.pais, primero.domicilio.pais)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+from fastapi import HTTPException
+from jose import jwt
+from ..api.cache_tokens import CacheTokens
+from ..api.dependencies import get_current_enfermera, get_current_user
+from ..api.routes.auth import logout_user
+from ..core.config import settings
+from ..core.revocacion import ListaRevocacion
+from ..core.security import create_access_token, decode_access_token
+from ..models.models import Enfermera, Rol
+from ..repositories.revocacion_sqlite import ListaRevocacionSQLite
+from ..repositories.sqlite_db import BaseSQLite
+from ..services.auth_service import InMemoryUserRepo, register
+from ..services.directorio_personal import DirectorioPersonal
+
+
+class TestListaRevocacion(unittest.TestCase):
+
+    def setUp(self):
+        self.lista = ListaRevocacion(duracion_tokens=3600)
+
+    def test_revocar_por_jti(self):
+        payload = decode_access_token(create_access_token({"email": "ana@hospital.com"}))
+        self.assertFalse(self.lista.revocado(payload))
+
+        self.lista.revocar(payload["jti"], payload["exp"])
+        self.assertTrue(self.lista.revocado(payload))
+        self.assertFalse(self.lista.revocado({**payload, "jti": "otro"}))
+
+    def test_revocar_usuario_afecta_solo_a_los_tokens_anteriores(self):
+        ahora = int(time.time())
+        self.lista.revocar_usuario("ana@hospital.com", desde=ahora)
+
+        self.assertTrue(self.lista.revocado({"email": "ana@hospital.com", "iat": ahora - 1}))
+        self.assertFalse(self.lista.revocado({"email": "ana@hospital.com", "iat": ahora}))
+        self.assertFalse(self.lista.revocado({"email": "otro@hospital.com", "iat": ahora - 1}))
+
+    def test_descarta_las_entradas_vencidas(self):
+        self.lista.revocar("a" * 32, time.time() - 1)
+        self.lista.revocar("b" * 32, time.time() + 60)
+        self.lista.revocar_usuario("ana@hospital.com", desde=time.time() - 7200)
+
+        self.assertEqual(self.lista.estadisticas(), {"tokens_revocados": 1, "usuarios_con_corte": 0})
+
+
+class TestListaRevocacionSQLite(unittest.TestCase):
+    """Dos instancias sobre el mismo archivo hacen de dos workers"""
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        ruta = str(Path(self.directorio.name) / "guardia.db")
+        self.lista = ListaRevocacionSQLite(BaseSQLite(ruta), duracion_tokens=3600)
+        self.otro_worker = ListaRevocacionSQLite(BaseSQLite(ruta), duracion_tokens=3600)
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    def test_revocar_por_jti_se_ve_en_otro_worker(self):
+        payload = decode_access_token(create_access_token({"email": "ana@hospital.com"}))
+        version = self.otro_worker.version()
+
+        self.lista.revocar(payload["jti"], payload["exp"])
+        self.assertTrue(self.otro_worker.revocado(payload))
+        self.assertFalse(self.otro_worker.revocado({**payload, "jti": "otro"}))
+        self.assertEqual(self.otro_worker.version(), version + 1)
+
+    def test_revocar_usuario_afecta_solo_a_los_tokens_anteriores(self):
+        ahora = int(time.time())
+        self.lista.revocar_usuario("ana@hospital.com", desde=ahora)
+        self.lista.revocar_usuario("ana@hospital.com", desde=ahora - 60)
+
+        self.assertTrue(self.otro_worker.revocado({"email": "ana@hospital.com", "iat": ahora - 1}))
+        self.assertFalse(self.otro_worker.revocado({"email": "ana@hospital.com", "iat": ahora}))
+        self.assertFalse(self.otro_worker.revocado({"email": "otro@hospital.com", "iat": ahora - 1}))
+
+    def test_descarta_las_entradas_vencidas(self):
+        self.lista.revocar("a" * 32, time.time() - 1)
+        self.lista.revocar("b" * 32, time.time() + 60)
+        self.lista.revocar_usuario("ana@hospital.com", desde=time.time() - 7200)
+
+        self.assertEqual(self.otro_worker.estadisticas(), {"tokens_revocados": 1, "usuarios_con_corte": 0})
+
+    def test_logout_en_un_worker_invalida_el_cache_del_otro(self):
+        token = create_access_token({"email": "ana@hospital.com", "rol": "ENFERMERA"})
+        cache_otro_worker = CacheTokens()
+        with patch.object(settings, "AUTH_SIN_ESTADO", True):
+            usuario = get_current_user(token, InMemoryUserRepo(), cache_otro_worker, self.otro_worker)
+            logout_user(token, usuario, self.lista, CacheTokens())
+            with self.assertRaises(HTTPException):
+                get_current_user(token, InMemoryUserRepo(), cache_otro_worker, self.otro_worker)
+
+
+class TestPrincipalSinEstado(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = CacheTokens()
+        self.revocacion = ListaRevocacion(3600)
+        self.token = create_access_token({"email": "ana@hospital.com", "rol": "ENFERMERA", "matricula": "MN-1"})
+
+    def test_usuario_desde_los_claims_sin_repositorio(self):
+        repo_vacio = InMemoryUserRepo()
+        with patch.object(settings, "AUTH_SIN_ESTADO", True):
+            usuario = get_current_user(self.token, repo_vacio, self.cache, self.revocacion)
+        enfermera = get_current_enfermera(usuario, DirectorioPersonal())
+
+        self.assertEqual((usuario.email, usuario.rol, usuario.matricula), ("ana@hospital.com", Rol.ENFERMERA, "MN-1"))
+        self.assertIsInstance(enfermera, Enfermera)
+        self.assertEqual(enfermera.matricula, "MN-1")
+
+    def test_token_sin_rol(self):
+        token = create_access_token({"email": "ana@hospital.com"})
+        with patch.object(settings, "AUTH_SIN_ESTADO", True):
+            with self.assertRaises(HTTPException) as context:
+                get_current_user(token, InMemoryUserRepo(), self.cache, self.revocacion)
+        self.assertEqual(context.exception.status_code, 401)
+
+    def test_logout_revoca_el_token(self):
+        with patch.object(settings, "AUTH_SIN_ESTADO", True):
+            usuario = get_current_user(self.token, InMemoryUserRepo(), self.cache, self.revocacion)
+            logout_user(self.token, usuario, self.revocacion, self.cache)
+            with self.assertRaises(HTTPException):
+                get_current_user(self.token, InMemoryUserRepo(), self.cache, self.revocacion)
+
+    def test_logout_sin_jti_descarta_los_demas_tokens_del_cache(self):
+        def token_sin_jti(segundos_antes: int) -> str:
+            emitido = datetime.utcnow() - timedelta(seconds=segundos_antes)
+            claims = {"email": "ana@hospital.com", "rol": "ENFERMERA", "iat": emitido, "exp": emitido + timedelta(hours=1)}
+            return jwt.encode(claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+        primero, segundo = token_sin_jti(10), token_sin_jti(20)
+        with patch.object(settings, "AUTH_SIN_ESTADO", True):
+            usuario = get_current_user(primero, InMemoryUserRepo(), self.cache, self.revocacion)
+            get_current_user(segundo, InMemoryUserRepo(), self.cache, self.revocacion)
+            logout_user(primero, usuario, self.revocacion, self.cache)
+            with self.assertRaises(HTTPException):
+                get_current_user(segundo, InMemoryUserRepo(), self.cache, self.revocacion)
+
+    def test_corte_del_usuario_revoca_sus_tokens_anteriores(self):
+        repo = InMemoryUserRepo()
+        usuario = register("ana@hospital.com", "password123", Rol.ENFERMERA, repo)
+        anterior = create_access_token({"email": usuario.email, "rol": "ENFERMERA"})
+        self.assertIs(get_current_user(anterior, repo, self.cache, self.revocacion), usuario)
+
+        # Los iat tienen resolución de segundos: el corte tiene que ser posterior
+        self.revocacion.revocar_usuario(usuario.email, desde=time.time() + 1)
+        self.cache.invalidar(usuario.email)
+        with self.assertRaises(HTTPException):
+            get_current_user(anterior, repo, self.cache, self.revocacion)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,328 @@
+import unittest
+from ..services.proyeccion_listas import ingreso_a_list_item
+from ..services.servicio_emergencias import ServicioEmergencias
+from ..models.models import Doctor, Enfermera, NivelEmergencia
+from .mocks import DBPacientes
+
+
+DOMICILIO = {
+    "calle": "San Martín",
+    "numero": 123,
+    "localidad": "Yerba Buena",
+    "ciudad": "Yerba Buena",
+    "provincia": "Tucumán",
+    "pais": "Argentina"
+}
+
+
+def registrar(servicio: ServicioEmergencias, cuil: str, nivel: NivelEmergencia = NivelEmergencia.URGENCIA):
+    """Registra un ingreso con signos vitales válidos y retorna el ingreso creado"""
+    ingreso, _ = servicio.registrar_urgencia(
+        cuil=cuil,
+        enfermera=Enfermera("Ana", "López"),
+        informe="Dolor abdominal",
+        nivel_emergencia=nivel,
+        temperatura=37.5,
+        frecuencia_cardiaca=85,
+        frecuencia_respiratoria=18,
+        frecuencia_sistolica=120,
+        frecuencia_diastolica=80,
+        nombre="Juan",
+        apellido="Pérez",
+        obra_social=None,
+        domicilio=DOMICILIO
+    )
+    return ingreso
+
+
+class TestServicioEmergenciasIndices(unittest.TestCase):
+
+    def setUp(self):
+        self.servicio = ServicioEmergencias(DBPacientes())
+        self.doctor = Doctor("20-30000000-1", "Gregorio", "House", "MP-1", email="house@hospital.com")
+
+    def test_obtener_ingreso_por_id_en_todos_los_estados(self):
+        """El índice por id encuentra el ingreso pendiente, en proceso y finalizado"""
+        ingreso = registrar(self.servicio, "20-12345678-9")
+        self.assertIs(self.servicio.obtener_ingreso_por_id(ingreso.id), ingreso)
+
+        self.servicio.reclamar_siguiente_paciente(self.doctor)
+        self.assertEqual(self.servicio.obtener_ingreso_por_id(ingreso.id).estado, "EN_PROCESO")
+
+        self.servicio.registrar_atencion(ingreso.id, self.doctor, "Alta médica")
+        self.assertEqual(self.servicio.obtener_ingreso_por_id(ingreso.id).estado, "FINALIZADO")
+
+    def test_obtener_ingreso_inexistente(self):
+        self.assertIsNone(self.servicio.obtener_ingreso_por_id("no-existe"))
+
+    def test_registrar_atencion_de_ingreso_pendiente_falla(self):
+        """Un ingreso pendiente está indexado pero no puede recibir atención"""
+        ingreso = registrar(self.servicio, "20-12345678-9")
+        with self.assertRaises(ValueError):
+            self.servicio.registrar_atencion(ingreso.id, self.doctor, "Alta médica")
+
+    def test_asignacion_por_doctor(self):
+        """El doctor queda asignado al reclamar y se libera al registrar la atención"""
+        ingreso = registrar(self.servicio, "20-12345678-9")
+        registrar(self.servicio, "27-98765432-1")
+        self.assertIsNone(self.servicio.obtener_ingreso_asignado(self.doctor.email))
+
+        self.servicio.reclamar_siguiente_paciente(self.doctor)
+        self.assertIs(self.servicio.obtener_ingreso_asignado(self.doctor.email), ingreso)
+
+        with self.assertRaises(ValueError) as context:
+            self.servicio.reclamar_siguiente_paciente(self.doctor)
+        self.assertIn("ya tiene un paciente en revisión", str(context.exception))
+
+        self.servicio.registrar_atencion(ingreso.id, self.doctor, "Alta médica")
+        self.assertIsNone(self.servicio.obtener_ingreso_asignado(self.doctor.email))
+        self.assertEqual(self.servicio.reclamar_siguiente_paciente(self.doctor).cuil_paciente, "27-98765432-1")
+
+
+class TestRegistroEnLote(unittest.TestCase):
+
+    def setUp(self):
+        self.pacientes_repo = DBPacientes()
+        self.servicio = ServicioEmergencias(self.pacientes_repo)
+        registrar(self.servicio, "20-00000000-0", NivelEmergencia.SIN_URGENCIA)
+
+    def solicitud(self, cuil: str, nivel: NivelEmergencia = NivelEmergencia.URGENCIA, **cambios) -> dict:
+        datos = {
+            "cuil": cuil,
+            "informe": "Politraumatismo",
+            "nivel_emergencia": nivel,
+            "temperatura": 36.8,
+            "frecuencia_cardiaca": 110,
+            "frecuencia_respiratoria": 24,
+            "frecuencia_sistolica": 100,
+            "frecuencia_diastolica": 60,
+            "nombre": "Víctima",
+            "apellido": "Incidente",
+            "obra_social": None,
+            "domicilio": DOMICILIO,
+        }
+        datos.update(cambios)
+        return datos
+
+    def test_resultado_por_solicitud_y_orden_de_la_cola(self):
+        resultados = self.servicio.registrar_urgencias_lote(Enfermera("Ana", "López"), [
+            self.solicitud("20-11111111-1", NivelEmergencia.URGENCIA),
+            self.solicitud("20-22222222-2", frecuencia_cardiaca=-5),
+            self.solicitud("20-33333333-3", NivelEmergencia.CRITICA),
+            self.solicitud("20-44444444-4", nombre=None),
+            self.solicitud("20-00000000-0", NivelEmergencia.CRITICA, nombre=None),
+        ])
+
+        self.assertEqual([r.indice for r in resultados], [0, 1, 2, 3, 4])
+        self.assertEqual([r.ingreso is not None for r in resultados], [True, False, True, False, True])
+        self.assertIsNotNone(resultados[1].error)
+        self.assertEqual(resultados[3].error, "El campo nombre es obligatorio")
+        # Paciente nuevo: advertencia; paciente existente: sin advertencia
+        self.assertIsNotNone(resultados[0].mensaje_advertencia)
+        self.assertIsNone(resultados[4].mensaje_advertencia)
+        # Una solicitud inválida no da de alta al paciente
+        self.assertFalse(self.pacientes_repo.existe_paciente("20-22222222-2"))
+        self.assertEqual(
+            [i.cuil_paciente for i in self.servicio.obtener_ingresos_pendientes()],
+            ["20-33333333-3", "20-00000000-0", "20-11111111-1", "20-00000000-0"]
+        )
+        self.assertIs(self.servicio.obtener_ingreso_por_id(resultados[2].ingreso.id), resultados[2].ingreso)
+
+    def test_mismo_paciente_dos_veces_en_el_lote(self):
+        """La segunda solicitud encuentra al paciente creado por la primera"""
+        resultados = self.servicio.registrar_urgencias_lote(Enfermera("Ana", "López"), [
+            self.solicitud("20-11111111-1"),
+            self.solicitud("20-11111111-1", nombre=None, apellido=None, domicilio=None),
+        ])
+
+        self.assertTrue(all(r.ingreso is not None for r in resultados))
+        self.assertIs(resultados[0].ingreso.paciente, resultados[1].ingreso.paciente)
+
+
+class TestVersiones(unittest.TestCase):
+
+    def setUp(self):
+        self.servicio = ServicioEmergencias(DBPacientes())
+        self.doctor = Doctor("20-30000000-1", "Gregorio", "House", "MP-1", email="house@hospital.com")
+
+    def test_cada_lista_cambia_de_version_solo_con_sus_cambios(self):
+        pendientes, en_proceso = self.servicio.version_pendientes(), self.servicio.version_en_proceso()
+
+        ingreso = registrar(self.servicio, "20-11111111-1")
+        self.assertGreater(self.servicio.version_pendientes(), pendientes)
+        self.assertEqual(self.servicio.version_en_proceso(), en_proceso)
+
+        pendientes = self.servicio.version_pendientes()
+        self.servicio.reclamar_siguiente_paciente(self.doctor)
+        self.assertGreater(self.servicio.version_pendientes(), pendientes)
+        self.assertGreater(self.servicio.version_en_proceso(), en_proceso)
+
+        pendientes, en_proceso = self.servicio.version_pendientes(), self.servicio.version_en_proceso()
+        self.servicio.registrar_atencion(ingreso.id, self.doctor, "Alta")
+        self.assertEqual(self.servicio.version_pendientes(), pendientes)
+        self.assertGreater(self.servicio.version_en_proceso(), en_proceso)
+
+    def test_version_del_ingreso_avanza_con_cada_transicion(self):
+        ingreso = registrar(self.servicio, "20-11111111-1")
+        versiones = [self.servicio.version_ingreso(ingreso.id)]
+        self.servicio.reclamar_siguiente_paciente(self.doctor)
+        versiones.append(self.servicio.version_ingreso(ingreso.id))
+        self.servicio.registrar_atencion(ingreso.id, self.doctor, "Alta")
+        versiones.append(self.servicio.version_ingreso(ingreso.id))
+
+        self.assertEqual(versiones, sorted(set(versiones)))
+        self.assertIsNone(self.servicio.version_ingreso("no-existe"))
+
+
+class TestProyeccionListas(unittest.TestCase):
+
+    def setUp(self):
+        self.servicio = ServicioEmergencias(DBPacientes())
+        self.doctor = Doctor("20-30000000-1", "Gregorio", "House", "MP-1", email="house@hospital.com")
+
+    def assertProyeccionCoincide(self, servicio):
+        """Las filas de la proyección son las mismas que se armarían desde los ingresos"""
+        self.assertEqual(
+            servicio.obtener_filas_pendientes(),
+            [ingreso_a_list_item(i) for i in servicio.obtener_ingresos_pendientes()]
+        )
+        self.assertEqual(
+            servicio.obtener_filas_en_proceso(),
+            [ingreso_a_list_item(i) for i in servicio.obtener_ingresos_en_proceso()]
+        )
+
+    def test_cada_transicion_actualiza_las_filas(self):
+        niveles = list(NivelEmergencia)
+        for numero in range(6):
+            registrar(self.servicio, f"20-{numero:08d}-1", niveles[(numero * 2) % 5])
+        self.assertProyeccionCoincide(self.servicio)
+
+        reclamado = self.servicio.reclamar_siguiente_paciente(self.doctor)
+        self.servicio.atender_siguiente()
+        self.assertProyeccionCoincide(self.servicio)
+        self.assertEqual(self.servicio.obtener_filas_en_proceso()[0].estado, "EN_PROCESO")
+
+        self.servicio.registrar_atencion(reclamado.id, self.doctor, "Alta")
+        self.assertProyeccionCoincide(self.servicio)
+        self.assertEqual(self.servicio.obtener_filas_en_proceso(), [])
+
+    def test_cargar_ingresos_reconstruye_las_filas(self):
+        for numero in range(3):
+            registrar(self.servicio, f"20-{numero:08d}-1")
+        self.servicio.reclamar_siguiente_paciente(self.doctor)
+
+        restaurado = ServicioEmergencias(DBPacientes())
+        restaurado.cargar_ingresos(self.servicio.exportar_ingresos())
+
+        self.assertProyeccionCoincide(restaurado)
+        self.assertEqual(len(restaurado.obtener_filas_pendientes()), 2)
+
+
+class TestCambiosPendientes(unittest.TestCase):
+
+    def setUp(self):
+        self.servicio = ServicioEmergencias(DBPacientes(), max_cambios=4)
+        self.doctor = Doctor("20-30000000-1", "Gregorio", "House", "MP-1", email="house@hospital.com")
+
+    def aplicar(self, lista, cambios):
+        """Aplica los cambios a la lista del cliente como lo haría el frontend"""
+        restantes = [fila for fila in lista if fila.id not in cambios.bajas]
+        return sorted(
+            restantes + cambios.altas,
+            key=lambda fila: (NivelEmergencia[fila.nivel_emergencia].value['nivel'], fila.fecha_ingreso)
+        )
+
+    def test_cambios_reconstruyen_la_lista(self):
+        registrar(self.servicio, "20-11111111-1", NivelEmergencia.URGENCIA)
+        version = self.servicio.version_pendientes()
+        lista_cliente = self.servicio.obtener_filas_pendientes()
+
+        critica = registrar(self.servicio, "20-22222222-2", NivelEmergencia.CRITICA)
+        menor = registrar(self.servicio, "20-33333333-3", NivelEmergencia.URGENCIA_MENOR)
+        self.servicio.reclamar_siguiente_paciente(self.doctor)
+        cambios = self.servicio.obtener_cambios_pendientes(version)
+
+        # La crítica entró y salió después de la versión del cliente: no aparece
+        self.assertNotIn(critica.id, [i.id for i in cambios.altas] + cambios.bajas)
+        self.assertEqual([i.id for i in cambios.altas], [menor.id])
+        self.assertEqual(cambios.version, self.servicio.version_pendientes())
+        self.assertEqual(
+            [fila.id for fila in self.aplicar(lista_cliente, cambios)],
+            [fila.id for fila in self.servicio.obtener_filas_pendientes()]
+        )
+
+    def test_version_descartada_remite_a_la_lista_completa(self):
+        registrar(self.servicio, "20-11111111-1")
+        version = self.servicio.version_pendientes()
+        for numero in range(5):
+            registrar(self.servicio, f"20-{numero:08d}-2")
+
+        self.assertIsNone(self.servicio.obtener_cambios_pendientes(version))
+        self.assertIsNone(self.servicio.obtener_cambios_pendientes(self.servicio.version_pendientes() + 1))
+        actual = self.servicio.obtener_cambios_pendientes(self.servicio.version_pendientes())
+        self.assertEqual((actual.altas, actual.bajas), ([], []))
+
+    def test_cargar_ingresos_descarta_los_cambios(self):
+        version = self.servicio.version_pendientes()
+        registrar(self.servicio, "20-11111111-1")
+
+        self.servicio.cargar_ingresos([])
+
+        self.assertIsNone(self.servicio.obtener_cambios_pendientes(version))
+
+
+class TestPaginacion(unittest.TestCase):
+
+    def setUp(self):
+        self.servicio = ServicioEmergencias(DBPacientes())
+        niveles = list(NivelEmergencia)
+        for numero in range(7):
+            registrar(self.servicio, f"20-{numero:08d}-1", niveles[(numero * 3) % 5])
+
+    def recorrer(self, obtener_pagina, limite):
+        ids, cursor = [], None
+        while True:
+            pagina = obtener_pagina(limite, cursor)
+            ids.extend(fila.id for fila in pagina.filas)
+            if pagina.cursor_siguiente is None:
+                return ids
+            cursor = pagina.cursor_siguiente
+
+    def test_paginas_de_la_lista_de_espera(self):
+        esperados = [i.id for i in self.servicio.obtener_ingresos_pendientes()]
+
+        self.assertEqual(self.recorrer(self.servicio.obtener_pagina_pendientes, 3), esperados)
+        self.assertEqual(self.recorrer(self.servicio.obtener_pagina_pendientes, 7), esperados)
+
+    def test_cursor_sobrevive_a_cambios_en_la_lista(self):
+        primera = self.servicio.obtener_pagina_pendientes(3)
+        # Un reclamo saca un ingreso ya entregado: la página siguiente no se corre
+        self.servicio.reclamar_siguiente_paciente(
+            Doctor("20-30000000-1", "Gregorio", "House", "MP-1", email="house@hospital.com")
+        )
+        segunda = self.servicio.obtener_pagina_pendientes(3, primera.cursor_siguiente)
+
+        restantes = [i.id for i in self.servicio.obtener_ingresos_pendientes()]
+        self.assertEqual([i.id for i in segunda.filas], restantes[2:5])
+
+    def test_paginas_de_ingresos_en_proceso(self):
+        for numero in range(5):
+            self.servicio.reclamar_siguiente_paciente(
+                Doctor("", f"Doctor{numero}", "Guardia", f"MP-{numero}", email=f"doctor{numero}@hospital.com")
+            )
+        esperados = [i.id for i in self.servicio.obtener_ingresos_en_proceso()]
+
+        self.assertEqual(self.recorrer(self.servicio.obtener_pagina_en_proceso, 2), esperados)
+
+    def test_cursor_invalido(self):
+        cursor = self.servicio.obtener_pagina_pendientes(1).cursor_siguiente
+
+        for invalido in ("no-es-un-cursor", cursor + "x"):
+            with self.assertRaises(ValueError):
+                self.servicio.obtener_pagina_pendientes(2, invalido)
+        # Un cursor de la lista de espera no sirve para la de ingresos en proceso
+        with self.assertRaises(ValueError):
+            self.servicio.obtener_pagina_en_proceso(2, cursor)
+        # Ni para otra instancia del servicio (por ejemplo, después de un reinicio)
+        with self.assertRaises(ValueError):
+            ServicioEmergencias(DBPacientes()).obtener_pagina_pendientes(2, cursor)
@@ -0,0 +1,197 @@
+import unittest
+import multiprocessing
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+from ..services.proyeccion_listas import ingreso_a_list_item
+from ..repositories.sqlite_db import BaseSQLite
+from ..repositories.paciente_repo_sqlite import SQLitePacientesRepo
+from ..repositories.user_repo_sqlite import SQLiteUserRepo
+from ..services.servicio_emergencias_sqlite import ServicioEmergenciasSQLite
+from ..services.auth_service import register, login
+from ..models.models import Doctor, Enfermera, EstadoIngreso, NivelEmergencia, Rol
+from .test_servicio_emergencias import DOMICILIO, registrar
+
+
+PROCESOS = 4
+RECLAMOS_POR_PROCESO = 10
+
+
+def crear_servicio(ruta: str) -> ServicioEmergenciasSQLite:
+    db = BaseSQLite(ruta)
+    return ServicioEmergenciasSQLite(db, SQLitePacientesRepo(db))
+
+
+def reclamar_en_proceso(ruta: str, numero: int, resultados) -> None:
+    """Cuerpo de cada worker: reclama y finaliza ingresos sobre la base compartida"""
+    servicio = crear_servicio(ruta)
+    doctor = Doctor("", f"Doctor{numero}", "Guardia", f"MP-{numero}", email=f"doctor{numero}@hospital.com")
+    for _ in range(RECLAMOS_POR_PROCESO):
+        ingreso = servicio.reclamar_siguiente_paciente(doctor)
+        resultados.put(ingreso.id)
+        servicio.registrar_atencion(ingreso.id, doctor, "Alta")
+
+
+class TestServicioEmergenciasSQLite(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = str(Path(self.directorio.name) / "guardia.db")
+        self.servicio = crear_servicio(self.ruta)
+        self.doctor = Doctor("20-30000000-1", "Gregorio", "House", "MP-1", email="house@hospital.com")
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    def test_orden_de_la_lista_de_espera(self):
+        urgencia = registrar(self.servicio, "20-11111111-1", NivelEmergencia.URGENCIA)
+        critica = registrar(self.servicio, "20-22222222-2", NivelEmergencia.CRITICA)
+        urgencia_2 = registrar(self.servicio, "20-33333333-3", NivelEmergencia.URGENCIA)
+
+        self.assertEqual(
+            [i.id for i in self.servicio.obtener_ingresos_pendientes()],
+            [critica.id, urgencia.id, urgencia_2.id]
+        )
+
+    def test_filas_de_las_listas(self):
+        niveles = list(NivelEmergencia)
+        for numero in range(4):
+            registrar(self.servicio, f"20-{numero:08d}-1", niveles[(numero * 3) % 5])
+        reclamado = self.servicio.reclamar_siguiente_paciente(self.doctor)
+
+        self.assertEqual(
+            self.servicio.obtener_filas_pendientes(),
+            [ingreso_a_list_item(i) for i in self.servicio.obtener_ingresos_pendientes()]
+        )
+        self.assertEqual(self.servicio.obtener_filas_en_proceso(), [ingreso_a_list_item(reclamado)])
+
+    def test_paginacion_continua_en_otro_proceso(self):
+        niveles = list(NivelEmergencia)
+        for numero in range(5):
+            registrar(self.servicio, f"20-{numero:08d}-1", niveles[(numero * 3) % 5])
+        esperados = [i.id for i in self.servicio.obtener_ingresos_pendientes()]
+
+        primera = self.servicio.obtener_pagina_pendientes(3)
+        segunda = crear_servicio(self.ruta).obtener_pagina_pendientes(3, primera.cursor_siguiente)
+
+        self.assertEqual([i.id for i in primera.filas + segunda.filas], esperados)
+        self.assertIsNone(segunda.cursor_siguiente)
+
+    def test_versiones_compartidas_entre_procesos(self):
+        """Las versiones las mantienen triggers de la base: otra instancia ve los cambios"""
+        otro = crear_servicio(self.ruta)
+        self.assertEqual(otro.epoca, self.servicio.epoca)
+        pendientes, en_proceso = otro.version_pendientes(), otro.version_en_proceso()
+
+        ingreso = registrar(self.servicio, "20-11111111-1")
+        self.assertGreater(otro.version_pendientes(), pendientes)
+        self.assertEqual(otro.version_en_proceso(), en_proceso)
+        version_ingreso = otro.version_ingreso(ingreso.id)
+
+        self.servicio.reclamar_siguiente_paciente(self.doctor)
+        self.assertGreater(otro.version_en_proceso(), en_proceso)
+        self.assertGreater(otro.version_ingreso(ingreso.id), version_ingreso)
+
+        # Sin buffer de cambios compartido: solo la versión actual no remite a la lista completa
+        self.assertIsNone(otro.obtener_cambios_pendientes(pendientes))
+        self.assertIsNotNone(otro.obtener_cambios_pendientes(otro.version_pendientes()))
+
+        version_paciente = otro.pacientes_repo.obtener_version_paciente("20-11111111-1")
+        self.servicio.pacientes_repo.guardar_paciente(ingreso.paciente)
+        self.assertEqual(otro.pacientes_repo.obtener_version_paciente("20-11111111-1"), version_paciente + 1)
+
+    def test_ciclo_completo_visible_desde_otra_conexion(self):
+        """Otro proceso (otra instancia sobre la misma base) ve el mismo estado"""
+        ingreso = registrar(self.servicio, "20-11111111-1")
+        otro = crear_servicio(self.ruta)
+
+        reclamado = otro.reclamar_siguiente_paciente(self.doctor)
+        self.assertEqual(reclamado.id, ingreso.id)
+        self.assertEqual(self.servicio.obtener_ingreso_asignado(self.doctor.email).id, ingreso.id)
+        self.assertEqual([i.id for i in self.servicio.obtener_ingresos_en_proceso()], [ingreso.id])
+
+        self.servicio.registrar_atencion(ingreso.id, self.doctor, "Paciente estabilizado")
+        finalizado = otro.obtener_ingreso_por_id(ingreso.id)
+        self.assertEqual(finalizado.estado_ingreso, EstadoIngreso.FINALIZADO)
+        self.assertEqual(finalizado.atencion.informe, "Paciente estabilizado")
+        self.assertEqual(finalizado.doctor_asignado.email, self.doctor.email)
+        self.assertIsNone(otro.obtener_ingreso_asignado(self.doctor.email))
+        self.assertEqual(finalizado.paciente.nombre, "Juan")
+
+    def test_doctor_con_paciente_en_revision_no_puede_reclamar(self):
+        registrar(self.servicio, "20-11111111-1")
+        registrar(self.servicio, "20-22222222-2")
+        self.servicio.reclamar_siguiente_paciente(self.doctor)
+
+        with self.assertRaises(ValueError) as contexto:
+            self.servicio.reclamar_siguiente_paciente(self.doctor)
+        self.assertIn("ya tiene un paciente en revisión", str(contexto.exception))
+        self.assertEqual(len(self.servicio.obtener_ingresos_pendientes()), 1)
+
+    def test_lista_de_espera_vacia(self):
+        with self.assertRaises(ValueError) as contexto:
+            self.servicio.reclamar_siguiente_paciente(self.doctor)
+        self.assertEqual(str(contexto.exception), "No hay pacientes en la lista de espera")
+
+    def test_reclamos_concurrentes_entre_procesos_son_atomicos(self):
+        total = PROCESOS * RECLAMOS_POR_PROCESO
+        for n in range(total):
+            registrar(self.servicio, f"20-{n:08d}-1")
+
+        contexto = multiprocessing.get_context("spawn")
+        resultados = contexto.Queue()
+        procesos = [
+            contexto.Process(target=reclamar_en_proceso, args=(self.ruta, n, resultados))
+            for n in range(PROCESOS)
+        ]
+        for proceso in procesos:
+            proceso.start()
+        for proceso in procesos:
+            proceso.join(60)
+            self.assertEqual(proceso.exitcode, 0)
+
+        reclamados = [resultados.get(timeout=5) for _ in range(total)]
+        self.assertEqual(len(set(reclamados)), total)
+        self.assertEqual(self.servicio.obtener_ingresos_pendientes(), [])
+        self.assertEqual(self.servicio.obtener_ingresos_en_proceso(), [])
+
+    def test_alta_simultanea_del_mismo_paciente_en_dos_workers(self):
+        otro_worker = crear_servicio(self.ruta)
+
+        def admitir(servicio, nombre):
+            return servicio.registrar_urgencia(
+                cuil="20-11111111-1", enfermera=Enfermera("Ana", "López"), informe="Dolor abdominal",
+                nivel_emergencia=NivelEmergencia.URGENCIA, temperatura=37.5, frecuencia_cardiaca=85,
+                frecuencia_respiratoria=18, frecuencia_sistolica=120, frecuencia_diastolica=80,
+                nombre=nombre, apellido="Pérez", obra_social=None, domicilio=DOMICILIO
+            )
+
+        _, creado = admitir(self.servicio, "Juan")
+        repo = otro_worker.pacientes_repo
+        guardado = repo.obtener_paciente_por_cuil("20-11111111-1")
+        # El otro worker buscó el CUIL antes de que este worker lo insertara
+        with patch.object(repo, "obtener_paciente_por_cuil", side_effect=[None, guardado]):
+            ingreso, mensaje = admitir(otro_worker, "Juana")
+
+        self.assertIsNotNone(creado)
+        self.assertIsNone(mensaje)
+        self.assertEqual(ingreso.paciente.nombre, "Juan")
+        self.assertEqual(repo.obtener_paciente_por_cuil("20-11111111-1").nombre, "Juan")
+
+    def test_repositorio_de_usuarios(self):
+        repo = SQLiteUserRepo(self.servicio.db)
+        register("house@hospital.com", "strongpass1", Rol.MEDICO, repo=repo)
+
+        with self.assertRaises(ValueError):
+            register("house@hospital.com", "otrapass12", Rol.MEDICO, repo=repo)
+        self.assertEqual(login("house@hospital.com", "strongpass1", repo=repo).rol, Rol.MEDICO)
+        self.assertEqual(repo.count(), 1)
+        self.assertEqual([u.email for u in repo.get_all_by_rol(Rol.MEDICO)], ["house@hospital.com"])
+
+    def test_reemplazar_password_hash_solo_si_no_cambio(self):
+        repo = SQLiteUserRepo(self.servicio.db)
+        anterior = register("house@hospital.com", "strongpass1", Rol.MEDICO, repo=repo).password_hash
+
+        self.assertTrue(repo.reemplazar_password_hash("house@hospital.com", anterior, "nuevo"))
+        self.assertFalse(repo.reemplazar_password_hash("house@hospital.com", anterior, "otro"))
+        self.assertEqual(repo.get("house@hospital.com").password_hash, "nuevo")
@@ -0,0 +1,132 @@
+import unittest
+import tempfile
+import threading
+import time
+from pathlib import Path
+from ..persistence.snapshot import GestorSnapshots, cargar_ultima_imagen, restaurar_imagen
+from ..persistence.wal import WriteAheadLog, leer_registros, reproducir
+from ..services.auth_service import InMemoryUserRepo, register
+from ..services.servicio_emergencias import ServicioEmergencias
+from ..models.models import Doctor, NivelEmergencia, Rol
+from .mocks import DBPacientes
+from .test_servicio_emergencias import registrar
+
+
+class TestSnapshots(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta_snapshots = str(Path(self.directorio.name) / "snapshots")
+        self.ruta_wal = str(Path(self.directorio.name) / "guardia.wal")
+        self.doctor = Doctor("20-30000000-1", "Gregorio", "House", "MP-1", email="house@hospital.com")
+
+        self.user_repo = InMemoryUserRepo()
+        register("house@hospital.com", "strongpass1", Rol.MEDICO, repo=self.user_repo)
+        self.pacientes_repo = DBPacientes()
+        self.wal = WriteAheadLog(self.ruta_wal)
+        self.servicio = ServicioEmergencias(self.pacientes_repo, wal=self.wal)
+        self.gestor = GestorSnapshots(
+            self.ruta_snapshots, self.user_repo, self.pacientes_repo, self.servicio, wal=self.wal
+        )
+
+    def tearDown(self):
+        self.wal.cerrar()
+        self.directorio.cleanup()
+
+    def esperar_snapshot(self):
+        limite = time.time() + 10
+        while self.gestor.en_curso and time.time() < limite:
+            time.sleep(0.01)
+        self.assertTrue(self.gestor.ultimo_resultado["exito"])
+
+    def test_snapshot_en_segundo_plano_y_restauracion(self):
+        """El snapshot captura usuarios, pacientes e ingresos en todos sus estados"""
+        en_proceso = registrar(self.servicio, "20-11111111-1", NivelEmergencia.CRITICA)
+        pendiente = registrar(self.servicio, "20-22222222-2", NivelEmergencia.URGENCIA)
+        self.servicio.reclamar_siguiente_paciente(self.doctor)
+
+        self.assertTrue(self.gestor.guardar_en_segundo_plano())
+        self.esperar_snapshot()
+
+        user_repo, pacientes_repo = InMemoryUserRepo(), DBPacientes()
+        ingresos, lsn = restaurar_imagen(cargar_ultima_imagen(self.ruta_snapshots), user_repo, pacientes_repo)
+        restaurado = ServicioEmergencias(pacientes_repo)
+        restaurado.cargar_ingresos(ingresos)
+
+        self.assertEqual(lsn, self.wal.ultimo_lsn)
+        self.assertTrue(user_repo.get("house@hospital.com").verificar_password("strongpass1"))
+        self.assertEqual(user_repo.get("house@hospital.com").rol, Rol.MEDICO)
+        self.assertTrue(pacientes_repo.existe_paciente("20-22222222-2"))
+        self.assertEqual([i.id for i in restaurado.obtener_ingresos_pendientes()], [pendiente.id])
+        self.assertEqual(restaurado.obtener_ingreso_asignado(self.doctor.email).id, en_proceso.id)
+        self.assertIs(restaurado.obtener_ingreso_por_id(pendiente.id).paciente,
+                      pacientes_repo.obtener_paciente_por_cuil("20-22222222-2"))
+
+    def test_wal_posterior_al_snapshot(self):
+        """Las operaciones posteriores al snapshot se recuperan del WAL"""
+        antes = registrar(self.servicio, "20-11111111-1")
+        self.gestor.guardar_en_segundo_plano()
+        self.esperar_snapshot()
+        despues = registrar(self.servicio, "20-22222222-2", NivelEmergencia.CRITICA)
+        self.servicio.reclamar_siguiente_paciente(self.doctor)
+        self.wal.cerrar()
+
+        # El snapshot ya incluye la primera admisión: el WAL la descartó
+        self.assertEqual(self.gestor.ultimo_resultado["registros_wal_descartados"], 1)
+        self.assertEqual([r["op"] for r in leer_registros(self.ruta_wal)], ["admision", "reclamo"])
+
+        pacientes_repo = DBPacientes()
+        ingresos, lsn = restaurar_imagen(cargar_ultima_imagen(self.ruta_snapshots), InMemoryUserRepo(), pacientes_repo)
+        ingresos = reproducir(leer_registros(self.ruta_wal, lsn), pacientes_repo, ingresos)
+        restaurado = ServicioEmergencias(pacientes_repo)
+        restaurado.cargar_ingresos(ingresos)
+
+        self.assertEqual([i.id for i in restaurado.obtener_ingresos_pendientes()], [antes.id])
+        self.assertEqual(restaurado.obtener_ingreso_asignado(self.doctor.email).id, despues.id)
+
+    def test_conserva_los_snapshots_mas_recientes(self):
+        registrar(self.servicio, "20-11111111-1")
+        for _ in range(4):
+            self.gestor.guardar_en_segundo_plano()
+            self.esperar_snapshot()
+
+        self.assertEqual(self.gestor.snapshots_realizados, 4)
+        self.assertEqual(len(list(Path(self.ruta_snapshots).glob("snapshot-*"))), 2)
+
+    def test_snapshot_durante_admisiones_concurrentes(self):
+        """Un snapshot tomado mientras otros hilos escriben en el WAL termina y se restaura"""
+        detener = threading.Event()
+        admitidos = []
+
+        def admitir(numero_hilo: int):
+            i = 0
+            while not detener.is_set():
+                admitidos.append(registrar(self.servicio, f"20-{numero_hilo:02d}{i:06d}-1").id)
+                i += 1
+
+        hilos = [threading.Thread(target=admitir, args=(n,)) for n in range(4)]
+        for hilo in hilos:
+            hilo.start()
+        try:
+            for _ in range(3):
+                time.sleep(0.02)
+                self.assertTrue(self.gestor.guardar_en_segundo_plano())
+                self.esperar_snapshot()
+        finally:
+            detener.set()
+            for hilo in hilos:
+                hilo.join()
+        self.wal.cerrar()
+
+        pacientes_repo = DBPacientes()
+        ingresos, lsn = restaurar_imagen(cargar_ultima_imagen(self.ruta_snapshots), InMemoryUserRepo(), pacientes_repo)
+        self.assertGreater(len(ingresos), 0)
+        ingresos = reproducir(leer_registros(self.ruta_wal, lsn), pacientes_repo, ingresos)
+        restaurado = ServicioEmergencias(pacientes_repo)
+        restaurado.cargar_ingresos(ingresos)
+
+        self.assertEqual(
+            [i.id for i in restaurado.obtener_ingresos_pendientes()],
+            [i.id for i in self.servicio.obtener_ingresos_pendientes()]
+        )
+        self.assertEqual(len(restaurado.obtener_ingresos_pendientes()), len(admitidos))
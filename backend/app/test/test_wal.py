@@ -0,0 +1,179 @@
+import unittest
+import tempfile
+import threading
+from pathlib import Path
+from ..persistence.wal import WriteAheadLog, leer_registros, reproducir
+from ..services.servicio_emergencias import ServicioEmergencias
+from ..models.models import Doctor, Enfermera, NivelEmergencia
+from .mocks import DBPacientes
+from .test_servicio_emergencias import DOMICILIO, registrar
+
+
+class TestWriteAheadLog(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = str(Path(self.directorio.name) / "guardia.wal")
+        self.doctor = Doctor("20-30000000-1", "Gregorio", "House", "MP-1", email="house@hospital.com")
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    def restaurar(self) -> ServicioEmergencias:
+        repo = DBPacientes()
+        servicio = ServicioEmergencias(repo)
+        servicio.cargar_ingresos(reproducir(leer_registros(self.ruta), repo))
+        return servicio
+
+    def test_replay_reconstruye_el_estado(self):
+        """Pendientes, en proceso y finalizados se recuperan tras reiniciar"""
+        wal = WriteAheadLog(self.ruta)
+        servicio = ServicioEmergencias(DBPacientes(), wal=wal)
+        finalizado = registrar(servicio, "20-11111111-1", NivelEmergencia.CRITICA)
+        en_proceso = registrar(servicio, "20-22222222-2", NivelEmergencia.EMERGENCIA)
+        pendiente_1 = registrar(servicio, "20-33333333-3", NivelEmergencia.SIN_URGENCIA)
+        pendiente_2 = registrar(servicio, "20-44444444-4", NivelEmergencia.URGENCIA)
+
+        servicio.reclamar_siguiente_paciente(self.doctor)
+        servicio.registrar_atencion(finalizado.id, self.doctor, "Alta médica")
+        servicio.reclamar_siguiente_paciente(self.doctor)
+        wal.cerrar()
+
+        restaurado = self.restaurar()
+        self.assertEqual(
+            [i.id for i in restaurado.obtener_ingresos_pendientes()],
+            [pendiente_2.id, pendiente_1.id]
+        )
+        self.assertEqual([i.id for i in restaurado.obtener_ingresos_en_proceso()], [en_proceso.id])
+        self.assertEqual(restaurado.obtener_ingreso_asignado(self.doctor.email).id, en_proceso.id)
+        self.assertEqual(restaurado.obtener_ingreso_por_id(finalizado.id).atencion.informe, "Alta médica")
+        self.assertEqual(restaurado.obtener_ingreso_por_id(pendiente_1.id).fecha_ingreso, pendiente_1.fecha_ingreso)
+        self.assertTrue(restaurado.pacientes_repo.existe_paciente("20-33333333-3"))
+
+    def test_reapertura_continua_la_secuencia(self):
+        """Al reabrir el log se continúa desde el último LSN"""
+        wal = WriteAheadLog(self.ruta)
+        servicio = ServicioEmergencias(DBPacientes(), wal=wal)
+        registrar(servicio, "20-11111111-1")
+        wal.cerrar()
+
+        wal = WriteAheadLog(self.ruta)
+        self.assertEqual(wal.ultimo_lsn, 1)
+        self.assertEqual(wal.registrar({"op": "noop"}), 2)
+        wal.cerrar()
+
+    def test_registro_incompleto_se_descarta(self):
+        """Una última línea cortada por una caída no impide el replay"""
+        wal = WriteAheadLog(self.ruta)
+        servicio = ServicioEmergencias(DBPacientes(), wal=wal)
+        registrar(servicio, "20-11111111-1")
+        wal.cerrar()
+        with open(self.ruta, "ab") as archivo:
+            archivo.write(b'{"op":"admision","ingr')
+
+        self.assertEqual(len(self.restaurar().obtener_ingresos_pendientes()), 1)
+        wal = WriteAheadLog(self.ruta)
+        self.assertEqual(wal.ultimo_lsn, 1)
+        wal.cerrar()
+        self.assertEqual(len(list(leer_registros(self.ruta))), 1)
+
+    def test_admision_invalida_no_deja_pacientes_sin_registrar(self):
+        """Una admisión rechazada por sus signos vitales no impide el replay de las siguientes"""
+        wal = WriteAheadLog(self.ruta)
+        servicio = ServicioEmergencias(DBPacientes(), wal=wal)
+        with self.assertRaises(ValueError):
+            servicio.registrar_urgencia(
+                cuil="20-12345678-9", enfermera=Enfermera("Ana", "López"), informe="Fiebre",
+                nivel_emergencia=NivelEmergencia.URGENCIA, temperatura=-5, frecuencia_cardiaca=85,
+                frecuencia_respiratoria=18, frecuencia_sistolica=120, frecuencia_diastolica=80,
+                nombre="Juan", apellido="Pérez", obra_social=None, domicilio=DOMICILIO
+            )
+        self.assertFalse(servicio.pacientes_repo.existe_paciente("20-12345678-9"))
+        ingreso = registrar(servicio, "20-12345678-9")
+        wal.cerrar()
+
+        restaurado = self.restaurar()
+        self.assertEqual([i.id for i in restaurado.obtener_ingresos_pendientes()], [ingreso.id])
+        self.assertTrue(restaurado.pacientes_repo.existe_paciente("20-12345678-9"))
+
+    def test_datos_del_paciente_viajan_en_la_primera_admision_registrada(self):
+        """Si otra admisión del mismo CUIL llega antes al WAL, es la que lleva los datos del paciente"""
+        wal = WriteAheadLog(self.ruta)
+        servicio = ServicioEmergencias(DBPacientes(), wal=wal)
+        # Una request da de alta al paciente y todavía no registró su admisión...
+        with servicio._lock_pacientes:
+            servicio._obtener_o_crear_paciente("20-12345678-9", "Juan", "Pérez", None, None, DOMICILIO)
+        # ...cuando otra admite al mismo paciente, ya existente
+        primero = registrar(servicio, "20-12345678-9")
+        segundo = registrar(servicio, "20-12345678-9")
+        wal.cerrar()
+
+        registros = list(leer_registros(self.ruta))
+        self.assertIn("paciente", registros[0])
+        self.assertNotIn("paciente", registros[1])
+        restaurado = self.restaurar()
+        self.assertEqual([i.id for i in restaurado.obtener_ingresos_pendientes()], [primero.id, segundo.id])
+
+    def test_reclamo_sin_wal_deja_al_paciente_en_la_cola(self):
+        """Si el WAL rechaza el reclamo, el ingreso sigue pendiente y en su lista"""
+        wal = WriteAheadLog(self.ruta)
+        servicio = ServicioEmergencias(DBPacientes(), wal=wal)
+        urgente = registrar(servicio, "20-11111111-1", NivelEmergencia.CRITICA)
+        otro = registrar(servicio, "20-22222222-2")
+        version = servicio.version_pendientes()
+        wal.cerrar()
+
+        with self.assertRaises(RuntimeError):
+            servicio.reclamar_siguiente_paciente(self.doctor)
+        with self.assertRaises(RuntimeError):
+            servicio.atender_siguiente()
+
+        self.assertEqual([i.id for i in servicio.obtener_ingresos_pendientes()], [urgente.id, otro.id])
+        self.assertEqual([f.id for f in servicio.obtener_filas_pendientes()], [urgente.id, otro.id])
+        self.assertEqual(servicio.version_pendientes(), version)
+        self.assertIsNone(servicio.obtener_ingreso_asignado(self.doctor.email))
+        self.assertEqual(servicio.obtener_ingresos_en_proceso(), [])
+
+    def test_compactar_descarta_los_registros_anteriores(self):
+        """Compactar deja solo los registros posteriores al LSN y el log sigue aceptando registros"""
+        wal = WriteAheadLog(self.ruta)
+        servicio = ServicioEmergencias(DBPacientes(), wal=wal)
+        registrar(servicio, "20-11111111-1")
+        registrar(servicio, "20-22222222-2")
+        posterior = registrar(servicio, "20-33333333-3")
+
+        self.assertEqual(wal.compactar(2), 2)
+        self.assertEqual(wal.compactar(2), 0)
+        registrar(servicio, "20-44444444-4")
+        wal.cerrar()
+
+        self.assertEqual([r["lsn"] for r in leer_registros(self.ruta)], [3, 4])
+        self.assertEqual(reproducir(leer_registros(self.ruta), DBPacientes())[0].id, posterior.id)
+        wal = WriteAheadLog(self.ruta)
+        self.assertEqual(wal.ultimo_lsn, 4)
+        self.assertEqual(wal.compactar(4), 2)
+        wal.cerrar()
+        # Con el log vacío, la secuencia continúa desde el LSN del snapshot
+        wal = WriteAheadLog(self.ruta, lsn_inicial=4)
+        self.assertEqual(wal.registrar({"op": "noop"}), 5)
+        wal.cerrar()
+
+    def test_group_commit_agrupa_fsyncs(self):
+        """Admisiones concurrentes comparten fsyncs"""
+        wal = WriteAheadLog(self.ruta, demora_commit_ms=2)
+        servicio = ServicioEmergencias(DBPacientes(), wal=wal)
+
+        def admitir(numero_hilo: int):
+            for i in range(20):
+                registrar(servicio, f"20-{numero_hilo:02d}{i:06d}-1")
+
+        hilos = [threading.Thread(target=admitir, args=(n,)) for n in range(8)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        wal.cerrar()
+
+        self.assertEqual(wal.registros_escritos, 160)
+        self.assertLess(wal.fsyncs, 160)
+        self.assertEqual(wal.lsn_durable, 160)
@@ -15,8 +15,21 @@ import RefreshIcon from '@mui/icons-material/Refresh';
 import PeopleIcon from '@mui/icons-material/People';
 import { TarjetaPaciente } from './TarjetaPaciente';
 import { useUrgencias } from '../../hooks/useUrgencias';
+import { useEventosUrgencias, reemplazarPorId, quitarPorId } from '../../hooks/useEventosUrgencias';
+import type { EventoUrgencia } from '../../hooks/useEventosUrgencias';
+import { NIVELES_EMERGENCIA } from '../../utils/constants';
 import type { IngresoListItem } from '../../services/urgenciasService';
 
+// Mismo orden que la cola del backend: nivel de emergencia y luego hora de llegada
+const compararPorPrioridad = (a: IngresoListItem, b: IngresoListItem): number => {
+  const nivelA = NIVELES_EMERGENCIA[a.nivel_emergencia as keyof typeof NIVELES_EMERGENCIA]?.nivel ?? 99;
+  const nivelB = NIVELES_EMERGENCIA[b.nivel_emergencia as keyof typeof NIVELES_EMERGENCIA]?.nivel ?? 99;
+  if (nivelA !== nivelB) {
+    return nivelA - nivelB;
+  }
+  return a.fecha_ingreso.localeCompare(b.fecha_ingreso);
+};
+
 interface ListaEsperaProps {
   refreshTrigger?: number;
   showReclamarButton?: boolean;
@@ -40,14 +53,26 @@ export const ListaEspera: React.FC<ListaEsperaProps> = ({
     cargarIngresos();
   }, [refreshTrigger]);
 
-  // Auto-refresh cada 30 segundos
+  // Cambios en tiempo real: admisiones entran a la lista, reclamos salen
+  const aplicarEvento = (evento: EventoUrgencia) => {
+    if (evento.tipo === 'admision' && evento.item) {
+      const item = evento.item;
+      setIngresos((actuales) => reemplazarPorId(actuales, item).sort(compararPorPrioridad));
+    } else if (evento.tipo === 'reclamo') {
+      setIngresos((actuales) => quitarPorId(actuales, evento.id));
+    }
+  };
+  const streamConectado = useEventosUrgencias(aplicarEvento, cargarIngresos);
+
+  // Auto-refresh cada 30 segundos; con el stream conectado solo como respaldo
+  // (con varios workers cada stream trae los cambios de un solo worker)
   useEffect(() => {
     const interval = setInterval(() => {
       cargarIngresos();
-    }, 30000);
+    }, streamConectado ? 120000 : 30000);
 
     return () => clearInterval(interval);
-  }, []);
+  }, [streamConectado]);
 
   return (
     <Paper elevation={3} sx={{ p: 3 }}>
@@ -16,6 +16,8 @@ import AssignmentIcon from '@mui/icons-material/Assignment';
 import { useNavigate } from 'react-router-dom';
 import { TarjetaPaciente } from './TarjetaPaciente';
 import { useUrgencias } from '../../hooks/useUrgencias';
+import { useEventosUrgencias, reemplazarPorId, quitarPorId } from '../../hooks/useEventosUrgencias';
+import type { EventoUrgencia } from '../../hooks/useEventosUrgencias';
 import { isMedico } from '../../services/authService';
 import type { IngresoListItem } from '../../services/urgenciasService';
 
@@ -38,14 +40,26 @@ export const ListaRevisionEnProceso: React.FC<ListaRevisionEnProcesoProps> = ({
     cargarIngresos();
   }, [refreshTrigger]);
 
-  // Auto-refresh cada 30 segundos
+  // Cambios en tiempo real: reclamos entran a la lista, finalizaciones salen
+  const aplicarEvento = (evento: EventoUrgencia) => {
+    if (evento.tipo === 'reclamo' && evento.item) {
+      const item = evento.item;
+      setIngresos((actuales) => reemplazarPorId(actuales, item));
+    } else if (evento.tipo === 'finalizacion') {
+      setIngresos((actuales) => quitarPorId(actuales, evento.id));
+    }
+  };
+  const streamConectado = useEventosUrgencias(aplicarEvento, cargarIngresos);
+
+  // Auto-refresh cada 30 segundos; con el stream conectado solo como respaldo
+  // (con varios workers cada stream trae los cambios de un solo worker)
   useEffect(() => {
     const interval = setInterval(() => {
       cargarIngresos();
-    }, 30000);
+    }, streamConectado ? 120000 : 30000);
 
     return () => clearInterval(interval);
-  }, []);
+  }, [streamConectado]);
 
   const handleContinuar = (ingresoId: string) => {
     navigate(`/urgencias/revision/${ingresoId}`);
@@ -0,0 +1,121 @@
+/**
+ * Hook para recibir por server-sent events los cambios de la lista de espera
+ * y de los ingresos en proceso (GET /api/urgencias/eventos)
+ */
+import { useEffect, useRef, useState } from 'react';
+import { API_CONFIG } from '../utils/constants';
+import { obtenerTicketEventos } from '../services/urgenciasService';
+import type { IngresoListItem } from '../services/urgenciasService';
+
+// Espera antes de reconectar el stream (igual al `retry` que envía el servidor)
+const REINTENTO_MS = 3000;
+
+export type TipoEventoUrgencia = 'admision' | 'reclamo' | 'finalizacion';
+
+export interface EventoUrgencia {
+  tipo: TipoEventoUrgencia;
+  id: string;
+  estado: string;
+  doctor: string | null;
+  // Presente en admisiones y reclamos
+  item?: IngresoListItem;
+}
+
+/**
+ * Se suscribe al stream de eventos mientras el componente está montado.
+ *
+ * @param onEvento - Se llama con cada evento recibido
+ * @param onConectado - Se llama al (re)conectar; el componente debe volver a
+ *   pedir la lista completa porque pudo perder eventos mientras no estaba conectado
+ * @returns true mientras el stream está conectado
+ */
+export const useEventosUrgencias = (
+  onEvento: (evento: EventoUrgencia) => void,
+  onConectado?: () => void
+): boolean => {
+  const [conectado, setConectado] = useState(false);
+  const onEventoRef = useRef(onEvento);
+  const onConectadoRef = useRef(onConectado);
+  onEventoRef.current = onEvento;
+  onConectadoRef.current = onConectado;
+
+  useEffect(() => {
+    if (!localStorage.getItem(API_CONFIG.TOKEN_KEY) || typeof EventSource === 'undefined') {
+      return;
+    }
+
+    let activo = true;
+    let fuente: EventSource | null = null;
+    let reintento: ReturnType<typeof setTimeout> | undefined;
+
+    const reconectar = () => {
+      if (activo) {
+        reintento = setTimeout(conectar, REINTENTO_MS);
+      }
+    };
+
+    const conectar = async () => {
+      let ticket: string;
+      try {
+        ticket = await obtenerTicketEventos();
+      } catch {
+        // Mientras tanto se sigue con el polling
+        reconectar();
+        return;
+      }
+      if (!activo) {
+        return;
+      }
+
+      // EventSource no permite enviar headers: en la URL viaja un ticket que
+      // vence en segundos y solo sirve para este stream, no el token de acceso
+      const url = `${API_CONFIG.BASE_URL}/api/urgencias/eventos?ticket=${encodeURIComponent(ticket)}`;
+      fuente = new EventSource(url);
+
+      fuente.onopen = () => {
+        setConectado(true);
+        onConectadoRef.current?.();
+      };
+      fuente.onerror = () => {
+        // El reintento propio de EventSource usaría el mismo ticket, que ya
+        // puede estar vencido: se cierra y se reconecta con uno nuevo
+        setConectado(false);
+        fuente?.close();
+        reconectar();
+      };
+
+      const tipos: TipoEventoUrgencia[] = ['admision', 'reclamo', 'finalizacion'];
+      tipos.forEach((tipo) => {
+        fuente?.addEventListener(tipo, (mensaje) => {
+          const datos = JSON.parse((mensaje as MessageEvent).data);
+          onEventoRef.current({ tipo, ...datos });
+        });
+      });
+    };
+
+    conectar();
+
+    return () => {
+      activo = false;
+      clearTimeout(reintento);
+      fuente?.close();
+      setConectado(false);
+    };
+  }, []);
+
+  return conectado;
+};
+
+/**
+ * Inserta o reemplaza un item en una lista (por id), manteniendo el resto
+ */
+export const reemplazarPorId = (lista: IngresoListItem[], item: IngresoListItem): IngresoListItem[] => [
+  ...lista.filter((ingreso) => ingreso.id !== item.id),
+  item,
+];
+
+/**
+ * Quita un item de una lista por id
+ */
+export const quitarPorId = (lista: IngresoListItem[], id: string): IngresoListItem[] =>
+  lista.filter((ingreso) => ingreso.id !== id);
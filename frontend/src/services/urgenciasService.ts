@@ -222,3 +222,16 @@ export const buscarPacientePorCuil = async (cuil: string): Promise<PacienteRespo
 };
 
 
+
+/**
+ * Obtener un ticket de corta duración para abrir el stream de eventos
+ * (EventSource no permite enviar el header Authorization)
+ */
+export const obtenerTicketEventos = async (): Promise<string> => {
+  try {
+    const response = await api.post<{ ticket: string; expires_in: number }>('/api/urgencias/eventos/ticket');
+    return response.data.ticket;
+  } catch (error) {
+    throw new Error(getErrorMessage(error));
+  }
+};